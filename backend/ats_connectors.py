@@ -0,0 +1,207 @@
+"""
+Celerio Scout - ATS Connectors
+Detects Greenhouse, Lever, Ashby and Workable job boards linked or embedded on
+a company's site and reads the structured job list from the board's public
+JSON endpoint, giving exact open-role counts by department
+"""
+import re
+import asyncio
+import aiohttp
+from typing import Dict, List, Optional, Tuple
+from cache import get_cache, set_cache
+
+# Public job board endpoints; {token} is the company's board name
+ATS_API_URLS = {
+    'greenhouse': 'https://boards-api.greenhouse.io/v1/boards/{token}/jobs',
+    'lever': 'https://api.lever.co/v0/postings/{token}?mode=json',
+    'ashby': 'https://api.ashbyhq.com/posting-api/job-board/{token}',
+    'workable': 'https://apply.workable.com/api/v1/widget/accounts/{token}'
+}
+
+# Links and embed scripts that identify a board (checked in order)
+ATS_PATTERNS = [
+    ('greenhouse', re.compile(r'(?:job-)?boards(?:-api)?\.greenhouse\.io/(?:embed/job_board(?:/js)?\?for=|v1/boards/)?([A-Za-z0-9_-]+)', re.IGNORECASE)),
+    ('lever', re.compile(r'(?:jobs|api)\.lever\.co/(?:v0/postings/)?([A-Za-z0-9_.-]+)', re.IGNORECASE)),
+    ('ashby', re.compile(r'jobs\.ashbyhq\.com/([A-Za-z0-9_.%-]+)', re.IGNORECASE)),
+    ('workable', re.compile(r'apply\.workable\.com/(?:api/v\d/widget/accounts/)?([A-Za-z0-9_-]+)', re.IGNORECASE)),
+    ('workable', re.compile(r'//([A-Za-z0-9-]+)\.workable\.com', re.IGNORECASE)),
+]
+
+# Path segments that follow the board host but are not board names
+_NOT_BOARD_TOKENS = {'embed', 'js', 'v0', 'v1', 'api', 'www', 'apply', 'jobs', 'careers'}
+
+# Role classification by department name, falling back to the job title
+ENGINEERING_KEYWORDS = ['engineer', 'developer', 'software', 'engineering', 'r&d', 'research', 'data', 'devops',
+                        'infrastructure', 'platform', 'technical', 'technology', 'machine learning', 'ml ', 'sre']
+SALES_KEYWORDS = ['sales', 'account executive', 'account manager', 'sdr', 'bdr', 'business development',
+                  'revenue', 'go-to-market', 'gtm', 'partnerships', 'customer success']
+
+# Which ATS a company uses changes rarely - cache the board lookup longer than the job list
+ATS_BOARD_TTL = 7 * 86400
+
+
+def detect_ats(html: str) -> Optional[Tuple[str, str]]:
+    """(ats, board token) for the first job board linked or embedded in a page"""
+    if not html:
+        return None
+    for ats, pattern in ATS_PATTERNS:
+        for match in pattern.finditer(html):
+            token = match.group(1).strip('.').lower()
+            if token and token not in _NOT_BOARD_TOKENS:
+                return ats, token
+    return None
+
+
+def classify_role(department: str, title: str = '') -> str:
+    """'engineering', 'sales' or 'other' for a job"""
+    for text in (department, title):
+        text = f" {(text or '').lower()} "
+        if any(keyword in text for keyword in SALES_KEYWORDS):
+            return 'sales'
+        if any(keyword in text for keyword in ENGINEERING_KEYWORDS):
+            return 'engineering'
+    return 'other'
+
+
+def parse_ats_jobs(ats: str, payload) -> List[Dict]:
+    """Normalize a board payload into [{'title', 'department'}]"""
+    if ats == 'greenhouse':
+        return [
+            {
+                'title': job.get('title', ''),
+                'department': ((job.get('departments') or [{}])[0] or {}).get('name') or ''
+            }
+            for job in (payload or {}).get('jobs', [])
+        ]
+    if ats == 'lever':
+        return [
+            {
+                'title': posting.get('text', ''),
+                'department': (posting.get('categories') or {}).get('department')
+                              or (posting.get('categories') or {}).get('team') or ''
+            }
+            for posting in payload or []
+        ]
+    if ats == 'ashby':
+        return [
+            {'title': job.get('title', ''), 'department': job.get('department') or job.get('team') or ''}
+            for job in (payload or {}).get('jobs', [])
+            if job.get('isListed', True)
+        ]
+    if ats == 'workable':
+        return [
+            {'title': job.get('title', ''), 'department': job.get('department') or ''}
+            for job in (payload or {}).get('jobs', [])
+        ]
+    return []
+
+
+def hiring_signal_from_jobs(ats: str, token: str, jobs: List[Dict]) -> Dict:
+    """Hiring signal (hiring_status, sales_to_eng_ratio and role counts) from a job list
+    (sales_to_eng_ratio is None when the board has no engineering or sales roles)"""
+    roles_by_department: Dict[str, int] = {}
+    counts = {'engineering': 0, 'sales': 0, 'other': 0}
+    for job in jobs:
+        department = job.get('department') or 'Other'
+        roles_by_department[department] = roles_by_department.get(department, 0) + 1
+        counts[classify_role(job.get('department', ''), job.get('title', ''))] += 1
+
+    eng_count, sales_count = counts['engineering'], counts['sales']
+    if eng_count == 0:
+        # No engineering or sales openings says nothing about the mix - unknown (scored neutral)
+        ratio = 999 if sales_count > 0 else None
+    else:
+        ratio = sales_count / eng_count
+
+    return {
+        # A board with no openings is a real "not hiring" signal
+        'hiring_status': 'active' if jobs else 'frozen',
+        'sales_to_eng_ratio': ratio,
+        'ats': ats,
+        'ats_board': token,
+        'open_roles': len(jobs),
+        'engineering_roles': eng_count,
+        'sales_roles': sales_count,
+        'roles_by_department': dict(sorted(roles_by_department.items(), key=lambda item: item[1], reverse=True))
+    }
+
+
+async def fetch_ats_jobs(session: aiohttp.ClientSession, ats: str, token: str, timeout: int = 10) -> Optional[List[Dict]]:
+    """The board's job list in one request (None if the board doesn't exist or failed)"""
+    url = ATS_API_URLS[ats].format(token=token)
+    try:
+        async with session.get(url, headers={'Accept': 'application/json'},
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                return None
+            return parse_ats_jobs(ats, await response.json(content_type=None))
+    except Exception as e:
+        print(f"[ATS] Error fetching {ats} board {token}: {e}")
+        return None
+
+
+async def _fetch_page(session: aiohttp.ClientSession, url: str, timeout: int) -> Optional[str]:
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status == 200:
+                return await response.text()
+    except Exception:
+        pass
+    return None
+
+
+async def fetch_pages(session: aiohttp.ClientSession, urls: List[str], timeout: int = 5) -> Dict[str, Optional[str]]:
+    """{url: html or None} for several pages, fetched concurrently"""
+    return dict(zip(urls, await asyncio.gather(*[_fetch_page(session, url, timeout) for url in urls])))
+
+
+async def find_ats_board(session: aiohttp.ClientSession, domain: str, site_url: Optional[str] = None,
+                         timeout: int = 5) -> Tuple[Optional[Tuple[str, str]], Dict[str, Optional[str]]]:
+    """
+    Locate a company's job board from its careers pages and homepage, fetched concurrently.
+    Returns ((ats, token) or None, {url: html}) - the pages are reused for keyword fallback.
+    """
+    cache_key = f"ats_board:{domain}"
+    cached = get_cache(cache_key)
+    if cached is not None:
+        return (tuple(cached['board']) if cached['board'] else None), {}
+
+    base_url = (site_url or f"https://{domain}").rstrip('/')
+    urls = [f"{base_url}/careers", f"{base_url}/jobs", base_url]
+    pages = await fetch_pages(session, urls, timeout)
+
+    board = None
+    for url in urls:
+        board = detect_ats(pages[url] or '')
+        if board:
+            break
+
+    # Remember "no board" too, but only if the site answered at all
+    if board or any(pages.values()):
+        set_cache(cache_key, {'board': list(board) if board else None}, ATS_BOARD_TTL)
+    return board, pages
+
+
+async def get_ats_hiring_signal(domain: str, session: Optional[aiohttp.ClientSession] = None,
+                                site_url: Optional[str] = None) -> Tuple[Optional[Dict], Dict[str, Optional[str]]]:
+    """
+    Hiring signal from the company's ATS board, if it has one.
+    Returns (signal or None, fetched careers pages for the keyword fallback).
+    """
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession()
+    try:
+        board, pages = await find_ats_board(session, domain, site_url)
+        if not board:
+            return None, pages
+
+        ats, token = board
+        jobs = await fetch_ats_jobs(session, ats, token)
+        if jobs is None:
+            return None, pages
+
+        return hiring_signal_from_jobs(ats, token, jobs), pages
+    finally:
+        if own_session:
+            await session.close()
@@ -84,6 +84,14 @@ def cached(ttl: int = DEFAULT_TTL, key_prefix: str = ""):
         return wrapper
     return decorator
 
+def prime_cache(key_prefix: str, value: Any, *args, ttl: int = DEFAULT_TTL, **kwargs) -> None:
+    """Store the result a @cached(key_prefix=...) function would return for these arguments"""
+    set_cache(_make_key(key_prefix, *args, **kwargs), value, ttl)
+
+def peek_cache(key_prefix: str, *args, **kwargs) -> Optional[Any]:
+    """Cached result of a @cached(key_prefix=...) function for these arguments, if any"""
+    return get_cache(_make_key(key_prefix, *args, **kwargs))
+
 def get_cache_stats() -> Dict[str, Any]:
     """Get cache statistics"""
     total_entries = len(_cache)
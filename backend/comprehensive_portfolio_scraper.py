@@ -13,6 +13,7 @@ from typing import List, Dict
 sys.path.insert(0, str(Path(__file__).parent))
 
 from portfolio_scraper_observable import ObservablePortfolioScraper
+from membership_index import get_membership_index
 
 
 async def scrape_all_portfolios():
@@ -34,6 +35,7 @@ async def scrape_all_portfolios():
     print("Target: 1,267 companies")
     antler_companies = await scraper.scrape_antler_portfolio_observable(max_companies=2000)
     print(f"✅ Antler: Found {len(antler_companies)} companies")
+    await scraper.close()
     
     # Store in database
     print("\n[STEP 3] Storing companies in database...")
@@ -41,14 +43,15 @@ async def scrape_all_portfolios():
     conn = duckdb.connect(str(db_path))
     
     stored_count = 0
+    membership_index = get_membership_index(conn)
     for company in yc_companies + antler_companies:
         try:
             domain = company.get('domain', '').strip()
             if not domain:
                 continue
             
-            # Check if exists
-            existing = conn.execute(
+            # Check if exists (the filter rules most new companies out without a query)
+            existing = membership_index.might_contain('companies', domain) and conn.execute(
                 "SELECT id FROM companies WHERE domain = ?",
                 (domain,)
             ).fetchone()
@@ -69,6 +72,7 @@ async def scrape_all_portfolios():
                     datetime.now(),
                     datetime.now()
                 ))
+                membership_index.add('companies', domain, company.get('name', ''))
                 stored_count += 1
         except Exception as e:
             print(f"Error storing {company.get('name')}: {e}")
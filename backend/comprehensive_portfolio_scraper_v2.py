@@ -5,11 +5,13 @@ Removes limits, adds pagination, improves extraction for ~6k+ companies
 import asyncio
 import json
 from typing import List, Dict, Optional, Set
-import re
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
 import aiohttp
 from bs4 import BeautifulSoup
 from datetime import datetime
+from domain_resolver import GUESSED_DOMAIN_KEY, get_domain_resolver, guess_domain
+from domain_canonical import get_domain_canonicalizer
+from entity_resolution import EntityResolver
 
 try:
     from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
@@ -48,7 +50,8 @@ class ComprehensivePortfolioScraper:
         Expected: ~4000+ companies across all batches
         """
         companies = []
-        seen_companies = set()
+        # Same company listed in several batches or under variant names/domains
+        entity_resolver = EntityResolver('company')
         
         # ALL YC batches from inception to present
         # Format: W{year} or S{year} (Winter/Summer)
@@ -71,10 +74,8 @@ class ComprehensivePortfolioScraper:
                     for company in batch_companies:
                         domain = company.get('domain', '').lower().strip()
                         name = company.get('name', '').lower().strip()
-                        key = domain or name
                         
-                        if key and key not in seen_companies:
-                            seen_companies.add(key)
+                        if (domain or name) and entity_resolver.add_unique(company):
                             company['yc_batch'] = batch
                             companies.append(company)
                     
@@ -291,14 +292,17 @@ class ComprehensivePortfolioScraper:
                             if href:
                                 domain = await self._extract_domain_from_url(href)
                             
+                            guessed = False
                             if not domain:
                                 domain = await self._discover_domain_from_name(name)
+                                guessed = domain is not None
                             
                             companies.append({
                                 'name': name,
                                 'domain': domain or '',
                                 'source': 'antler',
-                                'portfolio_url': urljoin('https://www.antler.co', href) if href else url
+                                'portfolio_url': urljoin('https://www.antler.co', href) if href else url,
+                                GUESSED_DOMAIN_KEY: guessed
                             })
                     
                     current_count = len(companies)
@@ -327,53 +331,22 @@ class ComprehensivePortfolioScraper:
             import traceback
             traceback.print_exc()
         
+        # Verify guessed domains in one concurrent pass (shared resolver, results remembered across runs)
+        await get_domain_resolver().resolve_companies(companies, await self._get_session())
+        
         return companies
     
     async def _extract_domain_from_url(self, url: str) -> Optional[str]:
-        """Extract domain from URL"""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path
-            domain = domain.replace('www.', '').split('/')[0]
-            if domain and '.' in domain:
-                return domain.lower()
-        except:
-            pass
-        return None
+        """Canonical domain of a URL (host without www., subdomains kept, known redirects followed)"""
+        return get_domain_canonicalizer().canonicalize(url)
     
     async def _discover_domain_from_name(self, company_name: str) -> Optional[str]:
         """Try to discover domain from company name"""
         if not company_name or len(company_name) < 2:
             return None
         
-        clean_name = re.sub(r'[^\w\s-]', '', company_name.lower().strip())
-        clean_name = re.sub(r'\s+', ' ', clean_name).strip()
-        
-        potential_domains = []
-        no_spaces = clean_name.replace(' ', '').replace('-', '')
-        
-        # Common TLDs
-        for tld in ['.com', '.io', '.ai', '.co']:
-            potential_domains.append(f"{no_spaces}{tld}")
-            potential_domains.append(f"{clean_name.replace(' ', '-')}{tld}")
-        
-        # Try validating (limit to top 3)
-        session = await self._get_session()
-        for domain in potential_domains[:3]:
-            try:
-                async with session.get(
-                    f"https://{domain}",
-                    timeout=aiohttp.ClientTimeout(total=2),
-                    allow_redirects=True,
-                    ssl=False
-                ) as response:
-                    if response.status < 400:
-                        return domain
-            except:
-                continue
-        
-        # Return most likely candidate
-        return potential_domains[0] if potential_domains else None
+        # Cheap guess only; guesses are verified together once the scrape is done
+        return guess_domain(company_name)
     
     async def scrape_all_vcs(self, db_conn) -> Dict[str, List[Dict]]:
         """
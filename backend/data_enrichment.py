@@ -8,30 +8,26 @@ from typing import Dict, Optional
 from datetime import datetime, timedelta
 import aiohttp
 from bs4 import BeautifulSoup
-
-# Tier 1/2 VC funds (well-known, established funds)
-TIER_1_2_FUNDS = {
-    'Y Combinator', 'Sequoia Capital', 'Andreessen Horowitz', 'a16z', 
-    'Benchmark', 'Accel Partners', 'First Round Capital', 'NFX',
-    'Lightspeed Venture Partners', 'Founders Fund', 'Craft Ventures',
-    'SignalFire', 'Greylock Partners', 'Kleiner Perkins', 'NEA',
-    'Bessemer Venture Partners', 'Index Ventures', 'General Catalyst',
-    'Insight Partners', 'Tiger Global', 'Coatue', 'IVP'
-}
+from page_discovery import discover_pages, pages_for
+from domain_health import is_known_dead
+from taxonomy import fund_tier_matcher
 
 async def extract_funding_info(domain: str, company_name: str) -> Dict:
     """
     Extract funding information from company website or Crunchbase
     Returns: funding_amount (in USD), funding_currency, last_raise_date, last_raise_stage
     """
-    # Try to find funding info on company website (about page, press, etc.)
+    if is_known_dead(domain):
+        return {
+            'funding_amount': None,
+            'funding_currency': None,
+            'last_raise_date': None,
+            'last_raise_stage': None
+        }
+    
+    # Try to find funding info on company website (press and about pages it actually has)
     async with aiohttp.ClientSession() as session:
-        urls_to_check = [
-            f"https://{domain}/about",
-            f"https://{domain}/press",
-            f"https://{domain}/news",
-            f"https://www.{domain}/about"
-        ]
+        urls_to_check = pages_for(await discover_pages(domain, session), ['press', 'about'], limit=4)
         
         for url in urls_to_check:
             try:
@@ -77,12 +73,10 @@ async def extract_employee_count(domain: str) -> Optional[int]:
     """
     Extract employee count from company website (about page, team page)
     """
+    if is_known_dead(domain):
+        return None
     async with aiohttp.ClientSession() as session:
-        urls_to_check = [
-            f"https://{domain}/about",
-            f"https://{domain}/team",
-            f"https://www.{domain}/about"
-        ]
+        urls_to_check = pages_for(await discover_pages(domain, session), ['about', 'team'], limit=3)
         
         for url in urls_to_check:
             try:
@@ -115,15 +109,10 @@ async def extract_employee_count(domain: str) -> Optional[int]:
 
 def determine_fund_tier(vc_name: str) -> Optional[str]:
     """
-    Determine if VC is Tier 1 or Tier 2 based on known list
+    Determine if VC is Tier 1 or Tier 2 based on known list (taxonomy.FUND_TIERS)
     """
-    vc_name_lower = vc_name.lower()
-    for tier_fund in TIER_1_2_FUNDS:
-        if tier_fund.lower() in vc_name_lower or vc_name_lower in tier_fund.lower():
-            return "Tier 1"
-    
     # Could add Tier 2 logic here
-    return None
+    return fund_tier_matcher.first(vc_name)
 
 async def enrich_company_data(company: Dict, domain: str) -> Dict:
     """
@@ -0,0 +1,346 @@
+"""
+Celerio Scout - Domain Canonicalization
+Stores known domain redirects and maps company domains to one canonical form
+"""
+import asyncio
+import ipaddress
+import aiohttp
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from domain_health import get_domain_health, is_known_dead
+
+# Bundled copy of https://publicsuffix.org/list/public_suffix_list.dat (refresh by replacing the file)
+PUBLIC_SUFFIX_FILE = Path(__file__).parent.parent / "data" / "public_suffix_list.dat"
+
+# How long a redirect check is trusted; failed checks are retried sooner
+REDIRECT_TTL = timedelta(days=30)
+FAILED_REDIRECT_TTL = timedelta(days=7)
+
+# Redirect checks in flight at once, and per-check timeout (seconds)
+REDIRECT_CONCURRENCY = 50
+REDIRECT_TIMEOUT = 8
+
+# Stored redirects followed at most this many hops (chains of rebrands)
+MAX_REDIRECT_HOPS = 3
+
+# Redirect targets that say nothing about the company (parking, marketplaces, social profiles)
+IGNORED_REDIRECT_TARGETS = {
+    'sedoparking.com', 'hugedomains.com', 'dan.com', 'afternic.com', 'godaddy.com',
+    'bodis.com', 'parkingcrew.net', 'above.com', 'namecheap.com', 'squarespace.com',
+    'wix.com', 'linkedin.com', 'facebook.com', 'twitter.com', 'x.com', 'instagram.com',
+    'google.com', 'medium.com', 'linktr.ee', 'crunchbase.com'
+}
+
+
+def _to_ascii(name: str) -> Optional[str]:
+    """IDNA (punycode) form of a host name, None if it isn't a valid name"""
+    try:
+        return name.encode('idna').decode('ascii').lower()
+    except UnicodeError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_public_suffixes(path: Path = PUBLIC_SUFFIX_FILE) -> Tuple[Set[str], Set[str], Set[str]]:
+    """(rules, wildcard rules without '*.', exception rules without '!') in ASCII form"""
+    rules, wildcards, exceptions = set(), set(), set()
+    try:
+        lines = path.read_text(encoding='utf-8').splitlines()
+    except OSError as e:
+        print(f"[DOMAIN-CANONICAL] Public suffix list not available ({e}) - using last label as suffix")
+        lines = []
+    for line in lines:
+        rule = line.strip().split(' ')[0]
+        if not rule or rule.startswith('//'):
+            continue
+        if rule.startswith('!'):
+            target, rule = exceptions, rule[1:]
+        elif rule.startswith('*.'):
+            target, rule = wildcards, rule[2:]
+        else:
+            target = rules
+        ascii_rule = _to_ascii(rule)
+        if ascii_rule:
+            target.add(ascii_rule)
+    return rules, wildcards, exceptions
+
+
+def normalize_host(url_or_domain: str) -> Optional[str]:
+    """Lowercase IDNA host of a URL or bare domain (no scheme, port, path or trailing dot)"""
+    value = (url_or_domain or '').strip()
+    if not value:
+        return None
+    if '://' not in value:
+        value = 'http://' + value.lstrip('/')
+    try:
+        host = urlparse(value).hostname
+    except ValueError:
+        return None
+    host = (host or '').strip().rstrip('.')
+    if not host or '.' not in host or ' ' in host:
+        return None
+    return _to_ascii(host)
+
+
+def public_suffix(host: str) -> str:
+    """Public suffix of an ASCII host ('co.uk' for 'www.acme.co.uk')"""
+    rules, wildcards, exceptions = load_public_suffixes()
+    labels = host.split('.')
+    # Leftmost match is the longest rule; exceptions cut one label off their wildcard
+    for i in range(len(labels)):
+        candidate = '.'.join(labels[i:])
+        if candidate in exceptions:
+            return '.'.join(labels[i + 1:])
+        if candidate in rules:
+            return candidate
+        if i + 1 < len(labels) and '.'.join(labels[i + 1:]) in wildcards:
+            return candidate
+    # Default rule: the TLD
+    return labels[-1]
+
+
+def registrable_domain(host: str) -> Optional[str]:
+    """eTLD+1 of an ASCII host, None for bare public suffixes"""
+    suffix = public_suffix(host)
+    labels = host.split('.')
+    suffix_labels = suffix.count('.') + 1
+    if len(labels) <= suffix_labels:
+        return None
+    return '.'.join(labels[-(suffix_labels + 1):])
+
+
+def canonical_domain(url_or_domain: str) -> Optional[str]:
+    """
+    Canonical company domain of a URL or domain without consulting redirects:
+    the lowercase IDNA host without 'www.' ('https://WWW.Acme.co.uk/about' -> 'acme.co.uk',
+    'bücher.de' -> 'xn--bcher-kva.de'). Other subdomains are kept, since
+    'acme.substack.com' and 'beta.substack.com' are different companies - hosts
+    only merge through stored redirects. None for IPs, bare public suffixes and
+    unparseable input.
+    """
+    host = normalize_host(url_or_domain)
+    if not host:
+        return None
+    try:
+        ipaddress.ip_address(host)
+        return None
+    except ValueError:
+        pass
+    if host.startswith('www.'):
+        host = host[len('www.'):]
+    if not registrable_domain(host):
+        return None
+    return host
+
+
+class DomainCanonicalizer:
+    """Canonical domains with a persistent domain -> redirect target table"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection redirects live only for the lifetime of this canonicalizer
+        self.conn = db_conn
+        self._redirects: Dict[str, Dict] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+            self._load()
+
+    def _ensure_tables(self):
+        """Ensure domain_redirects table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_redirects (
+                domain TEXT PRIMARY KEY,
+                canonical_domain TEXT,     -- where the site ends up (same domain if no redirect)
+                final_url TEXT,
+                resolved BOOLEAN,          -- FALSE when the site didn't answer
+                checked_at TIMESTAMP
+            )
+        """)
+
+    def _load(self):
+        """Mirror the table in memory - canonicalize() is called for every ingested company"""
+        try:
+            rows = self.conn.execute(
+                "SELECT domain, canonical_domain, final_url, resolved, checked_at FROM domain_redirects"
+            ).fetchall()
+        except Exception as e:
+            print(f"[DOMAIN-CANONICAL] Error loading redirects: {e}")
+            return
+        for row in rows:
+            self._redirects[row[0]] = {
+                'canonical_domain': row[1],
+                'final_url': row[2],
+                'resolved': bool(row[3]),
+                'checked_at': row[4]
+            }
+
+    def attach(self, db_conn):
+        """Start persisting redirects to a database"""
+        if self.conn is None and db_conn is not None:
+            self.conn = db_conn
+            self._ensure_tables()
+            known = self._redirects
+            self._redirects = {}
+            self._load()
+            for domain, record in known.items():
+                self._store(domain, record)
+
+    def _store(self, domain: str, record: Dict):
+        self._redirects[domain] = record
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute("DELETE FROM domain_redirects WHERE domain = ?", (domain,))
+            self.conn.execute("""
+                INSERT INTO domain_redirects (domain, canonical_domain, final_url, resolved, checked_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (domain, record['canonical_domain'], record['final_url'], record['resolved'], record['checked_at']))
+        except Exception as e:
+            print(f"[DOMAIN-CANONICAL] Error saving {domain}: {e}")
+
+    def _is_fresh(self, record: Optional[Dict]) -> bool:
+        if record is None:
+            return False
+        ttl = REDIRECT_TTL if record['resolved'] else FAILED_REDIRECT_TTL
+        return datetime.now() - record['checked_at'] < ttl
+
+    def canonicalize(self, url_or_domain: str) -> Optional[str]:
+        """Canonical domain, following redirects already in the table (no network)"""
+        domain = canonical_domain(url_or_domain)
+        seen = {domain}
+        for _ in range(MAX_REDIRECT_HOPS):
+            record = self._redirects.get(domain)
+            target = record and record['canonical_domain']
+            if not target or target in seen:
+                break
+            seen.add(target)
+            domain = target
+        return domain
+
+    async def _check_redirect(self, session: aiohttp.ClientSession, domain: str) -> Dict:
+        """Request the site and see which canonical host it lands on"""
+        health = get_domain_health()
+        for url in (f"https://{domain}", f"http://{domain}"):
+            try:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=REDIRECT_TIMEOUT),
+                                        allow_redirects=True, ssl=False) as response:
+                    health.record_success(domain, response.status)
+                    final_url = str(response.url)
+                    target = canonical_domain(final_url)
+                    # Landing on a subdomain (app., en., a login page) doesn't make it the company's domain
+                    if not target or target in IGNORED_REDIRECT_TARGETS or target.endswith('.' + domain):
+                        target = domain
+                    return {'canonical_domain': target, 'final_url': final_url,
+                            'resolved': True, 'checked_at': datetime.now()}
+            except Exception as e:
+                error = e
+        health.record_fetch_error(domain, error)
+        return {'canonical_domain': domain, 'final_url': None, 'resolved': False, 'checked_at': datetime.now()}
+
+    async def resolve(self, url_or_domain: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
+        """Canonical domain, checking the site's redirect first if it isn't known yet"""
+        domain = canonical_domain(url_or_domain)
+        if not domain:
+            return None
+        if self._is_fresh(self._redirects.get(domain)) or is_known_dead(domain):
+            return self.canonicalize(domain)
+
+        # Concurrent checks of the same domain share one request
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(domain)
+        if pending is not None and pending.get_loop() is loop:
+            await asyncio.shield(pending)
+            return self.canonicalize(domain)
+
+        future = loop.create_future()
+        self._pending[domain] = future
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        try:
+            record = await self._check_redirect(session, domain)
+            if record['canonical_domain'] != domain:
+                print(f"[DOMAIN-CANONICAL] {domain} redirects to {record['canonical_domain']}")
+            self._store(domain, record)
+            return self.canonicalize(domain)
+        finally:
+            if not future.done():
+                future.set_result(None)
+            if self._pending.get(domain) is future:
+                del self._pending[domain]
+            if own_session:
+                await session.close()
+
+    async def canonicalize_companies(self, companies: List[Dict], resolve_redirects: bool = True,
+                                     session: Optional[aiohttp.ClientSession] = None,
+                                     concurrency: int = REDIRECT_CONCURRENCY) -> List[Dict]:
+        """
+        Companies with canonical domains, duplicates collapsed into the first
+        occurrence (its empty fields filled from the others). Companies without
+        a usable domain are kept as they are.
+        """
+        domains: Dict[str, Optional[str]] = {}
+        for company in companies:
+            raw = (company.get('domain') or '').strip()
+            if raw and raw not in domains:
+                domains[raw] = None
+
+        if resolve_redirects and domains:
+            limit = asyncio.Semaphore(max(concurrency, 1))
+            own_session = session is None
+            if own_session:
+                session = aiohttp.ClientSession()
+            try:
+                async def resolve(raw: str):
+                    async with limit:
+                        try:
+                            domains[raw] = await self.resolve(raw, session)
+                        except Exception as e:
+                            print(f"[DOMAIN-CANONICAL] Error resolving {raw}: {e}")
+                            domains[raw] = self.canonicalize(raw)
+
+                await asyncio.gather(*[resolve(raw) for raw in domains])
+            finally:
+                if own_session:
+                    await session.close()
+        else:
+            for raw in domains:
+                domains[raw] = self.canonicalize(raw)
+
+        collapsed: List[Dict] = []
+        by_domain: Dict[str, Dict] = {}
+        for company in companies:
+            raw = (company.get('domain') or '').strip()
+            domain = domains.get(raw) if raw else None
+            if not domain:
+                collapsed.append(company)
+                continue
+            existing = by_domain.get(domain)
+            if existing is None:
+                by_domain[domain] = {**company, 'domain': domain}
+                collapsed.append(by_domain[domain])
+                continue
+            for key, value in company.items():
+                if value not in (None, '', [], {}) and existing.get(key) in (None, '', [], {}):
+                    existing[key] = value
+
+        if len(collapsed) < len(companies):
+            print(f"[DOMAIN-CANONICAL] Collapsed {len(companies) - len(collapsed)} duplicate domains "
+                  f"({len(collapsed)} companies remain)")
+        return collapsed
+
+
+_shared_canonicalizer: Optional[DomainCanonicalizer] = None
+
+
+def get_domain_canonicalizer(db_conn=None) -> DomainCanonicalizer:
+    """Canonicalizer shared by all ingestion paths (persists once any caller provides a connection)"""
+    global _shared_canonicalizer
+    if _shared_canonicalizer is None:
+        _shared_canonicalizer = DomainCanonicalizer(db_conn)
+    else:
+        _shared_canonicalizer.attach(db_conn)
+    return _shared_canonicalizer
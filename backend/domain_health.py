@@ -0,0 +1,275 @@
+"""
+Celerio Scout - Domain Health
+Stores liveness of company domains so fetches can skip dead hosts
+"""
+import socket
+import asyncio
+import aiohttp
+from typing import Dict, Iterable, Optional
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+# Consecutive failures before a host is skipped (a missing DNS record counts immediately)
+FAILURES_BEFORE_BACKOFF = 2
+
+# Skip window after the threshold is reached, doubling per further failure
+BACKOFF_BASE = timedelta(days=1)
+BACKOFF_MAX = timedelta(days=30)
+
+# Failures closer together than this count once (one scan hits a host from several helpers)
+FAILURE_DEDUP_WINDOW = timedelta(minutes=10)
+
+# Sweeper: hosts checked at once, per-check timeouts, and how recent a check must be to skip it
+SWEEP_CONCURRENCY = 100
+SWEEP_DNS_TIMEOUT = 3
+SWEEP_HTTP_TIMEOUT = 8
+SWEEP_RECHECK_AFTER = timedelta(hours=12)
+
+
+def domain_of(url_or_domain: str) -> str:
+    """Bare host for a URL or domain (lowercase, no www.)"""
+    value = (url_or_domain or '').strip().lower()
+    host = urlparse(value).hostname if '://' in value else value.split('/')[0]
+    host = (host or '').split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def _dns_status(error: Optional[BaseException]) -> str:
+    """'nxdomain' when the name definitely doesn't exist, 'error' for other DNS failures, else 'ok'"""
+    if isinstance(error, socket.gaierror):
+        return 'nxdomain' if error.errno == socket.EAI_NONAME else 'error'
+    return 'ok'
+
+
+class DomainHealthStore:
+    """Per-domain DNS/HTTP health with failure backoff, persisted in DuckDB"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection health lives only for the lifetime of this store
+        self.conn = db_conn
+        self._health: Dict[str, Dict] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+            self._load()
+
+    def _ensure_tables(self):
+        """Ensure domain_health table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_health (
+                domain TEXT PRIMARY KEY,
+                dns_status TEXT,               -- ok / nxdomain / error
+                last_http_status INTEGER,      -- NULL when no response was received
+                last_error TEXT,
+                consecutive_failures INTEGER,
+                last_checked_at TIMESTAMP,
+                last_ok_at TIMESTAMP,
+                backoff_until TIMESTAMP        -- fetches are skipped until then
+            )
+        """)
+
+    def _load(self):
+        """Mirror the table in memory - fetch helpers check it on every request"""
+        try:
+            rows = self.conn.execute("""
+                SELECT domain, dns_status, last_http_status, last_error, consecutive_failures,
+                       last_checked_at, last_ok_at, backoff_until
+                FROM domain_health
+            """).fetchall()
+        except Exception as e:
+            print(f"[DOMAIN-HEALTH] Error loading domain health: {e}")
+            return
+        for row in rows:
+            self._health[row[0]] = {
+                'dns_status': row[1],
+                'last_http_status': row[2],
+                'last_error': row[3],
+                'consecutive_failures': row[4] or 0,
+                'last_checked_at': row[5],
+                'last_ok_at': row[6],
+                'backoff_until': row[7]
+            }
+
+    def attach(self, db_conn):
+        """Start persisting health to a database"""
+        if self.conn is None and db_conn is not None:
+            self.conn = db_conn
+            self._ensure_tables()
+            known = self._health
+            self._health = {}
+            self._load()
+            for domain, record in known.items():
+                self._save(domain, record)
+
+    def get(self, url_or_domain: str) -> Optional[Dict]:
+        return self._health.get(domain_of(url_or_domain))
+
+    def is_dead(self, url_or_domain: str, now: Optional[datetime] = None) -> bool:
+        """Whether fetches to this host should be skipped right now"""
+        record = self.get(url_or_domain)
+        if not record or not record.get('backoff_until'):
+            return False
+        return record['backoff_until'] > (now or datetime.now())
+
+    def record_success(self, url_or_domain: str, http_status: Optional[int] = None):
+        """The host answered (any HTTP status proves it is alive)"""
+        domain = domain_of(url_or_domain)
+        if not domain:
+            return
+        previous = self._health.get(domain)
+        now = datetime.now()
+        # Passive successes only touch the table when something changes
+        if previous and not previous['consecutive_failures'] and previous['last_http_status'] == http_status \
+                and previous['last_checked_at'] and now - previous['last_checked_at'] < SWEEP_RECHECK_AFTER:
+            return
+        self._save(domain, {
+            'dns_status': 'ok',
+            'last_http_status': http_status,
+            'last_error': None,
+            'consecutive_failures': 0,
+            'last_checked_at': now,
+            'last_ok_at': now,
+            'backoff_until': None
+        })
+
+    def record_failure(self, url_or_domain: str, error: str, dns_status: str = 'ok'):
+        """No response from the host (DNS failure, refused connection or timeout)"""
+        domain = domain_of(url_or_domain)
+        if not domain:
+            return
+        previous = self._health.get(domain) or {}
+        now = datetime.now()
+        if previous.get('consecutive_failures') and previous.get('last_checked_at') \
+                and now - previous['last_checked_at'] < FAILURE_DEDUP_WINDOW and dns_status != 'nxdomain':
+            return
+        failures = (previous.get('consecutive_failures') or 0) + 1
+        backoff_until = None
+        threshold = 1 if dns_status == 'nxdomain' else FAILURES_BEFORE_BACKOFF
+        if failures >= threshold:
+            backoff = min(BACKOFF_BASE * (2 ** (failures - threshold)), BACKOFF_MAX)
+            backoff_until = now + backoff
+        self._save(domain, {
+            'dns_status': dns_status,
+            'last_http_status': None,
+            'last_error': (error or '')[:200],
+            'consecutive_failures': failures,
+            'last_checked_at': now,
+            'last_ok_at': previous.get('last_ok_at'),
+            'backoff_until': backoff_until
+        })
+
+    def record_fetch_error(self, url_or_domain: str, error: BaseException):
+        """Record a failed fetch if the host itself didn't answer (HTTP errors don't count)"""
+        if isinstance(error, (aiohttp.ClientConnectorCertificateError, aiohttp.ClientSSLError)):
+            # The host completed a TLS handshake - only its certificate is bad, so it is alive
+            self.record_success(url_or_domain)
+        elif isinstance(error, aiohttp.ClientConnectorError):
+            self.record_failure(url_or_domain, str(error), dns_status=_dns_status(getattr(error, 'os_error', None)))
+        elif isinstance(error, asyncio.TimeoutError):
+            self.record_failure(url_or_domain, 'timeout')
+
+    def _save(self, domain: str, record: Dict):
+        self._health[domain] = record
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute("DELETE FROM domain_health WHERE domain = ?", (domain,))
+            self.conn.execute("""
+                INSERT INTO domain_health (domain, dns_status, last_http_status, last_error,
+                    consecutive_failures, last_checked_at, last_ok_at, backoff_until)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                domain,
+                record['dns_status'],
+                record['last_http_status'],
+                record['last_error'],
+                record['consecutive_failures'],
+                record['last_checked_at'],
+                record['last_ok_at'],
+                record['backoff_until']
+            ))
+        except Exception as e:
+            print(f"[DOMAIN-HEALTH] Error saving {domain}: {e}")
+
+    # Sweeping
+
+    async def check_domain(self, session: aiohttp.ClientSession, domain: str) -> bool:
+        """DNS lookup, then one HTTP request; records the outcome. True if the host answered."""
+        domain = domain_of(domain)
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.getaddrinfo(domain, 443, type=socket.SOCK_STREAM), SWEEP_DNS_TIMEOUT)
+        except socket.gaierror as e:
+            self.record_failure(domain, str(e), dns_status=_dns_status(e))
+            return False
+        except Exception as e:
+            self.record_failure(domain, str(e) or 'DNS timeout', dns_status='error')
+            return False
+
+        for url in (f"https://{domain}", f"http://{domain}"):
+            try:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=SWEEP_HTTP_TIMEOUT),
+                                        allow_redirects=True, ssl=False) as response:
+                    self.record_success(domain, response.status)
+                    return True
+            except Exception as e:
+                error = str(e) or type(e).__name__
+        self.record_failure(domain, error)
+        return False
+
+    async def sweep(self, domains: Iterable[str], concurrency: int = SWEEP_CONCURRENCY,
+                    force: bool = False) -> Dict[str, int]:
+        """Check many domains concurrently (skipping recently checked ones unless forced)"""
+        now = datetime.now()
+        to_check = []
+        for domain in dict.fromkeys(domain_of(domain) for domain in domains):
+            if not domain or '.' not in domain:
+                continue
+            record = self._health.get(domain)
+            if not force and record and record.get('last_checked_at') \
+                    and now - record['last_checked_at'] < SWEEP_RECHECK_AFTER:
+                continue
+            to_check.append(domain)
+
+        limit = asyncio.Semaphore(max(concurrency, 1))
+        async with aiohttp.ClientSession() as session:
+            async def check(domain: str) -> bool:
+                async with limit:
+                    return await self.check_domain(session, domain)
+
+            results = await asyncio.gather(*[check(domain) for domain in to_check])
+
+        summary = {
+            'checked': len(to_check),
+            'alive': sum(1 for ok in results if ok),
+            'failed': sum(1 for ok in results if not ok),
+            'dead': sum(1 for domain in to_check if self.is_dead(domain))
+        }
+        print(f"[DOMAIN-HEALTH] Swept {summary['checked']} domains: {summary['alive']} alive, "
+              f"{summary['failed']} failed, {summary['dead']} backed off")
+        return summary
+
+    def summary(self) -> Dict[str, int]:
+        now = datetime.now()
+        return {
+            'tracked': len(self._health),
+            'dead': sum(1 for domain in self._health if self.is_dead(domain, now)),
+            'nxdomain': sum(1 for record in self._health.values() if record.get('dns_status') == 'nxdomain')
+        }
+
+
+_shared_health: Optional[DomainHealthStore] = None
+
+
+def get_domain_health(db_conn=None) -> DomainHealthStore:
+    """Health store shared by all fetch helpers (persists once any caller provides a connection)"""
+    global _shared_health
+    if _shared_health is None:
+        _shared_health = DomainHealthStore(db_conn)
+    else:
+        _shared_health.attach(db_conn)
+    return _shared_health
+
+
+def is_known_dead(url_or_domain: str) -> bool:
+    """Whether a host is currently backed off (fetch helpers skip it)"""
+    return get_domain_health().is_dead(url_or_domain)
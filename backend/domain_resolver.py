@@ -0,0 +1,268 @@
+"""
+Celerio Scout - Domain Resolver
+Stores company name -> domain resolutions (misses included) and probes new names
+"""
+import re
+import socket
+import asyncio
+import aiohttp
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+
+# Candidates probed per name, in order of likelihood
+MAX_CANDIDATES = 8
+
+# Probes in flight across all names
+MAX_CONCURRENT_PROBES = 64
+
+# Per-candidate timeouts (seconds)
+DNS_TIMEOUT = 2
+HEAD_TIMEOUT = 3
+
+# How long a stored result is trusted; misses are retried sooner
+RESOLVED_TTL = timedelta(days=90)
+UNRESOLVED_TTL = timedelta(days=14)
+
+# Status codes that still prove a live site (HEAD not allowed, bot protection)
+_LIVE_STATUSES = {403, 405, 429}
+
+# Set by scrapers on a company whose domain is only the unverified name.com guess
+GUESSED_DOMAIN_KEY = 'domain_guessed'
+
+
+def normalize_company_name(company_name: str) -> str:
+    """Lowercase name with punctuation removed and whitespace collapsed"""
+    clean_name = re.sub(r'[^\w\s-]', '', (company_name or '').lower().strip())
+    return re.sub(r'\s+', ' ', clean_name).strip()
+
+
+def guess_domain(company_name: str) -> Optional[str]:
+    """Most likely domain for a name without checking it (name.com)"""
+    no_spaces = normalize_company_name(company_name).replace(' ', '').replace('-', '')
+    return f"{no_spaces}.com" if no_spaces else None
+
+
+def candidate_domains(company_name: str, limit: int = MAX_CANDIDATES) -> List[str]:
+    """Potential domains for a company name in order of likelihood"""
+    clean_name = normalize_company_name(company_name)
+    if len(clean_name) < 2:
+        return []
+
+    no_spaces = clean_name.replace(' ', '').replace('-', '')
+    with_hyphens = clean_name.replace(' ', '-')
+
+    # Direct name and hyphenated name with .com, then common startup TLDs, then less common ones
+    potential_domains = [f"{no_spaces}.com", f"{with_hyphens}.com"]
+    for tld in ['.io', '.ai', '.co']:
+        potential_domains.append(f"{no_spaces}{tld}")
+        potential_domains.append(f"{with_hyphens}{tld}")
+    for tld in ['.app', '.tech', '.dev']:
+        potential_domains.append(f"{no_spaces}{tld}")
+
+    return list(dict.fromkeys(domain for domain in potential_domains if not domain.startswith('.')))[:limit]
+
+
+class DomainResolver:
+    """Concurrent candidate probing with a persistent name -> domain table"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection results live only for the lifetime of this resolver
+        self.conn = db_conn
+        self._results: Dict[str, Dict] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._probe_limit: Optional[asyncio.Semaphore] = None
+        self._probe_loop = None
+        self.probes = 0
+        if self.conn is not None:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure domain_resolutions table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_resolutions (
+                name_key TEXT PRIMARY KEY,
+                domain TEXT,               -- NULL when no candidate answered
+                resolved BOOLEAN,
+                candidates_checked INTEGER,
+                resolved_at TIMESTAMP
+            )
+        """)
+
+    def attach(self, db_conn):
+        """Start persisting results to a database"""
+        if self.conn is None and db_conn is not None:
+            self.conn = db_conn
+            self._ensure_tables()
+
+    # Stored results
+
+    def lookup(self, company_name: str) -> Optional[Dict]:
+        """Stored result for a name ({'domain', 'resolved', 'resolved_at'}) if still valid"""
+        name_key = normalize_company_name(company_name)
+        record = self._results.get(name_key)
+        if record is None and self.conn is not None:
+            try:
+                row = self.conn.execute(
+                    "SELECT domain, resolved, resolved_at FROM domain_resolutions WHERE name_key = ?",
+                    (name_key,)
+                ).fetchone()
+            except Exception as e:
+                print(f"[DOMAIN-RESOLVER] Error loading {name_key}: {e}")
+                row = None
+            if row:
+                record = {'domain': row[0], 'resolved': bool(row[1]), 'resolved_at': row[2]}
+                self._results[name_key] = record
+
+        if record is None:
+            return None
+        ttl = RESOLVED_TTL if record['resolved'] else UNRESOLVED_TTL
+        if datetime.now() - record['resolved_at'] >= ttl:
+            return None
+        return record
+
+    def _store(self, name_key: str, domain: Optional[str], candidates_checked: int):
+        record = {'domain': domain, 'resolved': domain is not None, 'resolved_at': datetime.now()}
+        self._results[name_key] = record
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute("DELETE FROM domain_resolutions WHERE name_key = ?", (name_key,))
+            self.conn.execute("""
+                INSERT INTO domain_resolutions (name_key, domain, resolved, candidates_checked, resolved_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (name_key, domain, record['resolved'], candidates_checked, record['resolved_at']))
+        except Exception as e:
+            print(f"[DOMAIN-RESOLVER] Error saving {name_key}: {e}")
+
+    # Probing
+
+    async def _dns_resolves(self, domain: str) -> bool:
+        """Cheap pre-check: does the name have an address at all"""
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.getaddrinfo(domain, 443, type=socket.SOCK_STREAM), DNS_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _head_ok(self, session: aiohttp.ClientSession, url: str, **kwargs) -> bool:
+        try:
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=HEAD_TIMEOUT),
+                                    allow_redirects=True, **kwargs) as response:
+                return response.status < 400 or response.status in _LIVE_STATUSES
+        except Exception:
+            return False
+
+    async def probe(self, session: aiohttp.ClientSession, domain: str) -> bool:
+        """Whether a candidate domain serves a website (DNS, then HEAD over https, then http)"""
+        # Scrapers may run in their own event loops; the limit is per loop
+        loop = asyncio.get_running_loop()
+        if self._probe_limit is None or self._probe_loop is not loop:
+            self._probe_limit = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+            self._probe_loop = loop
+        async with self._probe_limit:
+            self.probes += 1
+            if not await self._dns_resolves(domain):
+                return False
+            if await self._head_ok(session, f"https://{domain}", ssl=False):
+                return True
+            return await self._head_ok(session, f"http://{domain}")
+
+    async def _probe_candidates(self, session: aiohttp.ClientSession, candidates: List[str]) -> Optional[str]:
+        """Best-ranked live candidate; lower-ranked probes are cancelled once it is known"""
+        tasks = [asyncio.ensure_future(self.probe(session, domain)) for domain in candidates]
+        try:
+            # Candidates are ranked, so the answer is the first live one in order -
+            # but all of them are already probing in parallel
+            for domain, task in zip(candidates, tasks):
+                if await task:
+                    return domain
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def resolve(self, company_name: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
+        """Verified domain for a company name (None if no candidate answers)"""
+        name_key = normalize_company_name(company_name)
+        if len(name_key) < 2:
+            return None
+
+        stored = self.lookup(name_key)
+        if stored is not None:
+            return stored['domain']
+
+        # Concurrent lookups of the same name share one probe
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(name_key)
+        if pending is not None and pending.get_loop() is loop:
+            return await asyncio.shield(pending)
+
+        future = loop.create_future()
+        self._pending[name_key] = future
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        try:
+            candidates = candidate_domains(name_key)
+            domain = await self._probe_candidates(session, candidates)
+            self._store(name_key, domain, len(candidates))
+            future.set_result(domain)
+            return domain
+        except BaseException:
+            # Waiters fall back like an unresolved name; nothing is stored
+            if not future.done():
+                future.set_result(None)
+            raise
+        finally:
+            if self._pending.get(name_key) is future:
+                del self._pending[name_key]
+            if own_session:
+                await session.close()
+
+    async def resolve_or_guess(self, company_name: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
+        """Verified domain, or the most likely candidate if none answered"""
+        return await self.resolve(company_name, session) or guess_domain(company_name)
+
+    async def resolve_companies(self, companies: List[Dict], session: Optional[aiohttp.ClientSession] = None) -> int:
+        """
+        Resolve every company with no domain or a guessed one, all names probed at once.
+        Companies keep (or get) the name.com guess when no candidate answers. Returns the number of names resolved.
+        """
+        pending = [company for company in companies
+                   if company.pop(GUESSED_DOMAIN_KEY, False) or not company.get('domain')]
+        names = list(dict.fromkeys(company.get('name') or '' for company in pending))
+        if not names:
+            return 0
+
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession()
+        try:
+            results = await asyncio.gather(*(self.resolve(name, session) for name in names), return_exceptions=True)
+        finally:
+            if own_session:
+                await session.close()
+
+        resolved = {name: domain for name, domain in zip(names, results) if isinstance(domain, str)}
+        for company in pending:
+            name = company.get('name') or ''
+            domain = resolved.get(name) or company.get('domain')
+            if not domain and len(normalize_company_name(name)) >= 2:
+                domain = guess_domain(name)
+            company['domain'] = domain or ''
+        return len(resolved)
+
+
+_shared_resolver: Optional[DomainResolver] = None
+
+
+def get_domain_resolver(db_conn=None) -> DomainResolver:
+    """Resolver shared by all scrapers (persists once any caller provides a connection)"""
+    global _shared_resolver
+    if _shared_resolver is None:
+        _shared_resolver = DomainResolver(db_conn)
+    else:
+        _shared_resolver.attach(db_conn)
+    return _shared_resolver
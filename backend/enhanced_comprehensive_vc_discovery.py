@@ -9,11 +9,13 @@ Multi-layered approach to discover ALL investment vehicles globally:
 import asyncio
 import aiohttp
 import re
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
 import json
 from datetime import datetime
+from domain_canonical import get_domain_canonicalizer
+from entity_resolution import EntityResolver
 
 try:
     from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
@@ -28,8 +30,7 @@ class ComprehensiveVCDiscovery:
     
     def __init__(self):
         self.discovered_vcs: List[Dict] = []
-        self.seen_firms: Set[str] = set()  # Track by normalized name
-        self.seen_domains: Set[str] = set()  # Track by domain
+        self.entity_resolver = EntityResolver('vc')  # Track by fuzzy name and domain
         
     def _normalize_name(self, name: str) -> str:
         """Normalize firm name for deduplication"""
@@ -45,49 +46,16 @@ class ComprehensiveVCDiscovery:
         return normalized
     
     def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL"""
+        """Canonical domain of a URL (host without www., subdomains kept, known redirects followed)"""
         if not url:
             return ""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path.split('/')[0]
-            domain = domain.replace('www.', '').lower()
-            return domain
-        except:
-            return ""
+        return get_domain_canonicalizer().canonicalize(url) or ""
     
     def _is_duplicate(self, vc: Dict) -> bool:
-        """Check if VC is duplicate using multiple criteria"""
-        firm_name = vc.get('firm_name', '').strip()
-        domain = vc.get('domain', '').strip()
-        url = vc.get('url', '').strip()
-        
-        if not firm_name:
-            return True
-        
-        # Normalize name
-        normalized_name = self._normalize_name(firm_name)
-        
-        # Check by normalized name
-        if normalized_name in self.seen_firms:
+        """Check if VC is duplicate (similar name, same domain or same domain root)"""
+        if not vc.get('firm_name', '').strip():
             return True
-        
-        # Check by domain
-        if domain and domain in self.seen_domains:
-            return True
-        
-        # Extract domain from URL if not provided
-        if not domain and url:
-            domain = self._extract_domain(url)
-            if domain and domain in self.seen_domains:
-                return True
-        
-        # Add to seen sets
-        self.seen_firms.add(normalized_name)
-        if domain:
-            self.seen_domains.add(domain)
-        
-        return False
+        return not self.entity_resolver.add_unique(vc)
     
     async def discover_from_crunchbase(self) -> List[Dict]:
         """
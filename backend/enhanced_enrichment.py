@@ -10,6 +10,10 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
+from page_discovery import discover_pages, pages_for
+from domain_health import is_known_dead
+from taxonomy import company_focus_matcher
+from enrichment_pipeline import EnrichmentProgress, run_enrichment_pipeline, DEFAULT_ENRICHMENT_CONCURRENCY
 
 # Try to import Firecrawl
 try:
@@ -26,11 +30,19 @@ try:
 except ImportError:
     CRAWL4AI_AVAILABLE = False
 
+# Requests in flight per source across all companies (crawl4ai starts a browser per page)
+DEFAULT_ENRICHMENT_SOURCE_LIMITS = {
+    'firecrawl': 5,
+    'crawl4ai': 2,
+    'http': 50
+}
+
 
 class EnhancedEnrichment:
     """World-class enrichment pipeline using Firecrawl and multiple data sources"""
     
-    def __init__(self, firecrawl_api_key: Optional[str] = None):
+    def __init__(self, firecrawl_api_key: Optional[str] = None, session: Optional[aiohttp.ClientSession] = None,
+                 source_limits: Optional[Dict[str, int]] = None):
         self.firecrawl_api_key = firecrawl_api_key
         self.firecrawl_app = None
         if FIRECRAWL_AVAILABLE and firecrawl_api_key:
@@ -39,6 +51,22 @@ class EnhancedEnrichment:
             except Exception as e:
                 print(f"Warning: Could not initialize Firecrawl: {e}")
                 self.firecrawl_app = None
+        # One HTTP client and one set of source limits shared by every company enriched
+        self._session = session
+        self._owns_session = session is None
+        limits = {**DEFAULT_ENRICHMENT_SOURCE_LIMITS, **(source_limits or {})}
+        self._source_limits = {source: asyncio.Semaphore(limit) for source, limit in limits.items()}
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        return self._session
+    
+    async def close(self):
+        """Close the HTTP client if this enricher created it"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
     
     async def crawl_with_firecrawl(self, url: str) -> Optional[Dict]:
         """Crawl a URL using Firecrawl for comprehensive data extraction"""
@@ -47,15 +75,16 @@ class EnhancedEnrichment:
         
         try:
             # Firecrawl can extract structured data from web pages
-            result = await asyncio.to_thread(
-                self.firecrawl_app.scrape_url,
-                url,
-                params={
-                    'formats': ['markdown', 'html'],
-                    'includeTags': ['h1', 'h2', 'h3', 'p', 'span', 'div'],
-                    'excludeTags': ['script', 'style', 'nav', 'footer']
-                }
-            )
+            async with self._source_limits['firecrawl']:
+                result = await asyncio.to_thread(
+                    self.firecrawl_app.scrape_url,
+                    url,
+                    params={
+                        'formats': ['markdown', 'html'],
+                        'includeTags': ['h1', 'h2', 'h3', 'p', 'span', 'div'],
+                        'excludeTags': ['script', 'style', 'nav', 'footer']
+                    }
+                )
             
             if result and result.get('success'):
                 return {
@@ -77,15 +106,45 @@ class EnhancedEnrichment:
             browser_config = BrowserConfig(headless=True)
             crawler_config = CrawlerRunConfig(timeout=10000)
             
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                result = await crawler.arun(url=url, config=crawler_config)
-                if result and result.success:
-                    return result.markdown or result.html
+            async with self._source_limits['crawl4ai']:
+                async with AsyncWebCrawler(config=browser_config) as crawler:
+                    result = await crawler.arun(url=url, config=crawler_config)
+                    if result and result.success:
+                        return result.markdown or result.html
         except Exception as e:
             print(f"Crawl4AI error for {url}: {e}")
         
         return None
     
+    async def fetch_with_http(self, url: str) -> Optional[str]:
+        """Plain HTTP fetch over the shared client"""
+        try:
+            async with self._source_limits['http']:
+                async with self._get_session().get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    if response.status == 200:
+                        return await response.text()
+        except Exception:
+            pass
+        return None
+    
+    async def _crawl_url(self, url: str) -> Optional[Dict]:
+        """Content of one URL: Firecrawl, then crawl4ai, then plain HTTP"""
+        # Try Firecrawl first
+        firecrawl_data = await self.crawl_with_firecrawl(url)
+        if firecrawl_data:
+            return firecrawl_data
+        
+        # Fallback to crawl4ai
+        crawl4ai_content = await self.crawl_with_crawl4ai(url)
+        if crawl4ai_content:
+            return {'content': crawl4ai_content}
+        
+        # Fallback to HTTP
+        content = await self.fetch_with_http(url)
+        if content:
+            return {'content': content}
+        return None
+    
     async def extract_comprehensive_data(self, domain: str, company_name: str) -> Dict:
         """
         Extract comprehensive company data from multiple sources:
@@ -110,46 +169,26 @@ class EnhancedEnrichment:
             'key_milestones': []
         }
         
-        # URLs to check
-        base_urls = [
-            f"https://{domain}",
-            f"https://www.{domain}",
-            f"https://{domain}/about",
-            f"https://{domain}/team",
-            f"https://{domain}/press",
-            f"https://{domain}/news",
-            f"https://{domain}/careers"
-        ]
+        # Hosts that don't answer would only burn Firecrawl/crawl4ai/HTTP timeouts
+        if is_known_dead(domain):
+            return enrichment_data
+        
+        # Homepage plus the about/team/press pages the site actually has
+        site_map = await discover_pages(domain, self._get_session())
+        urls = [site_map.get('homepage') or f"https://{domain}"] + pages_for(site_map, ['about', 'team', 'press'], limit=2)
         
         all_content = []
         
-        # Crawl each URL
-        for url in base_urls[:3]:  # Limit to first 3 for performance
-            try:
-                # Try Firecrawl first
-                firecrawl_data = await self.crawl_with_firecrawl(url)
-                if firecrawl_data:
-                    all_content.append(firecrawl_data['content'])
-                    # Extract metadata
-                    metadata = firecrawl_data.get('metadata', {})
-                    if metadata.get('title'):
-                        enrichment_data['product_description'] = metadata['title']
-                    continue
-                
-                # Fallback to crawl4ai
-                crawl4ai_content = await self.crawl_with_crawl4ai(url)
-                if crawl4ai_content:
-                    all_content.append(crawl4ai_content)
-                    continue
-                
-                # Fallback to HTTP
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            all_content.append(content)
-            except Exception as e:
+        # Crawl the URLs concurrently
+        crawled = await asyncio.gather(*[self._crawl_url(url) for url in urls])
+        for page in crawled:
+            if not page:
                 continue
+            all_content.append(page['content'])
+            # Extract metadata
+            metadata = page.get('metadata') or {}
+            if metadata.get('title'):
+                enrichment_data['product_description'] = metadata['title']
         
         # Parse all collected content
         combined_text = "\n\n".join(all_content)
@@ -282,54 +321,17 @@ class EnhancedEnrichment:
     
     async def _infer_focus_areas(self, domain: str, name: str) -> List[str]:
         """Infer focus areas from domain and company name"""
-        focus_areas = []
-        text = (domain + " " + name).lower()
-        
-        # AI/ML indicators
-        if any(kw in text for kw in ['ai', 'ml', 'machine learning', 'llm', 'gpt', 'neural', 'anthropic', 'openai']):
-            if not any(avoid in text for avoid in ['raise', 'paid', 'fair']):
-                focus_areas.append('AI/ML')
-        
-        # B2B SaaS indicators
-        if any(kw in text for kw in ['saas', 'b2b', 'enterprise', 'platform', 'api', 'software', 'cloud']):
-            focus_areas.append('B2B SaaS')
-        
-        # Fintech indicators
-        if any(kw in text for kw in ['fintech', 'finance', 'payment', 'banking', 'crypto', 'blockchain', 'stripe', 'plaid']):
-            focus_areas.append('Fintech')
-        
-        # DevTools indicators
-        if any(kw in text for kw in ['dev', 'developer', 'tools', 'infrastructure', 'ci/cd', 'deployment', 'github', 'gitlab']):
-            focus_areas.append('DevTools')
-        
+        focus_areas = company_focus_matcher.classify(domain + " " + name)
         return focus_areas if focus_areas else ['B2B SaaS']
 
 
-async def enrich_companies_batch(companies: List[Dict], firecrawl_api_key: Optional[str] = None, batch_size: int = 50):
+async def enrich_companies_batch(companies: List[Dict], firecrawl_api_key: Optional[str] = None, batch_size: int = 50,
+                                 concurrency: int = DEFAULT_ENRICHMENT_CONCURRENCY,
+                                 progress: Optional[EnrichmentProgress] = None):
     """Enrich a batch of companies using enhanced enrichment pipeline"""
     enricher = EnhancedEnrichment(firecrawl_api_key=firecrawl_api_key)
-    
-    enriched_count = 0
-    for i, company in enumerate(companies, 1):
-        try:
-            domain = company.get('domain', '').strip()
-            if not domain:
-                continue
-            
-            enriched = await enricher.enrich_company(company, domain)
-            enriched_count += 1
-            
-            if i % 10 == 0:
-                print(f"[ENHANCED-ENRICHMENT] Processed {i}/{len(companies)} companies")
-                await asyncio.sleep(0.5)  # Rate limiting
-        except Exception as e:
-            print(f"[ENHANCED-ENRICHMENT] Error enriching {company.get('name')}: {e}")
-            continue
-    
-    return enriched_count
-
-
-
-
-
-
+    try:
+        progress = await run_enrichment_pipeline(companies, enricher.enrich_company, concurrency, progress)
+    finally:
+        await enricher.close()
+    return progress.processed - progress.failed
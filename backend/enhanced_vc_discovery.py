@@ -7,7 +7,8 @@ import re
 from typing import List, Dict, Optional, Set
 from bs4 import BeautifulSoup
 import aiohttp
-from urllib.parse import urlparse
+from domain_canonical import get_domain_canonicalizer
+from entity_resolution import EntityResolver
 
 try:
     from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
@@ -302,30 +303,14 @@ class EnhancedVCDiscovery:
         return vcs
     
     def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL"""
+        """Canonical domain of a URL (registrable domain, known redirects followed)"""
         if not url:
             return ""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path
-            domain = domain.replace('www.', '').split('/')[0]
-            return domain.lower()
-        except:
-            return ""
+        return get_domain_canonicalizer().canonicalize(url) or ""
     
     def _deduplicate_vcs(self, vcs: List[Dict]) -> List[Dict]:
-        """Remove duplicate VCs"""
-        seen = set()
-        unique = []
-        
-        for vc in vcs:
-            # Use firm_name as key
-            key = vc.get('firm_name', '').lower().strip()
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(vc)
-        
-        return unique
+        """Remove duplicate VCs (fuzzy firm name and domain matching)"""
+        return EntityResolver('vc').dedupe([vc for vc in vcs if vc.get('firm_name', '').strip()])
     
     async def categorize_vc(self, vc: Dict) -> Dict:
         """Categorize VC by type, stage, and focus areas"""
@@ -13,6 +13,10 @@ from typing import Dict, List, Optional
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from enrichment_pipeline import EnrichmentProgress, run_enrichment_pipeline, DEFAULT_ENRICHMENT_CONCURRENCY
+from field_provenance import FieldProvenanceStore, is_missing
+from taxonomy import company_focus_matcher
+
 try:
     from data_enrichment import enrich_company_data
 except ImportError:
@@ -31,31 +35,16 @@ except ImportError:
 
 async def infer_focus_area_from_domain(domain: str, name: str) -> List[str]:
     """Infer focus area from domain and company name"""
-    focus_areas = []
-    text = (domain + " " + name).lower()
-    
-    # AI/ML indicators (check first to avoid false positives)
-    ai_keywords = ['ai', 'ml', 'machine learning', 'artificial intelligence', 'deep learning', 'llm', 'gpt', 'neural', 'openai', 'anthropic']
-    if any(keyword in text for keyword in ai_keywords):
-        # Make sure it's not matching "raise" or "paid" etc
-        if any(kw in text for kw in ['ai', 'ml', 'machine', 'llm', 'gpt']) and not any(avoid in text for avoid in ['raise', 'paid', 'fair']):
-            focus_areas.append('AI/ML')
-    
-    # B2B SaaS indicators
-    if any(keyword in text for keyword in ['saas', 'b2b', 'enterprise', 'platform', 'api', 'software', 'cloud']):
-        focus_areas.append('B2B SaaS')
-    
-    # Fintech indicators
-    if any(keyword in text for keyword in ['fintech', 'finance', 'payment', 'banking', 'crypto', 'blockchain', 'stripe', 'plaid']):
-        focus_areas.append('Fintech')
-    
-    # DevTools indicators
-    if any(keyword in text for keyword in ['dev', 'developer', 'tools', 'infrastructure', 'ci/cd', 'deployment', 'github', 'gitlab']):
-        focus_areas.append('DevTools')
-    
+    focus_areas = company_focus_matcher.classify(domain + " " + name)
     return focus_areas if focus_areas else ['B2B SaaS']  # Default to B2B SaaS
 
 
+def infer_focus_areas_batch(companies: List[Dict]) -> List[List[str]]:
+    """infer_focus_area_from_domain() for many companies in one taxonomy pass"""
+    texts = [f"{company.get('domain') or ''} {company.get('name') or ''}" for company in companies]
+    return [focus_areas if focus_areas else ['B2B SaaS'] for focus_areas in company_focus_matcher.classify_batch(texts)]
+
+
 async def infer_stage_from_yc_batch(yc_batch: Optional[str]) -> Optional[str]:
     """Infer stage from YC batch"""
     if not yc_batch:
@@ -66,133 +55,133 @@ async def infer_stage_from_yc_batch(yc_batch: Optional[str]) -> Optional[str]:
     return 'Seed'
 
 
-async def enrich_company_batch(conn, companies: List[Dict], batch_size: int = 50):
-    """Enrich a batch of companies"""
-    enriched_count = 0
-    updated_count = 0
-    
-    for i, company in enumerate(companies, 1):
-        try:
-            domain = company.get('domain', '').strip()
-            name = company.get('name', '').strip()
-            company_id = company.get('id')
-            
-            if not domain:
-                continue
-            
-            print(f"[ENRICH] [{i}/{len(companies)}] Enriching {name} ({domain})...")
-            
-            # Check what data is missing
-            needs_stage = not company.get('last_raise_stage')
-            needs_focus = not company.get('focus_areas') or company.get('focus_areas') == '[]' or company.get('focus_areas') == ''
-            needs_employees = not company.get('employee_count')
-            needs_funding = not company.get('funding_amount')
-            
-            updates = {}
-            
-            # Infer focus areas from domain/name
-            if needs_focus:
-                focus_areas = await infer_focus_area_from_domain(domain, name)
-                if focus_areas:
-                    updates['focus_areas'] = json.dumps(focus_areas)
-                    print(f"  → Focus areas: {focus_areas}")
-            
-            # Infer stage from YC batch
-            if needs_stage:
-                yc_batch = company.get('yc_batch')
-                stage = await infer_stage_from_yc_batch(yc_batch)
-                if stage:
-                    updates['last_raise_stage'] = stage
-                    print(f"  → Stage: {stage}")
-                elif yc_batch:
-                    # YC companies without explicit stage -> Seed
-                    updates['last_raise_stage'] = 'Seed'
-                    print(f"  → Stage: Seed (from YC batch)")
-            
-            # Try to use enhanced enrichment with Firecrawl if available
-            try:
-                from enhanced_enrichment import EnhancedEnrichment
-                import os
-                firecrawl_key = os.getenv('FIRECRAWL_API_KEY')
-                enricher = EnhancedEnrichment(firecrawl_api_key=firecrawl_key)
-                enriched = await enricher.enrich_company(company, domain)
-                
-                if enriched and enriched != company:
-                    # Merge enriched data
-                    if enriched.get('last_raise_stage') and not updates.get('last_raise_stage'):
-                        updates['last_raise_stage'] = enriched['last_raise_stage']
-                    if enriched.get('focus_areas') and not updates.get('focus_areas'):
-                        if isinstance(enriched['focus_areas'], list):
-                            updates['focus_areas'] = json.dumps(enriched['focus_areas'])
-                        else:
-                            updates['focus_areas'] = enriched['focus_areas']
-                    if enriched.get('employee_count') and not updates.get('employee_count'):
-                        updates['employee_count'] = enriched['employee_count']
-                    if enriched.get('funding_amount') and not updates.get('funding_amount'):
-                        updates['funding_amount'] = enriched['funding_amount']
-                    if enriched.get('founding_date') and not company.get('founding_date'):
-                        updates['founding_date'] = enriched['founding_date']
-                    if enriched.get('headquarters_location') and not company.get('headquarters_location'):
-                        updates['headquarters_location'] = enriched['headquarters_location']
-            except ImportError:
-                # Fallback to basic enrichment
-                try:
-                    enriched = await enrich_company_data(company, domain)
-                    if enriched and enriched != company:
-                        if enriched.get('last_raise_stage') and not updates.get('last_raise_stage'):
-                            updates['last_raise_stage'] = enriched['last_raise_stage']
-                        if enriched.get('focus_areas') and not updates.get('focus_areas'):
-                            if isinstance(enriched['focus_areas'], list):
-                                updates['focus_areas'] = json.dumps(enriched['focus_areas'])
-                            else:
-                                updates['focus_areas'] = enriched['focus_areas']
-                        if enriched.get('employee_count') and not updates.get('employee_count'):
-                            updates['employee_count'] = enriched['employee_count']
-                        if enriched.get('funding_amount') and not updates.get('funding_amount'):
-                            updates['funding_amount'] = enriched['funding_amount']
-                except Exception as e:
-                    print(f"  → Basic enrichment error (continuing): {e}")
-            except Exception as e:
-                print(f"  → Enhanced enrichment error (continuing): {e}")
-            
-            # Update database if we have updates
+def _merge_enriched(enriched: Optional[Dict], fields: List[str], updates: Dict) -> List[str]:
+    """Add the scheduled fields the enricher found (and inference didn't) to updates"""
+    merged = []
+    if not enriched:
+        return merged
+    for field in fields:
+        if field in updates or is_missing(enriched, field):
+            continue
+        value = enriched[field]
+        if field == 'focus_areas' and isinstance(value, list):
+            value = json.dumps(value)
+        updates[field] = value
+        merged.append(field)
+    return merged
+
+
+def _persist_updates(conn, provenance: FieldProvenanceStore, pending: List[tuple],
+                     previous: Dict[tuple, Dict]) -> int:
+    """Write a batch of (company_id, updates, attempted fields, value sources) in one transaction"""
+    if not pending:
+        return 0
+    now = datetime.now()
+    conn.begin()
+    try:
+        for company_id, updates, attempted, sources in pending:
             if updates:
-                set_clauses = []
-                params = []
-                for key, value in updates.items():
-                    set_clauses.append(f"{key} = ?")
-                    params.append(value)
-                
-                set_clauses.append("updated_at = ?")
-                params.append(datetime.now())
-                params.append(company_id)
-                
-                update_query = f"""
+                set_clauses = [f"{key} = ?" for key in updates] + ["updated_at = ?"]
+                params = list(updates.values()) + [now, company_id]
+                conn.execute(f"""
                     UPDATE companies 
                     SET {', '.join(set_clauses)}
                     WHERE id = ?
-                """
-                
-                conn.execute(update_query, params)
-                conn.commit()
-                updated_count += 1
-                print(f"  ✓ Updated {len(updates)} fields")
-            else:
-                print(f"  ⊗ No updates needed")
-            
-            enriched_count += 1
-            
-            # Small delay to avoid overwhelming the system
-            if i % 10 == 0:
-                await asyncio.sleep(0.1)
-                
+                """, params)
+            provenance.record_attempts(company_id, attempted, sources, previous)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(pending)
+
+
+async def enrich_company_batch(conn, companies: List[Dict], batch_size: int = 50,
+                               concurrency: Optional[int] = None, progress=None,
+                               provenance: Optional[FieldProvenanceStore] = None):
+    """
+    Enrich a batch of companies concurrently with one shared enricher and HTTP client.
+    Only fields that are missing and eligible per company_field_provenance are
+    attempted (companies already scheduled carry 'eligible_fields'); the site is
+    crawled only for fields that inference couldn't fill. Updates and provenance are
+    written `batch_size` companies per transaction. Pass an EnrichmentProgress to
+    follow progress and ETA while the batch runs.
+    """
+    provenance = provenance or FieldProvenanceStore(conn)
+    if any('eligible_fields' not in company for company in companies):
+        companies = provenance.schedule(companies)
+    previous = provenance.get_records(company.get('id') for company in companies)
+    
+    try:
+        from enhanced_enrichment import EnhancedEnrichment
+        import os
+        enricher = EnhancedEnrichment(firecrawl_api_key=os.getenv('FIRECRAWL_API_KEY'))
+        enrich, crawl_source = enricher.enrich_company, 'website'
+    except ImportError:
+        # Fallback to basic enrichment
+        enricher = None
+        enrich, crawl_source = enrich_company_data, 'basic'
+    
+    progress = progress or EnrichmentProgress()
+    pending: List[tuple] = []
+    
+    # Focus areas are inferred from domain/name for the whole batch up front
+    focus_candidates = [company for company in companies if 'focus_areas' in company['eligible_fields']]
+    inferred_focus = dict(zip(map(id, focus_candidates), infer_focus_areas_batch(focus_candidates)))
+    
+    def flush():
+        try:
+            progress.persisted += _persist_updates(conn, provenance, pending, previous)
         except Exception as e:
-            print(f"  ✗ Error enriching company {company.get('name', 'unknown')}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+            print(f"[ENRICH] Error saving {len(pending)} updates: {e}")
+        pending.clear()
+    
+    async def enrich_one(company: Dict, domain: str) -> bool:
+        name = (company.get('name') or '').strip()
+        fields = company['eligible_fields']
+        updates, sources = {}, {}
+        
+        # Infer focus areas from domain/name
+        if 'focus_areas' in fields:
+            focus_areas = inferred_focus.get(id(company))
+            if focus_areas:
+                updates['focus_areas'] = json.dumps(focus_areas)
+                sources['focus_areas'] = 'inferred'
+        
+        # Infer stage from YC batch (YC companies without explicit stage -> Seed)
+        if 'last_raise_stage' in fields:
+            stage = await infer_stage_from_yc_batch(company.get('yc_batch'))
+            if stage:
+                updates['last_raise_stage'] = stage
+                sources['last_raise_stage'] = 'inferred'
+        
+        # Crawl only for what inference couldn't fill
+        remaining = [field for field in fields if field not in updates]
+        if remaining:
+            try:
+                for field in _merge_enriched(await enrich(company, domain), remaining, updates):
+                    sources[field] = crawl_source
+            except Exception as e:
+                print(f"  → Enrichment error for {name} (continuing): {e}")
+        
+        pending.append((company.get('id'), updates, fields, sources))
+        if len(pending) >= batch_size:
+            flush()
+        return bool(updates)
+    
+    try:
+        await run_enrichment_pipeline(
+            companies, enrich_one,
+            concurrency=concurrency or DEFAULT_ENRICHMENT_CONCURRENCY,
+            progress=progress,
+            log_prefix="[ENRICH]"
+        )
+    finally:
+        flush()
+        if enricher is not None:
+            await enricher.close()
     
-    return enriched_count, updated_count
+    return progress.processed, progress.updated
 
 
 async def main():
@@ -0,0 +1,116 @@
+"""
+Celerio Scout - Enrichment Pipeline
+Bounded-concurrency worker pool for enriching batches of companies, with
+progress, throughput and ETA reporting
+"""
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Companies enriched at once by the batch pipeline
+DEFAULT_ENRICHMENT_CONCURRENCY = 25
+
+# Companies between progress log lines
+PROGRESS_REPORT_EVERY = 50
+
+
+class EnrichmentProgress:
+    """Progress, throughput and ETA of an enrichment batch"""
+    
+    def __init__(self, total: int = 0):
+        self.total = total
+        self.processed = 0
+        self.updated = 0
+        self.failed = 0
+        self.persisted = 0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+    
+    def finish(self):
+        """Mark the batch done (idempotent)"""
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+    
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+    
+    def companies_per_minute(self) -> float:
+        elapsed = self.elapsed()
+        return self.processed / elapsed * 60 if elapsed > 0 else 0.0
+    
+    def eta_seconds(self) -> Optional[float]:
+        """Seconds until the batch is done at the current rate (None before the first company finishes)"""
+        if self.finished_at is not None:
+            return 0.0
+        if not self.processed:
+            return None
+        return (self.total - self.processed) * self.elapsed() / self.processed
+    
+    def as_dict(self) -> Dict:
+        eta = self.eta_seconds()
+        return {
+            'status': 'completed' if self.finished_at is not None else 'running',
+            'total': self.total,
+            'processed': self.processed,
+            'updated': self.updated,
+            'failed': self.failed,
+            'persisted': self.persisted,
+            'elapsed_seconds': round(self.elapsed(), 1),
+            'companies_per_minute': round(self.companies_per_minute(), 1),
+            'eta_seconds': round(eta, 1) if eta is not None else None
+        }
+    
+    def log_line(self) -> str:
+        eta = self.eta_seconds()
+        eta_text = f"{eta:.0f}s" if eta is not None else "?"
+        return (f"Processed {self.processed}/{self.total} companies "
+                f"({self.companies_per_minute():.1f}/min, {self.failed} failed, ETA {eta_text})")
+
+
+async def run_enrichment_pipeline(
+    companies: List[Dict],
+    enrich: Callable[[Dict, str], Awaitable],
+    concurrency: int = DEFAULT_ENRICHMENT_CONCURRENCY,
+    progress: Optional[EnrichmentProgress] = None,
+    log_prefix: str = "[ENHANCED-ENRICHMENT]"
+) -> EnrichmentProgress:
+    """
+    Enrich companies with a fixed pool of workers pulling from a queue.
+    `enrich(company, domain)` is awaited once per company with a domain; its result
+    counts as an update when truthy. Failures are counted and don't stop the batch.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for company in companies:
+        if (company.get('domain') or '').strip():
+            queue.put_nowait(company)
+    
+    progress = progress or EnrichmentProgress()
+    progress.total = queue.qsize()
+    progress.started_at = time.monotonic()
+    
+    async def worker():
+        while True:
+            try:
+                company = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                if await enrich(company, company['domain'].strip()):
+                    progress.updated += 1
+            except Exception as e:
+                progress.failed += 1
+                print(f"{log_prefix} Error enriching {company.get('name')}: {e}")
+            progress.processed += 1
+            if progress.processed % PROGRESS_REPORT_EVERY == 0 and progress.processed < progress.total:
+                print(f"{log_prefix} {progress.log_line()}")
+    
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, progress.total)))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            if not task.done():
+                task.cancel()
+    progress.finish()
+    print(f"{log_prefix} {progress.log_line()}")
+    return progress
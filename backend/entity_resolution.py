@@ -0,0 +1,487 @@
+"""
+Celerio Scout - Entity Resolution
+Finds records of the same company or VC firm that arrive from different sources
+(YC, Antler, Crunchbase, F6S, search results) under slightly different names or
+domains. Candidates are blocked by domain root and name trigrams so each new
+record is compared with a handful of others, pairs are scored by string
+similarity, and matches are clustered with union-find - incrementally as records
+stream in. Clusters found in the companies/vcs tables are merged in DuckDB.
+"""
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+from domain_canonical import canonical_domain, registrable_domain
+
+# Pairs scoring at least this are the same entity
+MATCH_THRESHOLD = 0.9
+
+# Name cores this short only match exactly ('ai' vs 'a1' says nothing)
+MIN_FUZZY_NAME_LENGTH = 4
+
+# Blocking: trigram blocks larger than this are too common to narrow anything
+# down and are skipped; candidates must share this fraction of the record's
+# trigrams, and at most this many are scored per record
+MAX_BLOCK_SIZE = 200
+MIN_SHARED_TRIGRAMS = 0.5
+MAX_CANDIDATES = 20
+
+# Trigram Jaccard below this can't reach the threshold - skip the slower sequence match
+JACCARD_PREFILTER = 0.4
+
+# Legal forms dropped from names before comparing
+LEGAL_SUFFIXES = {
+    'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company', 'plc',
+    'gmbh', 'ag', 'sa', 'sas', 'sarl', 'bv', 'nv', 'pty', 'oy', 'ab', 'srl', 'spa'
+}
+
+# Words that don't identify a firm ('Accel' and 'Accel Partners' are the same VC)
+GENERIC_WORDS = {
+    'vc': {'the', 'ventures', 'venture', 'capital', 'partners', 'vc', 'fund', 'funds',
+           'investments', 'investors', 'management', 'group', 'holdings', 'equity'},
+    'company': {'the', 'hq', 'labs', 'technologies', 'technology', 'software', 'platform'}
+}
+
+# Tables resolved and merged per entity kind: name column, columns repointed to the
+# surviving row, rows deleted with the merged ones (keyed by a column that would clash),
+# and link tables whose (repointed column, other column) pairs must stay unique
+ENTITY_TABLES = {
+    'company': {
+        'table': 'companies',
+        'name_column': 'name',
+        'references': [('company_investments', 'company_id'), ('funding_rounds', 'company_id')],
+        'dependents': [('company_field_provenance', 'company_id')],
+        'pairs': [('company_investments', 'company_id', 'investor_id')]
+    },
+    'vc': {
+        'table': 'vcs',
+        'name_column': 'firm_name',
+        'references': [('company_investments', 'investor_id'), ('funding_rounds', 'lead_investor_id'),
+                       ('funding_round_investors', 'investor_id')],
+        'dependents': [],
+        'pairs': [('company_investments', 'investor_id', 'company_id'),
+                  ('funding_round_investors', 'investor_id', 'funding_round_id')]
+    }
+}
+
+
+def name_core(name: str, kind: str = 'company', keep_generic: bool = False) -> str:
+    """Comparable core of a name: ascii lowercase words without legal forms or (unless kept) generic words"""
+    text = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii').lower()
+    text = text.replace('&', ' and ')
+    words = re.sub(r'[^a-z0-9]+', ' ', text).split()
+    dropped = LEGAL_SUFFIXES if keep_generic else LEGAL_SUFFIXES | GENERIC_WORDS.get(kind, set())
+    core = [word for word in words if word not in dropped]
+    return ' '.join(core or words)
+
+
+def name_trigrams(core: str) -> Set[str]:
+    """Character trigrams of a name core (spaces removed, ends padded)"""
+    compact = f"#{core.replace(' ', '')}#"
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def domain_root(domain: Optional[str]) -> Optional[str]:
+    """Registrable domain without its suffix ('acme' for acme.io, app.acme.co.uk)"""
+    registrable = registrable_domain(domain) if domain else None
+    return registrable.split('.')[0] if registrable else None
+
+
+def name_similarity(a: Dict, b: Dict, shared_trigrams: Optional[int] = None) -> float:
+    """Similarity of two entities' name cores (0..1)"""
+    if a['core'] == b['core']:
+        return 1.0
+    if min(len(a['core']), len(b['core'])) < MIN_FUZZY_NAME_LENGTH:
+        return 0.0
+    shared = shared_trigrams if shared_trigrams is not None else len(a['trigrams'] & b['trigrams'])
+    jaccard = shared / (len(a['trigrams']) + len(b['trigrams']) - shared)
+    if jaccard < JACCARD_PREFILTER:
+        return jaccard
+    # Word order doesn't matter ('Labs Acme' vs 'Acme Labs')
+    sorted_a = ' '.join(sorted(a['core'].split()))
+    sorted_b = ' '.join(sorted(b['core'].split()))
+    return max(jaccard, SequenceMatcher(None, sorted_a, sorted_b).ratio())
+
+
+def match_score(a: Dict, b: Dict, shared_trigrams: Optional[int] = None) -> float:
+    """
+    Likelihood two entities are the same (0..1): the same domain is decisive,
+    unrelated domains rule a match out, otherwise names decide - with a
+    bonus when the domains share a root (acme.com / acme.io). Without a domain
+    on both sides generic words count ('Index Capital' is not 'Index Ventures').
+    """
+    if a['domain'] and b['domain']:
+        if a['domain'] == b['domain']:
+            return 1.0
+        if a['root'] != b['root']:
+            return 0.0
+        return min(1.0, name_similarity(a, b, shared_trigrams) + 0.1)
+    if a['core'] == b['core'] and a['full'] != b['full']:
+        return name_similarity({'core': a['full'], 'trigrams': name_trigrams(a['full'])},
+                               {'core': b['full'], 'trigrams': name_trigrams(b['full'])})
+    return name_similarity(a, b, shared_trigrams)
+
+
+def safe_to_merge(survivor: Dict, other: Dict) -> bool:
+    """
+    Whether deleting `other` into `survivor` is backed by more than fuzzy names:
+    the same domain, or (with a domain missing) the same full name, generic words included
+    """
+    if survivor['domain'] and other['domain']:
+        return survivor['domain'] == other['domain']
+    return bool(survivor['full']) and survivor['full'] == other['full']
+
+
+class UnionFind:
+    """Disjoint sets with path compression and union by size"""
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def add(self, key: Hashable):
+        if key not in self.parent:
+            self.parent[key] = key
+            self.size[key] = 1
+
+    def find(self, key: Hashable) -> Hashable:
+        root = key
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[key] != root:
+            self.parent[key], key = root, self.parent[key]
+        return root
+
+    def union(self, a: Hashable, b: Hashable) -> Hashable:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+
+class EntityResolver:
+    """Incremental blocking + matching + clustering of company or VC records"""
+
+    def __init__(self, kind: str = 'company', db_conn=None, threshold: float = MATCH_THRESHOLD):
+        if kind not in ENTITY_TABLES:
+            raise ValueError(f"Unknown entity kind: {kind}")
+        self.kind = kind
+        self.threshold = threshold
+        self.conn = db_conn
+        self._entities: Dict[Hashable, Dict] = {}
+        self._blocks: Dict[str, List[Hashable]] = defaultdict(list)
+        self._clusters = UnionFind()
+        # Record callers get back for a cluster (first one added, or the merge survivor)
+        self._representative: Dict[Hashable, Hashable] = {}
+        self._next_key = 0
+        self.comparisons = 0
+        self.matches: List[Tuple[Hashable, Hashable, float]] = []
+        if self.conn is not None:
+            self._load()
+
+    def _load(self):
+        """Index every row of the kind's table (keys are row ids)"""
+        config = ENTITY_TABLES[self.kind]
+        try:
+            rows = self.conn.execute(
+                f"SELECT id, {config['name_column']}, domain FROM {config['table']} ORDER BY id"
+            ).fetchall()
+        except Exception as e:
+            print(f"[ENTITY] Error loading {config['table']}: {e}")
+            return
+        for row in rows:
+            self.add({'name': row[1], 'domain': row[2]}, key=row[0])
+        print(f"[ENTITY] Indexed {len(rows)} {config['table']} rows "
+              f"({len(self.clusters())} duplicate clusters, {self.comparisons} comparisons)")
+
+    def attach(self, db_conn):
+        """Index a database's existing rows"""
+        if self.conn is None and db_conn is not None:
+            self.conn = db_conn
+            self._load()
+
+    def _entity(self, record: Dict) -> Dict:
+        name = record.get('name') or record.get('firm_name') or ''
+        domain = canonical_domain(record.get('domain') or record.get('url') or '')
+        core = name_core(name, self.kind)
+        return {
+            'name': name,
+            'domain': domain,
+            'root': domain_root(domain),
+            'core': core,
+            'full': name_core(name, self.kind, keep_generic=True),
+            'trigrams': name_trigrams(core) if core else set()
+        }
+
+    def _candidates(self, entity: Dict) -> List[Tuple[Hashable, Optional[int]]]:
+        """(key, shared trigram count) of indexed entities worth scoring against this one"""
+        candidates: Dict[Hashable, Optional[int]] = {}
+        # Exact domain-root and name blocks (only the latest records of a huge block -
+        # earlier ones are already clustered with them)
+        if entity['root']:
+            for key in self._blocks.get('d:' + entity['root'], [])[-MAX_BLOCK_SIZE:]:
+                candidates[key] = None
+        if entity['core']:
+            for key in self._blocks.get('n:' + entity['core'], [])[-MAX_BLOCK_SIZE:]:
+                candidates[key] = None
+
+        trigrams = entity['trigrams']
+        if trigrams:
+            shared = Counter()
+            for trigram in trigrams:
+                block = self._blocks.get('t:' + trigram)
+                if block and len(block) <= MAX_BLOCK_SIZE:
+                    shared.update(block)
+            needed = max(1, int(len(trigrams) * MIN_SHARED_TRIGRAMS))
+            for key, count in shared.most_common(MAX_CANDIDATES):
+                if count < needed:
+                    break
+                candidates.setdefault(key, count)
+        return list(candidates.items())
+
+    def _best_matches(self, entity: Dict) -> List[Tuple[Hashable, float]]:
+        matches = []
+        for key, shared in self._candidates(entity):
+            self.comparisons += 1
+            score = match_score(entity, self._entities[key], shared)
+            if score >= self.threshold:
+                matches.append((key, score))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def match(self, record: Dict) -> Optional[Hashable]:
+        """Representative key of the cluster a record belongs to, without adding it"""
+        matches = self._best_matches(self._entity(record))
+        return self.representative(matches[0][0]) if matches else None
+
+    def match_confirmed(self, record: Dict) -> Optional[Hashable]:
+        """
+        Like match(), but only for a match safe_to_merge() accepts (the same domain, or the
+        same full name with a domain missing) - what ingestion may treat as a duplicate
+        """
+        entity = self._entity(record)
+        for key, _ in self._best_matches(entity):
+            if safe_to_merge(self._entities[key], entity):
+                return self.representative(key)
+        return None
+
+    def add(self, record: Dict, key: Optional[Hashable] = None) -> Hashable:
+        """Index a record and join it to every cluster it matches; returns the cluster's representative"""
+        if key is None:
+            key = f"new:{self._next_key}"
+            self._next_key += 1
+        if key in self._entities:
+            return self.representative(key)
+
+        entity = self._entity(record)
+        matches = self._best_matches(entity)
+        if not entity['domain']:
+            # A bare name must not bridge clusters that its domain-less match can't tell apart
+            matches = matches[:1]
+        self._entities[key] = entity
+        self._clusters.add(key)
+        self._representative[key] = key
+        for other, score in matches:
+            representatives = (self.representative(other), self.representative(key))
+            root = self._clusters.union(other, key)
+            # The older record stays the representative
+            self._representative[root] = representatives[0]
+            self.matches.append((key, other, score))
+
+        if entity['root']:
+            self._blocks['d:' + entity['root']].append(key)
+        if entity['core']:
+            self._blocks['n:' + entity['core']].append(key)
+        for trigram in entity['trigrams']:
+            self._blocks['t:' + trigram].append(key)
+        return self.representative(key)
+
+    def add_many(self, records: Iterable[Dict]) -> List[Hashable]:
+        return [self.add(record) for record in records]
+
+    def add_unique(self, record: Dict, key: Optional[Hashable] = None) -> bool:
+        """Add a record; False if it joined a cluster that already existed"""
+        if key is None:
+            key = f"new:{self._next_key}"
+            self._next_key += 1
+        return self.add(record, key) == key
+
+    def representative(self, key: Hashable) -> Hashable:
+        return self._representative[self._clusters.find(key)]
+
+    def set_representative(self, key: Hashable, representative: Hashable):
+        self._representative[self._clusters.find(key)] = representative
+
+    def clusters(self, min_size: int = 2) -> List[List[Hashable]]:
+        """Clusters of at least min_size records (keys in insertion order)"""
+        groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for key in self._entities:
+            groups[self._clusters.find(key)].append(key)
+        return [members for members in groups.values() if len(members) >= min_size]
+
+    def dedupe(self, records: List[Dict]) -> List[Dict]:
+        """Records in order, keeping only the first of each cluster (for in-memory scrape results)"""
+        return [record for record in records if self.add_unique(record)]
+
+
+def _table_exists(conn, table: str) -> bool:
+    return conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", (table,)
+    ).fetchone()[0] > 0
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == '' or value == '[]' or value == '{}'
+
+
+def _collapse_pairs(conn, table: str, column: str, other_column: str, survivor_id):
+    """
+    After repointing, keep one row per (survivor, other) pair - the oldest active one
+    where the table tracks validity, closed history rows are left alone
+    """
+    columns = {row[0] for row in conn.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = ?", (table,)
+    ).fetchall()}
+    active = "valid_to IS NULL" if 'valid_to' in columns else "TRUE"
+    conn.execute(f"""
+        DELETE FROM {table}
+        WHERE {column} = ? AND {active} AND id NOT IN (
+            SELECT MIN(id) FROM {table} WHERE {column} = ? AND {active} GROUP BY {other_column}
+        )
+    """, (survivor_id, survivor_id))
+
+
+def merge_clusters(conn, kind: str, resolver: EntityResolver) -> Dict[Hashable, Hashable]:
+    """
+    Merge each cluster of duplicate rows into its most complete row: empty columns
+    are filled from the others, references are repointed, and the rest are deleted.
+    Returns {merged id: surviving id}.
+    """
+    config = ENTITY_TABLES[kind]
+    table = config['table']
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS entity_merges (
+            kind TEXT,
+            merged_id INTEGER,
+            survivor_id INTEGER,
+            merged_name TEXT,
+            merged_domain TEXT,
+            merged_at TIMESTAMP
+        )
+    """)
+    references = [(t, c) for t, c in config['references'] if _table_exists(conn, t)]
+    dependents = [(t, c) for t, c in config['dependents'] if _table_exists(conn, t)]
+    pairs = [(t, c, o) for t, c, o in config['pairs'] if _table_exists(conn, t)]
+
+    merged: Dict[Hashable, Hashable] = {}
+    skipped = 0
+    for members in resolver.clusters():
+        result = conn.execute(
+            f"SELECT * FROM {table} WHERE list_contains(?, id)", (list(members),)
+        )
+        columns = [desc[0] for desc in result.description]
+        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        if len(rows) < 2:
+            continue
+
+        # Most complete row survives (then the one with a domain, then the oldest)
+        rows.sort(key=lambda row: (
+            -sum(1 for value in row.values() if not _is_empty(value)),
+            _is_empty(row.get('domain')),
+            row['id']
+        ))
+        survivor = rows[0]
+        survivor_entity = resolver._entities.get(survivor['id'])
+        # Fuzzy clusters are for matching; only delete rows the domain or exact name confirms
+        others = [row for row in rows[1:]
+                  if survivor_entity is None or row['id'] not in resolver._entities
+                  or safe_to_merge(survivor_entity, resolver._entities[row['id']])]
+        skipped += len(rows) - 1 - len(others)
+        if not others:
+            continue
+        fills = {}
+        for column in columns:
+            if column == 'id' or not _is_empty(survivor[column]):
+                continue
+            for other in others:
+                if not _is_empty(other[column]):
+                    fills[column] = other[column]
+                    break
+        other_ids = [other['id'] for other in others]
+
+        conn.begin()
+        try:
+            for ref_table, ref_column in dependents:
+                conn.execute(f"DELETE FROM {ref_table} WHERE list_contains(?, {ref_column})", (other_ids,))
+            for ref_table, ref_column in references:
+                conn.execute(
+                    f"UPDATE {ref_table} SET {ref_column} = ? WHERE list_contains(?, {ref_column})",
+                    (survivor['id'], other_ids)
+                )
+            for pair_table, pair_column, other_column in pairs:
+                _collapse_pairs(conn, pair_table, pair_column, other_column, survivor['id'])
+            conn.execute(f"DELETE FROM {table} WHERE list_contains(?, id)", (other_ids,))
+            if fills:
+                assignments = ', '.join(f"{column} = ?" for column in fills)
+                conn.execute(f"UPDATE {table} SET {assignments} WHERE id = ?",
+                             (*fills.values(), survivor['id']))
+            now = datetime.now()
+            for other in others:
+                conn.execute("""
+                    INSERT INTO entity_merges (kind, merged_id, survivor_id, merged_name, merged_domain, merged_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (kind, other['id'], survivor['id'], other.get(config['name_column']), other.get('domain'), now))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"[ENTITY] Error merging {table} rows {[row['id'] for row in rows]}: {e}")
+            continue
+
+        resolver.set_representative(survivor['id'], survivor['id'])
+        for other_id in other_ids:
+            merged[other_id] = survivor['id']
+
+    print(f"[ENTITY] Merged {len(merged)} duplicate {table} rows"
+          + (f" ({skipped} name-only matches left unmerged)" if skipped else ""))
+    return merged
+
+
+_shared_resolvers: Dict[str, EntityResolver] = {}
+
+
+def get_entity_resolver(kind: str = 'company', db_conn=None) -> EntityResolver:
+    """Resolver shared by ingestion paths (indexes the table once any caller provides a connection)"""
+    resolver = _shared_resolvers.get(kind)
+    if resolver is None:
+        resolver = _shared_resolvers[kind] = EntityResolver(kind, db_conn)
+    else:
+        resolver.attach(db_conn)
+    return resolver
+
+
+def resolve_table(conn, kind: str = 'company', dry_run: bool = True) -> Dict:
+    """Re-index a whole table and (unless dry_run) merge its duplicate clusters and share the fresh index"""
+    resolver = EntityResolver(kind, conn)
+    clusters = resolver.clusters()
+    summary = {
+        'kind': kind,
+        'entities': len(resolver._entities),
+        'comparisons': resolver.comparisons,
+        'clusters': len(clusters),
+        'duplicates': sum(len(members) - 1 for members in clusters),
+        'merged': 0,
+        # Clusters to review before merging: [[(id, name, domain), ...], ...]
+        'preview': [
+            [(key, resolver._entities[key]['name'], resolver._entities[key]['domain']) for key in members]
+            for members in clusters[:50]
+        ]
+    }
+    if not dry_run:
+        summary['merged'] = len(merge_clusters(conn, kind, resolver))
+        _shared_resolvers[kind] = resolver
+    return summary
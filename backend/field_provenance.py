@@ -0,0 +1,195 @@
+"""
+Celerio Scout - Enrichment Field Provenance
+Stores the source, extractor version and retry time of each enriched company field
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+# Company columns filled by enrichment
+ENRICHED_FIELDS = ['last_raise_stage', 'focus_areas', 'employee_count', 'funding_amount']
+
+# Bump a field's version when its extractor changes so earlier misses are retried
+EXTRACTOR_VERSIONS = {
+    'last_raise_stage': 'stage-1',
+    'focus_areas': 'focus-1',
+    'employee_count': 'employees-1',
+    'funding_amount': 'funding-1'
+}
+
+# Confidence of a value by where it came from
+SOURCE_CONFIDENCE = {
+    'inferred': 0.5,  # keywords in domain/name, YC batch
+    'website': 0.7,   # extracted from the company's own pages
+    'basic': 0.4      # data_enrichment fallback
+}
+
+# Wait before retrying a field that was not found: doubles per attempt, capped
+RETRY_BACKOFF = timedelta(days=7)
+MAX_RETRY_BACKOFF = timedelta(days=90)
+
+# Found values are re-checked after this long (only if the column is emptied again)
+FOUND_REFRESH = timedelta(days=180)
+
+
+def is_missing(company: Dict, field: str) -> bool:
+    """Whether a company column still needs a value"""
+    value = company.get(field)
+    if field == 'focus_areas':
+        return not value or value == '[]'
+    return value is None or value == ''
+
+
+def retry_backoff(attempts: int) -> timedelta:
+    """Wait after the nth consecutive miss"""
+    return min(RETRY_BACKOFF * (2 ** max(attempts - 1, 0)), MAX_RETRY_BACKOFF)
+
+
+class FieldProvenanceStore:
+    """Persists per-field enrichment provenance and retry schedule in DuckDB"""
+
+    def __init__(self, db_conn=None, extractor_versions: Optional[Dict[str, str]] = None):
+        # Without a connection provenance lives only for the lifetime of this store
+        self.conn = db_conn
+        self.versions = {**EXTRACTOR_VERSIONS, **(extractor_versions or {})}
+        self._records: Dict[Tuple[int, str], Dict] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure company_field_provenance table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_field_provenance (
+                company_id INTEGER,
+                field TEXT,
+                value_source TEXT,         -- inferred / website / basic (NULL if nothing was found)
+                extractor_version TEXT,
+                confidence REAL,
+                found BOOLEAN,
+                attempts INTEGER,          -- consecutive attempts without a value
+                attempted_at TIMESTAMP,
+                next_eligible_at TIMESTAMP,
+                PRIMARY KEY (company_id, field)
+            )
+        """)
+
+    def get_records(self, company_ids: Optional[Iterable[int]] = None) -> Dict[Tuple[int, str], Dict]:
+        """Provenance records keyed by (company_id, field), for some or all companies"""
+        ids = None if company_ids is None else set(company_ids)
+        if self.conn is None:
+            return {key: record for key, record in self._records.items() if ids is None or key[0] in ids}
+
+        try:
+            query = """
+                SELECT company_id, field, value_source, extractor_version, confidence,
+                       found, attempts, attempted_at, next_eligible_at
+                FROM company_field_provenance
+            """
+            if ids is None:
+                rows = self.conn.execute(query).fetchall()
+            else:
+                rows = self.conn.execute(query + " WHERE list_contains(?, company_id)", (list(ids),)).fetchall()
+        except Exception as e:
+            print(f"[PROVENANCE] Error loading provenance: {e}")
+            return {}
+
+        return {
+            (row[0], row[1]): {
+                'value_source': row[2],
+                'extractor_version': row[3],
+                'confidence': row[4],
+                'found': bool(row[5]),
+                'attempts': row[6] or 0,
+                'attempted_at': row[7],
+                'next_eligible_at': row[8]
+            }
+            for row in rows
+        }
+
+    def is_eligible(self, field: str, record: Optional[Dict], now: Optional[datetime] = None) -> bool:
+        """A missing field is due when never attempted, past its retry time, or its extractor changed"""
+        if record is None:
+            return True
+        if record.get('extractor_version') != self.versions.get(field):
+            return True
+        next_eligible_at = record.get('next_eligible_at')
+        return next_eligible_at is None or next_eligible_at <= (now or datetime.now())
+
+    def eligible_fields(self, company: Dict, records: Dict[Tuple[int, str], Dict],
+                        now: Optional[datetime] = None) -> List[str]:
+        """Fields of a company that are missing and due for enrichment"""
+        now = now or datetime.now()
+        company_id = company.get('id')
+        return [
+            field for field in ENRICHED_FIELDS
+            if is_missing(company, field) and self.is_eligible(field, records.get((company_id, field)), now)
+        ]
+
+    def schedule(self, companies: List[Dict], limit: Optional[int] = None) -> List[Dict]:
+        """
+        Companies with at least one eligible field, each annotated with
+        'eligible_fields' (in input order, at most `limit` companies)
+        """
+        now = datetime.now()
+        records = self.get_records(company.get('id') for company in companies)
+        scheduled = []
+        for company in companies:
+            fields = self.eligible_fields(company, records, now)
+            if not fields:
+                continue
+            scheduled.append({**company, 'eligible_fields': fields})
+            if limit is not None and len(scheduled) >= limit:
+                break
+        return scheduled
+
+    def record_attempts(self, company_id: int, attempted: Iterable[str], found: Dict[str, str],
+                        previous: Optional[Dict[Tuple[int, str], Dict]] = None):
+        """
+        Record an enrichment attempt: `attempted` fields, of which `found` maps
+        field -> value source. Missed fields back off exponentially.
+        Doesn't commit - callers write this in the same transaction as the values.
+        """
+        now = datetime.now()
+        previous = previous if previous is not None else self.get_records([company_id])
+        records = {}
+        for field in attempted:
+            source = found.get(field)
+            prior = previous.get((company_id, field)) or {}
+            # A new extractor version starts the backoff over
+            same_version = prior.get('extractor_version') == self.versions.get(field)
+            attempts = 0 if source else (prior.get('attempts', 0) if same_version else 0) + 1
+            records[(company_id, field)] = {
+                'value_source': source,
+                'extractor_version': self.versions.get(field),
+                'confidence': SOURCE_CONFIDENCE.get(source) if source else None,
+                'found': bool(source),
+                'attempts': attempts,
+                'attempted_at': now,
+                'next_eligible_at': now + (FOUND_REFRESH if source else retry_backoff(attempts))
+            }
+        if not records:
+            return
+
+        if self.conn is None:
+            self._records.update(records)
+            return
+
+        for (company_id, field), record in records.items():
+            self.conn.execute(
+                "DELETE FROM company_field_provenance WHERE company_id = ? AND field = ?",
+                (company_id, field)
+            )
+            self.conn.execute("""
+                INSERT INTO company_field_provenance (company_id, field, value_source, extractor_version,
+                    confidence, found, attempts, attempted_at, next_eligible_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                company_id,
+                field,
+                record['value_source'],
+                record['extractor_version'],
+                record['confidence'],
+                record['found'],
+                record['attempts'],
+                record['attempted_at'],
+                record['next_eligible_at']
+            ))
@@ -40,6 +40,13 @@ async def force_comprehensive_scraping():
         return
     
     try:
+        from portfolio_snapshots import PortfolioSnapshotStore, IncrementalRunStats
+        from scale_all_vcs import scrape_vc_incremental
+        
+        # Portfolio snapshots let unchanged portfolios skip the full scrape
+        snapshot_store = PortfolioSnapshotStore(conn)
+        run_stats = IncrementalRunStats()
+        
         # Get initial counts
         initial_yc = conn.execute("SELECT COUNT(*) FROM companies WHERE source = 'yc'").fetchone()[0]
         initial_antler = conn.execute("SELECT COUNT(*) FROM companies WHERE source = 'antler'").fetchone()[0]
@@ -57,17 +64,20 @@ async def force_comprehensive_scraping():
         print("="*80 + "\n")
         
         try:
-            from comprehensive_portfolio_scraper_v2 import ComprehensivePortfolioScraper
-            
-            scraper = ComprehensivePortfolioScraper()
             print("Starting YC comprehensive scraping...")
             print("This will scrape ALL 40 batches (2005-2025)...")
             print("This may take 30-60 minutes...\n")
             
-            yc_companies = await scraper.scrape_yc_comprehensive()
-            print(f"\nFound {len(yc_companies)} YC companies")
+            result = await scrape_vc_incremental(
+                "Y Combinator", "https://www.ycombinator.com/companies", "Accelerator", snapshot_store
+            )
+            run_stats.record(result)
+            # Only companies added since the last snapshot need to be saved
+            yc_companies = result['added']
+            print(f"\nFound {len(result['companies'])} YC companies ({result['status']}, {len(yc_companies)} new)")
             
             # Save to database
+            failed = []
             if yc_companies:
                 print("Saving to database...")
                 saved = 0
@@ -105,12 +115,14 @@ async def force_comprehensive_scraping():
                             ))
                             saved += 1
                     except Exception as e:
+                        failed.append(company)
                         continue
                 
                 conn.commit()
                 print(f"Saved {saved} new YC companies to database")
             
-            await scraper.close_session()
+            # Only now that the new companies are stored does the snapshot move forward
+            snapshot_store.commit_snapshot(result, failed)
             
         except Exception as e:
             print(f"ERROR in YC scraping: {e}")
@@ -124,15 +136,19 @@ async def force_comprehensive_scraping():
         print("="*80 + "\n")
         
         try:
-            scraper = ComprehensivePortfolioScraper()
             print("Starting Antler comprehensive scraping...")
             print("This will use infinite scroll to get ALL companies...")
             print("This may take 10-20 minutes...\n")
             
-            antler_companies = await scraper.scrape_antler_comprehensive()
-            print(f"\nFound {len(antler_companies)} Antler companies")
+            result = await scrape_vc_incremental(
+                "Antler", "https://www.antler.co/portfolio", "VC", snapshot_store
+            )
+            run_stats.record(result)
+            antler_companies = result['added']
+            print(f"\nFound {len(result['companies'])} Antler companies ({result['status']}, {len(antler_companies)} new)")
             
             # Save to database
+            failed = []
             if antler_companies:
                 print("Saving to database...")
                 saved = 0
@@ -169,12 +185,14 @@ async def force_comprehensive_scraping():
                             ))
                             saved += 1
                     except Exception as e:
+                        failed.append(company)
                         continue
                 
                 conn.commit()
                 print(f"Saved {saved} new Antler companies to database")
             
-            await scraper.close_session()
+            # Only now that the new companies are stored does the snapshot move forward
+            snapshot_store.commit_snapshot(result, failed)
             
         except Exception as e:
             print(f"ERROR in Antler scraping: {e}")
@@ -191,7 +209,8 @@ async def force_comprehensive_scraping():
             
             print("Getting all VCs from database...")
             vc_results = await scrape_all_vcs_comprehensive(conn)
-            print(f"\nScraped {vc_results.get('total_companies', 0)} companies from all VCs")
+            print(f"\nScraped {vc_results.get('total_companies', 0)} companies from all VCs "
+                  f"({vc_results.get('new_companies', 0)} new)")
             
         except Exception as e:
             print(f"ERROR in VC scraping: {e}")
@@ -221,6 +240,9 @@ async def force_comprehensive_scraping():
         print(f"  After: {final_total}")
         print(f"  Added: {final_total - initial_total}")
         
+        print(f"\nYC + Antler Work Avoided:")
+        run_stats.print_summary()
+        
         yc_antler_total = final_yc + final_antler
         print(f"\nYC + Antler Total: {yc_antler_total}")
         
@@ -0,0 +1,326 @@
+"""
+Celerio Scout - GitHub Client
+Resolves candidate organizations and fetches their repository stats with
+batched GraphQL queries (one aliased lookup per org), falling back to
+ETag-conditional REST calls. Concurrent lookups are coalesced into batches.
+"""
+import os
+import re
+import json
+import asyncio
+import aiohttp
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from cache import get_cache, set_cache, prime_cache
+from rate_limiter import check_rate_limit, get_wait_time
+
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+
+GITHUB_GRAPHQL_URL = 'https://api.github.com/graphql'
+GITHUB_API_URL = 'https://api.github.com'
+
+# Org lookups per GraphQL query (each alias asks for 10 repos)
+GITHUB_BATCH_SIZE = 40
+
+# How long lookups are collected before a partial batch is sent (seconds)
+GITHUB_BATCH_WINDOW = 0.05
+
+# Repos read per org (most recently pushed first) and how many count for last commit
+REPOS_PER_ORG = 10
+COMMIT_REPOS = 5
+
+# TTLs match the github_stats cache in osint_sources (ETags live longer)
+GITHUB_STATS_TTL = 3600
+GITHUB_ETAG_TTL = 7 * 86400
+
+# Stats for a name that is not a GitHub organization (or has no repos)
+NO_REPO_STATS = {
+    'last_commit_days': 999,
+    'issue_velocity': 999,
+    'github_stars': 0,
+    'repo_count': 0
+}
+
+_LOGIN = re.compile(r'^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$')
+
+_ORG_FRAGMENT = """
+fragment OrgRepos on Organization {
+  login
+  repositories(first: %d, orderBy: {field: PUSHED_AT, direction: DESC}) {
+    nodes {
+      stargazerCount
+      pushedAt
+      defaultBranchRef { target { ... on Commit { committedDate } } }
+    }
+  }
+}
+""" % REPOS_PER_ORG
+
+
+def candidate_org_names(domain: str) -> List[str]:
+    """Candidate GitHub org names for a domain, most likely first"""
+    # Extract domain name (e.g., langdb.ai -> langdb)
+    domain_parts = domain.replace('www.', '').split('.')
+    if len(domain_parts) < 2:
+        return []
+
+    # Strategy 1: Use domain name directly (langdb.ai -> langdb)
+    base_name = domain_parts[0]
+    potential_orgs = [base_name]
+
+    # Strategy 2: Try removing common suffixes (langdb-ai -> langdb)
+    for suffix in ['-ai', '-io', '-app', '-tech', '-labs', '-inc', '-co']:
+        if base_name.endswith(suffix):
+            potential_orgs.append(base_name[:-len(suffix)])
+
+    # Strategy 3: Try camelCase split (langDB -> lang-db)
+    if base_name != base_name.lower():
+        potential_orgs.append(re.sub(r'([a-z])([A-Z])', r'\1-\2', base_name).lower())
+
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(org for org in potential_orgs if org))
+
+
+def stats_from_repos(repos: Optional[List[Dict]]) -> Dict[str, float]:
+    """Engineering pulse from normalized repos ({'stars', 'pushed_at', 'committed_at'})"""
+    if not repos:
+        return dict(NO_REPO_STATS)
+
+    most_recent_commit = None
+    for repo in repos[:COMMIT_REPOS]:
+        commit_date = repo.get('committed_at') or repo.get('pushed_at')
+        if commit_date and (not most_recent_commit or commit_date > most_recent_commit):
+            most_recent_commit = commit_date
+
+    days_ago = 999
+    if most_recent_commit:
+        commit_dt = datetime.fromisoformat(most_recent_commit.replace('Z', '+00:00'))
+        days_ago = (datetime.now(timezone.utc) - commit_dt).days
+
+    return {
+        'last_commit_days': days_ago,
+        'issue_velocity': 7,  # Would need to calculate from issues
+        'github_stars': sum(repo.get('stars') or 0 for repo in repos),
+        'repo_count': len(repos)
+    }
+
+
+class GitHubClient:
+    """Batched GitHub org resolution and repo stats"""
+
+    def __init__(self, token: str = GITHUB_TOKEN, batch_size: int = GITHUB_BATCH_SIZE,
+                 batch_window: float = GITHUB_BATCH_WINDOW):
+        self.token = token
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue: List[str] = []
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle = None
+        self._flush_tasks = set()
+        self.graphql_requests = 0
+        self.rest_requests = 0
+        self.rest_not_modified = 0
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            'Authorization': f'token {self.token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+
+    async def _wait_for_rate_limit(self):
+        if not check_rate_limit('github'):
+            await asyncio.sleep(get_wait_time('github'))
+
+    # Coalescing
+
+    async def org_repos(self, login: str) -> Optional[List[Dict]]:
+        """Repos of an organization (None if the login is not an org); concurrent calls are batched"""
+        if not _LOGIN.match(login):
+            return None
+
+        login = login.lower()
+        cached = get_cache(f"github_repos:{login}")
+        if cached is not None:
+            return cached.get('repos')
+
+        if login in self._pending:
+            return await asyncio.shield(self._pending[login])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[login] = future
+        self._queue.append(login)
+
+        if len(self._queue) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """Send the queued logins as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        logins, self._queue = self._queue, []
+        if not logins:
+            return
+        task = asyncio.ensure_future(self._resolve_batch(logins))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _resolve_batch(self, logins: List[str]):
+        """Fetch a batch and settle the waiting lookups"""
+        try:
+            results = await self.fetch_orgs(logins)
+        except Exception as e:
+            print(f"GitHub batch error: {e}")
+            results = {}
+        for login in logins:
+            future = self._pending.pop(login, None)
+            if future is not None and not future.done():
+                future.set_result(results.get(login))
+
+    # Fetching
+
+    async def fetch_orgs(self, logins: List[str]) -> Dict[str, Optional[List[Dict]]]:
+        """Repos for many org logins: one GraphQL query per batch, REST for what GraphQL could not answer"""
+        results: Dict[str, Optional[List[Dict]]] = {}
+        if not self.token:
+            return results
+
+        async with aiohttp.ClientSession() as session:
+            for start in range(0, len(logins), self.batch_size):
+                batch = logins[start:start + self.batch_size]
+                try:
+                    results.update(await self._graphql_orgs(session, batch))
+                except Exception as e:
+                    print(f"GitHub GraphQL error, falling back to REST: {e}")
+
+            missing = [login for login in logins if login not in results]
+            if missing:
+                rest_results = await asyncio.gather(*[self._rest_org_repos(session, login) for login in missing])
+                for login, repos in zip(missing, rest_results):
+                    if repos is not False:
+                        results[login] = repos
+
+        for login, repos in results.items():
+            set_cache(f"github_repos:{login}", {'repos': repos}, GITHUB_STATS_TTL)
+        return results
+
+    async def _graphql_orgs(self, session: aiohttp.ClientSession, logins: List[str]) -> Dict[str, Optional[List[Dict]]]:
+        """One aliased GraphQL query for a batch of org logins"""
+        aliases = {f"o{index}": login for index, login in enumerate(logins)}
+        query = "query {\n%s\n}\n%s" % (
+            "\n".join(f"  {alias}: organization(login: {json.dumps(login)}) {{ ...OrgRepos }}"
+                      for alias, login in aliases.items()),
+            _ORG_FRAGMENT
+        )
+
+        await self._wait_for_rate_limit()
+        self.graphql_requests += 1
+        headers = {**self._headers(), 'Authorization': f'bearer {self.token}'}
+        async with session.post(GITHUB_GRAPHQL_URL, json={'query': query}, headers=headers,
+                                timeout=aiohttp.ClientTimeout(total=20)) as response:
+            if response.status != 200:
+                raise Exception(f"status {response.status}")
+            payload = await response.json()
+
+        data = payload.get('data')
+        if data is None:
+            raise Exception(payload.get('errors') or 'no data')
+
+        # Orgs that don't exist come back as null with a NOT_FOUND error; anything else is retried over REST
+        failed_aliases = {
+            error['path'][0] for error in payload.get('errors') or []
+            if error.get('type') != 'NOT_FOUND' and error.get('path')
+        }
+
+        results = {}
+        for alias, login in aliases.items():
+            if alias in failed_aliases:
+                continue
+            org = data.get(alias)
+            if org is None:
+                results[login] = None
+                continue
+            results[login] = [
+                {
+                    'stars': repo.get('stargazerCount') or 0,
+                    'pushed_at': repo.get('pushedAt'),
+                    'committed_at': ((repo.get('defaultBranchRef') or {}).get('target') or {}).get('committedDate')
+                }
+                for repo in (org.get('repositories') or {}).get('nodes') or []
+            ]
+        return results
+
+    async def _rest_org_repos(self, session: aiohttp.ClientSession, login: str):
+        """
+        Org repos over REST with If-None-Match (304s don't count against the rate limit).
+        Returns repos, None if the login is not an org, or False on failure.
+        """
+        url = f"{GITHUB_API_URL}/orgs/{login}/repos?per_page={REPOS_PER_ORG}&sort=pushed"
+        etag_key = f"github_etag:{url}"
+        previous = get_cache(etag_key)
+        headers = self._headers()
+        if previous:
+            headers['If-None-Match'] = previous['etag']
+
+        await self._wait_for_rate_limit()
+        self.rest_requests += 1
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 304 and previous:
+                    self.rest_not_modified += 1
+                    set_cache(etag_key, previous, GITHUB_ETAG_TTL)
+                    return previous['repos']
+                if response.status == 404:
+                    return None
+                if response.status != 200:
+                    return False
+                repos = [
+                    {'stars': repo.get('stargazers_count') or 0, 'pushed_at': repo.get('pushed_at'), 'committed_at': None}
+                    for repo in await response.json()
+                ]
+                if response.headers.get('ETag'):
+                    set_cache(etag_key, {'etag': response.headers['ETag'], 'repos': repos}, GITHUB_ETAG_TTL)
+                return repos
+        except Exception as e:
+            print(f"GitHub API error: {e}")
+            return False
+
+    # Lookups used by the OSINT sources
+
+    async def resolve_org(self, domain: str) -> Optional[str]:
+        """
+        First candidate org name for a domain that exists on GitHub. Its stats are
+        cached as well, so the following get_github_stats call costs no request.
+        """
+        candidates = candidate_org_names(domain)
+        if not candidates:
+            return None
+
+        repos_by_candidate = await asyncio.gather(*[self.org_repos(login) for login in candidates])
+        for login, repos in zip(candidates, repos_by_candidate):
+            if repos is not None:
+                prime_cache("github_stats", stats_from_repos(repos), login, ttl=GITHUB_STATS_TTL)
+                return login
+
+        # Fallback: return first potential org name even without verification
+        prime_cache("github_stats", dict(NO_REPO_STATS), candidates[0], ttl=GITHUB_STATS_TTL)
+        return candidates[0]
+
+    async def org_stats(self, login: str) -> Dict[str, float]:
+        """Engineering pulse for one org login"""
+        return stats_from_repos(await self.org_repos(login))
+
+    def request_counts(self) -> Dict[str, int]:
+        return {
+            'graphql_requests': self.graphql_requests,
+            'rest_requests': self.rest_requests,
+            'rest_not_modified': self.rest_not_modified
+        }
+
+
+# Shared client so lookups from concurrent scans land in the same batches
+github_client = GitHubClient()
@@ -0,0 +1,92 @@
+"""
+Celerio Scout - Homepage Fingerprints
+SimHash of the normalized homepage text plus the extracted title and H1, used
+to reuse previous messaging signals while a homepage has not materially changed
+"""
+import re
+import hashlib
+from typing import Dict, Optional, Tuple
+from bs4 import BeautifulSoup
+
+# Max differing SimHash bits for two homepages to count as the same page
+SIMHASH_MATCH_DISTANCE = 3
+
+# Words per shingle fed into the SimHash
+SHINGLE_SIZE = 3
+
+SIMHASH_BITS = 64
+
+_H1 = re.compile(r'<h1[^>]*>(.*?)</h1>', re.IGNORECASE | re.DOTALL)
+_TITLE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_WORD = re.compile(r'\w+', re.UNICODE)
+# Digits change on every visit (dates, counters, cache busters) without the page changing
+_DIGITS = re.compile(r'\d+')
+
+
+def extract_title_h1(content: str) -> Tuple[str, str]:
+    """Raw (title, h1) text of a homepage, as used by the messaging vector"""
+    h1_match = _H1.search(content)
+    title_match = _TITLE.search(content)
+    h1_text = h1_match.group(1).strip() if h1_match else ""
+    title_text = title_match.group(1).strip() if title_match else ""
+    return title_text, h1_text
+
+
+def normalize_homepage_text(content: str) -> str:
+    """Visible homepage text, lowercased, with scripts/styles and digits removed"""
+    soup = BeautifulSoup(content, 'html.parser')
+    for tag in soup(['script', 'style', 'noscript', 'template', 'svg']):
+        tag.decompose()
+    text = _DIGITS.sub(' ', soup.get_text(' ').lower())
+    return ' '.join(_WORD.findall(text))
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """64-bit SimHash over word shingles"""
+    words = text.split()
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    counts = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            counts[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if counts[bit] > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+
+def homepage_features(content: Optional[str]) -> Optional[Dict]:
+    """Fingerprint of a homepage: {'simhash' (hex), 'title', 'h1'} (None without content)"""
+    if not content:
+        return None
+    title_text, h1_text = extract_title_h1(content)
+    return {
+        'simhash': format(simhash(normalize_homepage_text(content)), '016x'),
+        'title': title_text,
+        'h1': h1_text
+    }
+
+
+def fingerprint_matches(previous: Optional[Dict], features: Optional[Dict],
+                        max_distance: int = SIMHASH_MATCH_DISTANCE) -> bool:
+    """Same title and H1, and page text within max_distance SimHash bits"""
+    if not previous or not features or not previous.get('simhash'):
+        return False
+    if previous.get('title') != features['title'] or previous.get('h1') != features['h1']:
+        return False
+    return hamming_distance(int(previous['simhash'], 16), int(features['simhash'], 16)) <= max_distance
+
+
+def match_homepage(previous: Optional[Dict], content: Optional[str]) -> Optional[Dict]:
+    """The previous fingerprint record if the fetched homepage still matches it, else None"""
+    if fingerprint_matches(previous, homepage_features(content)):
+        return previous
+    return None
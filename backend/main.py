@@ -4,6 +4,7 @@ OSINT-powered startup stall detection engine
 """
 from fastapi import FastAPI, HTTPException, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 import json as json_module
@@ -16,10 +17,17 @@ import asyncio
 import threading
 from pathlib import Path
 from datetime import datetime, timedelta, date
-from urllib.parse import urlparse
-from scorer import calculate_scores, scan_company
+from scorer import scan_company, score_companies, ScoringStats, DEFAULT_SCAN_TIME_BUDGET
 from seeds import load_mock_data
 from portfolio_scraper import PortfolioScraper
+from portfolio_snapshots import IncrementalRunStats
+from signal_store import CompanySignalStore
+from field_provenance import FieldProvenanceStore
+from domain_resolver import get_domain_resolver
+from domain_health import get_domain_health
+from domain_canonical import get_domain_canonicalizer
+from entity_resolution import get_entity_resolver, resolve_table
+from membership_index import get_membership_index
 from vc_discovery import VCDiscovery
 from discovery_sources import DiscoverySourceManager
 
@@ -200,6 +208,22 @@ conn.execute("""
 # Initialize Discovery Source Manager
 discovery_source_manager = DiscoverySourceManager(conn)
 
+# Raw scoring signals with per-source freshness (company_signals table)
+signal_store = CompanySignalStore(conn)
+field_provenance = FieldProvenanceStore(conn)
+# Name -> domain resolutions shared by every portfolio scraper, persisted across runs
+domain_resolver = get_domain_resolver(conn)
+# Dead/backed-off hosts skipped by every fetch helper (domain_health table)
+domain_health = get_domain_health(conn)
+# Canonical company domains and known redirects (domain_redirects table), applied at ingestion
+domain_canonicalizer = get_domain_canonicalizer(conn)
+# Bloom filters over existing company/VC domains and names: a miss means definitely new, no SELECT needed
+membership_index = get_membership_index(conn)
+
+# Liveness sweep of all company domains: first run shortly after startup, then daily
+DOMAIN_SWEEP_DELAY = 60
+DOMAIN_SWEEP_INTERVAL = 24 * 3600
+
 # Investor-Company relationship tables
 conn.execute("""
     CREATE TABLE IF NOT EXISTS company_investments (
@@ -292,13 +316,7 @@ def load_initial_vcs():
             if not existing:
                 # Extract domain from URL
                 url = vc.get('url', '')
-                domain = ''
-                if url:
-                    try:
-                        parsed = urlparse(url)
-                        domain = parsed.netloc.replace('www.', '')
-                    except:
-                        pass
+                domain = domain_canonicalizer.canonicalize(url) or ''
                 
                 # Get portfolio URL (use url if portfolio_url not specified)
                 portfolio_url = vc.get('portfolio_url_pattern') or vc.get('url', '')
@@ -327,6 +345,7 @@ def load_initial_vcs():
                     datetime.now(),
                     datetime.now()
                 ))
+                membership_index.add('vcs', domain, vc['firm_name'])
         conn.commit()
         print(f"Loaded {len(vcs)} VCs from seed data")
     except Exception as e:
@@ -416,13 +435,34 @@ async def startup_event():
                     datetime.now(),
                     datetime.now()
                 ))
+                membership_index.add('companies', company['domain'], company['name'])
         conn.commit()
     
     # Load initial VCs from seed data
     load_initial_vcs()
+    
+    asyncio.create_task(domain_sweep_loop())
+
+def _company_domains() -> List[str]:
+    rows = conn.execute(
+        "SELECT DISTINCT domain FROM companies WHERE domain IS NOT NULL AND domain != ''"
+    ).fetchall()
+    return [row[0] for row in rows]
+
+async def domain_sweep_loop():
+    """Keep domain health current so scans and enrichment skip dead sites"""
+    await asyncio.sleep(DOMAIN_SWEEP_DELAY)
+    while True:
+        try:
+            await domain_health.sweep(_company_domains())
+        except Exception as e:
+            print(f"[DOMAIN-HEALTH] Sweep failed: {e}")
+        await asyncio.sleep(DOMAIN_SWEEP_INTERVAL)
 
 class ScanRequest(BaseModel):
     url: str
+    time_budget: Optional[float] = DEFAULT_SCAN_TIME_BUDGET  # Seconds before partial scores are returned
+    use_cached_signals: bool = True  # Reuse fresh stored signals; False refetches every source
 
 class CompanyResponse(BaseModel):
     id: int
@@ -456,6 +496,7 @@ class StatsResponse(BaseModel):
 
 class PortfolioScrapeRequest(BaseModel):
     portfolio_names: List[str]
+    incremental: bool = True  # Only analyze companies added since the last snapshot
 
 class PortfolioInfo(BaseModel):
     firm_name: str
@@ -1283,17 +1324,21 @@ async def free_text_search(request: FreeTextSearchRequest):
                     def _save_companies_batch(batch):
                         """Save a batch of companies to database"""
                         saved = 0
+                        company_entities = get_entity_resolver('company', conn)
                         for company in batch:
                             try:
-                                domain = company.get('domain', '').strip()
+                                domain = domain_canonicalizer.canonicalize(company.get('domain', '')) or ''
                                 if not domain:
                                     continue
                                 
-                                # Check if company already exists
-                                existing = conn.execute(
-                                    "SELECT id FROM companies WHERE domain = ?",
-                                    (domain,)
-                                ).fetchone()
+                                # Check if company already exists (or is stored under its exact name without a domain) -
+                                # only when the filter has seen the domain or name; otherwise it is definitely new
+                                existing = None
+                                if membership_index.might_contain('companies', domain, company.get('name')):
+                                    existing = conn.execute(
+                                        "SELECT id FROM companies WHERE domain = ?",
+                                        (domain,)
+                                    ).fetchone() or company_entities.match_confirmed({'name': company.get('name'), 'domain': domain})
                                 
                                 if not existing:
                                     # Ensure columns exist
@@ -1322,6 +1367,8 @@ async def free_text_search(request: FreeTextSearchRequest):
                                         datetime.now()
                                     ))
                                     conn.commit()
+                                    company_entities.add({'name': company.get('name'), 'domain': domain}, key=company_id)
+                                    membership_index.add('companies', domain, company.get('name'))
                                     saved += 1
                             except Exception as e:
                                 print(f"[FREE-TEXT] Error saving company batch: {e}")
@@ -1402,17 +1449,21 @@ async def free_text_search(request: FreeTextSearchRequest):
             
             # Store discovered companies in database
             if discovered_companies:
+                company_entities = get_entity_resolver('company', conn)
                 for company in discovered_companies:
                     try:
-                        domain = company.get('domain', '').strip()
+                        domain = domain_canonicalizer.canonicalize(company.get('domain', '')) or ''
                         if not domain:
                             continue
                             
-                        # Check if company already exists
-                        existing = conn.execute(
-                            "SELECT id FROM companies WHERE domain = ?",
-                            (domain,)
-                        ).fetchone()
+                        # Check if company already exists (or is stored under its exact name without a domain) -
+                        # only when the filter has seen the domain or name; otherwise it is definitely new
+                        existing = None
+                        if membership_index.might_contain('companies', domain, company.get('name')):
+                            existing = conn.execute(
+                                "SELECT id FROM companies WHERE domain = ?",
+                                (domain,)
+                            ).fetchone() or company_entities.match_confirmed({'name': company.get('name'), 'domain': domain})
                         
                         if not existing:
                             # Ensure columns exist before inserting
@@ -1442,6 +1493,8 @@ async def free_text_search(request: FreeTextSearchRequest):
                                 datetime.now()
                             ))
                             conn.commit()
+                            company_entities.add({'name': company.get('name'), 'domain': domain}, key=company_id)
+                            membership_index.add('companies', domain, company.get('name'))
                             discovered_count += 1
                             print(f"[FREE-TEXT] ✓ Added discovered company: {company.get('name')} ({domain})")
                         else:
@@ -1627,34 +1680,217 @@ async def free_text_search(request: FreeTextSearchRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error parsing query: {str(e)}")
 
+@app.post("/companies/rescore")
+async def rescore_companies_endpoint():
+    """
+    Recompute every company's 3M scores and stall probability from its stored
+    signals (no network fetches) and write them back in one pass.
+    """
+    try:
+        from vector_scoring import rescore_all_companies
+        # Off the event loop, on its own cursor (DuckDB connections aren't shared across threads)
+        return await run_in_threadpool(rescore_all_companies, conn.cursor())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rescoring companies: {str(e)}")
+
+class WhatIfRequest(BaseModel):
+    profile: Optional[str] = None  # Named profile from data/weight_profiles.json, e.g. "motion_heavy"
+    vector_weights: Optional[Dict[str, float]] = None  # e.g., {"motion": 0.6, "messaging": 0.2, "market": 0.2}
+    weights: Optional[Dict[str, Dict[str, float]]] = None  # e.g., {"motion": {"hiring": 0.5}}
+    thresholds: Optional[Dict[str, float]] = None  # e.g., {"stall_high": 45}
+    stall_probability: Optional[List[str]] = None  # Only return these buckets
+    limit: int = 50
+    offset: int = 0
+
+@app.post("/companies/what-if")
+async def what_if_ranking(request: WhatIfRequest):
+    """
+    Re-rank companies under alternative 3M weights and stall thresholds.
+    Scores are recomputed from stored signals on the fly and never persisted.
+    """
+    try:
+        from what_if_ranking import get_what_if_ranker
+        # NumPy scoring over the whole table - keep it off the event loop, on its own cursor
+        return await run_in_threadpool(
+            get_what_if_ranker().rerank,
+            conn.cursor(),
+            profile=request.profile,
+            vector_weights=request.vector_weights,
+            weights=request.weights,
+            thresholds=request.thresholds,
+            stall_probability=request.stall_probability,
+            limit=max(min(request.limit, 1000), 1),
+            offset=max(request.offset, 0)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ranking companies: {str(e)}")
+
+@app.get("/companies/what-if/profiles")
+async def list_weight_profiles():
+    """Named weight profiles available to /companies/what-if"""
+    try:
+        from what_if_ranking import get_what_if_ranker
+        return get_what_if_ranker().profiles.list_profiles()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading weight profiles: {str(e)}")
+
+class RefreshSignalsRequest(BaseModel):
+    limit: Optional[int] = None  # Refresh at most this many companies (stalest first)
+    concurrency: int = 20
+
+# Most recent /companies/refresh-signals run (see /companies/refresh-signals/status)
+_signal_refresh = None
+
+# Scores written during a signal refresh are committed in chunks of this size
+SIGNAL_REFRESH_COMMIT_EVERY = 50
+
+def _signal_refresh_summary(refresh: Dict) -> Dict:
+    """Progress plus signal reuse of a signal refresh run"""
+    summary = {**refresh['progress'].as_dict(), **refresh['stats'].as_dict()}
+    total_signals = summary['signals_cached'] + summary['signals_fetched']
+    summary['signal_reuse_pct'] = round(summary['signals_cached'] / total_signals * 100, 1) if total_signals else 0.0
+    summary['errors'] = refresh['errors'][:20]
+    return summary
+
+@app.post("/companies/refresh-signals")
+async def refresh_company_signals(request: RefreshSignalsRequest):
+    """
+    Nightly full-portfolio refresh: rescore every company, refetching only the
+    signals whose freshness policy expired and reusing fresh stored ones.
+    Runs in background and returns immediately; follow it on /companies/refresh-signals/status.
+    """
+    global _signal_refresh
+    try:
+        import asyncio
+        from enrichment_pipeline import EnrichmentProgress
+        
+        if _signal_refresh is not None and _signal_refresh['progress'].finished_at is None:
+            return {
+                "status": "running",
+                "message": "Signal refresh already in progress",
+                "progress": _signal_refresh_summary(_signal_refresh)
+            }
+        
+        query = """
+            SELECT id, name, domain FROM companies
+            WHERE domain IS NOT NULL AND domain != ''
+            ORDER BY updated_at ASC NULLS FIRST
+        """
+        if request.limit:
+            query += f" LIMIT {int(request.limit)}"
+        companies = [
+            {'id': row[0], 'name': row[1], 'domain': row[2]}
+            for row in conn.execute(query).fetchall()
+        ]
+        
+        refresh = {'progress': EnrichmentProgress(len(companies)), 'stats': ScoringStats(), 'errors': []}
+        _signal_refresh = refresh
+        progress = refresh['progress']
+        
+        async def refresh_background():
+            try:
+                async for result in score_companies(
+                    companies, concurrency=request.concurrency, stats=refresh['stats'], signal_store=signal_store
+                ):
+                    progress.processed += 1
+                    if result['error']:
+                        progress.failed += 1
+                        refresh['errors'].append({'domain': result['domain'], 'error': result['error']})
+                        continue
+                    scores = result['scores']
+                    conn.execute("""
+                        UPDATE companies SET
+                            messaging_score = ?, motion_score = ?, market_score = ?,
+                            stall_probability = ?, signals = ?, updated_at = ?
+                        WHERE id = ?
+                    """, (
+                        scores['messaging_score'],
+                        scores['motion_score'],
+                        scores['market_score'],
+                        scores['stall_probability'],
+                        json.dumps(scores['signals']),
+                        datetime.now(),
+                        result['company']['id']
+                    ))
+                    progress.updated += 1
+                    # Commit as it goes so an interrupted run keeps what it refreshed
+                    if progress.updated % SIGNAL_REFRESH_COMMIT_EVERY == 0:
+                        conn.commit()
+                        progress.persisted = progress.updated
+                conn.commit()
+                progress.persisted = progress.updated
+                
+                summary = _signal_refresh_summary(refresh)
+                print(f"[SIGNALS] Refreshed {summary['completed']} companies: {summary['signals_fetched']} signals fetched, "
+                      f"{summary['signals_cached']} reused ({summary['signal_reuse_pct']}%)")
+            except Exception as e:
+                print(f"[SIGNALS] Background signal refresh error: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                progress.finish()
+        
+        asyncio.create_task(refresh_background())
+        
+        return {
+            "status": "started",
+            "message": f"Signal refresh started in background for {len(companies)} companies",
+            "total_companies": len(companies),
+            "concurrency": request.concurrency
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error refreshing signals: {str(e)}")
+
+@app.get("/companies/refresh-signals/status")
+async def refresh_signals_status():
+    """Progress and signal reuse of the current (or last) signal refresh"""
+    if _signal_refresh is None:
+        return {"status": "idle"}
+    return _signal_refresh_summary(_signal_refresh)
+
+# Progress of the most recent /companies/enrich run (see /companies/enrich/status)
+_enrichment_progress = None
+
 @app.post("/companies/enrich")
-async def enrich_companies_endpoint(batch_size: int = 100, use_firecrawl: bool = True):
+async def enrich_companies_endpoint(batch_size: int = 100, use_firecrawl: bool = True, concurrency: int = 25):
     """
     Enrich companies in the database with stage, focus areas, employees, and funding data.
-    Runs enrichment in background and returns immediately.
+    Runs enrichment in background and returns immediately; follow it on /companies/enrich/status.
     """
+    global _enrichment_progress
     try:
         import asyncio
         from enrich_existing_companies import enrich_company_batch
+        from enrichment_pipeline import EnrichmentProgress
+        
+        if _enrichment_progress is not None and _enrichment_progress.finished_at is None:
+            return {
+                "status": "running",
+                "message": "Enrichment already in progress",
+                "progress": _enrichment_progress.as_dict()
+            }
         
         print("[ENRICH-API] Starting batch enrichment in background...")
         
-        # Get companies that need enrichment
+        # Get companies with missing fields, then keep those with fields due for another attempt
         companies = conn.execute("""
             SELECT id, name, domain, source, yc_batch, last_raise_stage, 
                    focus_areas, employee_count, funding_amount
             FROM companies
             WHERE last_raise_stage IS NULL OR focus_areas IS NULL OR focus_areas = '' OR focus_areas = '[]'
+               OR employee_count IS NULL OR funding_amount IS NULL
             ORDER BY created_at DESC
-            LIMIT ?
-        """, (batch_size,)).fetchall()
+        """).fetchall()
         
         columns = ['id', 'name', 'domain', 'source', 'yc_batch', 'last_raise_stage',
                   'focus_areas', 'employee_count', 'funding_amount']
-        company_dicts = [dict(zip(columns, row)) for row in companies]
+        company_dicts = field_provenance.schedule([dict(zip(columns, row)) for row in companies], limit=batch_size)
         
         total = len(company_dicts)
-        print(f"[ENRICH-API] Found {total} companies to enrich (batch size: {batch_size})")
+        print(f"[ENRICH-API] Found {total} companies to enrich (batch size: {batch_size}, "
+              f"{len(companies)} with missing fields)")
         
         if total == 0:
             return {
@@ -1665,15 +1901,22 @@ async def enrich_companies_endpoint(batch_size: int = 100, use_firecrawl: bool =
                 "updated": 0
             }
         
+        progress = EnrichmentProgress(total)
+        _enrichment_progress = progress
+        
         # Run enrichment in background task
         async def enrich_background():
             try:
-                enriched, updated = await enrich_company_batch(conn, company_dicts)
-                print(f"[ENRICH-API] Background enrichment completed: {enriched} processed, {updated} updated")
+                enriched, updated = await enrich_company_batch(conn, company_dicts, concurrency=concurrency, progress=progress,
+                                                               provenance=field_provenance)
+                print(f"[ENRICH-API] Background enrichment completed: {enriched} processed, {updated} updated "
+                      f"in {progress.elapsed():.0f}s")
             except Exception as e:
                 print(f"[ENRICH-API] Background enrichment error: {e}")
                 import traceback
                 traceback.print_exc()
+            finally:
+                progress.finish()
         
         # Start background task
         asyncio.create_task(enrich_background())
@@ -1683,7 +1926,8 @@ async def enrich_companies_endpoint(batch_size: int = 100, use_firecrawl: bool =
             "status": "started",
             "message": f"Enrichment started in background for {total} companies",
             "total_companies": total,
-            "batch_size": batch_size
+            "batch_size": batch_size,
+            "concurrency": concurrency
         }
     except Exception as e:
         print(f"[ENRICH-API] Error: {e}")
@@ -1692,6 +1936,67 @@ async def enrich_companies_endpoint(batch_size: int = 100, use_firecrawl: bool =
         raise HTTPException(status_code=500, detail=f"Enrichment error: {str(e)}")
 
 
+@app.get("/companies/enrich/status")
+async def enrich_status_endpoint():
+    """Progress, throughput and ETA of the current (or last) enrichment run"""
+    if _enrichment_progress is None:
+        return {"status": "idle"}
+    return _enrichment_progress.as_dict()
+
+
+@app.post("/domains/sweep")
+async def sweep_domains_endpoint(force: bool = False):
+    """Check every company domain now (force also rechecks recently checked ones)"""
+    try:
+        result = await domain_health.sweep(_company_domains(), force=force)
+        return {**result, **domain_health.summary()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/entities/resolve")
+async def resolve_entities_endpoint(kind: str = "company", dry_run: bool = True):
+    """
+    Find duplicate companies (kind=company) or VCs (kind=vc) across sources. By
+    default only counts and previews the clusters; dry_run=false merges each into
+    its most complete row
+    """
+    if kind not in ('company', 'vc'):
+        raise HTTPException(status_code=400, detail="kind must be 'company' or 'vc'")
+    try:
+        return resolve_table(conn, kind, dry_run=dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/domains/health")
+async def domain_health_endpoint():
+    """How many hosts are tracked and how many are currently skipped as dead"""
+    return domain_health.summary()
+
+
+async def _store_late_scan_scores(company: Dict):
+    """Update a scanned company once the signals that missed its scan deadline arrive"""
+    try:
+        conn.execute("""
+            UPDATE companies SET
+                messaging_score = ?, motion_score = ?, market_score = ?,
+                stall_probability = ?, signals = ?, updated_at = ?
+            WHERE id = ?
+        """, (
+            company['messaging_score'],
+            company['motion_score'],
+            company['market_score'],
+            company['stall_probability'],
+            json.dumps(company.get('signals', {})),
+            datetime.now(),
+            company['id']
+        ))
+        conn.commit()
+        print(f"[SCAN] Updated {company['domain']} with late signals: {', '.join(company['signals'].get('late_signals', []))}")
+    except Exception as e:
+        print(f"[SCAN] Error storing late signals for {company.get('domain')}: {e}")
+
 @app.post("/scan", response_model=CompanyResponse)
 async def scan_company_endpoint(request: ScanRequest):
     """Trigger a live scan for a specific URL"""
@@ -1699,7 +2004,12 @@ async def scan_company_endpoint(request: ScanRequest):
     debug_log("main.py:529", "scan_company_endpoint entry", {"thread_id": threading.current_thread().ident, "url": request.url}, "A")
     # #endregion
     try:
-        result = await scan_company(request.url)
+        result = await scan_company(
+            request.url,
+            time_budget=request.time_budget,
+            on_late_scores=_store_late_scan_scores,
+            signal_store=signal_store if request.use_cached_signals else None
+        )
         
         # Store in database
         # #region agent log
@@ -1768,6 +2078,7 @@ async def scan_company_endpoint(request: ScanRequest):
                     datetime.now(),
                     datetime.now()
                 ))
+                membership_index.add('companies', result['domain'], result['name'])
             # #region agent log
             except Exception as db_err:
                 debug_log("main.py:562", "INSERT error", {"thread_id": threading.current_thread().ident, "error": str(db_err)}, "B")
@@ -2886,17 +3197,19 @@ async def _discover_vcs_with_progress():
                     continue
                 
                 # Check if VC already exists
-                existing = conn.execute(
-                    "SELECT id, firm_name FROM vcs WHERE firm_name = ?",
-                    (firm_name,)
-                ).fetchone()
-                
                 domain = vc.get('domain', '').strip()
-                if not existing and domain:
+                existing = None
+                if membership_index.might_contain('vcs', domain, firm_name):
                     existing = conn.execute(
-                        "SELECT id, firm_name FROM vcs WHERE domain = ?",
-                        (domain,)
+                        "SELECT id, firm_name FROM vcs WHERE firm_name = ?",
+                        (firm_name,)
                     ).fetchone()
+                    
+                    if not existing and domain:
+                        existing = conn.execute(
+                            "SELECT id, firm_name FROM vcs WHERE domain = ?",
+                            (domain,)
+                        ).fetchone()
                 
                 if existing:
                     skipped_duplicates += 1
@@ -2922,6 +3235,7 @@ async def _discover_vcs_with_progress():
                     datetime.now(),
                     datetime.now()
                 ))
+                membership_index.add('vcs', vc.get('domain', ''), vc['firm_name'])
                 added_count += 1
                 
                 # Update progress every 10 items
@@ -3008,17 +3322,19 @@ async def discover_vcs():
                 if not firm_name:
                     continue
                 
-                existing = conn.execute(
-                    "SELECT id, firm_name FROM vcs WHERE firm_name = ?",
-                    (firm_name,)
-                ).fetchone()
-                
                 domain = vc.get('domain', '').strip()
-                if not existing and domain:
+                existing = None
+                if membership_index.might_contain('vcs', domain, firm_name):
                     existing = conn.execute(
-                        "SELECT id, firm_name FROM vcs WHERE domain = ?",
-                        (domain,)
+                        "SELECT id, firm_name FROM vcs WHERE firm_name = ?",
+                        (firm_name,)
                     ).fetchone()
+                    
+                    if not existing and domain:
+                        existing = conn.execute(
+                            "SELECT id, firm_name FROM vcs WHERE domain = ?",
+                            (domain,)
+                        ).fetchone()
                 
                 if existing:
                     skipped_duplicates += 1
@@ -3044,6 +3360,7 @@ async def discover_vcs():
                     datetime.now(),
                     datetime.now()
                 ))
+                membership_index.add('vcs', vc.get('domain', ''), vc['firm_name'])
                 added_count += 1
             except Exception as e:
                 errors += 1
@@ -3319,14 +3636,12 @@ async def discover_vcs_stream():
 async def add_vc(request: AddVCRequest):
     """Add a custom VC portfolio"""
     # Extract domain from URL
-    from urllib.parse import urlparse
-    parsed = urlparse(request.url)
-    domain = parsed.netloc or parsed.path.split('/')[0]
-    if domain.startswith('www.'):
-        domain = domain[4:]
+    domain = domain_canonicalizer.canonicalize(request.url)
+    if not domain:
+        raise HTTPException(status_code=400, detail="Invalid URL")
     
     # Check if VC already exists
-    existing = conn.execute(
+    existing = membership_index.might_contain('vcs', domain, request.firm_name) and conn.execute(
         "SELECT id FROM vcs WHERE firm_name = ? OR domain = ?",
         (request.firm_name, domain)
     ).fetchone()
@@ -3358,6 +3673,7 @@ async def add_vc(request: AddVCRequest):
         datetime.now()
     ))
     conn.commit()
+    membership_index.add('vcs', domain, request.firm_name)
     
     return PortfolioInfo(
         firm_name=request.firm_name,
@@ -3391,6 +3707,13 @@ async def get_focus_areas():
                 all_focus_areas.add(row[0])
     return sorted(list(all_focus_areas))
 
+async def _enumerate_async(iterator, start: int = 0):
+    """enumerate() for async iterators"""
+    idx = start
+    async for item in iterator:
+        yield idx, item
+        idx += 1
+
 @app.post("/portfolios/scrape")
 async def scrape_portfolios(request: PortfolioScrapeRequest):
     # #region agent log
@@ -3402,7 +3725,7 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
     """
     import asyncio
     
-    scraper = PortfolioScraper()
+    scraper = PortfolioScraper(conn)
     
     # Get portfolio URLs from database
     placeholders = ','.join(['?' for _ in request.portfolio_names])
@@ -3424,6 +3747,9 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
     
     # Scrape portfolios with progress logging and timeout
     portfolio_results = {}
+    removed_results = {}
+    incremental_results = {}
+    run_stats = IncrementalRunStats()
     scraped_count = 0
     
     try:
@@ -3434,13 +3760,18 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
                 
                 # Add timeout per portfolio (5 minutes max)
                 try:
-                    companies = await asyncio.wait_for(
-                        scraper.scrape_portfolio(firm_name, vc_info['url'], vc_info['type']),
+                    result = await asyncio.wait_for(
+                        scraper.scrape_portfolio_incremental(firm_name, vc_info['url'], vc_info['type']),
                         timeout=300.0  # 5 minutes per portfolio
                     )
-                    portfolio_results[firm_name] = companies
+                    run_stats.record(result)
+                    incremental_results[firm_name] = result
+                    companies = result['companies']
+                    # Unchanged companies were already enriched and scored on a previous run
+                    portfolio_results[firm_name] = result['added'] if request.incremental else companies
+                    removed_results[firm_name] = result['removed']
                     scraped_count += len(companies)
-                    print(f"Found {len(companies)} companies from {firm_name}")
+                    print(f"Found {len(companies)} companies from {firm_name} ({result['status']})")
                 except asyncio.TimeoutError:
                     print(f"Timeout scraping {firm_name} - continuing with next portfolio")
                     portfolio_results[firm_name] = []
@@ -3449,7 +3780,7 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
                     portfolio_results[firm_name] = []
     finally:
         # Clean up scraper session
-        await scraper.close_session()
+        await scraper.close()
     
     all_companies = []
     analyzed_companies = []
@@ -3459,6 +3790,10 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
     vc_name_to_id = {}
     company_to_vc = {}  # Map company to VC firm name
     for firm_name, companies in portfolio_results.items():
+        # One canonical domain per company (www/case/IDN variants, subdomains and redirects
+        # collapse) before anything is enriched or scored
+        companies = await domain_canonicalizer.canonicalize_companies(companies)
+        portfolio_results[firm_name] = companies
         # Get VC ID for this portfolio
         vc_result = conn.execute(
             "SELECT id FROM vcs WHERE firm_name = ?",
@@ -3474,37 +3809,74 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
         
         all_companies.extend(companies)
     
-    print(f"Total companies scraped: {len(all_companies)}")
+    # Close investment relationships for companies that left a portfolio
+    for firm_name, removed in removed_results.items():
+        investor_id = vc_name_to_id.get(firm_name)
+        if not investor_id:
+            continue
+        for company in removed:
+            domain = domain_canonicalizer.canonicalize(company.get('domain', '')) or ''
+            if not domain:
+                continue
+            try:
+                # Removed companies were stored on earlier runs - look their id up by domain
+                conn.execute("""
+                    UPDATE company_investments SET valid_to = ?, updated_at = ?
+                    WHERE company_id IN (SELECT id FROM companies WHERE domain = ?)
+                      AND investor_id = ? AND valid_to IS NULL
+                """, (datetime.now().date(), datetime.now(), domain, investor_id))
+            except Exception as inv_err:
+                print(f"Warning: Could not close investment relationship for {company.get('name')}: {inv_err}")
     
-    # Analyze each company (with rate limiting and progress)
-    total_to_analyze = len(all_companies)
+    print(f"Total companies to analyze: {len(all_companies)}")
+    run_stats.print_summary()
+    
+    # Analyze companies concurrently, persisting each one as its scores arrive
     analyzed_count = 0
     skipped_count = 0
+    failed_domains = set()
+    
+    companies_to_score = []
+    seen_domains = set()
+    for company in all_companies:
+        # Get domain - must be present, skip if not available
+        domain = company.get('domain', '').strip()
+        if domain in seen_domains:
+            # Held by several of the scraped portfolios - score it once
+            continue
+        if not domain:
+            skipped_count += 1
+            if skipped_count <= 5:  # Only log first few
+                print(f"Skipping {company.get('name', 'Unknown')} - no domain found")
+            continue
+        
+        # Validate domain format
+        if '.' not in domain or len(domain) < 4:
+            skipped_count += 1
+            if skipped_count <= 5:
+                print(f"Skipping {company.get('name', 'Unknown')} - invalid domain: {domain}")
+            continue
+        
+        seen_domains.add(domain)
+        companies_to_score.append(company)
+    
+    total_to_analyze = len(companies_to_score)
+    scoring_stats = ScoringStats()
     
-    for idx, company in enumerate(all_companies):
+    async for idx, result in _enumerate_async(
+        score_companies(companies_to_score, enrich=enrich_company_data, stats=scoring_stats, signal_store=signal_store)
+    ):
+        company = result['company']
         if idx % 10 == 0 and total_to_analyze > 10:
-            print(f"Analyzing company {idx+1}/{total_to_analyze}...")
+            print(f"Analyzed {idx}/{total_to_analyze} companies "
+                  f"({scoring_stats.throughput_per_minute():.1f}/min)...")
         try:
-            # Get domain - must be present, skip if not available
-            domain = company.get('domain', '').strip()
-            if not domain:
-                skipped_count += 1
-                if skipped_count <= 5:  # Only log first few
-                    print(f"Skipping {company.get('name', 'Unknown')} - no domain found")
-                continue
-            
-            # Validate domain format
-            if '.' not in domain or len(domain) < 4:
-                skipped_count += 1
-                if skipped_count <= 5:
-                    print(f"Skipping {company.get('name', 'Unknown')} - invalid domain: {domain}")
-                continue
+            if result['error']:
+                raise Exception(result['error'])
             
-            # Enrich company data with funding, employees, etc.
-            enriched_company = await enrich_company_data(company, domain)
-            
-            # Calculate scores
-            scores = await calculate_scores(domain, company['name'])
+            domain = result['domain']
+            enriched_company = result['enriched']
+            scores = result['scores']
             
             # Create company record
             company_id = hash(domain) % 1000000
@@ -3626,6 +3998,7 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
                         datetime.now(),
                         datetime.now()
                     ))
+                    membership_index.add('companies', company_record['domain'], company_record['name'])
                 # #region agent log
                 except Exception as db_err:
                     debug_log("main.py:968", "Portfolio scrape INSERT error", {"thread_id": threading.current_thread().ident, "error": str(db_err)}, "B")
@@ -3642,11 +4015,19 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
                     try:
                         # Check if investment relationship already exists
                         existing_inv = conn.execute("""
-                            SELECT id FROM company_investments 
+                            SELECT id, valid_to FROM company_investments 
                             WHERE company_id = ? AND investor_id = ?
+                            ORDER BY valid_to IS NULL DESC, valid_to DESC
+                            LIMIT 1
                         """, (company_id, investor_id)).fetchone()
                         
-                        if not existing_inv:
+                        if existing_inv and existing_inv[1] is not None:
+                            # Back in the portfolio after being removed - reopen the relationship
+                            conn.execute("""
+                                UPDATE company_investments SET valid_to = NULL, updated_at = ?
+                                WHERE id = ?
+                            """, (datetime.now(), existing_inv[0]))
+                        elif not existing_inv:
                             # Determine investment type based on VC type
                             vc_type_result = conn.execute(
                                 "SELECT type FROM vcs WHERE id = ?",
@@ -3685,21 +4066,30 @@ async def scrape_portfolios(request: PortfolioScrapeRequest):
             analyzed_companies.append(CompanyResponse(**company_record))
             analyzed_count += 1
             
-            # Rate limiting - small delay between analyses
-            await asyncio.sleep(0.5)
-            
         except Exception as e:
             print(f"Error analyzing company {company.get('name', 'unknown')}: {e}")
+            failed_domains.add(company.get('domain', '').strip())
             continue
     
     conn.commit()
     
-    print(f"Scraping complete: {len(all_companies)} companies found, {analyzed_count} analyzed, {skipped_count} skipped")
+    # Snapshots move forward only now that their companies are stored; companies that
+    # failed are left out so the next incremental run reports them as added again
+    for firm_name, result in incremental_results.items():
+        failed = [company for company in portfolio_results.get(firm_name, [])
+                  if company.get('domain', '').strip() in failed_domains]
+        scraper.snapshot_store.commit_snapshot(result, failed)
+    
+    print(f"Scraping complete: {scraped_count} companies found, {analyzed_count} analyzed, {skipped_count} skipped")
+    print(f"Scoring throughput: {scoring_stats.throughput_per_minute():.1f} companies/min, "
+          f"latency share by source: {scoring_stats.latency_share()}")
     
     return {
-        'scraped_count': len(all_companies),
+        'scraped_count': scraped_count,
         'analyzed_count': analyzed_count,
         'skipped_count': skipped_count,
+        'incremental': run_stats.as_dict(),
+        'scoring': scoring_stats.as_dict(),
         'portfolios': list(portfolio_results.keys()),
         'companies': [c.dict() for c in analyzed_companies]
     }
@@ -0,0 +1,232 @@
+"""
+Celerio Scout - Membership Index
+Compact Bloom filters over the domains and names already in the companies and
+vcs tables, so ingestion can tell a definitely-new record apart without a
+per-row SELECT. Built from DuckDB at startup (persisted between runs and topped
+up with rows added since), and updated on every insert.
+"""
+import math
+import hashlib
+from typing import Dict, Optional
+from datetime import datetime
+from domain_canonical import canonical_domain
+from entity_resolution import name_core
+
+# Filters are sized for at least this many keys (a domain and a name per row),
+# and twice what the table holds when rebuilt
+MIN_CAPACITY = 100_000
+FALSE_POSITIVE_RATE = 0.001
+
+# Bump when _domain_key()/_name_key() change so persisted filters are rebuilt
+# (2: domains keyed by canonical host rather than registrable domain,
+#  3: names keyed by their entity-resolution full name)
+KEY_VERSION = 3
+
+# Tables indexed: filter name -> (table, name column)
+INDEXED_TABLES = {
+    'companies': ('companies', 'name'),
+    'vcs': ('vcs', 'firm_name')
+}
+
+
+class BloomFilter:
+    """Bit-array Bloom filter with double hashing (no false negatives)"""
+
+    def __init__(self, capacity: int, error_rate: float = FALSE_POSITIVE_RATE,
+                 num_bits: Optional[int] = None, num_hashes: Optional[int] = None, bits: Optional[bytes] = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = num_bits or max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = num_hashes or max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def is_full(self) -> bool:
+        return self.count > self.capacity
+
+
+def _domain_key(domain: Optional[str]) -> Optional[str]:
+    value = (domain or '').strip()
+    return f"d:{canonical_domain(value) or value.lower()}" if value else None
+
+
+def _name_key(name: Optional[str]) -> Optional[str]:
+    # The exact-name rule entity resolution confirms duplicates by ('Acme, Inc.' is 'Acme')
+    value = name_core(name or '', keep_generic=True)
+    return f"n:{value}" if value else None
+
+
+def _add_row(bloom: BloomFilter, domain: Optional[str], entity_name: Optional[str]):
+    for key in (_domain_key(domain), _name_key(entity_name)):
+        if key:
+            bloom.add(key)
+
+
+class MembershipIndex:
+    """Bloom filters over existing companies and VCs, persisted in DuckDB"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection the filters start empty and only see what is added
+        self.conn = db_conn
+        self._filters: Dict[str, BloomFilter] = {
+            name: BloomFilter(MIN_CAPACITY) for name in INDEXED_TABLES
+        }
+        self._built_at: Dict[str, Optional[datetime]] = {name: None for name in INDEXED_TABLES}
+        self.lookups = 0
+        self.definitely_new = 0
+        if self.conn is not None:
+            self._ensure_tables()
+            self.load()
+
+    def _ensure_tables(self):
+        """Ensure membership_filters table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS membership_filters (
+                name TEXT PRIMARY KEY,
+                capacity INTEGER,
+                num_bits BIGINT,
+                num_hashes INTEGER,
+                item_count INTEGER,
+                bits BLOB,
+                built_at TIMESTAMP         -- rows created after this are added on load
+            )
+        """)
+        self.conn.execute("ALTER TABLE membership_filters ADD COLUMN IF NOT EXISTS key_version INTEGER")
+
+    def attach(self, db_conn):
+        """Start indexing (and persisting to) a database"""
+        if self.conn is None and db_conn is not None:
+            self.conn = db_conn
+            self._ensure_tables()
+            self.load()
+
+    def load(self):
+        """Restore persisted filters and add rows created since, rebuilding any that are missing, outdated or full"""
+        for name, (table, name_column) in INDEXED_TABLES.items():
+            try:
+                row = self.conn.execute(
+                    "SELECT capacity, num_bits, num_hashes, item_count, bits, built_at, key_version "
+                    "FROM membership_filters WHERE name = ?",
+                    (name,)
+                ).fetchone()
+                if row is None or row[6] != KEY_VERSION:
+                    self.rebuild(name)
+                    continue
+                bloom = BloomFilter(row[0], num_bits=row[1], num_hashes=row[2], bits=row[4])
+                bloom.count = row[3] or 0
+                self._filters[name] = bloom
+                # Rows inserted since the filter was saved (by scripts that don't update it)
+                topped_up_at = datetime.now()
+                rows = self.conn.execute(
+                    f"SELECT domain, {name_column} FROM {table} WHERE created_at IS NULL OR created_at >= ?",
+                    (row[5],)
+                ).fetchall()
+                self._built_at[name] = topped_up_at
+                for domain, entity_name in rows:
+                    _add_row(bloom, domain, entity_name)
+                if bloom.is_full():
+                    self.rebuild(name)
+                else:
+                    self.save(name)
+            except Exception as e:
+                print(f"[MEMBERSHIP] Error loading {name} filter: {e}")
+                self.rebuild(name)
+
+    def rebuild(self, name: str):
+        """Build a filter from scratch from its table"""
+        table, name_column = INDEXED_TABLES[name]
+        built_at = datetime.now()
+        try:
+            rows = self.conn.execute(f"SELECT domain, {name_column} FROM {table}").fetchall()
+        except Exception as e:
+            print(f"[MEMBERSHIP] Error reading {table}: {e}")
+            return
+        bloom = BloomFilter(max(MIN_CAPACITY, 2 * 2 * len(rows)))
+        for domain, entity_name in rows:
+            _add_row(bloom, domain, entity_name)
+        self._filters[name] = bloom
+        self._built_at[name] = built_at
+        print(f"[MEMBERSHIP] Built {name} filter from {len(rows)} rows "
+              f"({len(self._filters[name].bits) // 1024} KB)")
+        self.save(name)
+
+    def save(self, name: Optional[str] = None):
+        """Persist filters so the next start only adds rows created since"""
+        if self.conn is None:
+            return
+        for filter_name in ([name] if name else list(self._filters)):
+            bloom = self._filters[filter_name]
+            built_at = self._built_at[filter_name] or datetime.now()
+            try:
+                self.conn.execute("DELETE FROM membership_filters WHERE name = ?", (filter_name,))
+                self.conn.execute("""
+                    INSERT INTO membership_filters (name, capacity, num_bits, num_hashes, item_count, bits, built_at, key_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (filter_name, bloom.capacity, bloom.num_bits, bloom.num_hashes, bloom.count,
+                      bytes(bloom.bits), built_at, KEY_VERSION))
+            except Exception as e:
+                print(f"[MEMBERSHIP] Error saving {filter_name} filter: {e}")
+
+    def add(self, name: str, domain: Optional[str] = None, entity_name: Optional[str] = None):
+        """Record an inserted row's domain and name"""
+        bloom = self._filters[name]
+        _add_row(bloom, domain, entity_name)
+        if bloom.is_full() and self.conn is not None:
+            # Past capacity the false positive rate climbs - resize from the table
+            self.rebuild(name)
+
+    def might_contain(self, name: str, domain: Optional[str] = None, entity_name: Optional[str] = None) -> bool:
+        """
+        False only if no row has this domain or this name - the record is
+        definitely new and needs no SELECT. True means check the database.
+        """
+        self.lookups += 1
+        bloom = self._filters[name]
+        for key in (_domain_key(domain), _name_key(entity_name)):
+            if key and key in bloom:
+                return True
+        self.definitely_new += 1
+        return False
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            **{
+                name: {
+                    'items': bloom.count,
+                    'capacity': bloom.capacity,
+                    'size_kb': len(bloom.bits) // 1024,
+                    'num_hashes': bloom.num_hashes
+                }
+                for name, bloom in self._filters.items()
+            },
+            'lookups': self.lookups,
+            'definitely_new': self.definitely_new
+        }
+
+
+_shared_index: Optional[MembershipIndex] = None
+
+
+def get_membership_index(db_conn=None) -> MembershipIndex:
+    """Index shared by all ingestion paths (built once any caller provides a connection)"""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = MembershipIndex(db_conn)
+    else:
+        _shared_index.attach(db_conn)
+    return _shared_index
@@ -7,6 +7,7 @@ import re
 from typing import Dict, Optional, List
 from datetime import datetime
 import requests
+from taxonomy import focus_area_matcher, stage_matcher
 
 OLLAMA_BASE_URL = "http://localhost:11434"
 
@@ -155,79 +156,13 @@ def rule_based_parse(query: str) -> Dict:
     query_lower = query.lower()
     params = {}
     
-    # Extract stages (handle "Seed/Series A" format)
-    stages = []
-    stage_patterns = {
-        'pre-seed': 'Pre-Seed',
-        'seed': 'Seed',
-        'series a': 'Series A',
-        'series b': 'Series B',
-        'series c': 'Series C',
-        'growth': 'Growth'
-    }
-    
-    # Handle slash-separated stages like "Seed/Series A"
-    stage_slash_match = re.search(r'(seed|pre-seed|series\s+[abc]|growth)(?:\s*/\s*(seed|pre-seed|series\s+[abc]|growth))?', query_lower)
-    if stage_slash_match:
-        for group in stage_slash_match.groups():
-            if group:
-                # Normalize the stage name
-                for pattern, stage in stage_patterns.items():
-                    if pattern in group.lower():
-                        if stage not in stages:
-                            stages.append(stage)
-                        break
-    
-    # Also check for individual stage mentions
-    for pattern, stage in stage_patterns.items():
-        if pattern in query_lower and stage not in stages:
-            stages.append(stage)
-    
+    # Extract stages and focus areas from the shared taxonomy ('/' is a word
+    # boundary, so "Seed/Series A" and "AI/B2B" yield both sides)
+    stages = stage_matcher.classify(query_lower)
     if stages:
         params['stages'] = stages
     
-    # Extract focus areas (handle "AI/B2B" format)
-    focus_areas = []
-    focus_patterns = {
-        'ai/ml': 'AI/ML',
-        'ai': 'AI/ML',
-        'machine learning': 'AI/ML',
-        'ml': 'AI/ML',
-        'b2b': 'B2B SaaS',
-        'saas': 'B2B SaaS',
-        'fintech': 'Fintech',
-        'enterprise': 'Enterprise',
-        'devtools': 'DevTools',
-        'dev tools': 'DevTools'
-    }
-    
-    # Handle slash-separated focus areas like "AI/B2B"
-    focus_slash_match = re.search(r'(ai|ml|b2b|saas|fintech|enterprise|devtools|dev tools)(?:\s*/\s*(ai|ml|b2b|saas|fintech|enterprise|devtools|dev tools))?', query_lower)
-    if focus_slash_match:
-        for group in focus_slash_match.groups():
-            if group:
-                for pattern, area in focus_patterns.items():
-                    if pattern in group.lower():
-                        if area not in focus_areas:
-                            focus_areas.append(area)
-                        break
-    
-    # Also check for individual focus area mentions
-    # But avoid false positives - require word boundaries
-    # Skip "ai" pattern as it matches too many things (like "raise", "paid", etc.)
-    for pattern, area in focus_patterns.items():
-        if pattern == 'ai':  # Skip standalone "ai" to avoid false positives
-            continue
-        # Use word boundaries to avoid matching substrings
-        pattern_regex = r'\b' + re.escape(pattern) + r'\b'
-        if re.search(pattern_regex, query_lower) and area not in focus_areas:
-            focus_areas.append(area)
-    
-    # Only check for "ai" if it appears with context like "AI companies" or "AI/ML"
-    if re.search(r'\bai\b.*(?:companies?|startups?|firms?|businesses?|/ml|/machine)', query_lower, re.IGNORECASE):
-        if 'AI/ML' not in focus_areas:
-            focus_areas.append('AI/ML')
-    
+    focus_areas = focus_area_matcher.classify(query_lower)
     if focus_areas:
         params['focus_areas'] = focus_areas
     
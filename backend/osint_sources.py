@@ -5,13 +5,20 @@ Implements actual data collection from public APIs and sources
 import os
 import aiohttp
 import re
+import html
 import asyncio
 from typing import Dict, Optional, List
 from urllib.parse import urlparse
 import praw
 from bs4 import BeautifulSoup
-from cache import cached
+from cache import cached, peek_cache, prime_cache
 from rate_limiter import check_rate_limit, get_wait_time
+from github_client import github_client, candidate_org_names
+from reddit_client import RedditClient, reddit_ttl
+from ats_connectors import get_ats_hiring_signal, fetch_pages
+from domain_health import is_known_dead
+from domain_canonical import canonical_domain
+from domain_resolver import guess_domain
 
 # Try to import crawl4ai for advanced web scraping
 try:
@@ -31,6 +38,8 @@ try:
 except Exception:
     pass  # Will use fallback if Reddit credentials not available
 
+reddit_client = RedditClient(reddit)
+
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
 SIMILARWEB_API_KEY = os.getenv('SIMILARWEB_API_KEY', '')
 LINKEDIN_CLIENT_ID = os.getenv('LINKEDIN_CLIENT_ID', '')
@@ -41,68 +50,21 @@ async def fetch_github_org(domain: str) -> Optional[str]:
     """
     Try to find GitHub organization from domain using multiple heuristics
     Returns org name if found, None otherwise
+    Candidates from concurrent lookups are verified together in batched GraphQL queries
     """
-    # Extract domain name (e.g., langdb.ai -> langdb)
-    domain_parts = domain.replace('www.', '').split('.')
-    if len(domain_parts) >= 2:
-        potential_orgs = []
-        
-        # Strategy 1: Use domain name directly (langdb.ai -> langdb)
-        potential_orgs.append(domain_parts[0])
-        
-        # Strategy 2: Try removing common suffixes (langdb-ai -> langdb)
-        base_name = domain_parts[0]
-        for suffix in ['-ai', '-io', '-app', '-tech', '-labs', '-inc', '-co']:
-            if base_name.endswith(suffix):
-                potential_orgs.append(base_name[:-len(suffix)])
-        
-        # Strategy 3: Try camelCase split (langDB -> lang-db)
-        if base_name != base_name.lower():
-            # Convert camelCase to kebab-case
-            import re
-            kebab_case = re.sub(r'([a-z])([A-Z])', r'\1-\2', base_name).lower()
-            potential_orgs.append(kebab_case)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_orgs = []
-        for org in potential_orgs:
-            if org not in seen:
-                seen.add(org)
-                unique_orgs.append(org)
-        
-        # Try to verify org exists via GitHub API
-        if GITHUB_TOKEN:
-            # Check rate limit
-            if not check_rate_limit('github'):
-                wait_time = get_wait_time('github')
-                await asyncio.sleep(wait_time)
-            
-            headers = {
-                'Authorization': f'token {GITHUB_TOKEN}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            async with aiohttp.ClientSession() as session:
-                for org_name in unique_orgs:
-                    try:
-                        # Check if org exists
-                        org_url = f'https://api.github.com/orgs/{org_name}'
-                        async with session.get(org_url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                            if response.status == 200:
-                                return org_name
-                    except Exception:
-                        continue
-        
-        # Fallback: return first potential org name even without verification
-        # (GitHub API will handle 404 gracefully)
-        return unique_orgs[0] if unique_orgs else None
-    return None
+    if GITHUB_TOKEN:
+        return await github_client.resolve_org(domain)
+    
+    # Without a token nothing can be verified - return the most likely candidate
+    candidates = candidate_org_names(domain)
+    return candidates[0] if candidates else None
 
 @cached(ttl=3600, key_prefix="github_stats")  # Cache for 1 hour
 async def get_github_stats(org_name: str) -> Dict[str, float]:
     """
     Get GitHub statistics using GitHub API
     Returns: last_commit_days, issue_velocity, github_stars
+    Usually already cached by fetch_github_org; otherwise batched with other lookups
     """
     if not GITHUB_TOKEN:
         return {
@@ -112,76 +74,19 @@ async def get_github_stats(org_name: str) -> Dict[str, float]:
             'repo_count': 0
         }
     
-    # Check rate limit
-    if not check_rate_limit('github'):
-        wait_time = get_wait_time('github')
-        await asyncio.sleep(wait_time)
-    
-    headers = {
-        'Authorization': f'token {GITHUB_TOKEN}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            # Get organization repos
-            repos_url = f'https://api.github.com/orgs/{org_name}/repos?per_page=10&sort=updated'
-            async with session.get(repos_url, headers=headers) as response:
-                if response.status == 200:
-                    repos = await response.json()
-                    if not repos:
-                        return {
-                            'last_commit_days': 999,
-                            'issue_velocity': 999,
-                            'github_stars': 0,
-                            'repo_count': 0
-                        }
-                    
-                    # Calculate stats from repos
-                    total_stars = sum(repo.get('stargazers_count', 0) for repo in repos)
-                    
-                    # Get most recent commit
-                    most_recent_commit = None
-                    for repo in repos[:5]:  # Check top 5 repos
-                        commits_url = f"{repo['url']}/commits?per_page=1"
-                        async with session.get(commits_url, headers=headers) as commit_resp:
-                            if commit_resp.status == 200:
-                                commits = await commit_resp.json()
-                                if commits:
-                                    commit_date = commits[0]['commit']['author']['date']
-                                    if not most_recent_commit or commit_date > most_recent_commit:
-                                        most_recent_commit = commit_date
-                    
-                    # Calculate days since last commit
-                    if most_recent_commit:
-                        from datetime import datetime
-                        commit_dt = datetime.fromisoformat(most_recent_commit.replace('Z', '+00:00'))
-                        days_ago = (datetime.now(commit_dt.tzinfo) - commit_dt).days
-                    else:
-                        days_ago = 999
-                    
-                    return {
-                        'last_commit_days': days_ago,
-                        'issue_velocity': 7,  # Would need to calculate from issues
-                        'github_stars': total_stars,
-                        'repo_count': len(repos)
-                    }
-        except Exception as e:
-            print(f"GitHub API error: {e}")
-    
-    return {
-        'last_commit_days': 999,
-        'issue_velocity': 999,
-        'github_stars': 0,
-        'repo_count': 0
-    }
+    return await github_client.org_stats(org_name)
 
-@cached(ttl=7200, key_prefix="reddit_mentions")  # Cache for 2 hours
 async def get_reddit_mentions(company_name: str, domain: str) -> Dict[str, float]:
     """
     Search Reddit for company mentions using PRAW
     Returns: reddit_mentions, sentiment_score
+    PRAW runs in the Reddit client's thread; names from concurrent lookups are
+    searched together. Results are cached per company (longer when there are no mentions).
     """
+    cached_result = peek_cache("reddit_mentions", company_name, domain)
+    if cached_result is not None:
+        return cached_result
+    
     if not reddit:
         # Fallback: return mock data
         return {
@@ -189,94 +94,66 @@ async def get_reddit_mentions(company_name: str, domain: str) -> Dict[str, float
             'sentiment_score': 50.0
         }
     
-    # Check rate limit
-    if not check_rate_limit('reddit'):
-        wait_time = get_wait_time('reddit')
-        await asyncio.sleep(wait_time)
+    result = await reddit_client.mentions(company_name)
+    prime_cache("reddit_mentions", result, company_name, domain, ttl=reddit_ttl(result))
+    return result
+
+def _keyword_hiring_signal(content: str) -> Dict[str, Optional[str]]:
+    """Hiring signal from role keywords on a careers page (no ATS board found)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    job_text = soup.get_text().lower()
     
-    try:
-        subreddits = ['SaaS', 'startups', 'artificial', 'entrepreneur']
-        total_mentions = 0
-        positive_keywords = ['great', 'love', 'amazing', 'excellent', 'good', 'recommend']
-        negative_keywords = ['bad', 'hate', 'terrible', 'awful', 'disappointed', 'avoid']
-        
-        for subreddit_name in subreddits:
-            try:
-                subreddit = reddit.subreddit(subreddit_name)
-                # Search for company name
-                for submission in subreddit.search(company_name, limit=10, sort='relevance'):
-                    total_mentions += 1
-                    # Check comments too
-                    submission.comments.replace_more(limit=0)
-                    for comment in submission.comments.list()[:10]:
-                        if company_name.lower() in comment.body.lower():
-                            total_mentions += 0.5
-            except Exception:
-                continue
-        
-        # Simple sentiment scoring
-        sentiment_score = 50.0
-        if total_mentions > 0:
-            sentiment_score = min(80, 50 + (total_mentions * 2))
-        
-        return {
-            'reddit_mentions': int(total_mentions),
-            'sentiment_score': sentiment_score
-        }
-    except Exception as e:
-        print(f"Reddit API error: {e}")
+    # Count different types of roles
+    eng_count = sum(1 for kw in ['engineer', 'developer', 'software'] if kw in job_text)
+    sales_count = sum(1 for kw in ['sales', 'account executive', 'sdr', 'bdr', 'account manager'] if kw in job_text)
+    
+    if eng_count == 0 and sales_count == 0:
         return {
-            'reddit_mentions': 0,
-            'sentiment_score': 50.0
+            'hiring_status': 'unknown',
+            'sales_to_eng_ratio': 1.0
         }
+    
+    # Calculate ratio
+    if eng_count == 0:
+        ratio = 999 if sales_count > 0 else 1.0
+    else:
+        ratio = sales_count / eng_count if eng_count > 0 else 1.0
+    
+    return {
+        'hiring_status': 'active' if (eng_count + sales_count) > 0 else 'frozen',
+        'sales_to_eng_ratio': ratio
+    }
 
 @cached(ttl=3600, key_prefix="careers")  # Cache for 1 hour (hiring pages change frequently)
 async def scrape_careers_page(domain: str) -> Dict[str, Optional[str]]:
     """
     Scrape /careers page to detect hiring activity
     Returns: hiring_status, sales_to_eng_ratio
+    Companies with a Greenhouse/Lever/Ashby/Workable board get exact role counts
+    from its JSON endpoint; otherwise role keywords on the careers page are counted.
     """
+    if is_known_dead(domain):
+        return {
+            'hiring_status': 'unknown',
+            'sales_to_eng_ratio': 1.0
+        }
+    
     async with aiohttp.ClientSession() as session:
+        signal, pages = await get_ats_hiring_signal(domain, session)
+        if signal:
+            return signal
+        
         careers_urls = [
             f"https://{domain}/careers",
-            f"https://{domain}/jobs",
-            f"https://www.{domain}/careers",
-            f"https://www.{domain}/jobs"
+            f"https://{domain}/jobs"
         ]
+        if not pages:
+            # Board lookup came from cache - fetch the careers pages for the keyword count
+            pages = await fetch_pages(session, careers_urls)
         
         for url in careers_urls:
-            try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        soup = BeautifulSoup(content, 'html.parser')
-                        
-                        # Look for job listings
-                        job_keywords = ['engineer', 'developer', 'sales', 'account executive', 'sdr', 'bdr']
-                        job_text = soup.get_text().lower()
-                        
-                        # Count different types of roles
-                        eng_count = sum(1 for kw in ['engineer', 'developer', 'software'] if kw in job_text)
-                        sales_count = sum(1 for kw in ['sales', 'account executive', 'sdr', 'bdr', 'account manager'] if kw in job_text)
-                        
-                        if eng_count == 0 and sales_count == 0:
-                            return {
-                                'hiring_status': 'unknown',
-                                'sales_to_eng_ratio': 1.0
-                            }
-                        
-                        # Calculate ratio
-                        if eng_count == 0:
-                            ratio = 999 if sales_count > 0 else 1.0
-                        else:
-                            ratio = sales_count / eng_count if eng_count > 0 else 1.0
-                        
-                        return {
-                            'hiring_status': 'active' if (eng_count + sales_count) > 0 else 'frozen',
-                            'sales_to_eng_ratio': ratio
-                        }
-            except Exception:
-                continue
+            if pages.get(url):
+                return _keyword_hiring_signal(pages[url])
         
         return {
             'hiring_status': 'unknown',
@@ -330,11 +207,11 @@ async def scrape_yc_batch(batch: str) -> List[Dict]:
                             text = parent.get_text()
                             domain_match = re.search(r'([a-zA-Z0-9-]+\.(?:com|io|ai|co|dev|app))', text)
                             if domain_match:
-                                domain = domain_match.group(1)
+                                domain = canonical_domain(domain_match.group(1))
                         
                         # Fallback: construct domain from company name
                         if not domain:
-                            domain = company_name.lower().replace(' ', '').replace('-', '') + '.com'
+                            domain = guess_domain(company_name)
                         
                         companies.append({
                             'name': company_name,
@@ -379,11 +256,11 @@ async def scrape_yc_batch(batch: str) -> List[Dict]:
                                 text = parent.get_text()
                                 domain_match = re.search(r'([a-zA-Z0-9-]+\.(?:com|io|ai|co|dev|app))', text)
                                 if domain_match:
-                                    domain = domain_match.group(1)
+                                    domain = canonical_domain(domain_match.group(1))
                             
                             # Fallback: construct domain from company name
                             if not domain:
-                                domain = company_name.lower().replace(' ', '').replace('-', '') + '.com'
+                                domain = guess_domain(company_name)
                             
                             companies.append({
                                 'name': company_name,
@@ -451,12 +328,100 @@ async def get_similarweb_data(domain: str) -> Dict[str, float]:
     
     return None
 
-@cached(ttl=86400, key_prefix="wayback")  # Cache for 24 hours (historical data doesn't change)
-async def get_wayback_machine_snapshots(domain: str) -> Dict[str, float]:
+# Wayback history: distinct page versions (CDX collapse=digest) kept per domain
+WAYBACK_MAX_VERSIONS = 200
+
+# Volatility looks at distinct versions per quarter over the last two years
+WAYBACK_WINDOW_DAYS = 91
+WAYBACK_WINDOW_COUNT = 8
+
+# At most this many versions (the latest per changed window) are read for their H1
+WAYBACK_H1_SAMPLE = 5
+
+# Stop streaming an archived page after this many bytes if no </h1> was seen
+WAYBACK_H1_MAX_BYTES = 256 * 1024
+
+_H1_PATTERN = re.compile(r'<h1[^>]*>(.*?)</h1>', re.IGNORECASE | re.DOTALL)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def _wayback_versions(rows: List[List[str]]) -> List[Dict]:
+    """CDX JSON rows (header first) to version dicts, oldest first"""
+    if len(rows) < 2:
+        return []
+    header = rows[0]
+    return [dict(zip(header, row)) for row in rows[1:]]
+
+def _merge_wayback_versions(previous: List[Dict], new: List[Dict]) -> List[Dict]:
+    """Append newer versions, collapsing repeats of the latest digest"""
+    versions = list(previous)
+    last_timestamp = versions[-1]['timestamp'] if versions else ''
+    for version in new:
+        if version.get('timestamp', '') <= last_timestamp:
+            continue
+        if versions and versions[-1].get('digest') == version.get('digest'):
+            continue
+        versions.append({
+            'timestamp': version['timestamp'],
+            'digest': version.get('digest'),
+            'original': version.get('original'),
+            'h1': version.get('h1')
+        })
+        last_timestamp = version['timestamp']
+    return versions[-WAYBACK_MAX_VERSIONS:]
+
+def _wayback_windows(versions: List[Dict]) -> List[List[Dict]]:
+    """Versions grouped into quarterly windows, most recent window first"""
+    from datetime import datetime, timedelta
+    now = datetime.now()
+    windows = [[] for _ in range(WAYBACK_WINDOW_COUNT)]
+    for version in versions:
+        try:
+            captured = datetime.strptime(version['timestamp'][:14], '%Y%m%d%H%M%S')
+        except (KeyError, ValueError):
+            continue
+        index = (now - captured) // timedelta(days=WAYBACK_WINDOW_DAYS)
+        if 0 <= index < WAYBACK_WINDOW_COUNT:
+            windows[index].append(version)
+    return windows
+
+async def _stream_wayback_h1(session: aiohttp.ClientSession, timestamp: str, original: str) -> Optional[str]:
+    """Stream an archived page only until its first </h1> and return the H1 text ('' if none)"""
+    # id_ serves the capture as archived, without the Wayback toolbar markup
+    snapshot_url = f"http://web.archive.org/web/{timestamp}id_/{original}"
+    try:
+        async with session.get(snapshot_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return None
+            buffer = ''
+            received = 0
+            async for chunk in response.content.iter_chunked(8192):
+                received += len(chunk)
+                buffer += chunk.decode('utf-8', errors='ignore')
+                match = _H1_PATTERN.search(buffer)
+                if match:
+                    text = html.unescape(_TAG_PATTERN.sub(' ', match.group(1)))
+                    return ' '.join(text.split()).lower()
+                if received >= WAYBACK_H1_MAX_BYTES:
+                    break
+            return ''
+    except Exception:
+        return None
+
+async def get_wayback_machine_snapshots(domain: str, previous: Optional[Dict] = None) -> Dict[str, float]:
     """
     Get historical snapshots from Wayback Machine (archive.org)
     Returns: h1_volatility, snapshot_count, first_seen_date
+
+    Volatility comes from distinct page versions (CDX collapse=digest) per quarter.
+    H1s are only read when the page changed in more than one window, from the
+    latest version of each changed window, concurrently and streamed up to </h1>.
+    Pass the previous result to fetch only CDX entries newer than its last timestamp.
     """
+    previous = previous or {}
+    versions = list(previous.get('versions') or [])
+    first_seen_date = previous.get('first_seen_date')
+    last_timestamp = previous.get('last_timestamp')
+    
     # Check rate limit
     if not check_rate_limit('wayback'):
         wait_time = get_wait_time('wayback')
@@ -469,56 +434,88 @@ async def get_wayback_machine_snapshots(domain: str) -> Dict[str, float]:
             params = {
                 'url': domain,
                 'output': 'json',
-                'limit': 100,
-                'filter': 'statuscode:200'
+                'fl': 'timestamp,digest,original',
+                'filter': 'statuscode:200',
+                'collapse': 'digest'
             }
+            if last_timestamp:
+                params['from'] = last_timestamp
+            else:
+                # Latest distinct versions only on the first run
+                params['limit'] = -WAYBACK_MAX_VERSIONS
             
             async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    if len(data) > 1:  # First row is headers
-                        snapshot_count = len(data) - 1
-                        
-                        # Extract H1 tags from recent snapshots to check volatility
-                        h1_texts = []
-                        for row in data[1:6]:  # Check last 5 snapshots
-                            timestamp = row[1]
-                            snapshot_url = f"http://web.archive.org/web/{timestamp}/{domain}"
-                            
-                            try:
-                                async with session.get(snapshot_url, timeout=aiohttp.ClientTimeout(total=5)) as snap_resp:
-                                    if snap_resp.status == 200:
-                                        content = await snap_resp.text()
-                                        soup = BeautifulSoup(content, 'html.parser')
-                                        h1_tag = soup.find('h1')
-                                        if h1_tag:
-                                            h1_texts.append(h1_tag.get_text().strip().lower())
-                            except Exception:
-                                continue
-                        
-                        # Calculate H1 volatility (how many unique H1s)
-                        unique_h1s = len(set(h1_texts)) if h1_texts else 0
-                        h1_volatility = unique_h1s - 1 if unique_h1s > 0 else 0
-                        
-                        # First seen date
-                        first_timestamp = data[1][1] if len(data) > 1 else None
-                        first_seen_date = None
-                        if first_timestamp:
-                            from datetime import datetime
-                            try:
-                                first_seen_date = datetime.strptime(first_timestamp[:8], '%Y%m%d').isoformat()
-                            except Exception:
-                                pass
-                        
-                        return {
-                            'h1_volatility': h1_volatility,
-                            'snapshot_count': snapshot_count,
-                            'first_seen_date': first_seen_date
-                        }
+                if response.status != 200:
+                    raise Exception(f"CDX status {response.status}")
+                new_versions = _wayback_versions(await response.json(content_type=None))
+            
+            versions = _merge_wayback_versions(versions, new_versions)
+            if not versions:
+                return {
+                    'h1_volatility': 0,
+                    'snapshot_count': 0,
+                    'first_seen_date': None
+                }
+            
+            # First seen date
+            if not first_seen_date:
+                first_timestamp = versions[0]['timestamp']
+                if len(new_versions) >= WAYBACK_MAX_VERSIONS:
+                    # History was truncated - ask for the oldest capture
+                    async with session.get(url, params={'url': domain, 'output': 'json', 'fl': 'timestamp', 'limit': 1},
+                                           timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        if response.status == 200:
+                            rows = await response.json(content_type=None)
+                            if len(rows) > 1:
+                                first_timestamp = rows[1][0]
+                from datetime import datetime
+                try:
+                    first_seen_date = datetime.strptime(first_timestamp[:8], '%Y%m%d').isoformat()
+                except Exception:
+                    pass
+            
+            windows = _wayback_windows(versions)
+            versions_by_window = [len(window) for window in windows]
+            changed_windows = sum(1 for count in versions_by_window if count)
+            digest_volatility = min(max(changed_windows - 1, 0), 3)
+            
+            # Page stable across windows - no need to read any H1
+            h1_volatility = 0
+            h1_sampled = 0
+            if changed_windows > 1:
+                sample = [window[-1] for window in windows if window][:WAYBACK_H1_SAMPLE]
+                to_fetch = [version for version in sample if version.get('h1') is None]
+                h1_results = await asyncio.gather(*[
+                    _stream_wayback_h1(session, version['timestamp'], version.get('original') or domain)
+                    for version in to_fetch
+                ])
+                for version, h1_text in zip(to_fetch, h1_results):
+                    version['h1'] = h1_text
+                
+                h1_texts = [version['h1'] for version in sample if version.get('h1')]
+                h1_sampled = len(h1_texts)
+                if h1_texts:
+                    # Calculate H1 volatility (how many unique H1s)
+                    h1_volatility = len(set(h1_texts)) - 1
+                else:
+                    h1_volatility = digest_volatility
+            
+            return {
+                'h1_volatility': h1_volatility,
+                'snapshot_count': len(versions),
+                'first_seen_date': first_seen_date,
+                'digest_volatility': digest_volatility,
+                'versions_by_window': versions_by_window,
+                'h1_sampled': h1_sampled,
+                'last_timestamp': versions[-1]['timestamp'],
+                'versions': versions
+            }
         except Exception as e:
             print(f"Wayback Machine API error: {e}")
     
+    if previous:
+        # Keep the stored history rather than resetting it on a failed refresh
+        return previous
     return {
         'h1_volatility': 0,
         'snapshot_count': 0,
@@ -0,0 +1,208 @@
+"""
+Celerio Scout - Page Discovery
+Finds a company's about/team/press/careers/pricing pages from robots.txt, its
+sitemap and the homepage's own links, once per domain, so enrichers only
+request pages that exist instead of guessing paths
+"""
+import re
+import asyncio
+import aiohttp
+from html import unescape
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+from cache import get_cache, set_cache
+from domain_health import get_domain_health, is_known_dead
+
+# Path segments that identify a page's purpose
+PAGE_PURPOSES = {
+    'careers': ['careers', 'career', 'jobs', 'join-us', 'join', 'work-with-us', 'hiring', 'open-positions'],
+    'pricing': ['pricing', 'plans', 'price'],
+    'team': ['team', 'our-team', 'leadership', 'founders', 'people'],
+    'press': ['press', 'news', 'newsroom', 'media', 'press-releases', 'announcements', 'blog'],
+    'about': ['about', 'about-us', 'company', 'who-we-are', 'our-story', 'mission']
+}
+
+# Site maps are stable - rediscover weekly; unreachable sites are retried sooner
+PAGE_MAP_TTL = 7 * 86400
+EMPTY_PAGE_MAP_TTL = 86400
+
+# Pages kept per purpose (shallowest paths first)
+MAX_PAGES_PER_PURPOSE = 3
+
+# Child sitemaps read from a sitemap index, and bytes read per sitemap
+MAX_CHILD_SITEMAPS = 3
+MAX_SITEMAP_BYTES = 2 * 1024 * 1024
+
+_HREF = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\'#]+)', re.IGNORECASE)
+_LOC = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>', re.IGNORECASE)
+_SITEMAP_LINE = re.compile(r'^\s*sitemap\s*:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+# Leading locale segment (/en/, /en-us/) ignored when classifying
+_LOCALE = re.compile(r'^[a-z]{2}(?:[-_][a-z]{2})?$')
+_SEGMENT_PURPOSE = {
+    segment: purpose
+    for purpose, segments in PAGE_PURPOSES.items()
+    for segment in segments
+}
+
+
+def classify_url(url: str) -> Optional[str]:
+    """Purpose of a page from its path ('about', 'team', 'press', 'careers', 'pricing' or None)"""
+    segments = [segment for segment in urlparse(url).path.lower().split('/') if segment]
+    if segments and _LOCALE.match(segments[0]):
+        segments = segments[1:]
+    # Only the first two segments count; the deeper one is more specific (/company/team is team)
+    purpose = None
+    for segment in segments[:2]:
+        purpose = _SEGMENT_PURPOSE.get(segment.rsplit('.', 1)[0]) or purpose
+    return purpose
+
+
+def _same_site(url: str, domain: str) -> bool:
+    host = (urlparse(url).hostname or '').lower()
+    domain = domain.lower()
+    return host == domain or host.endswith('.' + domain)
+
+
+def classify_urls(urls: List[str], domain: str, robots: Optional[RobotFileParser] = None) -> Dict[str, List[str]]:
+    """Same-site URLs grouped by purpose, shallowest paths first"""
+    pages: Dict[str, List[str]] = {}
+    for url in dict.fromkeys(urls):
+        if not _same_site(url, domain):
+            continue
+        if robots is not None and not robots.can_fetch('*', url):
+            continue
+        purpose = classify_url(url)
+        if purpose:
+            pages.setdefault(purpose, []).append(url.split('?')[0].rstrip('/'))
+
+    def depth(url: str):
+        path = urlparse(url).path.strip('/')
+        return path.count('/'), len(path)
+
+    return {
+        purpose: sorted(dict.fromkeys(urls), key=depth)[:MAX_PAGES_PER_PURPOSE]
+        for purpose, urls in pages.items()
+    }
+
+
+def links_from_html(html: str, base_url: str) -> List[str]:
+    """Absolute URLs of the page's links"""
+    return [urljoin(base_url, unescape(href.strip())) for href in _HREF.findall(html or '')]
+
+
+def pages_for(site_map: Optional[Dict], purposes: List[str], limit: Optional[int] = None) -> List[str]:
+    """Discovered page URLs for some purposes, in purpose order"""
+    urls = []
+    for purpose in purposes:
+        urls.extend((site_map or {}).get('pages', {}).get(purpose, []))
+    urls = list(dict.fromkeys(urls))
+    return urls[:limit] if limit is not None else urls
+
+
+async def _fetch_text(session: aiohttp.ClientSession, url: str, timeout: int, max_bytes: Optional[int] = None):
+    """(final url, text) for a 200 response, else (None, None)"""
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                return None, None
+            if max_bytes:
+                body = await response.content.read(max_bytes)
+                return str(response.url), body.decode(response.charset or 'utf-8', errors='replace')
+            return str(response.url), await response.text()
+    except Exception as e:
+        get_domain_health().record_fetch_error(url, e)
+        return None, None
+
+
+async def _read_sitemaps(session: aiohttp.ClientSession, sitemap_urls: List[str], timeout: int,
+                         first: Optional[str] = None) -> List[str]:
+    """Page URLs from sitemaps, following one level of sitemap index"""
+    texts = [first] if first else []
+    fetched = await asyncio.gather(*[
+        _fetch_text(session, url, timeout, MAX_SITEMAP_BYTES) for url in sitemap_urls
+    ])
+    texts.extend(text for _, text in fetched if text)
+
+    urls, children = [], []
+    for text in texts:
+        locs = _LOC.findall(text)
+        if '<sitemapindex' in text.lower():
+            children.extend(locs)
+        else:
+            urls.extend(locs)
+
+    if children:
+        # Page sitemaps first (skip product/blog-post sitemaps when there are many)
+        children.sort(key=lambda url: 0 if re.search(r'page|main|site', url, re.IGNORECASE) else 1)
+        fetched = await asyncio.gather(*[
+            _fetch_text(session, url, timeout, MAX_SITEMAP_BYTES) for url in children[:MAX_CHILD_SITEMAPS]
+        ])
+        for _, text in fetched:
+            if text:
+                urls.extend(_LOC.findall(text))
+    return [unescape(url) for url in urls]
+
+
+async def discover_pages(domain: str, session: Optional[aiohttp.ClientSession] = None, timeout: int = 5) -> Dict:
+    """
+    Site map of a domain: {'homepage': final homepage URL or None, 'pages': {purpose: [urls]},
+    'sources': where pages were found}. Cached per domain.
+    """
+    cache_key = f"site_map:{domain}"
+    cached = get_cache(cache_key)
+    if cached is not None:
+        return cached
+    if is_known_dead(domain):
+        return {'homepage': None, 'pages': {}, 'sources': {'nav_links': 0, 'sitemap_urls': 0, 'robots': False}}
+
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession()
+    try:
+        base_url = f"https://{domain}"
+        # Homepage, robots.txt and the default sitemap in parallel
+        (homepage_url, homepage), (_, robots_txt), (_, default_sitemap) = await asyncio.gather(
+            _fetch_text(session, base_url, timeout),
+            _fetch_text(session, f"{base_url}/robots.txt", timeout),
+            _fetch_text(session, f"{base_url}/sitemap.xml", timeout, MAX_SITEMAP_BYTES)
+        )
+
+        robots = None
+        sitemap_urls = []
+        if robots_txt:
+            robots = RobotFileParser()
+            robots.parse(robots_txt.splitlines())
+            sitemap_urls = [url for url in _SITEMAP_LINE.findall(robots_txt)
+                            if url.rstrip('/') != f"{base_url}/sitemap.xml"]
+
+        if homepage is None:
+            # Only the www host answers
+            homepage_url, homepage = await _fetch_text(session, f"https://www.{domain}", timeout)
+
+        nav_links = links_from_html(homepage, homepage_url) if homepage else []
+        has_default_sitemap = bool(default_sitemap) and '<loc>' in default_sitemap.lower()
+        sitemap_links = []
+        if has_default_sitemap or sitemap_urls:
+            sitemap_links = await _read_sitemaps(
+                session, sitemap_urls, timeout, default_sitemap if has_default_sitemap else None
+            )
+
+        # Homepage links first, so they win ties with sitemap entries of the same depth
+        pages = classify_urls(nav_links + sitemap_links, domain, robots)
+
+        site_map = {
+            'homepage': homepage_url,
+            'pages': pages,
+            'sources': {
+                'nav_links': len(nav_links),
+                'sitemap_urls': len(sitemap_links),
+                'robots': robots_txt is not None
+            }
+        }
+        reachable = homepage_url is not None or bool(sitemap_links)
+        set_cache(cache_key, site_map, PAGE_MAP_TTL if reachable else EMPTY_PAGE_MAP_TTL)
+        return site_map
+    finally:
+        if own_session:
+            await session.close()
@@ -4,11 +4,12 @@ Scrapes VC portfolios and integrates with main system
 """
 import json
 import asyncio
+import time
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 import re
 import aiohttp
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
 
 try:
     from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
@@ -24,14 +25,27 @@ except ImportError:
     BrowserScraper = None
 
 from bs4 import BeautifulSoup
+from scrape_strategy import StrategyProfileStore
+from portfolio_templates import TemplateStore, learn_template, apply_template, yield_changed_materially
+from portfolio_snapshots import PortfolioSnapshotStore, page_fingerprint
+from domain_resolver import get_domain_resolver
+from domain_canonical import get_domain_canonicalizer
 
 
 class PortfolioScraper:
     """Scrapes VC portfolio pages and extracts company information"""
     
-    def __init__(self):
+    def __init__(self, db_conn=None):
         self.seed_data_path = Path("data/seed_data.json")
         self.session = None
+        # Per-portfolio fetch strategy memory (persisted when a DB connection is given)
+        self.strategy_store = StrategyProfileStore(db_conn)
+        # Learned extraction templates for generic portfolio pages
+        self.template_store = TemplateStore(db_conn)
+        # Last fingerprint and company set per portfolio for incremental scrapes
+        self.snapshot_store = PortfolioSnapshotStore(db_conn)
+        # Shared name -> domain resolution (persisted when a DB connection is given)
+        self.domain_resolver = get_domain_resolver(db_conn)
     
     async def _get_session(self):
         """Get or create aiohttp session"""
@@ -40,19 +54,8 @@ class PortfolioScraper:
         return self.session
     
     async def _extract_domain_from_url(self, url: str) -> Optional[str]:
-        """Extract domain from a URL"""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path
-            # Remove www. prefix
-            domain = domain.replace('www.', '')
-            # Remove trailing slashes and paths
-            domain = domain.split('/')[0]
-            if domain and '.' in domain:
-                return domain.lower()
-        except:
-            pass
-        return None
+        """Canonical domain of a URL (host without www., subdomains kept, known redirects followed)"""
+        return get_domain_canonicalizer().canonicalize(url)
     
     async def _validate_domain(self, domain: str) -> bool:
         """Validate that a domain exists and is reachable"""
@@ -64,80 +67,19 @@ class PortfolioScraper:
             return False
         
         try:
-            session = await self._get_session()
-            # Try https first (most common)
-            try:
-                async with session.get(
-                    f"https://{domain}",
-                    timeout=aiohttp.ClientTimeout(total=3),
-                    allow_redirects=True,
-                    ssl=False
-                ) as response:
-                    if response.status < 400:
-                        return True
-            except:
-                # Try http as fallback
-                try:
-                    async with session.get(
-                        f"http://{domain}",
-                        timeout=aiohttp.ClientTimeout(total=3),
-                        allow_redirects=True
-                    ) as response:
-                        if response.status < 400:
-                            return True
-                except:
-                    pass
+            return await self.domain_resolver.probe(await self._get_session(), domain)
         except Exception:
-            # If validation fails, we'll still try the domain
-            pass
-        return False
+            return False
     
     async def _discover_domain_from_name(self, company_name: str) -> Optional[str]:
         """Try to discover domain from company name using multiple heuristics"""
         if not company_name or len(company_name) < 2:
             return None
         
-        # Clean company name - remove special chars but keep hyphens/spaces for now
-        clean_name = re.sub(r'[^\w\s-]', '', company_name.lower().strip())
-        # Remove extra spaces but keep single spaces/hyphens
-        clean_name = re.sub(r'\s+', ' ', clean_name).strip()
-        
-        # Generate potential domains in order of likelihood
-        potential_domains = []
-        
-        # Strategy 1: Direct name with .com (most common)
-        no_spaces = clean_name.replace(' ', '').replace('-', '')
-        potential_domains.append(f"{no_spaces}.com")
-        
-        # Strategy 2: With hyphens (common for multi-word companies)
-        with_hyphens = clean_name.replace(' ', '-')
-        potential_domains.append(f"{with_hyphens}.com")
-        
-        # Strategy 3: Common TLDs for startups
-        for tld in ['.io', '.ai', '.co']:
-            potential_domains.append(f"{no_spaces}{tld}")
-            potential_domains.append(f"{with_hyphens}{tld}")
-        
-        # Strategy 4: Less common TLDs
-        for tld in ['.app', '.tech', '.dev']:
-            potential_domains.append(f"{no_spaces}{tld}")
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_domains = []
-        for domain in potential_domains:
-            if domain not in seen:
-                seen.add(domain)
-                unique_domains.append(domain)
-        
-        # Try validating domains (limit to top 8 to avoid too many requests)
-        for domain in unique_domains[:8]:
-            if await self._validate_domain(domain):
-                return domain
-        
-        # If validation fails, return the most likely candidate anyway (.com)
+        # Candidates are probed concurrently and results (misses included) are remembered;
+        # if nothing answers, return the most likely candidate anyway (.com)
         # This allows the system to try analyzing it even if validation was slow/failed
-        return f"{no_spaces}.com" if no_spaces else None
+        return await self.domain_resolver.resolve_or_guess(company_name, await self._get_session())
     
     def get_available_portfolios(self, db_conn=None) -> List[Dict]:
         """Get list of available portfolios from database or seed data"""
@@ -187,171 +129,301 @@ class PortfolioScraper:
         Returns list of company dictionaries
         
         Strategy:
-        1. Try Playwright browser automation (best for JavaScript-heavy sites)
-        2. Fall back to crawl4ai if Playwright unavailable
-        3. Fall back to HTTP requests if both fail
+        1. If this portfolio has a stored strategy profile, start with the strategy that
+           worked last time and only escalate when the yield drops
+        2. Otherwise try Playwright browser automation (best for JavaScript-heavy sites),
+           then crawl4ai, then plain HTTP requests
         """
-        companies = []
-        html_content = None
-        technical_details = {}
+        companies, _ = await self._scrape_portfolio_pages(firm_name, url)
+        return companies
+    
+    async def scrape_portfolio_incremental(self, firm_name: str, url: str, firm_type: str = "VC") -> Dict:
+        """
+        Scrape a portfolio and compare it with the last snapshot
+        Returns {'status': 'new'|'changed'|'unchanged'|'partial'|'failed', 'companies', 'added', 'removed'}
+        
+        Pages whose fingerprint matches the snapshot are not re-extracted, and only
+        added/removed companies need to go to enrichment and scoring. A new or changed
+        result carries a staged 'snapshot'; pass it to self.snapshot_store.commit_snapshot()
+        once the added companies are stored.
+        """
+        snapshot = self.snapshot_store.get_snapshot(url)
+        profile = self.strategy_store.get_profile(url)
+        companies, details = await self._scrape_portfolio_pages(firm_name, url, snapshot)
+        
+        if details.get('unchanged'):
+            print(f"{firm_name} unchanged since last scrape ({len(companies)} companies)")
+            return self.snapshot_store.unchanged_result(url)
+        
+        if not companies:
+            return {'status': 'failed', 'companies': [], 'added': [], 'removed': []}
+        
+        if not self.strategy_store.is_yield_acceptable(profile, len(companies)):
+            # A partial scrape would report everything it missed as removed - keep the
+            # previous snapshot and only pass on companies that are new
+            added = self.snapshot_store.diff(snapshot, companies)[0] if snapshot else list(companies)
+            print(f"{firm_name}: low yield ({len(companies)} companies), snapshot kept")
+            return {'status': 'partial', 'companies': companies, 'added': added, 'removed': []}
         
-        # Strategy 1: Try Playwright browser automation (most reliable for JS-heavy sites)
+        result = self.snapshot_store.stage_snapshot(
+            url, firm_name, details.get('content_hash'), details.get('strategy'), companies
+        )
+        print(f"{firm_name}: {len(result['added'])} added, {len(result['removed'])} removed")
+        return result
+    
+    async def _scrape_portfolio_pages(self, firm_name: str, url: str, snapshot: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
+        """Run the fetch strategy cascade and return (companies, details of the winning fetch)"""
+        profile = self.strategy_store.get_profile(url)
+        
+        available = []
         if PLAYWRIGHT_AVAILABLE and BrowserScraper:
-            try:
-                print(f"Using Playwright browser automation for {firm_name}...")
-                # Determine wait selectors based on firm
-                wait_selectors = []
-                if firm_name == "Y Combinator":
-                    wait_selectors = ['.company-card', '[class*="Company"]', 'a[href*="/companies/"]']
-                elif firm_name == "Antler":
-                    wait_selectors = ['.portfolio-item', '[class*="company"]']
-                elif firm_name == "NFX":
-                    wait_selectors = ['.company', '[class*="portfolio"]']
-                
-                async with BrowserScraper() as browser_scraper:
-                    result = await browser_scraper.scrape_with_browser(
-                        url=url,
-                        wait_selectors=wait_selectors if wait_selectors else None,
-                        wait_timeout=60000,
-                        extract_technical_details=True
-                    )
-                    
-                    if result.get('success') and result.get('companies'):
-                        companies = result['companies']
-                        html_content = result.get('html')
-                        technical_details = result.get('technical_details', {})
-                        print(f"Playwright extracted {len(companies)} companies from {firm_name}")
-                        print(f"Technical details: Framework={technical_details.get('framework')}, "
-                              f"Rendering={technical_details.get('rendering_method')}")
-                        
-                        # Ensure all companies have domains using discovery
-                        for company in companies:
-                            if not company.get('domain'):
-                                domain = await self._discover_domain_from_name(company.get('name', ''))
-                                if domain:
-                                    company['domain'] = domain
-                                    print(f"Discovered domain for {company.get('name')}: {domain}")
-                        
-                        # If we got companies, return them (don't need to parse HTML)
-                        if companies:
-                            return companies
-            except Exception as e:
-                print(f"Playwright error for {firm_name}: {e}, trying crawl4ai...")
+            available.append('playwright')
+        if CRAWL4AI_AVAILABLE:
+            available.append('crawl4ai')
+        available.append('http')
         
-        # Strategy 2: Try crawl4ai (for JavaScript-heavy sites)
-        if CRAWL4AI_AVAILABLE and not companies:
-            try:
-                browser_config = BrowserConfig(
-                    headless=True,
-                    verbose=False
-                )
-                
-                crawler_config = CrawlerRunConfig(
-                    wait_for_images=False,
-                    process_iframes=False,
-                    screenshot=False,
-                    wait_for="domcontentloaded",  # Faster than networkidle
-                    page_timeout=60000  # 60 seconds
+        strategies = self.strategy_store.plan_strategies(profile, available)
+        if profile:
+            print(f"Strategy profile for {firm_name}: best={profile.get('best_strategy')}, "
+                  f"rendering={profile.get('rendering_method')}, typical={profile.get('typical_company_count')} companies")
+        
+        best_companies = []
+        best_strategy = None
+        best_details = {}
+        best_duration_ms = 0
+        
+        for strategy in strategies:
+            started = time.monotonic()
+            companies, technical_details = await self._scrape_with_strategy(strategy, firm_name, url, profile, snapshot)
+            duration_ms = int((time.monotonic() - started) * 1000)
+            technical_details['strategy'] = strategy
+            
+            if technical_details.get('unchanged'):
+                # Page fingerprint matches the snapshot - nothing to re-extract
+                return companies, technical_details
+            
+            if len(companies) > len(best_companies):
+                best_companies = companies
+                best_strategy = strategy
+                best_details = technical_details
+                best_duration_ms = duration_ms
+            
+            if self.strategy_store.is_yield_acceptable(profile, len(companies)):
+                break
+            
+            if companies:
+                print(f"{strategy} yielded {len(companies)} companies for {firm_name} "
+                      f"(typical: {profile.get('typical_company_count')}), escalating...")
+        
+        if best_companies:
+            self.strategy_store.record_success(
+                url, firm_name, best_strategy, len(best_companies), best_duration_ms, best_details
+            )
+        elif profile:
+            self.strategy_store.record_failure(url, firm_name, profile.get('best_strategy'))
+        
+        return best_companies, best_details
+    
+    async def _scrape_with_strategy(
+        self,
+        strategy: str,
+        firm_name: str,
+        url: str,
+        profile: Optional[Dict] = None,
+        snapshot: Optional[Dict] = None
+    ) -> Tuple[List[Dict], Dict]:
+        """Run a single fetch strategy and return (companies, technical_details)"""
+        if strategy == 'playwright':
+            return await self._scrape_with_playwright(firm_name, url, profile, snapshot)
+        
+        if strategy == 'crawl4ai':
+            html_content = await self._fetch_html_with_crawl4ai(firm_name, url)
+        else:
+            html_content = await self._fetch_html_with_http(firm_name, url)
+        
+        if not html_content:
+            return [], {}
+        
+        content_hash = page_fingerprint(html_content)
+        if self.snapshot_store.matches(snapshot, content_hash, strategy):
+            return snapshot['companies'], {'content_hash': content_hash, 'unchanged': True}
+        
+        return await self._parse_portfolio_html(html_content, firm_name, url), {'content_hash': content_hash}
+    
+    async def _scrape_with_playwright(
+        self,
+        firm_name: str,
+        url: str,
+        profile: Optional[Dict] = None,
+        snapshot: Optional[Dict] = None
+    ) -> Tuple[List[Dict], Dict]:
+        """Scrape with Playwright browser automation (most reliable for JS-heavy sites)"""
+        try:
+            print(f"Using Playwright browser automation for {firm_name}...")
+            # Determine wait selectors based on firm
+            wait_selectors = []
+            if firm_name == "Y Combinator":
+                wait_selectors = ['.company-card', '[class*="Company"]', 'a[href*="/companies/"]']
+            elif firm_name == "Antler":
+                wait_selectors = ['.portfolio-item', '[class*="company"]']
+            elif firm_name == "NFX":
+                wait_selectors = ['.company', '[class*="portfolio"]']
+            elif profile and profile.get('matched_selectors'):
+                # Reuse selectors that matched on the previous run
+                wait_selectors = list(profile['matched_selectors'].values())
+            
+            async with BrowserScraper() as browser_scraper:
+                result = await browser_scraper.scrape_with_browser(
+                    url=url,
+                    wait_selectors=wait_selectors if wait_selectors else None,
+                    wait_timeout=60000,
+                    extract_technical_details=True
                 )
                 
-                async with AsyncWebCrawler(config=browser_config) as crawler:
-                    result = await crawler.arun(url=url, config=crawler_config)
+                if result.get('success') and result.get('companies'):
+                    companies = result['companies']
+                    technical_details = dict(result.get('technical_details', {}))
+                    technical_details['content_hash'] = page_fingerprint(result.get('html'))
                     
-                    if result.success and result.html:
-                        html_content = result.html
-            except Exception as e:
-                print(f"Crawl4AI error for {firm_name}: {e}, trying fallback...")
-        
-        # Fallback to regular HTTP request if crawl4ai failed or unavailable
-        if not html_content:
-            try:
-                session = await self._get_session()
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5'
-                }
-                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30), allow_redirects=True) as response:
-                    if response.status == 200:
-                        html_content = await response.text(encoding='utf-8', errors='ignore')
-                    elif response.status == 404:
-                        # Try alternative URLs for known VCs
-                        print(f"404 for {firm_name} at {url}, trying alternatives...")
-                        alternative_urls = {
-                            'NFX': ['https://www.nfx.com/', 'https://www.nfx.com/companies'],
-                            'Y Combinator': ['https://www.ycombinator.com/companies'],
-                        }
-                        if firm_name in alternative_urls:
-                            for alt_url in alternative_urls[firm_name]:
-                                try:
-                                    async with session.get(alt_url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as alt_resp:
-                                        if alt_resp.status == 200:
-                                            html_content = await alt_resp.text(encoding='utf-8', errors='ignore')
-                                            print(f"Found content at {alt_url}")
-                                            break
-                                except:
-                                    continue
-                        if not html_content:
-                            print(f"HTTP error {response.status} for {firm_name} - no alternatives worked")
-                            return []
-                    else:
-                        print(f"HTTP error {response.status} for {firm_name}")
-                        return []
-            except Exception as e:
-                print(f"Error fetching {firm_name}: {e}")
-                return []
+                    if self.snapshot_store.matches(snapshot, technical_details['content_hash'], 'playwright'):
+                        # Rendered page is unchanged - skip domain discovery for every company
+                        technical_details['unchanged'] = True
+                        return snapshot['companies'], technical_details
+                    print(f"Playwright extracted {len(companies)} companies from {firm_name}")
+                    print(f"Technical details: Framework={technical_details.get('framework')}, "
+                          f"Rendering={technical_details.get('rendering_method')}")
+                    
+                    # Ensure all companies have domains using discovery
+                    for company in companies:
+                        if not company.get('domain'):
+                            domain = await self._discover_domain_from_name(company.get('name', ''))
+                            if domain:
+                                company['domain'] = domain
+                                print(f"Discovered domain for {company.get('name')}: {domain}")
+                    
+                    return companies, technical_details
+        except Exception as e:
+            print(f"Playwright error for {firm_name}: {e}")
         
-        # Parse HTML and extract companies
-        if html_content:
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
+        return [], {}
+    
+    async def _fetch_html_with_crawl4ai(self, firm_name: str, url: str) -> Optional[str]:
+        """Fetch rendered HTML with crawl4ai (for JavaScript-heavy sites)"""
+        try:
+            browser_config = BrowserConfig(
+                headless=True,
+                verbose=False
+            )
+            
+            crawler_config = CrawlerRunConfig(
+                wait_for_images=False,
+                process_iframes=False,
+                screenshot=False,
+                wait_for="domcontentloaded",  # Faster than networkidle
+                page_timeout=60000  # 60 seconds
+            )
+            
+            async with AsyncWebCrawler(config=browser_config) as crawler:
+                result = await crawler.arun(url=url, config=crawler_config)
                 
-                # Special handling for known portfolio structures
-                if firm_name == "Y Combinator":
-                    # Try using the existing YC batch scraper first (more reliable)
-                    try:
-                        from osint_sources import scrape_yc_batch
-                        # Extract batch from URL or use recent batches
-                        batch_match = re.search(r'batch=([WS]\d+)', url)
-                        if batch_match:
-                            batch = batch_match.group(1)
-                            print(f"Using YC batch scraper for batch {batch}")
-                            batch_companies = await scrape_yc_batch(batch)
-                            if batch_companies:
-                                companies = batch_companies
-                            else:
-                                companies = await self._scrape_yc_portfolio(soup, url)
-                        else:
-                            # Try multiple recent batches
-                            print("Scraping multiple YC batches...")
-                            # ALL batches from 2005-2025
-                            all_batches = []
-                            for year in range(2005, 2025):
-                                all_batches.extend([f'W{str(year)[-2:]}', f'S{str(year)[-2:]}'])
-                            all_companies = []
-                            for batch in all_batches:  # NO LIMIT - scrape ALL batches
-                                try:
-                                    batch_companies = await scrape_yc_batch(batch)
-                                    all_companies.extend(batch_companies)
-                                except:
-                                    continue
-                            if all_companies:
-                                companies = all_companies
-                            else:
-                                companies = await self._scrape_yc_portfolio(soup, url)
-                    except Exception as e:
-                        print(f"YC batch scraper failed, using fallback: {e}")
-                        companies = await self._scrape_yc_portfolio(soup, url)
-                elif firm_name == "NFX":
-                    companies = await self._scrape_nfx_portfolio(soup, url)
-                elif firm_name == "Antler":
-                    companies = await self._scrape_antler_portfolio(soup, url)
+                if result.success and result.html:
+                    return result.html
+        except Exception as e:
+            print(f"Crawl4AI error for {firm_name}: {e}")
+        
+        return None
+    
+    async def _fetch_html_with_http(self, firm_name: str, url: str) -> Optional[str]:
+        """Fetch HTML with a regular HTTP request"""
+        html_content = None
+        try:
+            session = await self._get_session()
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5'
+            }
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30), allow_redirects=True) as response:
+                if response.status == 200:
+                    html_content = await response.text(encoding='utf-8', errors='ignore')
+                elif response.status == 404:
+                    # Try alternative URLs for known VCs
+                    print(f"404 for {firm_name} at {url}, trying alternatives...")
+                    alternative_urls = {
+                        'NFX': ['https://www.nfx.com/', 'https://www.nfx.com/companies'],
+                        'Y Combinator': ['https://www.ycombinator.com/companies'],
+                    }
+                    if firm_name in alternative_urls:
+                        for alt_url in alternative_urls[firm_name]:
+                            try:
+                                async with session.get(alt_url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as alt_resp:
+                                    if alt_resp.status == 200:
+                                        html_content = await alt_resp.text(encoding='utf-8', errors='ignore')
+                                        print(f"Found content at {alt_url}")
+                                        break
+                            except:
+                                continue
+                    if not html_content:
+                        print(f"HTTP error {response.status} for {firm_name} - no alternatives worked")
                 else:
-                    # Generic scraping for other portfolios
-                    companies = await self._scrape_generic_portfolio(soup, url, firm_name)
-            except Exception as e:
-                print(f"Error parsing HTML for {firm_name}: {e}")
-                return []
+                    print(f"HTTP error {response.status} for {firm_name}")
+        except Exception as e:
+            print(f"Error fetching {firm_name}: {e}")
+        
+        return html_content
+    
+    async def _parse_portfolio_html(self, html_content: str, firm_name: str, url: str) -> List[Dict]:
+        """Parse portfolio HTML and extract companies"""
+        companies = []
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            
+            # Special handling for known portfolio structures
+            if firm_name == "Y Combinator":
+                # Try using the existing YC batch scraper first (more reliable)
+                try:
+                    from osint_sources import scrape_yc_batch
+                    # Extract batch from URL or use recent batches
+                    batch_match = re.search(r'batch=([WS]\d+)', url)
+                    if batch_match:
+                        batch = batch_match.group(1)
+                        print(f"Using YC batch scraper for batch {batch}")
+                        batch_companies = await scrape_yc_batch(batch)
+                        if batch_companies:
+                            companies = batch_companies
+                        else:
+                            companies = await self._scrape_yc_portfolio(soup, url)
+                    else:
+                        # Try multiple recent batches
+                        print("Scraping multiple YC batches...")
+                        # ALL batches from 2005-2025
+                        all_batches = []
+                        for year in range(2005, 2025):
+                            all_batches.extend([f'W{str(year)[-2:]}', f'S{str(year)[-2:]}'])
+                        all_companies = []
+                        for batch in all_batches:  # NO LIMIT - scrape ALL batches
+                            try:
+                                batch_companies = await scrape_yc_batch(batch)
+                                all_companies.extend(batch_companies)
+                            except:
+                                continue
+                        if all_companies:
+                            companies = all_companies
+                        else:
+                            companies = await self._scrape_yc_portfolio(soup, url)
+                except Exception as e:
+                    print(f"YC batch scraper failed, using fallback: {e}")
+                    companies = await self._scrape_yc_portfolio(soup, url)
+            elif firm_name == "NFX":
+                companies = await self._scrape_nfx_portfolio(soup, url)
+            elif firm_name == "Antler":
+                companies = await self._scrape_antler_portfolio(soup, url)
+            else:
+                # Generic scraping for other portfolios
+                companies = await self._scrape_generic_portfolio(soup, url, firm_name)
+        except Exception as e:
+            print(f"Error parsing HTML for {firm_name}: {e}")
+            return []
         
         return companies
     
@@ -839,6 +911,47 @@ class PortfolioScraper:
         return companies
     
     async def _scrape_generic_portfolio(self, soup: BeautifulSoup, url: str, firm_name: str) -> List[Dict]:
+        """Generic portfolio scraping - learned template first, broad heuristics as fallback"""
+        companies = await self._scrape_with_template(soup, url, firm_name)
+        if companies:
+            return companies
+        return await self._scrape_generic_heuristics(soup, url, firm_name)
+    
+    async def _scrape_with_template(self, soup: BeautifulSoup, url: str, firm_name: str) -> List[Dict]:
+        """
+        Apply the stored extraction template for this VC.
+        The template is (re-)learned on first scrape or when its yield changes materially.
+        """
+        source = firm_name.lower().replace(' ', '_')
+        companies = []
+        
+        template = self.template_store.get_template(firm_name)
+        if template:
+            companies = apply_template(soup, template, source)
+            if companies and not yield_changed_materially(template, len(companies)):
+                self.template_store.record_applied(firm_name, len(companies))
+                print(f"Template for {firm_name} extracted {len(companies)} companies")
+                return await self._fill_missing_domains(companies)
+            print(f"Template for {firm_name} yielded {len(companies)} companies "
+                  f"(learned: {template.get('record_count')}), re-learning...")
+        
+        learned = learn_template(soup, url)
+        if learned:
+            learned_companies = apply_template(soup, learned, source)
+            if len(learned_companies) >= len(companies):
+                self.template_store.save_template(firm_name, learned, len(learned_companies))
+                print(f"Learned template for {firm_name}: {learned['record_selector']} "
+                      f"({len(learned_companies)} companies)")
+                companies = learned_companies
+        
+        return await self._fill_missing_domains(companies)
+    
+    async def _fill_missing_domains(self, companies: List[Dict]) -> List[Dict]:
+        """Discover domains for companies extracted without a website link (all names probed at once)"""
+        await self.domain_resolver.resolve_companies(companies, await self._get_session())
+        return companies
+    
+    async def _scrape_generic_heuristics(self, soup: BeautifulSoup, url: str, firm_name: str) -> List[Dict]:
         """Generic portfolio scraping with domain extraction"""
         companies = []
         seen_companies = set()
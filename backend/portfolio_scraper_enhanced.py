@@ -4,7 +4,7 @@ Generic scraper that adapts to different portfolio websites
 """
 import asyncio
 import json
-from typing import List, Dict, Optional, Set, Callable
+from typing import List, Dict, Optional, Set, Callable, Any, Tuple
 import re
 from urllib.parse import urlparse
 from datetime import datetime
@@ -16,6 +16,13 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 from bs4 import BeautifulSoup
+from domain_resolver import GUESSED_DOMAIN_KEY, get_domain_resolver, guess_domain
+
+# Field names used by portfolio list APIs (Algolia, Webflow CMS, custom JSON endpoints)
+API_NAME_KEYS = ('name', 'company_name', 'companyName')
+API_WEBSITE_KEYS = ('website', 'website_url', 'websiteUrl', 'url', 'domain', 'homepage', 'company_url')
+# Fields only company records carry - a generic 'url' alone also matches blog posts and nav items
+API_COMPANY_KEYS = ('website', 'website_url', 'websiteUrl', 'domain', 'homepage', 'company_url', 'batch')
 
 
 class PortfolioConfig:
@@ -33,7 +40,9 @@ class PortfolioConfig:
         load_more_wait_time: float = 2.0,
         max_scroll_attempts: int = 500,
         max_no_change_count: int = 5,
-        extract_company_data: Optional[Callable] = None
+        extract_company_data: Optional[Callable] = None,
+        capture_api_responses: Optional[bool] = None,
+        api_url_patterns: List[str] = None
     ):
         self.name = name
         self.url = url
@@ -47,6 +56,40 @@ class PortfolioConfig:
         self.max_scroll_attempts = max_scroll_attempts
         self.max_no_change_count = max_no_change_count
         self.extract_company_data = extract_company_data
+        self.api_url_patterns = api_url_patterns or []  # Only capture responses whose URL contains one of these
+        # Parse companies from XHR/fetch JSON payloads - on by default only for sites with known API patterns
+        self.capture_api_responses = bool(self.api_url_patterns) if capture_api_responses is None else capture_api_responses
+
+
+class ApiResponseCollector:
+    """Collects JSON payloads from XHR/fetch responses while a portfolio page paginates"""
+    
+    def __init__(self, url_patterns: List[str] = None):
+        self.url_patterns = url_patterns or []
+        self.payloads: List[Any] = []
+        self.response_count = 0
+    
+    async def on_response(self, response):
+        """Playwright 'response' event handler"""
+        try:
+            if response.request.resource_type not in ('xhr', 'fetch'):
+                return
+            if self.url_patterns and not any(pattern in response.url for pattern in self.url_patterns):
+                return
+            if 'json' not in response.headers.get('content-type', ''):
+                return
+            
+            payload = await response.json()
+            self.payloads.append(payload)
+            self.response_count += 1
+        except Exception:
+            # Body may be unavailable (redirects, aborted requests) - DOM extraction still covers it
+            pass
+    
+    def drain(self) -> List[Any]:
+        """Return payloads captured since the last drain"""
+        payloads, self.payloads = self.payloads, []
+        return payloads
 
 
 class EnhancedPortfolioScraper:
@@ -85,15 +128,21 @@ class EnhancedPortfolioScraper:
                 # Set viewport
                 await page.set_viewport_size({"width": 1920, "height": 1080})
                 
+                # Capture the JSON/XHR responses that feed paginated lists
+                collector = None
+                if config.capture_api_responses:
+                    collector = ApiResponseCollector(config.api_url_patterns)
+                    page.on("response", collector.on_response)
+                
                 # Navigate to portfolio page
                 print(f"[PORTFOLIO-SCRAPER] Navigating to {config.name} portfolio page...")
                 await page.goto(config.url, wait_until="networkidle", timeout=60000)
                 await asyncio.sleep(2)  # Wait for initial load
                 
                 if config.scroll_type == "infinite":
-                    companies = await self._scrape_infinite_scroll(page, config, seen_domains, seen_names)
+                    companies = await self._scrape_infinite_scroll(page, config, seen_domains, seen_names, collector)
                 elif config.scroll_type == "load_more":
-                    companies = await self._scrape_load_more(page, config, seen_domains, seen_names)
+                    companies = await self._scrape_load_more(page, config, seen_domains, seen_names, collector)
                 else:
                     # Single page scrape
                     companies = await self._extract_companies_from_page(page, config, seen_domains, seen_names)
@@ -105,6 +154,9 @@ class EnhancedPortfolioScraper:
             import traceback
             traceback.print_exc()
         
+        # Verify guessed domains in one concurrent pass (shared resolver, results remembered across runs)
+        await get_domain_resolver().resolve_companies(companies)
+        
         # Validate and clean companies
         validated_companies = self._validate_companies(companies, config)
         
@@ -116,31 +168,24 @@ class EnhancedPortfolioScraper:
         page, 
         config: PortfolioConfig, 
         seen_domains: Set[str], 
-        seen_names: Set[str]
+        seen_names: Set[str],
+        collector: Optional[ApiResponseCollector] = None
     ) -> List[Dict]:
         """Scrape portfolio with infinite scroll"""
         companies = []
         previous_count = 0
         no_change_count = 0
         scroll_attempts = 0
+        processed_nodes = 0
         
         print(f"[PORTFOLIO-SCRAPER] Starting infinite scroll extraction for {config.name}...")
         
         while scroll_attempts < config.max_scroll_attempts and len(companies) < config.max_companies:
-            # Extract companies from current page state
-            page_companies = await self._extract_companies_from_page(page, config, seen_domains, seen_names)
-            
-            # Add new companies
-            for company in page_companies:
-                domain = company.get('domain', '').lower().strip()
-                name = company.get('name', '').lower().strip()
-                
-                if domain:
-                    seen_domains.add(domain)
-                if name:
-                    seen_names.add(name)
-                
-                companies.append(company)
+            # Extract only what arrived since the previous scroll (API payloads + new DOM nodes)
+            page_companies, processed_nodes = await self._extract_new_companies(
+                page, config, seen_domains, seen_names, collector, processed_nodes
+            )
+            self._add_companies(companies, page_companies, seen_domains, seen_names)
             
             current_count = len(companies)
             
@@ -169,6 +214,9 @@ class EnhancedPortfolioScraper:
             
             scroll_attempts += 1
         
+        if collector:
+            print(f"[PORTFOLIO-SCRAPER] {config.name}: Captured {collector.response_count} API responses")
+        
         return companies
     
     async def _scrape_load_more(
@@ -176,29 +224,22 @@ class EnhancedPortfolioScraper:
         page, 
         config: PortfolioConfig, 
         seen_domains: Set[str], 
-        seen_names: Set[str]
+        seen_names: Set[str],
+        collector: Optional[ApiResponseCollector] = None
     ) -> List[Dict]:
         """Scrape portfolio with Load More button"""
         companies = []
         load_more_attempts = 0
+        processed_nodes = 0
         
         print(f"[PORTFOLIO-SCRAPER] Starting Load More extraction for {config.name}...")
         
         while load_more_attempts < config.max_scroll_attempts and len(companies) < config.max_companies:
-            # Extract companies from current page state
-            page_companies = await self._extract_companies_from_page(page, config, seen_domains, seen_names)
-            
-            # Add new companies
-            for company in page_companies:
-                domain = company.get('domain', '').lower().strip()
-                name = company.get('name', '').lower().strip()
-                
-                if domain:
-                    seen_domains.add(domain)
-                if name:
-                    seen_names.add(name)
-                
-                companies.append(company)
+            # Extract only what arrived since the previous click (API payloads + new DOM nodes)
+            page_companies, processed_nodes = await self._extract_new_companies(
+                page, config, seen_domains, seen_names, collector, processed_nodes
+            )
+            self._add_companies(companies, page_companies, seen_domains, seen_names)
             
             current_count = len(companies)
             
@@ -243,8 +284,199 @@ class EnhancedPortfolioScraper:
             
             load_more_attempts += 1
         
+        if collector:
+            print(f"[PORTFOLIO-SCRAPER] {config.name}: Captured {collector.response_count} API responses")
+        
         return companies
     
+    def _add_companies(self, companies: List[Dict], new_companies: List[Dict], seen_domains: Set[str], seen_names: Set[str]):
+        """Append newly extracted companies and mark them as seen"""
+        for company in new_companies:
+            domain = company.get('domain', '').lower().strip()
+            name = company.get('name', '').lower().strip()
+            
+            if domain:
+                seen_domains.add(domain)
+            if name:
+                seen_names.add(name)
+            
+            companies.append(company)
+    
+    def _company_node_selector(self, config: PortfolioConfig) -> str:
+        """CSS selector for the DOM nodes that represent portfolio companies"""
+        if config.company_selectors:
+            return ', '.join(config.company_selectors)
+        return 'a[href*="/companies/"], a[href*="/company/"], a[href*="/portfolio/"]'
+    
+    async def _extract_new_companies(
+        self,
+        page,
+        config: PortfolioConfig,
+        seen_domains: Set[str],
+        seen_names: Set[str],
+        collector: Optional[ApiResponseCollector],
+        processed_nodes: int
+    ) -> Tuple[List[Dict], int]:
+        """
+        Extract companies added since the last pagination step.
+        Captured API payloads are parsed first; the DOM is only read when the
+        company node count grew, and then only the new nodes are parsed.
+        Returns (new_companies, processed_node_count).
+        """
+        companies = []
+        
+        if collector:
+            for payload in collector.drain():
+                companies.extend(self._extract_companies_from_payload(payload, config, seen_domains, seen_names))
+        
+        # Custom extractors need the full page
+        if config.extract_company_data:
+            companies.extend(await self._extract_companies_from_page(page, config, seen_domains, seen_names))
+            return companies, processed_nodes
+        
+        selector = self._company_node_selector(config)
+        try:
+            node_count = await page.evaluate("(selector) => document.querySelectorAll(selector).length", selector)
+        except Exception as e:
+            print(f"[PORTFOLIO-SCRAPER] Error counting company nodes: {e}")
+            return companies, processed_nodes
+        
+        if node_count > processed_nodes:
+            companies.extend(await self._extract_companies_from_new_nodes(
+                page, config, selector, processed_nodes, seen_domains, seen_names
+            ))
+        elif node_count < processed_nodes:
+            # List was re-rendered or virtualized - fall back to a full rescan once
+            companies.extend(await self._extract_companies_from_page(page, config, seen_domains, seen_names))
+        elif node_count == 0 and not companies:
+            # Selectors match nothing on this site - use the generic full-page heuristics
+            companies.extend(await self._extract_companies_from_page(page, config, seen_domains, seen_names))
+        
+        return companies, node_count
+    
+    async def _extract_companies_from_new_nodes(
+        self,
+        page,
+        config: PortfolioConfig,
+        selector: str,
+        start_index: int,
+        seen_domains: Set[str],
+        seen_names: Set[str]
+    ) -> List[Dict]:
+        """Parse only the company nodes appended after start_index"""
+        companies = []
+        
+        try:
+            # Serialize each new node with its enclosing card so domain lookups in the parent still work
+            fragments = await page.evaluate("""([selector, start]) => {
+                return Array.from(document.querySelectorAll(selector)).slice(start).map(el => {
+                    const parent = el.parentElement ? el.parentElement.closest('div, article, section') : null;
+                    el.setAttribute('data-celerio-node', '1');
+                    const html = (parent && parent.outerHTML.length < 20000) ? parent.outerHTML : el.outerHTML;
+                    el.removeAttribute('data-celerio-node');
+                    return html;
+                });
+            }""", [selector, start_index])
+        except Exception as e:
+            print(f"[PORTFOLIO-SCRAPER] Error reading new company nodes: {e}")
+            return companies
+        
+        for fragment in fragments:
+            fragment_soup = BeautifulSoup(fragment, 'html.parser')
+            elem = fragment_soup.find(attrs={'data-celerio-node': True}) or fragment_soup.find()
+            if elem is None:
+                continue
+            company = await self._extract_company_from_element(elem, config, seen_domains, seen_names)
+            if company:
+                companies.append(company)
+                seen_names.add(company['name'].lower().strip())
+        
+        return companies
+    
+    def _extract_companies_from_payload(
+        self,
+        payload: Any,
+        config: PortfolioConfig,
+        seen_domains: Set[str],
+        seen_names: Set[str]
+    ) -> List[Dict]:
+        """Extract companies from a captured JSON API payload"""
+        records = []
+        self._collect_company_records(payload, records)
+        
+        companies = []
+        for record in records:
+            company_name = None
+            for key in API_NAME_KEYS:
+                if isinstance(record.get(key), str) and record[key].strip():
+                    company_name = record[key].strip()
+                    break
+            
+            if not company_name or len(company_name) < 2 or len(company_name) > 100:
+                continue
+            
+            name_key = company_name.lower()
+            if name_key in seen_names:
+                continue
+            
+            domain = None
+            for key in API_WEBSITE_KEYS:
+                value = record.get(key)
+                if isinstance(value, str) and '.' in value:
+                    parsed = urlparse(value if '://' in value else f"https://{value}")
+                    potential_domain = parsed.netloc.replace('www.', '').lower()
+                    if potential_domain and not any(exclude in potential_domain for exclude in config.exclude_domains):
+                        domain = potential_domain
+                        break
+            
+            if domain and domain in seen_domains:
+                continue
+            
+            focus_areas = []
+            for key in ('industries', 'tags', 'sectors'):
+                if isinstance(record.get(key), list):
+                    focus_areas = [str(tag) for tag in record[key] if isinstance(tag, (str, int))]
+                    break
+            
+            batch = record.get('batch') if isinstance(record.get('batch'), str) else ''
+            
+            companies.append({
+                'name': company_name,
+                'domain': domain or '',
+                'source': config.name.lower().replace(' ', '_'),
+                'focus_areas': focus_areas,
+                'yc_batch': batch,
+                'year': None,
+                'portfolio_url': config.url
+            })
+            seen_names.add(name_key)
+            if domain:
+                seen_domains.add(domain)
+        
+        return companies
+    
+    def _collect_company_records(self, node: Any, records: List[Dict], depth: int = 0):
+        """Walk a JSON payload and collect dicts that look like company records"""
+        if depth > 8:
+            return
+        
+        if isinstance(node, list):
+            for item in node:
+                if isinstance(item, dict) and self._looks_like_company_record(item):
+                    records.append(item)
+                else:
+                    self._collect_company_records(item, records, depth + 1)
+        elif isinstance(node, dict):
+            for value in node.values():
+                if isinstance(value, (list, dict)):
+                    self._collect_company_records(value, records, depth + 1)
+    
+    def _looks_like_company_record(self, record: Dict) -> bool:
+        """A company record has a name plus a website, domain or batch"""
+        has_name = any(isinstance(record.get(key), str) for key in API_NAME_KEYS)
+        has_identity = any(record.get(key) for key in API_COMPANY_KEYS)
+        return has_name and has_identity
+    
     async def _extract_companies_from_page(
         self, 
         page, 
@@ -344,9 +576,11 @@ class EnhancedPortfolioScraper:
                             domain = potential_domain
                             break
             
-            # Discover domain from name if needed
+            # Discover domain from name if needed (verified after extraction)
+            guessed = False
             if not domain:
                 domain = await self._discover_domain_from_name(company_name)
+                guessed = domain is not None
             
             # Extract additional data
             focus_areas = []
@@ -378,7 +612,8 @@ class EnhancedPortfolioScraper:
                 'focus_areas': focus_areas,
                 'yc_batch': batch,
                 'year': year,
-                'portfolio_url': config.url
+                'portfolio_url': config.url,
+                GUESSED_DOMAIN_KEY: guessed
             }
             
         except Exception as e:
@@ -415,15 +650,8 @@ class EnhancedPortfolioScraper:
         if not company_name or len(company_name) < 2:
             return None
         
-        # Clean company name
-        clean_name = re.sub(r'[^\w\s-]', '', company_name.lower().strip())
-        clean_name = re.sub(r'\s+', ' ', clean_name).strip()
-        
-        # Generate potential domains
-        no_spaces = clean_name.replace(' ', '').replace('-', '')
-        
-        # Return most likely domain (will be validated later)
-        return f"{no_spaces}.com" if no_spaces else None
+        # Cheap guess only; scrape_portfolio() verifies all guesses together once extraction is done
+        return guess_domain(company_name)
     
     def _validate_companies(self, companies: List[Dict], config: PortfolioConfig) -> List[Dict]:
         """Validate and clean company data for enterprise-grade quality"""
@@ -506,6 +734,7 @@ class EnhancedPortfolioScraper:
                 '[class*="company"]'
             ],
             exclude_domains=['ycombinator.com', 'twitter.com', 'linkedin.com'],
+            api_url_patterns=['algolia'],  # YC's directory is fed by Algolia search responses
             max_companies=max_companies,
             scroll_wait_time=2.0,
             max_scroll_attempts=500,
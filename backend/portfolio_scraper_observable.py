@@ -4,12 +4,10 @@ Provides full visibility into scraping operations
 """
 import asyncio
 import json
-import base64
 from typing import List, Dict, Optional, Set, Callable, Any
 import re
 from urllib.parse import urlparse
 from datetime import datetime
-from pathlib import Path
 
 try:
     from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
@@ -18,6 +16,8 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 from bs4 import BeautifulSoup
+from screenshot_pipeline import ScreenshotConfig, ScreenshotPipeline
+from domain_resolver import GUESSED_DOMAIN_KEY, get_domain_resolver, guess_domain
 
 # Progress callback type
 ProgressCallback = Callable[[Dict[str, Any]], None]
@@ -26,13 +26,22 @@ ProgressCallback = Callable[[Dict[str, Any]], None]
 class ObservablePortfolioScraper:
     """Portfolio scraper with full observability - screenshots, progress tracking, and browser monitoring"""
     
-    def __init__(self, progress_callback: Optional[ProgressCallback] = None):
+    def __init__(
+        self,
+        progress_callback: Optional[ProgressCallback] = None,
+        screenshot_config: Optional[ScreenshotConfig] = None
+    ):
         self.playwright = None
         self.browser = None
         self.page = None
         self.progress_callback = progress_callback
-        self.screenshots_dir = Path("artifacts/portfolio_scraping")
-        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        # Sampled thumbnails, encoded off the scrape loop and referenced by URL in events
+        self.screenshots = ScreenshotPipeline(screenshot_config)
+    
+    async def close(self):
+        """Finish pending screenshots and stop the encoding thread"""
+        await self.screenshots.drain()
+        self.screenshots.close()
     
     async def _emit_progress(self, event_type: str, data: Dict[str, Any]):
         """Emit progress event to callback"""
@@ -46,35 +55,43 @@ class ObservablePortfolioScraper:
             except Exception as e:
                 print(f"[OBSERVABLE] Error emitting progress: {e}")
     
-    async def _take_screenshot(self, page, label: str, portfolio_name: str) -> Optional[str]:
-        """Take screenshot and return base64 encoded data"""
-        try:
-            screenshot_bytes = await page.screenshot(full_page=False)
-            screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-            
-            # Save screenshot to disk
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{portfolio_name}_{label}_{timestamp}.png"
-            filepath = self.screenshots_dir / filename
-            filepath.write_bytes(screenshot_bytes)
-            
+    async def _take_screenshot(
+        self,
+        page,
+        label: str,
+        portfolio_name: str,
+        step: Optional[int] = None,
+        every_n: Optional[int] = None
+    ) -> bool:
+        """
+        Capture a sampled screenshot (step 0 = first page, None = final state).
+        The thumbnail is encoded in a worker thread and announced by URL once stored.
+        """
+        if not page or not self.screenshots.should_capture(step, every_n):
+            return False
+        
+        async def on_stored(info: Dict[str, Any]):
             await self._emit_progress('screenshot', {
                 'label': label,
                 'portfolio': portfolio_name,
-                'filename': filename,
-                'screenshot': screenshot_b64,
-                'url': await page.url if page else None
+                'filename': info['filename'],
+                'screenshot_url': info['screenshot_url'],
+                'width': info['width'],
+                'height': info['height'],
+                'bytes': info['bytes'],
+                'url': info['page_url']
             })
-            
-            return screenshot_b64
+        
+        try:
+            return await self.screenshots.capture(page, on_stored)
         except Exception as e:
             print(f"[OBSERVABLE] Error taking screenshot: {e}")
-            return None
+            return False
     
     async def scrape_yc_portfolio_observable(
         self, 
         max_companies: int = 10000,
-        screenshot_interval: int = 10  # Take screenshot every N scrolls
+        screenshot_interval: Optional[int] = None  # Screenshot every N scrolls (defaults to screenshot config)
     ) -> List[Dict]:
         """Scrape YC portfolio with full observability - ensures browser cleanup"""
         companies = []
@@ -123,7 +140,7 @@ class ObservablePortfolioScraper:
             await asyncio.sleep(2)
             
             # Initial screenshot
-            await self._take_screenshot(page, "initial_load", portfolio_name)
+            await self._take_screenshot(page, "initial_load", portfolio_name, step=0)
             
             previous_count = 0
             no_change_count = 0
@@ -162,9 +179,11 @@ class ObservablePortfolioScraper:
                     'companies_batch': new_companies_batch[:10]  # Emit up to 10 companies per batch
                 })
                 
-                # Screenshot every N scrolls
-                if scroll_attempts % screenshot_interval == 0:
-                    await self._take_screenshot(page, f"scroll_{scroll_attempts}", portfolio_name)
+                # Sampled screenshot every N scrolls
+                await self._take_screenshot(
+                    page, f"scroll_{scroll_attempts + 1}", portfolio_name,
+                    step=scroll_attempts + 1, every_n=screenshot_interval
+                )
                 
                 # Check if still finding new companies
                 if current_count == previous_count:
@@ -221,6 +240,9 @@ class ObservablePortfolioScraper:
             # Small delay to ensure cleanup completes
             await asyncio.sleep(0.2)
         
+        # Let screenshots still being encoded reach the event stream before completion
+        await self.screenshots.drain()
+        
         await self._emit_progress('complete', {
             'portfolio': portfolio_name,
             'companies_found': len(companies)
@@ -231,7 +253,7 @@ class ObservablePortfolioScraper:
     async def scrape_antler_portfolio_observable(
         self,
         max_companies: int = 5000,
-        screenshot_interval: int = 5  # Take screenshot every N clicks
+        screenshot_interval: Optional[int] = None  # Screenshot every N clicks (defaults to screenshot config)
     ) -> List[Dict]:
         """Scrape Antler portfolio with full observability"""
         companies = []
@@ -276,7 +298,7 @@ class ObservablePortfolioScraper:
             await asyncio.sleep(3)
             
             # Initial screenshot
-            await self._take_screenshot(page, "initial_load", portfolio_name)
+            await self._take_screenshot(page, "initial_load", portfolio_name, step=0)
             
             load_more_attempts = 0
             max_load_more_attempts = 200
@@ -313,9 +335,11 @@ class ObservablePortfolioScraper:
                     'companies_batch': new_companies_batch[:10]  # Emit up to 10 companies per batch
                 })
                 
-                # Screenshot every N clicks
-                if load_more_attempts % screenshot_interval == 0:
-                    await self._take_screenshot(page, f"load_more_{load_more_attempts}", portfolio_name)
+                # Sampled screenshot every N clicks
+                await self._take_screenshot(
+                    page, f"load_more_{load_more_attempts + 1}", portfolio_name,
+                    step=load_more_attempts + 1, every_n=screenshot_interval
+                )
                 
                 # Try to click Load More
                 load_more_clicked = False
@@ -400,6 +424,12 @@ class ObservablePortfolioScraper:
             # Small delay to ensure cleanup completes
             await asyncio.sleep(0.2)
         
+        # Verify guessed domains in one concurrent pass (shared resolver, results remembered across runs)
+        await get_domain_resolver().resolve_companies(companies)
+        
+        # Let screenshots still being encoded reach the event stream before completion
+        await self.screenshots.drain()
+        
         await self._emit_progress('complete', {
             'portfolio': portfolio_name,
             'companies_found': len(companies)
@@ -580,15 +610,18 @@ class ObservablePortfolioScraper:
                                 parsed = urlparse(href)
                                 domain = parsed.netloc.replace('www.', '')
                         
+                        guessed = False
                         if not domain:
                             domain = await self._discover_domain_from_name(company_name)
+                            guessed = domain is not None
                         
                         companies.append({
                             'name': company_name.strip(),
                             'domain': domain or '',
                             'source': 'antler',
                             'focus_areas': [],
-                            'portfolio_url': 'https://www.antler.co/portfolio'
+                            'portfolio_url': 'https://www.antler.co/portfolio',
+                            GUESSED_DOMAIN_KEY: guessed
                         })
                         
                         seen_names.add(name_key)
@@ -606,11 +639,8 @@ class ObservablePortfolioScraper:
         if not company_name or len(company_name) < 2:
             return None
         
-        clean_name = re.sub(r'[^\w\s-]', '', company_name.lower().strip())
-        clean_name = re.sub(r'\s+', ' ', clean_name).strip()
-        no_spaces = clean_name.replace(' ', '').replace('-', '')
-        
-        return f"{no_spaces}.com" if no_spaces else None
+        # Cheap guess only; guesses are verified together once the scrape is done
+        return guess_domain(company_name)
     
     async def scrape_both_observable(self) -> Dict[str, List[Dict]]:
         """Scrape both portfolios with observability - ensures proper browser cleanup"""
@@ -5,11 +5,12 @@ Provides real-time updates to frontend
 import asyncio
 import json
 from typing import Dict, List
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.responses import StreamingResponse, FileResponse
 from sse_starlette.sse import EventSourceResponse
 import queue
 import threading
+from screenshot_pipeline import resolve_screenshot_path
 
 router = APIRouter()
 
@@ -80,3 +81,13 @@ async def sse_portfolio_scraping(session_id: str):
     
     return EventSourceResponse(event_generator())
 
+
+@router.get("/portfolio-scraping/screenshots/{filename}")
+async def get_scraping_screenshot(filename: str):
+    """Serve a stored scraping screenshot referenced by a progress event"""
+    filepath = resolve_screenshot_path(filename)
+    if filepath is None:
+        raise HTTPException(status_code=404, detail="Screenshot not found")
+    media_type = "image/webp" if filepath.suffix == ".webp" else "image/jpeg"
+    # Content-addressed, so the file behind a URL never changes
+    return FileResponse(filepath, media_type=media_type, headers={"Cache-Control": "public, max-age=31536000, immutable"})
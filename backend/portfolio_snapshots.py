@@ -0,0 +1,353 @@
+"""
+Celerio Scout - Portfolio Snapshots
+Stores each portfolio's content fingerprint and last extracted company set
+"""
+import json
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import aiohttp
+from domain_canonical import canonical_domain, normalize_host, registrable_domain
+
+# Bump when company_key() changes; older snapshots are diffed with legacy_company_key()
+# once and re-saved (1: 'www.'-stripped domain, 2: registrable domain, 3: canonical host)
+COMPANY_KEY_VERSION = 3
+
+# Re-scrape a portfolio fully once its snapshot is older than this, even if the
+# fingerprint still matches (catches pages that load their list separately)
+MAX_SNAPSHOT_AGE = timedelta(days=7)
+
+# Markup that changes on every request without the portfolio changing
+_VOLATILE_PATTERNS = [
+    re.compile(r'<script\b[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<style\b[^>]*>.*?</style>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<noscript\b[^>]*>.*?</noscript>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<!--.*?-->', re.DOTALL),
+    re.compile(r'\s(?:nonce|data-reactid|data-csrf|csrf-token|integrity)="[^"]*"', re.IGNORECASE),
+    re.compile(r'<meta\b[^>]*name="(?:csrf-token|csrf-param)"[^>]*>', re.IGNORECASE),
+]
+_WHITESPACE = re.compile(r'\s+')
+_INTER_TAG_WHITESPACE = re.compile(r'>\s+<')
+
+
+def page_fingerprint(content: str) -> Optional[str]:
+    """Content hash of a fetched page (or API payload) with volatile markup stripped"""
+    if not content:
+        return None
+    normalized = content
+    for pattern in _VOLATILE_PATTERNS:
+        normalized = pattern.sub('', normalized)
+    normalized = _INTER_TAG_WHITESPACE.sub('><', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip()
+    return hashlib.sha256(normalized.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def company_key(company: Dict) -> str:
+    """Stable identity of a scraped company within a portfolio"""
+    domain = canonical_domain(company.get('domain') or '')
+    if domain:
+        return domain
+    return (company.get('name') or '').strip().lower()
+
+
+def legacy_company_key(company: Dict) -> str:
+    """
+    Identity that snapshots of every earlier key version agree on (the registrable
+    domain), used to diff against a snapshot stored before COMPANY_KEY_VERSION
+    """
+    host = normalize_host(company.get('domain') or '')
+    domain = registrable_domain(host) if host else None
+    if domain:
+        return domain
+    return (company.get('name') or '').strip().lower()
+
+
+def diff_companies(previous: List[Dict], current: List[Dict], key=company_key) -> Tuple[List[Dict], List[Dict]]:
+    """Return (added, removed) companies between two extracted company sets"""
+    previous_keys = {key(c) for c in previous}
+    current_keys = {key(c) for c in current}
+    added = [c for c in current if key(c) and key(c) not in previous_keys]
+    removed = [c for c in previous if key(c) and key(c) not in current_keys]
+    return added, removed
+
+
+async def fetch_page_fingerprint(url: str, session: Optional[aiohttp.ClientSession] = None, timeout: int = 15) -> Optional[str]:
+    """Fetch a page over plain HTTP and return its fingerprint (None on failure)"""
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession()
+    try:
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        }
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout), ssl=False) as response:
+            if response.status != 200:
+                return None
+            return page_fingerprint(await response.text())
+    except Exception as e:
+        print(f"[SNAPSHOT] Error fingerprinting {url}: {e}")
+        return None
+    finally:
+        if own_session:
+            await session.close()
+
+
+class IncrementalRunStats:
+    """Counts the scraping work done and avoided during an incremental run"""
+
+    def __init__(self):
+        self.portfolios_new = 0
+        self.portfolios_changed = 0
+        self.portfolios_unchanged = 0
+        self.portfolios_failed = 0
+        self.companies_seen = 0
+        self.companies_added = 0
+        self.companies_removed = 0
+
+    def record(self, result: Dict):
+        """Add one portfolio's incremental result to the run totals"""
+        status = result.get('status')
+        if status == 'new':
+            self.portfolios_new += 1
+        elif status == 'changed':
+            self.portfolios_changed += 1
+        elif status == 'unchanged':
+            self.portfolios_unchanged += 1
+        else:
+            self.portfolios_failed += 1
+        self.companies_seen += len(result.get('companies', []))
+        self.companies_added += len(result.get('added', []))
+        self.companies_removed += len(result.get('removed', []))
+
+    def as_dict(self) -> Dict:
+        """Run summary including the share of company work skipped"""
+        skipped = max(self.companies_seen - self.companies_added, 0)
+        return {
+            'portfolios_new': self.portfolios_new,
+            'portfolios_changed': self.portfolios_changed,
+            'portfolios_unchanged': self.portfolios_unchanged,
+            'portfolios_failed': self.portfolios_failed,
+            'companies_seen': self.companies_seen,
+            'companies_added': self.companies_added,
+            'companies_removed': self.companies_removed,
+            'companies_skipped': skipped,
+            'work_avoided_pct': round(skipped / self.companies_seen * 100, 1) if self.companies_seen else 0.0
+        }
+
+    def print_summary(self):
+        """Print the run summary"""
+        summary = self.as_dict()
+        print(f"[SNAPSHOT] Portfolios: {summary['portfolios_new']} new, {summary['portfolios_changed']} changed, "
+              f"{summary['portfolios_unchanged']} unchanged, {summary['portfolios_failed']} failed")
+        print(f"[SNAPSHOT] Companies: {summary['companies_added']} added, {summary['companies_removed']} removed, "
+              f"{summary['companies_skipped']} skipped ({summary['work_avoided_pct']}% of work avoided)")
+
+
+class PortfolioSnapshotStore:
+    """Persists per-portfolio fingerprints and extracted company sets in DuckDB"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection snapshots live only for the lifetime of this store
+        self.conn = db_conn
+        self._snapshots: Dict[str, Dict] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure portfolio_snapshots table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+                portfolio_url TEXT PRIMARY KEY,
+                firm_name TEXT,
+                content_hash TEXT,
+                hash_strategy TEXT,  -- fetch strategy the hash was computed from
+                companies JSON,
+                company_count INTEGER,
+                unchanged_runs INTEGER DEFAULT 0,
+                fetched_at TIMESTAMP,
+                changed_at TIMESTAMP
+            )
+        """)
+        self.conn.execute("ALTER TABLE portfolio_snapshots ADD COLUMN IF NOT EXISTS key_version INTEGER")
+
+    def get_snapshot(self, portfolio_url: str) -> Optional[Dict]:
+        """Get the last snapshot for a portfolio URL"""
+        if portfolio_url in self._snapshots:
+            return self._snapshots[portfolio_url]
+
+        if self.conn is None:
+            return None
+
+        try:
+            row = self.conn.execute("""
+                SELECT portfolio_url, firm_name, content_hash, hash_strategy, companies,
+                       company_count, unchanged_runs, fetched_at, changed_at, key_version
+                FROM portfolio_snapshots
+                WHERE portfolio_url = ?
+            """, (portfolio_url,)).fetchone()
+        except Exception as e:
+            print(f"[SNAPSHOT] Error loading snapshot for {portfolio_url}: {e}")
+            return None
+
+        if not row:
+            return None
+
+        snapshot = {
+            'portfolio_url': row[0],
+            'firm_name': row[1],
+            'content_hash': row[2],
+            'hash_strategy': row[3],
+            'companies': json.loads(row[4]) if row[4] else [],
+            'company_count': row[5] or 0,
+            'unchanged_runs': row[6] or 0,
+            'fetched_at': row[7],
+            'changed_at': row[8],
+            'key_version': row[9] or 1
+        }
+        self._snapshots[portfolio_url] = snapshot
+        return snapshot
+
+    def matches(self, snapshot: Optional[Dict], content_hash: Optional[str], strategy: str) -> bool:
+        """Check whether a freshly fetched page is unchanged since the snapshot"""
+        if not snapshot or not content_hash or not snapshot.get('companies'):
+            return False
+        if snapshot.get('hash_strategy') != strategy or snapshot.get('content_hash') != content_hash:
+            return False
+        changed_at = snapshot.get('changed_at')
+        return changed_at is not None and datetime.now() - changed_at < MAX_SNAPSHOT_AGE
+
+    def record_unchanged(self, portfolio_url: str):
+        """Record a run that found the portfolio unchanged"""
+        snapshot = self.get_snapshot(portfolio_url)
+        if not snapshot:
+            return
+
+        snapshot['unchanged_runs'] = (snapshot.get('unchanged_runs') or 0) + 1
+        snapshot['fetched_at'] = datetime.now()
+
+        if self.conn is None:
+            return
+
+        try:
+            self.conn.execute(
+                "UPDATE portfolio_snapshots SET unchanged_runs = ?, fetched_at = ? WHERE portfolio_url = ?",
+                (snapshot['unchanged_runs'], snapshot['fetched_at'], portfolio_url)
+            )
+            self.conn.commit()
+        except Exception as e:
+            print(f"[SNAPSHOT] Error updating snapshot for {portfolio_url}: {e}")
+
+    def stage_snapshot(
+        self,
+        portfolio_url: str,
+        firm_name: str,
+        content_hash: Optional[str],
+        hash_strategy: Optional[str],
+        companies: List[Dict]
+    ) -> Dict:
+        """
+        Incremental result ({'status', 'companies', 'added', 'removed', 'snapshot'}) relative
+        to the previous snapshot. Nothing is stored until commit_snapshot() is called with it,
+        so callers commit only once the added companies have been saved downstream.
+        """
+        previous = self.get_snapshot(portfolio_url)
+        if previous:
+            added, removed = self.diff(previous, companies)
+            status = 'changed'
+        else:
+            added, removed = list(companies), []
+            status = 'new'
+
+        now = datetime.now()
+        snapshot = {
+            'portfolio_url': portfolio_url,
+            'firm_name': firm_name,
+            'content_hash': content_hash,
+            'hash_strategy': hash_strategy,
+            'companies': companies,
+            'company_count': len(companies),
+            'unchanged_runs': 0,
+            'fetched_at': now,
+            'changed_at': now,
+            'key_version': COMPANY_KEY_VERSION
+        }
+        return {'status': status, 'companies': companies, 'added': added, 'removed': removed, 'snapshot': snapshot}
+
+    def commit_snapshot(self, result: Dict, failed: Optional[List[Dict]] = None):
+        """
+        Store the snapshot staged in an incremental result. Companies in failed (not
+        saved downstream) are left out and the fingerprint dropped, so the next run
+        re-extracts the page and reports them as added again.
+        """
+        snapshot = result.get('snapshot')
+        if snapshot is None:
+            # Unchanged, partial and failed results have nothing to store
+            return
+        if failed:
+            failed_keys = {company_key(company) for company in failed}
+            failed_names = {(company.get('name') or '').strip().lower() for company in failed}
+            companies = [
+                company for company in snapshot['companies']
+                if company_key(company) not in failed_keys
+                and (company.get('name') or '').strip().lower() not in failed_names
+            ]
+            snapshot = dict(snapshot, companies=companies, company_count=len(companies), content_hash=None)
+            print(f"[SNAPSHOT] {snapshot['firm_name']}: {len(failed)} companies not saved, left out of the snapshot")
+
+        portfolio_url = snapshot['portfolio_url']
+        self._snapshots[portfolio_url] = snapshot
+        if self.conn is None:
+            return
+        try:
+            self.conn.execute("DELETE FROM portfolio_snapshots WHERE portfolio_url = ?", (portfolio_url,))
+            self.conn.execute("""
+                INSERT INTO portfolio_snapshots
+                (portfolio_url, firm_name, content_hash, hash_strategy, companies,
+                 company_count, unchanged_runs, fetched_at, changed_at, key_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                portfolio_url,
+                snapshot['firm_name'],
+                snapshot['content_hash'],
+                snapshot['hash_strategy'],
+                json.dumps(snapshot['companies'], default=str),
+                snapshot['company_count'],
+                0,
+                snapshot['fetched_at'],
+                snapshot['changed_at'],
+                COMPANY_KEY_VERSION
+            ))
+            self.conn.commit()
+        except Exception as e:
+            print(f"[SNAPSHOT] Error saving snapshot for {portfolio_url}: {e}")
+
+    def save_snapshot(
+        self,
+        portfolio_url: str,
+        firm_name: str,
+        content_hash: Optional[str],
+        hash_strategy: Optional[str],
+        companies: List[Dict]
+    ) -> Dict:
+        """Stage and immediately store a snapshot (for callers with nothing to save downstream)"""
+        result = self.stage_snapshot(portfolio_url, firm_name, content_hash, hash_strategy, companies)
+        self.commit_snapshot(result)
+        return result
+
+    def diff(self, snapshot: Dict, companies: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """(added, removed) relative to a snapshot (removals from older key versions matched by registrable domain)"""
+        previous = snapshot.get('companies', [])
+        added, removed = diff_companies(previous, companies)
+        if (snapshot.get('key_version') or 1) < COMPANY_KEY_VERSION:
+            # Re-scoring a company twice is harmless, closing its investment is not - only
+            # report removals the coarser legacy key agrees on
+            print(f"[SNAPSHOT] Migrating {snapshot.get('portfolio_url')} to company key version {COMPANY_KEY_VERSION}")
+            _, removed = diff_companies(previous, companies, key=legacy_company_key)
+        return added, removed
+
+    def unchanged_result(self, portfolio_url: str) -> Dict:
+        """Incremental result for a portfolio whose page did not change"""
+        self.record_unchanged(portfolio_url)
+        snapshot = self.get_snapshot(portfolio_url) or {}
+        return {'status': 'unchanged', 'companies': snapshot.get('companies', []), 'added': [], 'removed': []}
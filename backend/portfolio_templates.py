@@ -0,0 +1,307 @@
+"""
+Celerio Scout - Learned Portfolio Extraction Templates
+Stores learned CSS extraction templates for each VC portfolio page
+"""
+import json
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+from datetime import datetime
+from urllib.parse import urlparse, urljoin
+from bs4 import BeautifulSoup
+
+# Minimum number of sibling records before a structure counts as a portfolio list
+MIN_TEMPLATE_RECORDS = 6
+
+# Re-learn when the template yield moves by more than this share of the learned count
+YIELD_CHANGE_THRESHOLD = 0.5
+
+# Field selectors tried (in order) when locating the company name inside a record
+NAME_SELECTOR_CANDIDATES = [
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    '[class*="name"]', '[class*="title"]',
+    'img[alt]', 'a'
+]
+
+# Marker for "the record element itself is the link"
+SELF_SELECTOR = ':self'
+
+_CSS_IDENTIFIER = re.compile(r'^[A-Za-z_-][A-Za-z0-9_-]*$')
+
+
+def _css_segment(elem) -> str:
+    """CSS selector segment (tag + stable classes) for an element"""
+    classes = [c for c in elem.get('class', []) if _CSS_IDENTIFIER.match(c)]
+    return elem.name + ''.join(f'.{c}' for c in sorted(classes))
+
+
+def _css_path(soup: BeautifulSoup, elem) -> str:
+    """Shortest ancestor path selector that uniquely identifies elem"""
+    if elem.get('id') and _CSS_IDENTIFIER.match(elem['id']):
+        return f"#{elem['id']}"
+
+    segments = []
+    current = elem
+    while current is not None and current.name not in (None, '[document]') and len(segments) < 8:
+        segment = _css_segment(current)
+        if current.parent is not None:
+            same = [s for s in current.parent.find_all(current.name, recursive=False) if _css_segment(s) == segment]
+            if len(same) > 1:
+                segment += f':nth-of-type({current.parent.find_all(current.name, recursive=False).index(current) + 1})'
+        segments.insert(0, segment)
+
+        selector = ' > '.join(segments)
+        try:
+            if len(soup.select(selector)) == 1:
+                return selector
+        except Exception:
+            pass
+
+        if current.get('id') and _CSS_IDENTIFIER.match(current['id']):
+            segments[0] = f"#{current['id']}"
+            return ' > '.join(segments)
+        current = current.parent
+
+    return ' > '.join(segments)
+
+
+def _pick_field_selector(records: List, candidates: List[str], min_share: float = 0.6) -> Optional[str]:
+    """First candidate selector present in at least min_share of the records"""
+    for selector in candidates:
+        hits = sum(1 for record in records if record.select_one(selector) is not None)
+        if hits >= len(records) * min_share:
+            return selector
+    return None
+
+
+def learn_template(soup: BeautifulSoup, page_url: str, min_records: int = MIN_TEMPLATE_RECORDS) -> Optional[Dict]:
+    """
+    Find the repeating DOM record structure on a portfolio page.
+    Returns a compiled template (container/record selectors plus name, link and
+    logo positions inside a record) or None if no list structure was found.
+    """
+    best = None
+    best_score = 0.0
+
+    for parent in soup.find_all(True):
+        # Menus and dropdowns repeat too, but never hold the portfolio
+        if parent.name in ('nav', 'header', 'footer', 'select') or parent.find_parent(['nav', 'header', 'footer']):
+            continue
+
+        children = parent.find_all(True, recursive=False)
+        if len(children) < min_records:
+            continue
+
+        signature, count = Counter(_css_segment(c) for c in children).most_common(1)[0]
+        if count < min_records:
+            continue
+
+        records = [c for c in children if _css_segment(c) == signature]
+        sample = records[:20]
+        with_link = sum(1 for r in sample if (r.name == 'a' and r.get('href')) or r.find('a', href=True))
+        with_logo = sum(1 for r in sample if r.find('img'))
+        with_text = sum(1 for r in sample if 1 < len(r.get_text(strip=True)) <= 200 or r.find('img', alt=True))
+
+        # Portfolio records link somewhere and carry a short name
+        if with_link < len(sample) * 0.5 or with_text < len(sample) * 0.5:
+            continue
+
+        score = count * (1 + with_link / len(sample) + with_logo / len(sample))
+        if score > best_score:
+            best_score = score
+            best = (parent, signature, records)
+
+    if not best:
+        return None
+
+    parent, signature, records = best
+    sample = records[:20]
+    container_selector = _css_path(soup, parent)
+
+    if all(r.name == 'a' for r in sample):
+        link_selector = SELF_SELECTOR
+    else:
+        link_selector = _pick_field_selector(sample, ['a[href^="http"]', 'a[href]'], min_share=0.5)
+
+    return {
+        'page_url': page_url,
+        'container_selector': container_selector,
+        'record_selector': f"{container_selector} > {signature}",
+        'name_selector': _pick_field_selector(sample, NAME_SELECTOR_CANDIDATES),
+        'link_selector': link_selector,
+        'logo_selector': 'img' if _pick_field_selector(sample, ['img'], min_share=0.5) else None,
+        'record_count': len(records)
+    }
+
+
+def apply_template(soup: BeautifulSoup, template: Dict, source: str, exclude_domains: Optional[List[str]] = None) -> List[Dict]:
+    """Extract companies from a page using a learned template"""
+    companies = []
+    seen_names = set()
+    page_url = template.get('page_url', '')
+    base_domain = urlparse(page_url).netloc.replace('www.', '').lower()
+    exclude_domains = [d for d in (exclude_domains or []) + [base_domain] if d]
+
+    try:
+        records = soup.select(template['record_selector'])
+    except Exception as e:
+        print(f"[TEMPLATE] Invalid record selector {template.get('record_selector')}: {e}")
+        return companies
+
+    for record in records:
+        # Company name
+        company_name = None
+        name_selector = template.get('name_selector')
+        name_elem = record.select_one(name_selector) if name_selector else None
+        if name_elem is not None:
+            company_name = name_elem.get('alt') if name_elem.name == 'img' else name_elem.get_text(' ', strip=True)
+        if not company_name:
+            text_lines = [line.strip() for line in record.get_text('\n').split('\n') if line.strip()]
+            company_name = text_lines[0] if text_lines else None
+
+        if not company_name or len(company_name) < 2 or len(company_name) > 80:
+            continue
+
+        name_key = company_name.lower().strip()
+        if name_key in seen_names:
+            continue
+        seen_names.add(name_key)
+
+        # Company website
+        domain = None
+        link_selector = template.get('link_selector')
+        link_elem = record if link_selector == SELF_SELECTOR else (record.select_one(link_selector) if link_selector else None)
+        if link_elem is not None and link_elem.get('href'):
+            parsed = urlparse(urljoin(page_url, link_elem['href']))
+            potential_domain = parsed.netloc.replace('www.', '').lower()
+            if potential_domain and not any(exclude in potential_domain for exclude in exclude_domains):
+                domain = potential_domain
+
+        # Logo
+        logo_url = None
+        logo_selector = template.get('logo_selector')
+        logo_elem = record.select_one(logo_selector) if logo_selector else None
+        if logo_elem is not None and logo_elem.get('src'):
+            logo_url = urljoin(page_url, logo_elem['src'])
+
+        companies.append({
+            'name': company_name.strip(),
+            'domain': domain or '',
+            'source': source,
+            'yc_batch': '',
+            'logo_url': logo_url,
+            'portfolio_url': page_url
+        })
+
+    return companies
+
+
+def yield_changed_materially(template: Dict, company_count: int) -> bool:
+    """Check whether a template's yield drifted far enough from the learned count to re-learn"""
+    learned_count = template.get('record_count') or 0
+    if learned_count == 0:
+        return True
+    return abs(company_count - learned_count) > learned_count * YIELD_CHANGE_THRESHOLD
+
+
+def template_selectors(template: Optional[Dict]) -> List[str]:
+    """Company selectors for PortfolioConfig derived from a learned template"""
+    if not template or not template.get('record_selector'):
+        return []
+    return [template['record_selector']]
+
+
+class TemplateStore:
+    """Persists learned extraction templates per VC in DuckDB"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection templates live only for the lifetime of this store
+        self.conn = db_conn
+        self._templates: Dict[str, Dict] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure portfolio_templates table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS portfolio_templates (
+                firm_name TEXT PRIMARY KEY,
+                portfolio_url TEXT,
+                template JSON,
+                record_count INTEGER,
+                last_yield INTEGER,
+                relearn_count INTEGER DEFAULT 0,
+                learned_at TIMESTAMP,
+                applied_at TIMESTAMP
+            )
+        """)
+
+    def get_template(self, firm_name: str) -> Optional[Dict]:
+        """Get the learned template for a VC"""
+        if firm_name in self._templates:
+            return self._templates[firm_name]
+
+        if self.conn is None:
+            return None
+
+        try:
+            row = self.conn.execute(
+                "SELECT template, relearn_count FROM portfolio_templates WHERE firm_name = ?",
+                (firm_name,)
+            ).fetchone()
+        except Exception as e:
+            print(f"[TEMPLATE] Error loading template for {firm_name}: {e}")
+            return None
+
+        if not row or not row[0]:
+            return None
+
+        template = json.loads(row[0])
+        template['relearn_count'] = row[1] or 0
+        self._templates[firm_name] = template
+        return template
+
+    def save_template(self, firm_name: str, template: Dict, company_count: int):
+        """Store a newly learned template"""
+        previous = self.get_template(firm_name)
+        relearn_count = (previous.get('relearn_count', 0) + 1) if previous else 0
+        template = {**template, 'relearn_count': relearn_count}
+        self._templates[firm_name] = template
+
+        if self.conn is None:
+            return
+
+        try:
+            now = datetime.now()
+            self.conn.execute("DELETE FROM portfolio_templates WHERE firm_name = ?", (firm_name,))
+            self.conn.execute("""
+                INSERT INTO portfolio_templates
+                (firm_name, portfolio_url, template, record_count, last_yield, relearn_count, learned_at, applied_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                firm_name,
+                template.get('page_url'),
+                json.dumps({k: v for k, v in template.items() if k != 'relearn_count'}),
+                template.get('record_count'),
+                company_count,
+                relearn_count,
+                now,
+                now
+            ))
+            self.conn.commit()
+        except Exception as e:
+            print(f"[TEMPLATE] Error saving template for {firm_name}: {e}")
+
+    def record_applied(self, firm_name: str, company_count: int):
+        """Record a successful application of a stored template"""
+        if self.conn is None:
+            return
+
+        try:
+            self.conn.execute(
+                "UPDATE portfolio_templates SET last_yield = ?, applied_at = ? WHERE firm_name = ?",
+                (company_count, datetime.now(), firm_name)
+            )
+            self.conn.commit()
+        except Exception as e:
+            print(f"[TEMPLATE] Error updating template for {firm_name}: {e}")
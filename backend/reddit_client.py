@@ -0,0 +1,179 @@
+"""
+Celerio Scout - Reddit Client
+Runs PRAW off the event loop in a dedicated thread, searches one multireddit
+for many company names at once and bounds comment expansion per company
+"""
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, List
+from rate_limiter import check_rate_limit, get_wait_time
+
+# Searched together as one multireddit (r/SaaS+startups+...)
+REDDIT_SUBREDDITS = ['SaaS', 'startups', 'artificial', 'entrepreneur']
+
+# Company names per search request and the Reddit search query length cap
+REDDIT_BATCH_SIZE = 8
+REDDIT_QUERY_MAX_CHARS = 500
+
+# How long names are collected before a partial batch is searched (seconds)
+REDDIT_BATCH_WINDOW = 0.25
+
+# Submissions counted per company, and how many of them get their comments loaded
+REDDIT_SUBMISSIONS_PER_COMPANY = 10
+REDDIT_COMMENT_SUBMISSIONS = 3
+REDDIT_COMMENT_LIMIT = 10
+
+# Cache TTLs: companies with no Reddit presence are rechecked less often
+REDDIT_TTL_ACTIVE = 7200
+REDDIT_TTL_QUIET = 86400
+
+NO_MENTIONS = {
+    'reddit_mentions': 0,
+    'sentiment_score': 50.0
+}
+
+
+def reddit_ttl(result: Dict) -> int:
+    """Cache TTL for a company's Reddit result"""
+    return REDDIT_TTL_ACTIVE if result.get('reddit_mentions') else REDDIT_TTL_QUIET
+
+
+def mentions_result(total_mentions: float) -> Dict[str, float]:
+    """reddit_mentions / sentiment_score from a mention count"""
+    # Simple sentiment scoring
+    sentiment_score = 50.0
+    if total_mentions > 0:
+        sentiment_score = min(80, 50 + (total_mentions * 2))
+    return {
+        'reddit_mentions': int(total_mentions),
+        'sentiment_score': sentiment_score
+    }
+
+
+class RedditClient:
+    """Batched, non-blocking Reddit mention lookups over a PRAW instance"""
+
+    def __init__(self, reddit, batch_size: int = REDDIT_BATCH_SIZE, batch_window: float = REDDIT_BATCH_WINDOW):
+        self.reddit = reddit
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # PRAW is synchronous and not thread-safe - one worker keeps it off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reddit")
+        self._queue: List[str] = []
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle = None
+        self._flush_tasks = set()
+        self.search_requests = 0
+
+    async def mentions(self, company_name: str) -> Dict[str, float]:
+        """Mentions of a company; concurrent lookups share multireddit searches"""
+        name = ' '.join(company_name.replace('"', ' ').split())
+        if not self.reddit or len(name) < 2:
+            return dict(NO_MENTIONS)
+
+        key = name.lower()
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+
+        # Keep the OR query within Reddit's length limit
+        query_length = sum(len(queued) + 6 for queued in self._queue) + len(key)
+        if self._queue and query_length > REDDIT_QUERY_MAX_CHARS:
+            self._flush()
+        self._queue.append(key)
+
+        if len(self._queue) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """Search the queued names as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        names, self._queue = self._queue, []
+        if not names:
+            return
+        task = asyncio.ensure_future(self._resolve_batch(names))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _resolve_batch(self, names: List[str]):
+        """Run a batch search in the Reddit thread and settle the waiting lookups"""
+        # Check rate limit
+        if not check_rate_limit('reddit'):
+            await asyncio.sleep(get_wait_time('reddit'))
+
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._executor, self._search_batch, names)
+        except Exception as e:
+            print(f"Reddit API error: {e}")
+            results = {}
+
+        for name in names:
+            future = self._pending.pop(name, None)
+            if future is not None and not future.done():
+                future.set_result(results.get(name, dict(NO_MENTIONS)))
+
+    def _search_batch(self, names: List[str]) -> Dict[str, Dict]:
+        """One multireddit search for several names, attributed by name match (Reddit thread)"""
+        self.search_requests += 1
+        multireddit = self.reddit.subreddit('+'.join(REDDIT_SUBREDDITS))
+        query = ' OR '.join(f'"{name}"' for name in names)
+        patterns = {name: re.compile(r'\b' + re.escape(name) + r'\b') for name in names}
+
+        totals = {name: 0.0 for name in names}
+        submissions = {name: 0 for name in names}
+        expanded = {name: 0 for name in names}
+
+        limit = min(100, REDDIT_SUBMISSIONS_PER_COMPANY * len(names))
+        returned = 0
+        for submission in multireddit.search(query, limit=limit, sort='relevance'):
+            returned += 1
+            text = f"{submission.title} {getattr(submission, 'selftext', '')}".lower()
+            matched = [
+                name for name in names
+                if submissions[name] < REDDIT_SUBMISSIONS_PER_COMPANY and patterns[name].search(text)
+            ]
+            for name in matched:
+                totals[name] += 1
+                submissions[name] += 1
+
+            # Bounded comment expansion: top-level comments of the first few submissions only
+            expand = [name for name in matched if expanded[name] < REDDIT_COMMENT_SUBMISSIONS]
+            if not expand:
+                continue
+            try:
+                submission.comment_limit = REDDIT_COMMENT_LIMIT
+                submission.comments.replace_more(limit=0)
+                for comment in islice(submission.comments, REDDIT_COMMENT_LIMIT):
+                    body = comment.body.lower()
+                    for name in expand:
+                        if patterns[name].search(body):
+                            totals[name] += 0.5
+            except Exception:
+                pass
+            for name in expand:
+                expanded[name] += 1
+
+        results = {name: mentions_result(total) for name, total in totals.items()}
+
+        # A full result page may have been taken by one popular name - search the names
+        # it crowded out on their own rather than cache them as quiet
+        if returned >= limit and len(names) > 1:
+            for name in names:
+                if not submissions[name]:
+                    results.update(self._search_batch([name]))
+        return results
+
+    def close(self):
+        """Stop the Reddit thread"""
+        self._executor.shutdown(wait=False)
@@ -19,6 +19,10 @@ except ImportError:
     EnhancedPortfolioScraper = None
     PortfolioConfig = None
 
+from portfolio_templates import TemplateStore, template_selectors
+from portfolio_snapshots import PortfolioSnapshotStore, IncrementalRunStats, fetch_page_fingerprint
+from scrape_strategy import YIELD_DROP_RATIO
+
 
 async def scrape_all_vcs_comprehensive(db_conn) -> Dict[str, Dict]:
     """
@@ -30,6 +34,7 @@ async def scrape_all_vcs_comprehensive(db_conn) -> Dict[str, Dict]:
         'successful_scrapes': 0,
         'failed_scrapes': 0,
         'total_companies': 0,
+        'new_companies': 0,
         'vc_results': {}
     }
     
@@ -43,6 +48,9 @@ async def scrape_all_vcs_comprehensive(db_conn) -> Dict[str, Dict]:
     """).fetchall()
     
     results['total_vcs'] = len(vc_results)
+    template_store = TemplateStore(db_conn)
+    snapshot_store = PortfolioSnapshotStore(db_conn)
+    run_stats = IncrementalRunStats()
     print(f"\n{'='*80}")
     print(f"COMPREHENSIVE VC SCRAPING - {len(vc_results)} VCs")
     print(f"{'='*80}\n")
@@ -58,21 +66,32 @@ async def scrape_all_vcs_comprehensive(db_conn) -> Dict[str, Dict]:
             portfolio_url = row[1] or row[2]
             vc_type = row[3] or 'VC'
             
-            task = scrape_single_vc(firm_name, portfolio_url, vc_type)
+            task = scrape_vc_incremental(
+                firm_name, portfolio_url, vc_type, snapshot_store, template_store.get_template(firm_name)
+            )
             tasks.append((firm_name, task))
         
         # Execute batch in parallel
         for firm_name, task in tasks:
             try:
-                companies = await task
+                result = await task
+                # Companies are only reported here, not stored - nothing to wait for
+                snapshot_store.commit_snapshot(result)
+                run_stats.record(result)
+                companies = result['companies']
                 results['vc_results'][firm_name] = {
                     'companies': companies,
+                    'added': result['added'],
+                    'removed': result['removed'],
                     'count': len(companies),
-                    'status': 'success'
+                    'status': 'success',
+                    'snapshot_status': result['status']
                 }
                 results['successful_scrapes'] += 1
                 results['total_companies'] += len(companies)
-                print(f"✓ {firm_name}: {len(companies)} companies")
+                results['new_companies'] += len(result['added'])
+                print(f"✓ {firm_name}: {len(companies)} companies ({result['status']}, "
+                      f"+{len(result['added'])}/-{len(result['removed'])})")
             except Exception as e:
                 results['vc_results'][firm_name] = {
                     'companies': [],
@@ -87,11 +106,44 @@ async def scrape_all_vcs_comprehensive(db_conn) -> Dict[str, Dict]:
         if batch_start + batch_size < len(vc_results):
             await asyncio.sleep(2)
     
+    results['incremental'] = run_stats.as_dict()
+    run_stats.print_summary()
     return results
 
 
-async def scrape_single_vc(firm_name: str, portfolio_url: str, vc_type: str) -> List[Dict]:
-    """Scrape a single VC portfolio"""
+async def scrape_vc_incremental(
+    firm_name: str,
+    portfolio_url: str,
+    vc_type: str,
+    snapshot_store: PortfolioSnapshotStore,
+    template: Dict = None
+) -> Dict:
+    """
+    Scrape a VC portfolio unless its page is unchanged since the last snapshot
+    Returns {'status', 'companies', 'added', 'removed'} plus the staged 'snapshot'
+    (snapshot_store.commit_snapshot() stores it once the added companies are saved)
+    """
+    snapshot = snapshot_store.get_snapshot(portfolio_url)
+    
+    # A cheap HTTP fingerprint decides whether the full browser scrape is needed
+    content_hash = await fetch_page_fingerprint(portfolio_url) if portfolio_url else None
+    if snapshot_store.matches(snapshot, content_hash, 'http'):
+        return snapshot_store.unchanged_result(portfolio_url)
+    
+    companies = await scrape_single_vc(firm_name, portfolio_url, vc_type, template)
+    if not companies:
+        return {'status': 'failed', 'companies': [], 'added': [], 'removed': []}
+    
+    if snapshot and len(companies) < (snapshot.get('company_count') or 0) * YIELD_DROP_RATIO:
+        # Low yield - keep the snapshot rather than report the missed companies as removed
+        added, _ = snapshot_store.diff(snapshot, companies)
+        return {'status': 'partial', 'companies': companies, 'added': added, 'removed': []}
+    
+    return snapshot_store.stage_snapshot(portfolio_url, firm_name, content_hash, 'http', companies)
+
+
+async def scrape_single_vc(firm_name: str, portfolio_url: str, vc_type: str, template: Dict = None) -> List[Dict]:
+    """Scrape a single VC portfolio (using its learned extraction template when available)"""
     
     # Special handling for known VCs
     if firm_name == "Y Combinator":
@@ -114,6 +166,7 @@ async def scrape_single_vc(firm_name: str, portfolio_url: str, vc_type: str) ->
             name=firm_name,
             url=portfolio_url,
             scroll_type="infinite",  # Most use infinite scroll
+            company_selectors=template_selectors(template),
             max_companies=10000,  # NO LIMIT
             max_scroll_attempts=1000,  # Increased for comprehensive scraping
             scroll_wait_time=2.0,
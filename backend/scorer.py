@@ -4,20 +4,181 @@ Calculates Messaging, Motion, and Market vector scores
 """
 import asyncio
 import aiohttp
-import re
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from urllib.parse import urlparse
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Callable, Awaitable, AsyncIterator
 import textstat
 import json
 
+from homepage_fingerprint import extract_title_h1, homepage_features, match_homepage
+from domain_health import get_domain_health, is_known_dead
+from domain_canonical import get_domain_canonicalizer
+
+# Companies scored at once by score_companies
+DEFAULT_SCORING_CONCURRENCY = 20
+
+# Concurrent requests per signal source across a scoring batch
+DEFAULT_SOURCE_LIMITS = {
+    'homepage': 20,
+    'wayback': 4,
+    'linkedin': 4,
+    'traffic': 10,
+    'careers': 10,
+    'reddit': 16,  # names are batched into shared multireddit searches
+    'github': 40,  # lookups are coalesced into batched GraphQL queries
+    'enrichment': 10
+}
+
+# Component weights of each 3M vector (components are on a 0-100 scale)
+DEFAULT_WEIGHTS = {
+    'messaging': {'jargon': 0.4, 'positioning': 0.4, 'stability': 0.2},
+    'motion': {'traffic': 0.4, 'hiring': 0.4, 'ratio': 0.2},
+    'market': {'sentiment': 0.3, 'github': 0.4, 'activity': 0.3}
+}
+
+# Average vector score below which stall probability is high / medium
+DEFAULT_THRESHOLDS = {'stall_high': 40.0, 'stall_medium': 60.0}
+
+# Default time budget (seconds) for a /scan before partial scores are returned
+DEFAULT_SCAN_TIME_BUDGET = 15.0
+
+# Extra time signals that miss the scan deadline get to finish in the background
+LATE_SIGNAL_BUDGET = 120.0
+
+# Signal values used when a source fails or misses the scan deadline
+SIGNAL_DEFAULTS = {
+    'homepage': None,
+    'wayback': {},
+    'linkedin': {},
+    'traffic': {'traffic_score': 50.0, 'global_rank': 1000000},
+    'careers': {'hiring_status': 'unknown', 'sales_to_eng_ratio': 1.0},
+    'reddit': {'reddit_mentions': 0, 'sentiment_score': 50.0},
+    'github_org': None,
+    'github_stats': {'last_commit_days': 30, 'issue_velocity': 7, 'github_stars': 0}
+}
+
+
+class ScoringStats:
+    """Throughput and per-source latency for a scoring batch"""
+    
+    def __init__(self, source_limits: Optional[Dict[str, int]] = None):
+        self.source_limits = {**DEFAULT_SOURCE_LIMITS, **(source_limits or {})}
+        self.semaphores = {source: asyncio.Semaphore(limit) for source, limit in self.source_limits.items()}
+        self.source_seconds: Dict[str, float] = {}
+        self.source_calls: Dict[str, int] = {}
+        self.started_at = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.signals_cached = 0
+        self.signals_fetched = 0
+    
+    def cap_source_limits(self, source_limits: Optional[Dict[str, int]]):
+        """Lower per-source limits to the configured ones where those are tighter"""
+        for source, limit in (source_limits or {}).items():
+            current = self.source_limits.get(source)
+            if current is None or limit < current:
+                self.source_limits[source] = limit
+                self.semaphores[source] = asyncio.Semaphore(limit)
+    
+    def record_source(self, source: str, seconds: float):
+        """Add one source call's latency"""
+        self.source_seconds[source] = self.source_seconds.get(source, 0.0) + seconds
+        self.source_calls[source] = self.source_calls.get(source, 0) + 1
+    
+    def throughput_per_minute(self) -> float:
+        """Companies finished (scored or failed) per minute"""
+        elapsed = time.monotonic() - self.started_at
+        return (self.completed + self.failed) / elapsed * 60 if elapsed > 0 else 0.0
+    
+    def latency_share(self) -> Dict[str, float]:
+        """Share of total source latency spent in each source (0-1)"""
+        total = sum(self.source_seconds.values())
+        if not total:
+            return {}
+        return {source: round(seconds / total, 3) for source, seconds in
+                sorted(self.source_seconds.items(), key=lambda item: item[1], reverse=True)}
+    
+    def as_dict(self) -> Dict:
+        return {
+            'completed': self.completed,
+            'failed': self.failed,
+            'elapsed_seconds': round(time.monotonic() - self.started_at, 1),
+            'companies_per_minute': round(self.throughput_per_minute(), 1),
+            'source_latency_share': self.latency_share(),
+            'source_calls': dict(self.source_calls),
+            'signals_cached': self.signals_cached,
+            'signals_fetched': self.signals_fetched
+        }
+
+
+class ScanBudget:
+    """
+    Time budget for one scan. Scores are returned at the deadline; signals still
+    in flight may keep running until the hard deadline (deadline + late budget).
+    """
+    
+    def __init__(self, seconds: float, late_seconds: float = LATE_SIGNAL_BUDGET):
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + seconds
+        self.hard_deadline = self.deadline + late_seconds
+    
+    def remaining(self) -> float:
+        """Seconds until partial scores are returned"""
+        return max(self.deadline - time.monotonic(), 0.0)
+    
+    def remaining_hard(self) -> float:
+        """Seconds until any signal fetch is abandoned"""
+        return max(self.hard_deadline - time.monotonic(), 0.0)
+
+
+# Stats of the scoring batch the current task belongs to (None outside score_companies)
+_scoring_stats: ContextVar[Optional[ScoringStats]] = ContextVar('scoring_stats', default=None)
+
+# Budget of the scan the current task belongs to (None for unbounded scans)
+_scan_budget: ContextVar[Optional[ScanBudget]] = ContextVar('scan_budget', default=None)
+
+
+def budget_timeout(default: float) -> float:
+    """Per-request timeout capped by the current scan's remaining budget"""
+    budget = _scan_budget.get()
+    if budget is None:
+        return default
+    return max(min(default, budget.remaining_hard()), 0.1)
+
+
+@asynccontextmanager
+async def source_slot(source: str):
+    """Hold a per-source concurrency slot and record the call latency for the current batch"""
+    stats = _scoring_stats.get()
+    if stats is None or source not in stats.semaphores:
+        yield
+        return
+    
+    async with stats.semaphores[source]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            stats.record_source(source, time.monotonic() - started)
+
 async def fetch_url(session: aiohttp.ClientSession, url: str, timeout: int = 10) -> Optional[str]:
-    """Fetch URL content with timeout"""
+    """Fetch URL content with timeout (capped by the scan budget); known-dead hosts are skipped"""
+    health = get_domain_health()
+    if health.is_dead(url):
+        return None
+    request_timeout = budget_timeout(timeout)
     try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=request_timeout)) as response:
+            health.record_success(url, response.status)
             if response.status == 200:
                 return await response.text()
     except Exception as e:
         print(f"Error fetching {url}: {e}")
+        # A timeout cut short by the scan budget says nothing about the host
+        if request_timeout >= timeout or not isinstance(e, asyncio.TimeoutError):
+            health.record_fetch_error(url, e)
     return None
 
 async def check_web_traffic(domain: str) -> Dict[str, float]:
@@ -28,7 +189,8 @@ async def check_web_traffic(domain: str) -> Dict[str, float]:
     from osint_sources import get_traffic_estimate
     
     try:
-        return await get_traffic_estimate(domain)
+        async with source_slot('traffic'):
+            return await get_traffic_estimate(domain)
     except Exception as e:
         print(f"Traffic check error: {e}")
         return {
@@ -44,7 +206,8 @@ async def check_social_signals(company_name: str, domain: str) -> Dict[str, floa
     from osint_sources import get_reddit_mentions
     
     try:
-        return await get_reddit_mentions(company_name, domain)
+        async with source_slot('reddit'):
+            return await get_reddit_mentions(company_name, domain)
     except Exception as e:
         print(f"Social signals error: {e}")
         return {
@@ -52,18 +215,20 @@ async def check_social_signals(company_name: str, domain: str) -> Dict[str, floa
             'sentiment_score': 50.0
         }
 
-async def check_engineering_pulse(domain: str, company_name: str = "") -> Dict[str, float]:
-    """
-    Check GitHub activity and engineering velocity
-    Returns: last_commit_days, issue_velocity, github_stars
-    """
-    from osint_sources import fetch_github_org, get_github_stats
+async def fetch_github_org_signal(domain: str) -> Optional[str]:
+    """Find the GitHub organization for a domain"""
+    from osint_sources import fetch_github_org
+    
+    async with source_slot('github'):
+        return await fetch_github_org(domain)
+
+async def fetch_github_stats_signal(org_name: Optional[str]) -> Dict[str, float]:
+    """GitHub activity for an organization (defaults when no org was found)"""
+    from osint_sources import get_github_stats
     
-    # Try to find GitHub org
-    org_name = await fetch_github_org(domain)
     if org_name:
-        stats = await get_github_stats(org_name)
-        return stats
+        async with source_slot('github'):
+            return await get_github_stats(org_name)
     
     # Fallback to mock data
     return {
@@ -72,6 +237,14 @@ async def check_engineering_pulse(domain: str, company_name: str = "") -> Dict[s
         'github_stars': 0
     }
 
+async def check_engineering_pulse(domain: str, company_name: str = "") -> Dict[str, float]:
+    """
+    Check GitHub activity and engineering velocity
+    Returns: last_commit_days, issue_velocity, github_stars
+    """
+    org_name = await fetch_github_org_signal(domain)
+    return await fetch_github_stats_signal(org_name)
+
 async def check_hiring_signals(domain: str) -> Dict[str, Optional[str]]:
     """
     Check /careers page for hiring activity
@@ -80,7 +253,8 @@ async def check_hiring_signals(domain: str) -> Dict[str, Optional[str]]:
     from osint_sources import scrape_careers_page
     
     try:
-        return await scrape_careers_page(domain)
+        async with source_slot('careers'):
+            return await scrape_careers_page(domain)
     except Exception as e:
         print(f"Hiring signals error: {e}")
         return {
@@ -88,96 +262,95 @@ async def check_hiring_signals(domain: str) -> Dict[str, Optional[str]]:
             'sales_to_eng_ratio': 1.0
         }
 
-async def analyze_messaging(domain: str, company_name: str) -> Dict[str, float]:
-    """
-    Analyze messaging vector:
-    - H1 volatility (via Wayback Machine)
-    - Positioning consistency (title vs LinkedIn)
-    - Jargon density
-    """
-    from osint_sources import get_wayback_machine_snapshots, get_linkedin_company_data, fetch_homepage_with_crawl4ai
+async def fetch_homepage(domain: str) -> Optional[str]:
+    """Fetch homepage HTML, falling back to crawl4ai for JavaScript-heavy sites"""
+    from osint_sources import fetch_homepage_with_crawl4ai
     
-    async with aiohttp.ClientSession() as session:
-        # Try to fetch homepage
-        homepage_url = f"https://{domain}" if not domain.startswith('http') else domain
-        content = await fetch_url(session, homepage_url)
+    homepage_url = f"https://{domain}" if not domain.startswith('http') else domain
+    async with source_slot('homepage'):
+        async with aiohttp.ClientSession() as session:
+            content = await fetch_url(session, homepage_url)
         
         # If simple HTTP fetch fails, try crawl4ai for JavaScript-heavy sites
-        if not content:
+        # (a browser render needs a few seconds, so skip it once the budget is spent,
+        # and don't bother for hosts that don't answer at all)
+        budget = _scan_budget.get()
+        if not content and (budget is None or budget.remaining_hard() > 5) and not is_known_dead(homepage_url):
             content = await fetch_homepage_with_crawl4ai(homepage_url)
-        
-        if not content:
-            return {
-                'messaging_score': 50.0,
-                'h1_volatility': 0,
-                'positioning_consistency': 50.0,
-                'jargon_density': 0.05
-            }
-        
-        # Extract H1 and title
-        h1_match = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.IGNORECASE | re.DOTALL)
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-        
-        h1_text = h1_match.group(1).strip() if h1_match else ""
-        title_text = title_match.group(1).strip() if title_match else ""
-        
-        # Calculate jargon density (AI buzzwords)
-        ai_buzzwords = ['ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning', 
-                       'neural network', 'llm', 'gpt', 'transformer', 'generative']
-        all_text = (h1_text + " " + title_text).lower()
-        jargon_count = sum(1 for word in ai_buzzwords if word in all_text)
-        jargon_density = jargon_count / max(len(all_text.split()), 1)
-        
-        # Get Wayback Machine data for H1 volatility
-        wayback_data = await get_wayback_machine_snapshots(domain)
-        h1_volatility = wayback_data.get('h1_volatility', 0)
-        
-        # Get LinkedIn data for positioning consistency
-        linkedin_data = await get_linkedin_company_data(company_name, domain)
-        
-        # Positioning consistency (check if title and H1 are similar)
-        positioning_score = 50.0
-        if h1_text and title_text:
-            # Simple similarity check
-            h1_words = set(h1_text.lower().split())
-            title_words = set(title_text.lower().split())
-            if h1_words and title_words:
-                overlap = len(h1_words & title_words) / len(h1_words | title_words)
-                positioning_score = overlap * 100
-        
-        # If LinkedIn data available, enhance positioning score
-        if linkedin_data.get('industry'):
-            # Could compare LinkedIn industry with messaging positioning
-            positioning_score = min(100, positioning_score + 10)
-        
-        # Calculate messaging score
-        # High score = low jargon, high consistency, low volatility
-        messaging_score = (
-            (1 - min(jargon_density * 10, 1)) * 40 +  # Jargon penalty (max 40 points)
-            positioning_score * 0.4 +  # Consistency (max 40 points)
-            (1 - min(h1_volatility / 3, 1)) * 20  # Stability (max 20 points)
-        )
-        
+    return content
+
+async def fetch_wayback_signal(domain: str, previous: Optional[Dict] = None) -> Dict:
+    """Wayback Machine snapshot history (H1 volatility), incremental from a previous result"""
+    from osint_sources import get_wayback_machine_snapshots
+    
+    async with source_slot('wayback'):
+        return await get_wayback_machine_snapshots(domain, previous)
+
+async def fetch_linkedin_signal(company_name: str, domain: str) -> Dict:
+    """LinkedIn company data"""
+    from osint_sources import get_linkedin_company_data
+    
+    async with source_slot('linkedin'):
+        return await get_linkedin_company_data(company_name, domain)
+
+def compute_messaging(content: Optional[str], wayback_data: Dict, linkedin_data: Dict) -> Dict[str, float]:
+    """Messaging vector from homepage content, Wayback history and LinkedIn data"""
+    if not content:
         return {
-            'messaging_score': max(0, min(100, messaging_score)),
-            'h1_volatility': h1_volatility,
-            'positioning_consistency': positioning_score,
-            'jargon_density': jargon_density,
-            'wayback_snapshots': wayback_data.get('snapshot_count', 0)
+            'messaging_score': 50.0,
+            'h1_volatility': 0,
+            'positioning_consistency': 50.0,
+            'jargon_density': 0.05,
+            'homepage_fetched': False
         }
-
-async def analyze_motion(domain: str, company_name: str = "") -> Dict[str, float]:
-    """
-    Analyze motion vector:
-    - Traffic growth
-    - Hiring activity
-    - Sales velocity proxies
-    """
-    # Get signals
-    traffic_data = await check_web_traffic(domain)
-    hiring_data = await check_hiring_signals(domain)
     
-    # Calculate motion score
+    # Extract H1 and title
+    title_text, h1_text = extract_title_h1(content)
+    
+    # Calculate jargon density (AI buzzwords)
+    ai_buzzwords = ['ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning', 
+                   'neural network', 'llm', 'gpt', 'transformer', 'generative']
+    all_text = (h1_text + " " + title_text).lower()
+    jargon_count = sum(1 for word in ai_buzzwords if word in all_text)
+    jargon_density = jargon_count / max(len(all_text.split()), 1)
+    
+    # H1 volatility from Wayback Machine
+    h1_volatility = wayback_data.get('h1_volatility', 0)
+    
+    # Positioning consistency (check if title and H1 are similar)
+    positioning_score = 50.0
+    if h1_text and title_text:
+        # Simple similarity check
+        h1_words = set(h1_text.lower().split())
+        title_words = set(title_text.lower().split())
+        if h1_words and title_words:
+            overlap = len(h1_words & title_words) / len(h1_words | title_words)
+            positioning_score = overlap * 100
+    
+    # If LinkedIn data available, enhance positioning score
+    if linkedin_data.get('industry'):
+        # Could compare LinkedIn industry with messaging positioning
+        positioning_score = min(100, positioning_score + 10)
+    
+    # Calculate messaging score
+    # High score = low jargon, high consistency, low volatility
+    weights = DEFAULT_WEIGHTS['messaging']
+    messaging_score = (
+        (1 - min(jargon_density * 10, 1)) * 100 * weights['jargon'] +  # Jargon penalty
+        positioning_score * weights['positioning'] +  # Consistency
+        (1 - min(h1_volatility / 3, 1)) * 100 * weights['stability']  # Stability
+    )
+    
+    return {
+        'messaging_score': max(0, min(100, messaging_score)),
+        'h1_volatility': h1_volatility,
+        'positioning_consistency': positioning_score,
+        'jargon_density': jargon_density,
+        'wayback_snapshots': wayback_data.get('snapshot_count', 0)
+    }
+
+def compute_motion(traffic_data: Dict, hiring_data: Dict) -> Dict[str, float]:
+    """Motion vector from traffic and hiring signals"""
     traffic_score = traffic_data['traffic_score']
     
     # Hiring component
@@ -190,16 +363,19 @@ async def analyze_motion(domain: str, company_name: str = "") -> Dict[str, float
     # Sales to Eng ratio component
     ratio_score = 50.0
     ratio = hiring_data.get('sales_to_eng_ratio', 1.0)
-    if 0.5 <= ratio <= 2.0:  # Healthy range
+    if ratio is None:  # No engineering or sales openings - no evidence either way
+        pass
+    elif 0.5 <= ratio <= 2.0:  # Healthy range
         ratio_score = 70.0
     elif ratio > 3.0:  # Too many sales, not enough product
         ratio_score = 30.0
     
     # Motion score = weighted average
+    weights = DEFAULT_WEIGHTS['motion']
     motion_score = (
-        traffic_score * 0.4 +
-        hiring_score * 0.4 +
-        ratio_score * 0.2
+        traffic_score * weights['traffic'] +
+        hiring_score * weights['hiring'] +
+        ratio_score * weights['ratio']
     )
     
     return {
@@ -209,16 +385,8 @@ async def analyze_motion(domain: str, company_name: str = "") -> Dict[str, float
         'sales_to_eng_ratio': ratio
     }
 
-async def analyze_market(domain: str, company_name: str = "") -> Dict[str, float]:
-    """
-    Analyze market vector:
-    - PMF proxies (technographic churn, social sentiment)
-    - Unit economics proxies
-    """
-    # Get signals
-    social_data = await check_social_signals(company_name, domain)
-    eng_data = await check_engineering_pulse(domain, company_name)
-    
+def compute_market(social_data: Dict, eng_data: Dict) -> Dict[str, float]:
+    """Market vector from social sentiment and GitHub activity"""
     # Social sentiment component
     sentiment_score = social_data['sentiment_score']
     reddit_mentions = social_data['reddit_mentions']
@@ -242,10 +410,11 @@ async def analyze_market(domain: str, company_name: str = "") -> Dict[str, float
         activity_score = 20.0
     
     # Market score = weighted average
+    weights = DEFAULT_WEIGHTS['market']
     market_score = (
-        sentiment_score * 0.3 +
-        github_score * 0.4 +
-        activity_score * 0.3
+        sentiment_score * weights['sentiment'] +
+        github_score * weights['github'] +
+        activity_score * weights['activity']
     )
     
     return {
@@ -256,30 +425,332 @@ async def analyze_market(domain: str, company_name: str = "") -> Dict[str, float
         'last_commit_days': eng_data['last_commit_days']
     }
 
+
+class SignalGraph:
+    """
+    Dependency graph of signal fetches and vector formulas.
+    Every node starts as soon as its dependencies resolve, so independent
+    sources run in parallel and a vector is computed once its inputs arrive.
+    """
+    
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.preloaded: Dict[str, object] = {}
+    
+    def add(self, name: str, fn: Callable, deps: List[str] = None, default=None, formula: bool = False):
+        """
+        Add a node; fn (sync or async) receives the dependency results in order.
+        default is used as the node result if fn raises or misses the deadline.
+        Formula nodes are pure and can be evaluated over partial inputs.
+        """
+        for dep in deps or []:
+            if dep not in self.nodes:
+                raise ValueError(f"Signal node {name} depends on unknown node {dep}")
+        self.nodes[name] = {'fn': fn, 'deps': list(deps or []), 'default': default, 'formula': formula}
+    
+    def preload(self, values: Dict[str, object]):
+        """Resolve source nodes from known values (e.g. fresh cached signals) instead of fetching"""
+        for name, value in values.items():
+            if name in self.nodes and not self.nodes[name]['formula']:
+                self.preloaded[name] = value
+    
+    def sources(self) -> List[str]:
+        """Names of the source (non-formula) nodes"""
+        return [name for name, node in self.nodes.items() if not node['formula']]
+    
+    def _closure(self, targets: List[str]) -> List[str]:
+        """Targets plus everything they depend on, in insertion (dependency) order"""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                # A preloaded node needs nothing fetched for it
+                if name not in self.preloaded:
+                    stack.extend(self.nodes[name]['deps'])
+        return [name for name in self.nodes if name in needed]
+    
+    def _start(self, order: List[str], budget: Optional[ScanBudget] = None) -> Dict[str, asyncio.Task]:
+        """Create one task per node; each awaits its dependencies before running"""
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def run_node(name: str):
+            if name in self.preloaded:
+                return self.preloaded[name]
+            node = self.nodes[name]
+            inputs = [await tasks[dep] for dep in node['deps']]
+            try:
+                result = node['fn'](*inputs)
+                if asyncio.iscoroutine(result):
+                    if budget is not None:
+                        result = await asyncio.wait_for(result, timeout=budget.remaining_hard())
+                    else:
+                        result = await result
+                return result
+            except Exception as e:
+                print(f"Signal {name} error: {e!r}")
+                return node['default']
+        
+        token = _scan_budget.set(budget)
+        try:
+            for name in order:
+                tasks[name] = asyncio.create_task(run_node(name))
+        finally:
+            _scan_budget.reset(token)
+        return tasks
+    
+    async def run(self, targets: Optional[List[str]] = None) -> Dict[str, object]:
+        """Run the graph (or the subgraph needed for targets) and return results by node"""
+        order = self._closure(targets) if targets else list(self.nodes)
+        tasks = self._start(order)
+        results = await asyncio.gather(*tasks.values())
+        return dict(zip(tasks.keys(), results))
+    
+    async def run_with_deadline(self, budget: ScanBudget, targets: Optional[List[str]] = None):
+        """
+        Run the graph until the budget's deadline.
+        Returns (results, missing, late) - results hold every node, with defaults for
+        sources that have not resolved and formulas evaluated over what has arrived;
+        missing lists the unresolved source nodes; late is a future for the complete
+        results (None when nothing is missing).
+        """
+        order = self._closure(targets) if targets else list(self.nodes)
+        tasks = self._start(order, budget)
+        await asyncio.wait(list(tasks.values()), timeout=budget.remaining())
+        
+        results = {}
+        missing = []
+        for name in order:
+            node = self.nodes[name]
+            if tasks[name].done():
+                results[name] = tasks[name].result()
+            elif node['formula']:
+                # Evaluate the formula over whatever its inputs resolved to
+                results[name] = node['fn'](*[results[dep] for dep in node['deps']])
+            else:
+                results[name] = node['default']
+                missing.append(name)
+        
+        if not missing:
+            return results, [], None
+        
+        async def complete():
+            values = await asyncio.gather(*tasks.values())
+            return dict(zip(tasks.keys(), values))
+        
+        return results, missing, asyncio.ensure_future(complete())
+
+
+# Sources only needed to re-derive messaging; skipped while the homepage fingerprint matches
+FINGERPRINT_GATED_SOURCES = ['wayback', 'linkedin']
+
+def build_signal_graph(
+    domain: str,
+    company_name: str,
+    previous_fingerprint: Optional[Dict] = None,
+    previous_wayback: Optional[Dict] = None
+) -> SignalGraph:
+    """
+    Signal DAG for one company: 8 source fetches feeding the 3 vector formulas.
+    With the previous homepage fingerprint, Wayback and LinkedIn wait for the homepage
+    and are only fetched (and messaging only recomputed) when the page drifted.
+    With the previous Wayback result only newer CDX entries are requested.
+    """
+    graph = SignalGraph()
+    
+    # Source fetches - independent except github stats, which needs the org
+    graph.add('homepage', lambda: fetch_homepage(domain), default=SIGNAL_DEFAULTS['homepage'])
+    if previous_fingerprint:
+        # Pure comparison, not a source: never reported as a missing signal
+        graph.add('homepage_match', lambda content: match_homepage(previous_fingerprint, content),
+                  deps=['homepage'], formula=True)
+        graph.add('wayback', lambda match: match['wayback'] if match else fetch_wayback_signal(domain, previous_wayback),
+                  deps=['homepage_match'], default=SIGNAL_DEFAULTS['wayback'])
+        graph.add('linkedin', lambda match: SIGNAL_DEFAULTS['linkedin'] if match else fetch_linkedin_signal(company_name, domain),
+                  deps=['homepage_match'], default=SIGNAL_DEFAULTS['linkedin'])
+    else:
+        graph.add('wayback', lambda: fetch_wayback_signal(domain, previous_wayback), default=SIGNAL_DEFAULTS['wayback'])
+        graph.add('linkedin', lambda: fetch_linkedin_signal(company_name, domain), default=SIGNAL_DEFAULTS['linkedin'])
+    graph.add('traffic', lambda: check_web_traffic(domain), default=SIGNAL_DEFAULTS['traffic'])
+    graph.add('careers', lambda: check_hiring_signals(domain), default=SIGNAL_DEFAULTS['careers'])
+    graph.add('reddit', lambda: check_social_signals(company_name, domain), default=SIGNAL_DEFAULTS['reddit'])
+    graph.add('github_org', lambda: fetch_github_org_signal(domain), default=SIGNAL_DEFAULTS['github_org'])
+    graph.add('github_stats', fetch_github_stats_signal, deps=['github_org'], default=SIGNAL_DEFAULTS['github_stats'])
+    
+    # Vector formulas
+    if previous_fingerprint:
+        graph.add('messaging', _messaging_or_previous, deps=['homepage', 'wayback', 'linkedin', 'homepage_match'], formula=True)
+    else:
+        graph.add('messaging', compute_messaging, deps=['homepage', 'wayback', 'linkedin'], formula=True)
+    graph.add('motion', compute_motion, deps=['traffic', 'careers'], formula=True)
+    graph.add('market', compute_market, deps=['reddit', 'github_stats'], formula=True)
+    return graph
+
+def _messaging_or_previous(content: Optional[str], wayback_data: Dict, linkedin_data: Dict, match: Optional[Dict]) -> Dict:
+    """Previous messaging signals for an unchanged homepage, otherwise a fresh computation"""
+    if match and match.get('messaging'):
+        return {**match['messaging'], 'homepage_unchanged': True}
+    return compute_messaging(content, wayback_data, linkedin_data)
+
+async def analyze_messaging(domain: str, company_name: str) -> Dict[str, float]:
+    """
+    Analyze messaging vector:
+    - H1 volatility (via Wayback Machine)
+    - Positioning consistency (title vs LinkedIn)
+    - Jargon density
+    """
+    results = await build_signal_graph(domain, company_name).run(['messaging'])
+    return results['messaging']
+
+async def analyze_motion(domain: str, company_name: str = "") -> Dict[str, float]:
+    """
+    Analyze motion vector:
+    - Traffic growth
+    - Hiring activity
+    - Sales velocity proxies
+    """
+    results = await build_signal_graph(domain, company_name).run(['motion'])
+    return results['motion']
+
+async def analyze_market(domain: str, company_name: str = "") -> Dict[str, float]:
+    """
+    Analyze market vector:
+    - PMF proxies (technographic churn, social sentiment)
+    - Unit economics proxies
+    """
+    results = await build_signal_graph(domain, company_name).run(['market'])
+    return results['market']
+
 def calculate_stall_probability(messaging_score: float, motion_score: float, market_score: float) -> str:
     """Calculate overall stall probability"""
     avg_score = (messaging_score + motion_score + market_score) / 3
     
-    if avg_score < 40:
+    if avg_score < DEFAULT_THRESHOLDS['stall_high']:
         return "high"
-    elif avg_score < 60:
+    elif avg_score < DEFAULT_THRESHOLDS['stall_medium']:
         return "medium"
     else:
         return "low"
 
-async def calculate_scores(domain: str, company_name: str) -> Dict:
+# Background tasks updating scans with late signals (kept referenced until done)
+_late_signal_tasks = set()
+
+# Graph nodes that produce the score dictionary
+VECTOR_NODES = ['messaging', 'motion', 'market']
+
+async def calculate_scores(
+    domain: str,
+    company_name: str,
+    time_budget: Optional[float] = None,
+    on_late_scores: Optional[Callable[[Dict], Awaitable]] = None,
+    signal_store=None
+) -> Dict:
     """
-    Main scoring function - runs all analyses in parallel
+    Main scoring function - runs every signal fetch as one dependency graph
     Returns complete score dictionary
-    """
-    # Run all analyses concurrently
-    messaging_task = analyze_messaging(domain, company_name)
-    motion_task = analyze_motion(domain, company_name)
-    market_task = analyze_market(domain, company_name)
     
-    messaging_result, motion_result, market_result = await asyncio.gather(
-        messaging_task, motion_task, market_task
+    With a time_budget (seconds) the scores are computed from the signals that arrived
+    by the deadline; unresolved sources are listed in signals['missing_signals'].
+    They keep running in the background and on_late_scores(scores) is awaited with
+    the complete scores once they finish (without a callback they are cancelled).
+    
+    With a signal_store (CompanySignalStore), fresh stored signals are reused and only
+    stale sources are fetched; fetched signals are written back to the store. The store
+    also keeps the homepage fingerprint, so an unchanged homepage reuses the previous
+    messaging signals without calling Wayback or LinkedIn.
+    """
+    records = signal_store.get_signals(domain) if signal_store is not None else {}
+    stored = signal_store.fresh_signals(domain, records) if signal_store is not None else {}
+    graph = build_signal_graph(
+        domain, company_name,
+        previous_fingerprint=stored.get('homepage_fingerprint'),
+        # Stale Wayback history still saves refetching the CDX entries it already has
+        previous_wayback=(records.get('wayback') or {}).get('value')
     )
+    graph.preload(stored)
+    
+    if time_budget is None:
+        results = await graph.run(VECTOR_NODES)
+        _store_fetched_signals(signal_store, domain, graph, results)
+        return _assemble_scores(results, graph if signal_store is not None else None)
+    
+    results, missing, late = await graph.run_with_deadline(ScanBudget(time_budget), VECTOR_NODES)
+    _store_fetched_signals(signal_store, domain, graph, results, exclude=missing)
+    scores = _assemble_scores(results, graph if signal_store is not None else None)
+    if not missing:
+        return scores
+    
+    scores['signals']['missing_signals'] = missing
+    scores['signals']['partial'] = True
+    print(f"Scan of {domain} hit its {time_budget}s budget, missing signals: {', '.join(missing)}")
+    
+    if on_late_scores is None:
+        late.cancel()
+        return scores
+    
+    async def complete_late_signals():
+        try:
+            final_results = await late
+            _store_fetched_signals(signal_store, domain, graph, final_results, only=missing)
+            final_scores = _assemble_scores(final_results, graph if signal_store is not None else None)
+            final_scores['signals']['late_signals'] = missing
+            await on_late_scores(final_scores)
+        except Exception as e:
+            print(f"Error completing late signals for {domain}: {e}")
+    
+    task = asyncio.create_task(complete_late_signals())
+    _late_signal_tasks.add(task)
+    task.add_done_callback(_late_signal_tasks.discard)
+    return scores
+
+def _reused_sources(graph: SignalGraph, results: Dict) -> List[str]:
+    """Sources not fetched in this run: preloaded from the store or skipped for an unchanged homepage"""
+    reused = set(graph.preloaded)
+    if results.get('homepage_match'):
+        reused.update(FINGERPRINT_GATED_SOURCES)
+    return sorted(reused)
+
+def _store_fetched_signals(
+    signal_store,
+    domain: str,
+    graph: SignalGraph,
+    results: Dict,
+    exclude: List[str] = (),
+    only: Optional[List[str]] = None
+):
+    """
+    Write the signals fetched in this run (and a new homepage fingerprint) back to the signal store.
+    exclude lists unresolved sources; only restricts the write to some sources (late signals).
+    """
+    if signal_store is None:
+        return
+    reused = _reused_sources(graph, results)
+    fetched = {
+        name: results[name] for name in graph.sources()
+        if name in results and name not in reused and name not in exclude
+        and (only is None or name in only)
+    }
+    
+    # Fingerprint the homepage messaging was derived from, unless it matched the previous one
+    # (keeping the original fingerprint time so messaging is fully re-derived once it expires).
+    # Messaging computed from a defaulted source must not be frozen with it.
+    content = results.get('homepage')
+    messaging_inputs = ['homepage'] + FINGERPRINT_GATED_SOURCES
+    if content and not results.get('homepage_match') and not any(name in exclude for name in messaging_inputs):
+        fetched['homepage_fingerprint'] = {
+            **homepage_features(content),
+            'messaging': results['messaging'],
+            # The version history itself lives in the wayback signal
+            'wayback': {key: value for key, value in (results['wayback'] or {}).items() if key != 'versions'}
+        }
+    signal_store.save_signals(domain, fetched, SIGNAL_DEFAULTS)
+
+def _assemble_scores(results: Dict, graph: Optional[SignalGraph] = None) -> Dict:
+    """Combine vector results into the score dictionary"""
+    messaging_result = results['messaging']
+    motion_result = results['motion']
+    market_result = results['market']
     
     # Extract scores
     messaging_score = messaging_result['messaging_score']
@@ -295,6 +766,14 @@ async def calculate_scores(domain: str, company_name: str) -> Dict:
         'motion': motion_result,
         'market': market_result
     }
+    if graph is not None:
+        # Which sources came from the signal store (or were skipped) and which were fetched
+        reused = _reused_sources(graph, results)
+        signals['cached_signals'] = reused
+        signals['fetched_signals'] = [
+            name for name in graph.sources()
+            if name in results and name not in reused
+        ]
     
     return {
         'messaging_score': round(messaging_score, 2),
@@ -304,27 +783,104 @@ async def calculate_scores(domain: str, company_name: str) -> Dict:
         'signals': signals
     }
 
-async def scan_company(url: str) -> Dict:
+async def score_companies(
+    companies: List[Dict],
+    concurrency: int = DEFAULT_SCORING_CONCURRENCY,
+    source_limits: Optional[Dict[str, int]] = None,
+    enrich: Optional[Callable[[Dict, str], Awaitable[Dict]]] = None,
+    stats: Optional[ScoringStats] = None,
+    signal_store=None
+) -> AsyncIterator[Dict]:
+    """
+    Score a batch of companies concurrently.
+    At most `concurrency` companies are in flight, and each signal source is capped
+    by its per-source limit across the whole batch. Results are yielded as they finish:
+    {'company', 'domain', 'scores', 'enriched', 'error', 'duration_ms'}.
+    A failing company yields an error result instead of aborting the batch.
+    Pass a ScoringStats to read throughput and per-source latency share afterwards,
+    and a CompanySignalStore to refetch only stale signals.
+    """
+    if stats is None:
+        stats = ScoringStats(source_limits)
+    else:
+        stats.cap_source_limits(source_limits)
+    global_limit = asyncio.Semaphore(max(concurrency, 1))
+    
+    async def score_one(company: Dict) -> Dict:
+        async with global_limit:
+            started = time.monotonic()
+            domain = (company.get('domain') or '').strip()
+            result = {'company': company, 'domain': domain, 'scores': None, 'enriched': None, 'error': None}
+            try:
+                if enrich:
+                    async with source_slot('enrichment'):
+                        result['enriched'] = await enrich(company, domain)
+                result['scores'] = await calculate_scores(
+                    domain, company.get('name', ''), signal_store=signal_store
+                )
+                signals = result['scores']['signals']
+                stats.signals_cached += len(signals.get('cached_signals', []))
+                stats.signals_fetched += len(signals.get('fetched_signals', []))
+                stats.completed += 1
+            except Exception as e:
+                result['error'] = str(e)
+                stats.failed += 1
+            result['duration_ms'] = int((time.monotonic() - started) * 1000)
+            return result
+    
+    token = _scoring_stats.set(stats)
+    try:
+        tasks = [asyncio.create_task(score_one(company)) for company in companies]
+    finally:
+        _scoring_stats.reset(token)
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Consumer stopped early - don't leave orphaned scans running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+async def scan_company(
+    url: str,
+    time_budget: Optional[float] = None,
+    on_late_scores: Optional[Callable[[Dict], Awaitable]] = None,
+    signal_store=None
+) -> Dict:
     """
     Scan a single company URL and return complete analysis
+    With a time_budget, partial scores are returned at the deadline and
+    on_late_scores(company) is awaited once the late signals complete.
+    With a signal_store, only stale signals are refetched.
     """
     from datetime import datetime
     
-    parsed = urlparse(url)
-    domain = parsed.netloc or parsed.path.split('/')[0]
+    domain = get_domain_canonicalizer().canonicalize(url)
     if not domain:
-        domain = url
+        parsed = urlparse(url)
+        domain = parsed.netloc or parsed.path.split('/')[0] or url
     
     # Extract company name from domain
     company_name = domain.split('.')[0].title()
     
+    company_id = hash(domain) % 1000000
+    
+    async def on_late(final_scores: Dict):
+        await on_late_scores({'id': company_id, 'name': company_name, 'domain': domain, **final_scores})
+    
     # Calculate scores
-    scores = await calculate_scores(domain, company_name)
+    scores = await calculate_scores(
+        domain, company_name, time_budget=time_budget,
+        on_late_scores=on_late if on_late_scores else None,
+        signal_store=signal_store
+    )
     
     now = datetime.now()
     
     return {
-        'id': hash(domain) % 1000000,  # Simple hash-based ID
+        'id': company_id,  # Simple hash-based ID
         'name': company_name,
         'domain': domain,
         'yc_batch': '',  # Empty for scanned companies
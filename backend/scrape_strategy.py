@@ -0,0 +1,200 @@
+"""
+Celerio Scout - Portfolio Fetch Strategy Memory
+Stores the fetch strategy that last worked for each portfolio URL
+"""
+import json
+from typing import Dict, List, Optional
+from datetime import datetime
+
+# Fetch strategies ordered from cheapest to most expensive
+STRATEGY_COST_ORDER = ['http', 'crawl4ai', 'playwright']
+
+# Order used when nothing is known about a portfolio yet (most reliable first)
+DEFAULT_STRATEGY_ORDER = ['playwright', 'crawl4ai', 'http']
+
+# Escalate to the next strategy when yield falls below this share of the typical count
+YIELD_DROP_RATIO = 0.6
+
+# Weight of the latest run when updating the typical company count
+TYPICAL_COUNT_SMOOTHING = 0.3
+
+
+class StrategyProfileStore:
+    """Persists per-portfolio fetch strategy profiles in DuckDB"""
+
+    def __init__(self, db_conn=None):
+        # Without a connection profiles live only for the lifetime of this store
+        self.conn = db_conn
+        self._profiles: Dict[str, Dict] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure portfolio_strategy_profiles table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS portfolio_strategy_profiles (
+                portfolio_url TEXT PRIMARY KEY,
+                firm_name TEXT,
+                rendering_method TEXT,
+                framework TEXT,
+                best_strategy TEXT,  -- 'http', 'crawl4ai', 'playwright'
+                matched_selectors JSON,
+                typical_company_count INTEGER,
+                last_company_count INTEGER,
+                last_duration_ms INTEGER,
+                success_count INTEGER DEFAULT 0,
+                failure_count INTEGER DEFAULT 0,
+                updated_at TIMESTAMP
+            )
+        """)
+
+    def get_profile(self, portfolio_url: str) -> Optional[Dict]:
+        """Get the stored strategy profile for a portfolio URL"""
+        if portfolio_url in self._profiles:
+            return self._profiles[portfolio_url]
+
+        if self.conn is None:
+            return None
+
+        try:
+            row = self.conn.execute("""
+                SELECT portfolio_url, firm_name, rendering_method, framework, best_strategy,
+                       matched_selectors, typical_company_count, last_company_count,
+                       last_duration_ms, success_count, failure_count, updated_at
+                FROM portfolio_strategy_profiles
+                WHERE portfolio_url = ?
+            """, (portfolio_url,)).fetchone()
+        except Exception as e:
+            print(f"[STRATEGY] Error loading profile for {portfolio_url}: {e}")
+            return None
+
+        if not row:
+            return None
+
+        profile = {
+            'portfolio_url': row[0],
+            'firm_name': row[1],
+            'rendering_method': row[2],
+            'framework': row[3],
+            'best_strategy': row[4],
+            'matched_selectors': json.loads(row[5]) if row[5] else {},
+            'typical_company_count': row[6] or 0,
+            'last_company_count': row[7] or 0,
+            'last_duration_ms': row[8],
+            'success_count': row[9] or 0,
+            'failure_count': row[10] or 0,
+            'updated_at': row[11]
+        }
+        self._profiles[portfolio_url] = profile
+        return profile
+
+    def plan_strategies(self, profile: Optional[Dict], available: List[str]) -> List[str]:
+        """
+        Order fetch strategies for a scrape.
+        Without a profile the default cascade is used. With one, the remembered
+        strategy goes first, followed by more expensive strategies (escalation)
+        and finally cheaper ones as a last resort.
+        """
+        if not profile or profile.get('best_strategy') not in STRATEGY_COST_ORDER:
+            return [s for s in DEFAULT_STRATEGY_ORDER if s in available]
+
+        start = profile['best_strategy']
+
+        # Server-rendered pages usually work over plain HTTP - try the cheapest option first
+        if profile.get('rendering_method') == 'server-side' and 'http' in available:
+            start = 'http'
+
+        start_idx = STRATEGY_COST_ORDER.index(start)
+        escalation = STRATEGY_COST_ORDER[start_idx + 1:]
+        fallback = list(reversed(STRATEGY_COST_ORDER[:start_idx]))
+
+        return [s for s in [start] + escalation + fallback if s in available]
+
+    def is_yield_acceptable(self, profile: Optional[Dict], company_count: int) -> bool:
+        """Check whether a strategy's yield is in line with what the portfolio usually returns"""
+        if company_count <= 0:
+            return False
+        if not profile or not profile.get('typical_company_count'):
+            return True
+        return company_count >= profile['typical_company_count'] * YIELD_DROP_RATIO
+
+    def record_success(
+        self,
+        portfolio_url: str,
+        firm_name: str,
+        strategy: str,
+        company_count: int,
+        duration_ms: int,
+        technical_details: Optional[Dict] = None
+    ):
+        """Record the strategy that produced companies for a portfolio"""
+        previous = self.get_profile(portfolio_url) or {}
+        technical_details = technical_details or {}
+
+        typical = previous.get('typical_company_count') or 0
+        if typical:
+            typical = int(round(typical * (1 - TYPICAL_COUNT_SMOOTHING) + company_count * TYPICAL_COUNT_SMOOTHING))
+        else:
+            typical = company_count
+
+        # Keep previously detected page details when this strategy could not inspect the page
+        profile = {
+            'portfolio_url': portfolio_url,
+            'firm_name': firm_name,
+            'rendering_method': technical_details.get('rendering_method') or previous.get('rendering_method'),
+            'framework': technical_details.get('framework') or previous.get('framework'),
+            'best_strategy': strategy,
+            'matched_selectors': technical_details.get('selectors') or previous.get('matched_selectors') or {},
+            'typical_company_count': typical,
+            'last_company_count': company_count,
+            'last_duration_ms': duration_ms,
+            'success_count': (previous.get('success_count') or 0) + 1,
+            'failure_count': previous.get('failure_count') or 0,
+            'updated_at': datetime.now()
+        }
+        self._save(profile)
+
+    def record_failure(self, portfolio_url: str, firm_name: str, strategy: str):
+        """Record a scrape where the remembered strategy no longer yields companies"""
+        previous = self.get_profile(portfolio_url)
+        if not previous:
+            return
+
+        profile = {
+            **previous,
+            'failure_count': (previous.get('failure_count') or 0) + 1,
+            'updated_at': datetime.now()
+        }
+        self._save(profile)
+
+    def _save(self, profile: Dict):
+        """Write a profile to the in-memory cache and the database"""
+        self._profiles[profile['portfolio_url']] = profile
+
+        if self.conn is None:
+            return
+
+        try:
+            self.conn.execute("DELETE FROM portfolio_strategy_profiles WHERE portfolio_url = ?", (profile['portfolio_url'],))
+            self.conn.execute("""
+                INSERT INTO portfolio_strategy_profiles
+                (portfolio_url, firm_name, rendering_method, framework, best_strategy, matched_selectors,
+                 typical_company_count, last_company_count, last_duration_ms, success_count, failure_count, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                profile['portfolio_url'],
+                profile.get('firm_name'),
+                profile.get('rendering_method'),
+                profile.get('framework'),
+                profile.get('best_strategy'),
+                json.dumps(profile.get('matched_selectors') or {}),
+                profile.get('typical_company_count'),
+                profile.get('last_company_count'),
+                profile.get('last_duration_ms'),
+                profile.get('success_count', 0),
+                profile.get('failure_count', 0),
+                profile.get('updated_at')
+            ))
+            self.conn.commit()
+        except Exception as e:
+            print(f"[STRATEGY] Error saving profile for {profile['portfolio_url']}: {e}")
@@ -0,0 +1,192 @@
+"""
+Celerio Scout - Screenshot Pipeline
+Sampled, off-the-hot-path screenshot capture for observable scrapers.
+Thumbnails are encoded in a worker thread, stored content-addressed and
+referenced from progress events by URL instead of inline bytes
+"""
+import asyncio
+import hashlib
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+SCREENSHOTS_DIR = Path("artifacts/portfolio_scraping/screenshots")
+
+# URL prefix screenshots are served under (see portfolio_scraping_monitor)
+SCREENSHOT_URL_PREFIX = "/api/portfolio-scraping/screenshots"
+
+SCREENSHOT_MODES = ('off', 'first_page', 'every_n')
+
+# Content-addressed screenshot filenames: <sha256>.<ext>
+SCREENSHOT_FILENAME = re.compile(r'^([0-9a-f]{64})\.(webp|jpg)$')
+
+
+class ScreenshotConfig:
+    """Sampling, encoding and retention settings for scraper screenshots"""
+
+    def __init__(
+        self,
+        mode: str = 'every_n',
+        every_n: int = 10,
+        thumbnail_width: int = 480,
+        image_format: str = 'webp',
+        quality: int = 60,
+        max_files: int = 500,
+        max_bytes: int = 50 * 1024 * 1024,
+        max_pending: int = 2
+    ):
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"Unknown screenshot mode: {mode} (expected one of {SCREENSHOT_MODES})")
+        self.mode = mode
+        self.every_n = max(every_n, 1)
+        self.thumbnail_width = thumbnail_width
+        # WebP needs Pillow; without it Playwright's own JPEG encoder is used
+        self.image_format = image_format if PILLOW_AVAILABLE else 'jpeg'
+        self.quality = quality
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+
+
+class ScreenshotPipeline:
+    """Captures sampled screenshots and stores thumbnails without blocking the scrape"""
+
+    def __init__(self, config: Optional[ScreenshotConfig] = None, screenshots_dir: Path = SCREENSHOTS_DIR):
+        self.config = config or ScreenshotConfig()
+        self.screenshots_dir = screenshots_dir
+        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        # A single worker keeps encoding off the event loop and serializes retention pruning
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshots")
+        self._pending = set()
+        self.captured_count = 0
+        self.skipped_count = 0
+
+    def should_capture(self, step: Optional[int], every_n: Optional[int] = None) -> bool:
+        """
+        Decide whether to capture at a scrape step.
+        step 0 is the first page, step None the final state and N the Nth scroll/click.
+        """
+        mode = self.config.mode
+        if mode == 'off':
+            return False
+        if mode == 'first_page':
+            return step == 0
+        if step is None or step == 0:
+            return True
+        return step % (every_n or self.config.every_n) == 0
+
+    async def capture(self, page, on_stored) -> bool:
+        """
+        Capture the viewport and hand encoding/storage to the worker thread.
+        on_stored(info) is awaited with the stored screenshot info once it is written.
+        Returns False if the sample was dropped.
+        """
+        if len(self._pending) >= self.config.max_pending:
+            # Encoder is behind - drop this sample rather than slow the scrape
+            self.skipped_count += 1
+            return False
+
+        # Playwright encodes JPEG much faster than PNG; Pillow re-encodes to the thumbnail format
+        raw_bytes = await page.screenshot(full_page=False, type='jpeg', quality=self.config.quality)
+        page_url = page.url
+
+        task = asyncio.create_task(self._store(raw_bytes, page_url, on_stored))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return True
+
+    async def _store(self, raw_bytes: bytes, page_url: str, on_stored):
+        """Encode and store a screenshot in the worker thread, then report it"""
+        try:
+            loop = asyncio.get_running_loop()
+            info = await loop.run_in_executor(self._executor, self._encode_and_write, raw_bytes)
+            info['page_url'] = page_url
+            self.captured_count += 1
+            await on_stored(info)
+        except Exception as e:
+            print(f"[SCREENSHOTS] Error storing screenshot: {e}")
+
+    def _encode_and_write(self, raw_bytes: bytes) -> Dict:
+        """Build the thumbnail, write it content-addressed and enforce retention (worker thread)"""
+        width = height = None
+        if PILLOW_AVAILABLE:
+            with Image.open(io.BytesIO(raw_bytes)) as image:
+                image = image.convert('RGB')
+                image.thumbnail((self.config.thumbnail_width, self.config.thumbnail_width * 4))
+                width, height = image.size
+                buffer = io.BytesIO()
+                pil_format = 'WEBP' if self.config.image_format == 'webp' else 'JPEG'
+                image.save(buffer, format=pil_format, quality=self.config.quality)
+                data = buffer.getvalue()
+        else:
+            data = raw_bytes
+
+        extension = 'webp' if self.config.image_format == 'webp' else 'jpg'
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{digest}.{extension}"
+        filepath = self.screenshots_dir / filename
+
+        if filepath.exists():
+            # Identical frame already stored - refresh it so retention keeps it
+            os.utime(filepath)
+        else:
+            tmp_path = filepath.with_suffix('.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, filepath)
+            self._prune()
+
+        return {
+            'filename': filename,
+            'screenshot_url': f"{SCREENSHOT_URL_PREFIX}/{filename}",
+            'bytes': len(data),
+            'width': width,
+            'height': height
+        }
+
+    def _prune(self):
+        """Delete the oldest screenshots beyond the file count / total size caps"""
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.screenshots_dir):
+            if entry.is_file() and SCREENSHOT_FILENAME.match(entry.name):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+
+        entries.sort()
+        excess_files = len(entries) - self.config.max_files
+        for mtime, size, path in entries:
+            if excess_files <= 0 and total_bytes <= self.config.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            excess_files -= 1
+            total_bytes -= size
+
+    async def drain(self):
+        """Wait for screenshots still being encoded"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def close(self):
+        """Stop the worker thread (call drain() first to keep pending screenshots)"""
+        self._executor.shutdown()
+
+
+def resolve_screenshot_path(filename: str, screenshots_dir: Path = SCREENSHOTS_DIR) -> Optional[Path]:
+    """Map a screenshot filename from an event URL to a stored file (None if invalid/missing)"""
+    if not SCREENSHOT_FILENAME.match(filename):
+        return None
+    filepath = screenshots_dir / filename
+    return filepath if filepath.is_file() else None
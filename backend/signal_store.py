@@ -0,0 +1,166 @@
+"""
+Celerio Scout - Company Signal Ledger
+Stores raw scoring signals per company with their source and fetch time
+"""
+import json
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+
+# How long a fetched signal stays fresh, per source (signal graph node name).
+# Wayback history is nearly static, GitHub activity moves daily, careers weekly.
+# The raw homepage HTML is not kept - it is fetched every scan and only its
+# fingerprint is stored.
+SIGNAL_FRESHNESS = {
+    'wayback': timedelta(days=30),
+    'linkedin': timedelta(days=14),
+    'traffic': timedelta(days=7),
+    'careers': timedelta(days=7),
+    'reddit': timedelta(days=2),
+    'github_org': timedelta(days=30),
+    'github_stats': timedelta(days=1),
+    # Homepage SimHash/title/H1 with the messaging signals derived from it; messaging
+    # is re-derived from scratch at least this often even if the page never changes
+    'homepage_fingerprint': timedelta(days=90)
+}
+
+# Fallback values (failed or empty fetches) are retried sooner than real results
+FALLBACK_FRESHNESS = timedelta(days=1)
+
+
+class CompanySignalStore:
+    """Persists raw signals per company domain and source in DuckDB"""
+
+    def __init__(self, db_conn=None, policies: Optional[Dict[str, timedelta]] = None):
+        # Without a connection signals live only for the lifetime of this store
+        self.conn = db_conn
+        self.policies = {**SIGNAL_FRESHNESS, **(policies or {})}
+        self._signals: Dict[str, Dict[str, Dict]] = {}
+        if self.conn is not None:
+            self._ensure_tables()
+
+    def _ensure_tables(self):
+        """Ensure company_signals table exists"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_signals (
+                domain TEXT,
+                source TEXT,
+                value JSON,
+                is_fallback BOOLEAN DEFAULT FALSE,  -- default value after a failed/empty fetch
+                fetched_at TIMESTAMP,
+                PRIMARY KEY (domain, source)
+            )
+        """)
+        # Raw homepage HTML stored by earlier versions
+        self.conn.execute("DELETE FROM company_signals WHERE source = 'homepage'")
+
+    def get_signals(self, domain: str) -> Dict[str, Dict]:
+        """All stored signals for a domain: source -> {'value', 'is_fallback', 'fetched_at'}"""
+        if self.conn is None:
+            return self._signals.get(domain, {})
+
+        try:
+            rows = self.conn.execute(
+                "SELECT source, value, is_fallback, fetched_at FROM company_signals WHERE domain = ?",
+                (domain,)
+            ).fetchall()
+        except Exception as e:
+            print(f"[SIGNALS] Error loading signals for {domain}: {e}")
+            return {}
+
+        return {
+            row[0]: {
+                'value': json.loads(row[1]) if row[1] is not None else None,
+                'is_fallback': bool(row[2]),
+                'fetched_at': row[3]
+            }
+            for row in rows
+        }
+
+    def max_age(self, source: str, is_fallback: bool = False) -> timedelta:
+        """Freshness window for a source (shorter for fallback values)"""
+        max_age = self.policies.get(source, timedelta(0))
+        return min(max_age, FALLBACK_FRESHNESS) if is_fallback else max_age
+
+    def is_fresh(self, source: str, record: Dict, now: Optional[datetime] = None) -> bool:
+        """Check a stored signal against its source's freshness policy"""
+        fetched_at = record.get('fetched_at')
+        if fetched_at is None:
+            return False
+        return (now or datetime.now()) - fetched_at < self.max_age(source, record.get('is_fallback', False))
+
+    def fresh_signals(self, domain: str, records: Optional[Dict[str, Dict]] = None) -> Dict[str, object]:
+        """Stored signal values that are still fresh, by source (records from get_signals, if already loaded)"""
+        now = datetime.now()
+        records = self.get_signals(domain) if records is None else records
+        return {
+            source: record['value']
+            for source, record in records.items()
+            if self.is_fresh(source, record, now)
+        }
+
+    def stale_sources(self, domain: str) -> List[str]:
+        """Sources that need refetching for a domain (missing or expired)"""
+        fresh = self.fresh_signals(domain)
+        return [source for source in self.policies if source not in fresh]
+
+    def save_signals(self, domain: str, values: Dict[str, object], defaults: Optional[Dict[str, object]] = None):
+        """
+        Store freshly fetched signal values for a domain.
+        Values equal to the source default are stored as fallbacks.
+        """
+        defaults = defaults or {}
+        now = datetime.now()
+        records = {
+            source: {'value': value, 'is_fallback': source in defaults and value == defaults[source], 'fetched_at': now}
+            for source, value in values.items()
+            if source in self.policies
+        }
+        if not records:
+            return
+
+        if self.conn is None:
+            self._signals.setdefault(domain, {}).update(records)
+            return
+
+        try:
+            for source, record in records.items():
+                self.conn.execute(
+                    "DELETE FROM company_signals WHERE domain = ? AND source = ?",
+                    (domain, source)
+                )
+                self.conn.execute("""
+                    INSERT INTO company_signals (domain, source, value, is_fallback, fetched_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    domain,
+                    source,
+                    json.dumps(record['value'], default=str),
+                    record['is_fallback'],
+                    now
+                ))
+            self.conn.commit()
+        except Exception as e:
+            print(f"[SIGNALS] Error saving signals for {domain}: {e}")
+
+    def invalidate(self, domain: str, sources: Optional[List[str]] = None):
+        """Force a refetch of some (or all) sources on the next scan"""
+        if self.conn is None:
+            if sources is None:
+                self._signals.pop(domain, None)
+            else:
+                for source in sources:
+                    self._signals.get(domain, {}).pop(source, None)
+            return
+
+        try:
+            if sources is None:
+                self.conn.execute("DELETE FROM company_signals WHERE domain = ?", (domain,))
+            else:
+                for source in sources:
+                    self.conn.execute(
+                        "DELETE FROM company_signals WHERE domain = ? AND source = ?",
+                        (domain, source)
+                    )
+            self.conn.commit()
+        except Exception as e:
+            print(f"[SIGNALS] Error invalidating signals for {domain}: {e}")
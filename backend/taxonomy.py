@@ -0,0 +1,164 @@
+"""
+Celerio Scout - Taxonomy
+One definition of the focus-area, stage and fund-tier keywords, each compiled
+into a single case-insensitive regex with word-boundary semantics, so "ai" no
+longer matches "raise" and every module classifies the same text the same way.
+classify_batch() scans thousands of texts in one regex pass.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+FOCUS_AREAS = {
+    "AI/ML": ["artificial intelligence", "machine learning", "ai", "ml", "ai/ml", "deep learning", "neural",
+              "llm", "llms", "gpt", "generative ai", "genai", "openai", "anthropic"],
+    "B2B SaaS": ["b2b", "saas", "b2b saas", "enterprise", "business software"],
+    "Fintech": ["fintech", "financial technology", "finance", "payment", "payments", "banking", "crypto",
+                "blockchain", "stripe", "plaid"],
+    "Healthcare": ["healthcare", "health tech", "healthtech", "medtech", "biotech", "pharma"],
+    "Consumer": ["consumer", "b2c", "retail", "e-commerce", "ecommerce", "marketplace"],
+    "Enterprise": ["enterprise", "b2b enterprise", "corporate software"],
+    "DevTools": ["developer tools", "devtools", "dev tools", "developer", "infrastructure", "ci/cd", "deployment",
+                 "github", "gitlab"],
+    "Security": ["cybersecurity", "security", "privacy", "compliance"],
+    "Climate": ["climate", "clean tech", "cleantech", "sustainability", "energy"],
+}
+
+# Generic words that only say something about a company's own domain or name
+# ("acme-api.com"); in a VC's thesis text they'd tag nearly every firm
+COMPANY_FOCUS_AREAS = {
+    label: terms + {
+        "B2B SaaS": ["platform", "api", "apis", "software", "cloud"],
+        "DevTools": ["dev", "tools"],
+    }.get(label, [])
+    for label, terms in FOCUS_AREAS.items()
+}
+
+STAGES = {
+    "Pre-Seed": ["pre-seed", "preseed", "idea stage", "concept"],
+    "Seed": ["seed", "seed stage", "early stage"],
+    "Series A": ["series a"],
+    "Series B": ["series b"],
+    "Series C": ["series c"],
+    "Growth": ["growth", "late stage", "growth stage"],
+}
+
+TIER_1_2_FUNDS = {
+    'Y Combinator', 'Sequoia Capital', 'Andreessen Horowitz', 'a16z',
+    'Benchmark', 'Accel Partners', 'First Round Capital', 'NFX',
+    'Lightspeed Venture Partners', 'Founders Fund', 'Craft Ventures',
+    'SignalFire', 'Greylock Partners', 'Kleiner Perkins', 'NEA',
+    'Bessemer Venture Partners', 'Index Ventures', 'General Catalyst',
+    'Insight Partners', 'Tiger Global', 'Coatue', 'IVP'
+}
+
+# Other full names sources use for the funds above. Bare firm words are left
+# out on purpose: 'accel' would also match Accel-KKR
+FUND_ALIASES = ['yc', 'ycombinator', 'lightspeed ventures', 'kpcb', 'bvp']
+
+FUND_TIERS = {
+    "Tier 1": sorted(TIER_1_2_FUNDS) + FUND_ALIASES,
+}
+
+# Spaces, hyphens and underscores are interchangeable inside a term ("series-a", "series_a")
+_SEPARATORS = r'[\s\-_]+'
+_TEXT_JOINER = '\x00'
+
+
+def normalize_term(term: str) -> str:
+    return re.sub(_SEPARATORS, ' ', term.lower()).strip()
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Regex for a character trie of terms - branches are tried once per prefix, not once per term"""
+    branches = [
+        (_SEPARATORS if char == ' ' else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # Optional continuations are greedy, so "b2b saas" is preferred over "b2b"
+    return f'(?:{pattern})?' if '' in node else pattern
+
+
+class TaxonomyMatcher:
+    """A label -> keywords taxonomy compiled into one word-bounded regex"""
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.labels = list(taxonomy)
+        self._order = {label: i for i, label in enumerate(self.labels)}
+        self._term_labels: Dict[str, Set[str]] = {}
+        for label, terms in taxonomy.items():
+            for term in terms:
+                self._term_labels.setdefault(normalize_term(term), set()).add(label)
+
+        trie: Dict = {}
+        for term in self._term_labels:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        pattern = r'(?<![a-z0-9])' + _trie_pattern(trie) + r'(?![a-z0-9])'
+        self._pattern = re.compile(pattern, re.IGNORECASE)
+        self._batch_pattern = re.compile(re.escape(_TEXT_JOINER) + '|' + pattern, re.IGNORECASE)
+        self._match_labels: Dict[str, Set[str]] = {}
+        self._orderings: Dict[frozenset, List[str]] = {}
+
+        # Matches don't overlap, so a term also carries the labels of the terms
+        # inside it ("b2b enterprise" is Enterprise and B2B SaaS)
+        terms = sorted(self._term_labels, key=len)
+        for term in terms:
+            for other in terms:
+                if len(other) < len(term) and re.search(
+                        r'(?<![a-z0-9])' + re.escape(other) + r'(?![a-z0-9])', term):
+                    self._term_labels[term] |= self._term_labels[other]
+
+    def _labels_of(self, match: str) -> Set[str]:
+        labels = self._match_labels.get(match)
+        if labels is None:
+            labels = self._match_labels[match] = self._term_labels.get(normalize_term(match), set())
+        return labels
+
+    def _ordered(self, labels: Set[str]) -> List[str]:
+        if not labels:
+            return []
+        key = frozenset(labels)
+        ordered = self._orderings.get(key)
+        if ordered is None:
+            ordered = self._orderings[key] = sorted(labels, key=self._order.__getitem__)
+        return list(ordered)
+
+    def classify(self, text: Optional[str]) -> List[str]:
+        """Labels whose keywords appear in text, in taxonomy order"""
+        labels: Set[str] = set()
+        for match in self._pattern.findall(text or ''):
+            labels |= self._labels_of(match)
+        return self._ordered(labels)
+
+    def first(self, text: Optional[str]) -> Optional[str]:
+        """Earliest label in taxonomy order that text matches"""
+        labels = self.classify(text)
+        return labels[0] if labels else None
+
+    def classify_batch(self, texts: List[Optional[str]]) -> List[List[str]]:
+        """classify() for every text, in a single scan over all of them"""
+        if not texts:
+            return []
+        # The joiner is matched too, so each one found moves on to the next text
+        joined = _TEXT_JOINER.join((text or '').replace(_TEXT_JOINER, ' ') for text in texts)
+        results: List[List[str]] = []
+        labels: Set[str] = set()
+        for match in self._batch_pattern.findall(joined):
+            if match == _TEXT_JOINER:
+                results.append(self._ordered(labels))
+                labels = set()
+            else:
+                labels |= self._labels_of(match)
+        results.append(self._ordered(labels))
+        return results
+
+
+focus_area_matcher = TaxonomyMatcher(FOCUS_AREAS)
+company_focus_matcher = TaxonomyMatcher(COMPANY_FOCUS_AREAS)
+stage_matcher = TaxonomyMatcher(STAGES)
+fund_tier_matcher = TaxonomyMatcher(FUND_TIERS)
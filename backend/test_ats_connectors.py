@@ -0,0 +1,130 @@
+"""Test script for ATS job board connectors (runs against a local stand-in server)"""
+import asyncio
+import sys
+sys.path.insert(0, '.')
+
+from aiohttp import web, ClientSession
+
+import ats_connectors
+from ats_connectors import detect_ats, get_ats_hiring_signal
+from cache import clear_cache
+from scorer import compute_motion
+
+PORT = 8765
+BASE = f"http://127.0.0.1:{PORT}"
+
+# Careers pages for one company per ATS, as they appear in the wild
+CAREERS_PAGES = {
+    'greenco': '<html><body><div id="grnhse_app"></div>'
+               '<script src="https://boards.greenhouse.io/embed/job_board/js?for=greenco"></script></body></html>',
+    'leverco': '<html><body><a href="https://jobs.lever.co/leverco">See open roles</a></body></html>',
+    'ashbyco': '<html><body><iframe src="https://jobs.ashbyhq.com/ashbyco/embed"></iframe></body></html>',
+    'workco': '<html><body><a href="https://apply.workable.com/workco/">Jobs</a></body></html>',
+    'quietco': '<html><body><h1>Join us</h1><p>We are hiring a software engineer.</p></body></html>'
+}
+
+BOARDS = {
+    'greenhouse': {'jobs': [
+        {'title': 'Senior Backend Engineer', 'departments': [{'name': 'Engineering'}]},
+        {'title': 'Frontend Engineer', 'departments': [{'name': 'Engineering'}]},
+        {'title': 'Account Executive', 'departments': [{'name': 'Sales'}]},
+        {'title': 'Office Manager', 'departments': [{'name': 'G&A'}]}
+    ]},
+    'lever': [
+        {'text': 'Account Executive, EMEA', 'categories': {'team': 'Sales'}},
+        {'text': 'SDR', 'categories': {'department': 'Sales'}},
+        {'text': 'Platform Engineer', 'categories': {'department': 'R&D'}}
+    ],
+    'ashby': {'jobs': [
+        {'title': 'ML Engineer', 'department': 'Engineering', 'isListed': True},
+        {'title': 'Unlisted role', 'department': 'Engineering', 'isListed': False}
+    ]},
+    'workable': {'jobs': []}
+}
+
+requests_seen = []
+
+
+async def careers(request):
+    company = request.match_info['company']
+    requests_seen.append(request.path)
+    if company not in CAREERS_PAGES:
+        return web.Response(status=404)
+    return web.Response(text=CAREERS_PAGES[company], content_type='text/html')
+
+
+async def board(request):
+    requests_seen.append(request.path)
+    return web.json_response(BOARDS[request.match_info['ats']])
+
+
+async def start_server():
+    app = web.Application()
+    app.router.add_get('/site/{company}/careers', careers)
+    app.router.add_get('/site/{company}/jobs', careers)
+    app.router.add_get('/site/{company}', careers)
+    app.router.add_get('/boards/{ats}/{token}', board)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', PORT).start()
+    return runner
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+async def main():
+    # Point the board endpoints at the stand-in server
+    for ats in ats_connectors.ATS_API_URLS:
+        ats_connectors.ATS_API_URLS[ats] = f"{BASE}/boards/{ats}/{{token}}"
+    clear_cache()
+    runner = await start_server()
+    ok = True
+
+    print("\n=== Detection ===")
+    for company, expected in [('greenco', 'greenhouse'), ('leverco', 'lever'), ('ashbyco', 'ashby'), ('workco', 'workable')]:
+        ok &= check(f"{company} -> {expected}", detect_ats(CAREERS_PAGES[company]) == (expected, company))
+    ok &= check("no board on a plain careers page", detect_ats(CAREERS_PAGES['quietco']) is None)
+
+    async with ClientSession() as session:
+        print("\n=== Role counts ===")
+        signal, _ = await get_ats_hiring_signal('greenco.test', session, site_url=f"{BASE}/site/greenco")
+        print(signal)
+        ok &= check("greenhouse: 4 roles, 2 eng, 1 sales", (signal['open_roles'], signal['engineering_roles'], signal['sales_roles']) == (4, 2, 1))
+        ok &= check("greenhouse: ratio 0.5", signal['sales_to_eng_ratio'] == 0.5)
+        ok &= check("greenhouse: by department", signal['roles_by_department'] == {'Engineering': 2, 'Sales': 1, 'G&A': 1})
+
+        signal, _ = await get_ats_hiring_signal('leverco.test', session, site_url=f"{BASE}/site/leverco")
+        print(signal)
+        ok &= check("lever: ratio 2.0", signal['sales_to_eng_ratio'] == 2.0)
+
+        signal, _ = await get_ats_hiring_signal('ashbyco.test', session, site_url=f"{BASE}/site/ashbyco")
+        print(signal)
+        ok &= check("ashby: unlisted roles skipped", signal['open_roles'] == 1 and signal['sales_to_eng_ratio'] == 0)
+
+        signal, _ = await get_ats_hiring_signal('workco.test', session, site_url=f"{BASE}/site/workco")
+        print(signal)
+        ok &= check("workable: empty board is frozen", signal['hiring_status'] == 'frozen' and signal['open_roles'] == 0)
+        ok &= check("workable: empty board has no ratio", signal['sales_to_eng_ratio'] is None)
+        # 2.5 is outside both the healthy and the sales-heavy band, i.e. the neutral ratio score
+        neutral = compute_motion({'traffic_score': 50.0}, {**signal, 'sales_to_eng_ratio': 2.5})
+        ok &= check("workable: empty board ratio scores neutral",
+                    compute_motion({'traffic_score': 50.0}, signal)['motion_score'] == neutral['motion_score'])
+
+        signal, pages = await get_ats_hiring_signal('quietco.test', session, site_url=f"{BASE}/site/quietco")
+        ok &= check("no board: no signal, pages returned for fallback", signal is None and bool(pages.get(f"{BASE}/site/quietco/careers")))
+
+        print("\n=== Board cache ===")
+        requests_seen.clear()
+        signal, _ = await get_ats_hiring_signal('greenco.test', session, site_url=f"{BASE}/site/greenco")
+        print(f"Requests on rescan: {requests_seen}")
+        ok &= check("rescan skips the careers pages, one board request", requests_seen == ['/boards/greenhouse/greenco'])
+
+    await runner.cleanup()
+    print(f"\n{'[SUCCESS] All ATS connector checks passed' if ok else '[FAIL] Some ATS connector checks failed'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
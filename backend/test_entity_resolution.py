@@ -0,0 +1,104 @@
+"""Test script for entity resolution merge decisions (runs on an in-memory DuckDB)"""
+import sys
+sys.path.insert(0, '.')
+
+import duckdb
+
+from entity_resolution import EntityResolver, resolve_table
+
+VCS = [
+    (1, 'Index Ventures', 'indexventures.com'),
+    (2, 'Index Capital', None),                  # different firm, no domain
+    (3, 'Accel', 'accel.com'),
+    (4, 'Accel Partners', 'https://www.accel.com/'),
+    (5, 'Sequoia Capital', None),
+    (6, 'Sequoia Capital', None),                # exact duplicate without a domain
+    (7, 'Benchmark', 'benchmark.com'),
+    (8, 'Benchmark Capital', 'benchmarkcapital.io')  # fuzzy name, different domain
+]
+
+# (id, company_id, investor_id, valid_to)
+INVESTMENTS = [
+    (1, 100, 3, None),
+    (2, 101, 1, None),
+    (7, 100, 4, None),          # same company under the duplicate Accel row
+    (8, 102, 4, '2025-01-01')   # closed history stays
+]
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+def make_db():
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE vcs (id INTEGER, firm_name TEXT, domain TEXT, type TEXT)")
+    conn.execute("""
+        CREATE TABLE company_investments (
+            id INTEGER PRIMARY KEY, company_id INTEGER, investor_id INTEGER, valid_to DATE
+        )
+    """)
+    for row in VCS:
+        conn.execute("INSERT INTO vcs VALUES (?, ?, ?, 'VC')", row)
+    for row in INVESTMENTS:
+        conn.execute("INSERT INTO company_investments VALUES (?, ?, ?, ?)", row)
+    return conn
+
+
+def main():
+    ok = True
+
+    print("\n=== Matching ===")
+    resolver = EntityResolver('vc')
+    ok &= check("same domain matches", resolver.add({'name': 'Accel', 'domain': 'accel.com'})
+                == resolver.add({'name': 'Accel Partners', 'domain': 'www.accel.com'}))
+    resolver.add({'name': 'Index Ventures', 'domain': 'indexventures.com'})
+    ok &= check("generic words count without a domain", resolver.match({'name': 'Index Capital'}) is None)
+    ok &= check("different domains never match",
+                resolver.match({'name': 'Accel', 'domain': 'accel-kkr.com'}) is None)
+
+    print("\n=== Confirmed matches (ingestion) ===")
+    companies = EntityResolver('company')
+    companies.add({'name': 'Acme Robotics', 'domain': None}, key=1)
+    companies.add({'name': 'Stripe', 'domain': 'stripe.com'}, key=2)
+    ok &= check("exact name with a missing domain is confirmed",
+                companies.match_confirmed({'name': 'Acme Robotics Inc.', 'domain': 'acmerobotics.com'}) == 1)
+    ok &= check("fuzzy name matches", companies.match({'name': 'Acme Robotic', 'domain': 'acmerobotic.com'}) == 1)
+    ok &= check("but is not confirmed",
+                companies.match_confirmed({'name': 'Acme Robotic', 'domain': 'acmerobotic.com'}) is None)
+    ok &= check("same domain is confirmed",
+                companies.match_confirmed({'name': 'Stripe Payments', 'domain': 'www.stripe.com'}) == 2)
+
+    print("\n=== Dry run ===")
+    conn = make_db()
+    summary = resolve_table(conn, 'vc')
+    print({key: value for key, value in summary.items() if key != 'preview'})
+    ok &= check("dry run by default deletes nothing", conn.execute("SELECT COUNT(*) FROM vcs").fetchone()[0] == len(VCS))
+    ok &= check("dry run previews clusters", len(summary['preview']) == summary['clusters'] > 0)
+
+    print("\n=== Merge ===")
+    summary = resolve_table(conn, 'vc', dry_run=False)
+    remaining = {row[0] for row in conn.execute("SELECT id FROM vcs").fetchall()}
+    print(f"Remaining ids: {sorted(remaining)}")
+    ok &= check("Index Capital is not merged into Index Ventures", {1, 2} <= remaining)
+    ok &= check("Accel rows with one domain are merged", len({3, 4} & remaining) == 1)
+    ok &= check("exact duplicate names are merged", len({5, 6} & remaining) == 1)
+    ok &= check("different domains are not merged", {7, 8} <= remaining)
+
+    accel = ({3, 4} & remaining).pop()
+    active = conn.execute("""
+        SELECT company_id, COUNT(*) FROM company_investments
+        WHERE investor_id = ? AND valid_to IS NULL GROUP BY company_id
+    """, (accel,)).fetchall()
+    print(f"Active Accel investments: {active}")
+    ok &= check("one active row per (company, investor) pair", dict(active) == {100: 1})
+    ok &= check("closed history is repointed, not dropped", conn.execute(
+        "SELECT COUNT(*) FROM company_investments WHERE investor_id = ? AND valid_to IS NOT NULL", (accel,)
+    ).fetchone()[0] == 1)
+
+    print(f"\n{'[SUCCESS] All entity resolution checks passed' if ok else '[FAIL] Some entity resolution checks failed'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Test script for homepage SimHash fingerprints and the match threshold"""
+import sys
+sys.path.insert(0, '.')
+
+import random
+
+from homepage_fingerprint import (
+    SIMHASH_MATCH_DISTANCE, homepage_features, fingerprint_matches, match_homepage, hamming_distance
+)
+
+VOCABULARY = ['build', 'ship', 'faster', 'teams', 'platform', 'secure', 'data', 'customers', 'workflow', 'insights',
+              'automate', 'reports', 'cloud', 'analytics', 'pricing', 'enterprise', 'integrations', 'support']
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+def page(words, h1="Analytics for fast teams", title="Acme - Analytics", extra=""):
+    return (f"<html><head><title>{title}</title><script>var build = {random.random()};</script></head>"
+            f"<body><h1>{h1}</h1><p>{' '.join(words)}</p>{extra}</body></html>")
+
+
+def flip_bits(simhash_hex, count):
+    return format(int(simhash_hex, 16) ^ sum(1 << bit for bit in range(count)), '016x')
+
+
+def distance(a, b):
+    return hamming_distance(int(a['simhash'], 16), int(b['simhash'], 16))
+
+
+def main():
+    ok = True
+    rng = random.Random(3)
+    words = [rng.choice(VOCABULARY) for _ in range(400)]
+    original = homepage_features(page(words, extra="<footer>© 2025 Acme, 1,204 customers</footer>"))
+
+    print("\n=== Noise that isn't a change ===")
+    noisy = homepage_features(page(words, extra="<footer>© 2026 Acme, 1,377 customers</footer>"))
+    ok &= check("new script contents and digits give the same SimHash", distance(original, noisy) == 0)
+    ok &= check("so the homepage matches", match_homepage(original, page(words, extra="<footer>© 2026 Acme, 9 customers</footer>")) is original)
+
+    print("\n=== Small edit ===")
+    edited = list(words)
+    edited[200] = 'onboarding'
+    small = homepage_features(page(edited, extra="<footer>© 2025 Acme, 1,204 customers</footer>"))
+    print(f"One word changed: {distance(original, small)} bits")
+    ok &= check("a one-word edit stays within the threshold", fingerprint_matches(original, small))
+
+    print("\n=== Real changes ===")
+    rewritten = homepage_features(page([rng.choice(VOCABULARY) for _ in range(400)]))
+    print(f"Rewritten copy: {distance(original, rewritten)} bits")
+    ok &= check("rewritten copy is a different page", not fingerprint_matches(original, rewritten))
+    ok &= check("new H1 on the same text is a different page",
+                not fingerprint_matches(original, dict(original, h1="Automate your reports")))
+    ok &= check("new title on the same text is a different page",
+                not fingerprint_matches(original, dict(original, title="Acme")))
+
+    print("\n=== Threshold ===")
+    at_limit = dict(original, simhash=flip_bits(original['simhash'], SIMHASH_MATCH_DISTANCE))
+    past_limit = dict(original, simhash=flip_bits(original['simhash'], SIMHASH_MATCH_DISTANCE + 1))
+    ok &= check(f"{SIMHASH_MATCH_DISTANCE} differing bits match", fingerprint_matches(original, at_limit))
+    ok &= check(f"{SIMHASH_MATCH_DISTANCE + 1} differing bits don't match", not fingerprint_matches(original, past_limit))
+    ok &= check("a custom max_distance is honoured", fingerprint_matches(original, past_limit, max_distance=SIMHASH_MATCH_DISTANCE + 1))
+
+    print("\n=== Missing data ===")
+    ok &= check("no previous fingerprint never matches", match_homepage(None, page(words)) is None)
+    ok &= check("no homepage never matches", match_homepage(original, None) is None and homepage_features('') is None)
+    ok &= check("a record without a SimHash never matches", not fingerprint_matches(dict(original, simhash=None), original))
+
+    print(f"\n{'[SUCCESS] All homepage fingerprint checks passed' if ok else '[FAIL] Some homepage fingerprint checks failed'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Test script for the membership Bloom filters (runs on an in-memory DuckDB)"""
+import sys
+sys.path.insert(0, '.')
+
+from datetime import datetime, timedelta
+
+import duckdb
+
+from membership_index import MembershipIndex
+
+COMPANIES = [(i, f"Company {i}", f"company{i}.com") for i in range(1, 2001)]
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+def make_db():
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE companies (id INTEGER, name TEXT, domain TEXT, created_at TIMESTAMP)")
+    conn.execute("CREATE TABLE vcs (id INTEGER, firm_name TEXT, domain TEXT, created_at TIMESTAMP)")
+    created_at = datetime.now() - timedelta(days=1)
+    conn.executemany("INSERT INTO companies VALUES (?, ?, ?, ?)", [row + (created_at,) for row in COMPANIES])
+    conn.execute("INSERT INTO vcs VALUES (1, 'Accel Partners', 'accel.com', ?)", (created_at,))
+    return conn
+
+
+def find_company(conn, index, domain, name, queries):
+    """The ingestion check in main.py: SELECT only when the filter says 'maybe'"""
+    if not index.might_contain('companies', domain, name):
+        return None
+    queries.append(domain)
+    return conn.execute("SELECT id FROM companies WHERE domain = ?", (domain,)).fetchone()
+
+
+def main():
+    ok = True
+    conn = make_db()
+
+    print("\n=== Persist and reload ===")
+    MembershipIndex(conn)
+    reloaded = MembershipIndex(conn)
+    missing = [domain for _, _, domain in COMPANIES if not reloaded.might_contain('companies', domain)]
+    ok &= check("no false negatives for domains after a reload", not missing)
+    ok &= check("no false negatives for names after a reload",
+                all(reloaded.might_contain('companies', None, name) for _, name, _ in COMPANIES))
+    ok &= check("www/case variants of a stored domain are found",
+                reloaded.might_contain('companies', 'WWW.Company7.com'))
+    ok &= check("legal forms don't hide a stored name",
+                reloaded.might_contain('companies', None, 'Company 7, Inc.'))
+
+    print("\n=== Top-up by created_at ===")
+    # A script inserted rows without updating the filter
+    conn.execute("INSERT INTO companies VALUES (5000, 'Late Arrival', 'latearrival.io', ?)", (datetime.now(),))
+    conn.execute("INSERT INTO companies VALUES (5001, 'No Timestamp', 'notimestamp.io', NULL)")
+    topped_up = MembershipIndex(conn)
+    ok &= check("row created after the filter was saved is added on load",
+                topped_up.might_contain('companies', 'latearrival.io'))
+    ok &= check("row without created_at is added on load",
+                topped_up.might_contain('companies', 'notimestamp.io'))
+
+    print("\n=== Maybe falls through to SQL ===")
+    queries = []
+    found = find_company(conn, topped_up, 'company42.com', 'Company 42', queries)
+    ok &= check("known domain is confirmed by SQL", found is not None and found[0] == 42 and queries == ['company42.com'])
+
+    queries = []
+    found = find_company(conn, topped_up, 'company42.io', 'Company 42', queries)
+    ok &= check("known name with a new domain still queries SQL", queries == ['company42.io'] and found is None)
+
+    queries = []
+    new_domains = [f"brand-new-{i}.dev" for i in range(1000)]
+    for domain in new_domains:
+        find_company(conn, topped_up, domain, domain, queries)
+    print(f"SQL lookups for {len(new_domains)} new companies: {len(queries)}")
+    ok &= check("definitely-new companies mostly skip SQL", len(queries) <= 5)
+    ok &= check("every SQL lookup of a new company found nothing",
+                all(conn.execute("SELECT id FROM companies WHERE domain = ?", (domain,)).fetchone() is None
+                    for domain in queries))
+
+    topped_up.add('companies', 'brand-new-1.dev', 'Brand New 1')
+    ok &= check("added rows are found without a reload", topped_up.might_contain('companies', 'brand-new-1.dev'))
+
+    print(f"\n{'[SUCCESS] All membership index checks passed' if ok else '[FAIL] Some membership index checks failed'}")
+
+
+if __name__ == "__main__":
+    main()
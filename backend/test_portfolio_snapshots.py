@@ -0,0 +1,109 @@
+"""Test script for incremental portfolio snapshots (runs on an in-memory DuckDB)"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+from datetime import datetime
+
+import duckdb
+
+from portfolio_snapshots import PortfolioSnapshotStore, COMPANY_KEY_VERSION, page_fingerprint
+
+URL = "https://vc.test/portfolio"
+LEGACY_URL = "https://oldvc.test/portfolio"
+
+FIRST_RUN = [
+    {'name': 'Acme', 'domain': 'acme.com'},
+    {'name': 'Beta', 'domain': 'https://www.beta.io/'},
+    {'name': 'Gamma', 'domain': 'gamma.ai'},
+]
+SECOND_RUN = [
+    {'name': 'Acme', 'domain': 'www.acme.com'},
+    {'name': 'Beta', 'domain': 'beta.io'},
+    {'name': 'Delta', 'domain': 'delta.dev'},
+]
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+def names(companies):
+    return sorted(company['name'] for company in companies)
+
+
+def stored_row(conn, url):
+    return conn.execute(
+        "SELECT company_count, content_hash, key_version FROM portfolio_snapshots WHERE portfolio_url = ?", (url,)
+    ).fetchone()
+
+
+def main():
+    ok = True
+    conn = duckdb.connect()
+    store = PortfolioSnapshotStore(conn)
+
+    print("\n=== Fingerprints ===")
+    ok &= check("volatile markup doesn't change the fingerprint",
+                page_fingerprint('<ul><li>Acme</li></ul><script>var t=1</script>') ==
+                page_fingerprint('<ul>\n  <li>Acme</li>\n</ul><script>var t=2</script>'))
+    ok &= check("a new company changes the fingerprint",
+                page_fingerprint('<ul><li>Acme</li></ul>') != page_fingerprint('<ul><li>Acme</li><li>Delta</li></ul>'))
+
+    print("\n=== Stage and commit ===")
+    result = store.stage_snapshot(URL, 'Test VC', 'hash-1', 'http', FIRST_RUN)
+    ok &= check("first run is new, every company added", result['status'] == 'new' and names(result['added']) == ['Acme', 'Beta', 'Gamma'])
+    ok &= check("staging stores nothing", stored_row(conn, URL) is None and store.get_snapshot(URL) is None)
+    store.commit_snapshot(result)
+    ok &= check("commit stores the snapshot", stored_row(conn, URL) == (3, 'hash-1', COMPANY_KEY_VERSION))
+
+    print("\n=== Added / removed / unchanged ===")
+    reloaded = PortfolioSnapshotStore(conn)
+    snapshot = reloaded.get_snapshot(URL)
+    ok &= check("same fingerprint matches after a reload", reloaded.matches(snapshot, 'hash-1', 'http'))
+    ok &= check("other fingerprint or strategy doesn't match",
+                not reloaded.matches(snapshot, 'hash-2', 'http') and not reloaded.matches(snapshot, 'hash-1', 'browser'))
+    unchanged = reloaded.unchanged_result(URL)
+    ok &= check("unchanged result reports no work", unchanged['status'] == 'unchanged'
+                and not unchanged['added'] and not unchanged['removed'] and len(unchanged['companies']) == 3)
+    ok &= check("unchanged run is counted",
+                conn.execute("SELECT unchanged_runs FROM portfolio_snapshots WHERE portfolio_url = ?", (URL,)).fetchone()[0] == 1)
+
+    result = reloaded.stage_snapshot(URL, 'Test VC', 'hash-2', 'http', SECOND_RUN)
+    print(f"added={names(result['added'])} removed={names(result['removed'])}")
+    ok &= check("changed page reports the diff", result['status'] == 'changed')
+    ok &= check("only the new company is added (www./URL variants are unchanged)", names(result['added']) == ['Delta'])
+    ok &= check("only the missing company is removed", names(result['removed']) == ['Gamma'])
+
+    print("\n=== Failed companies ===")
+    reloaded.commit_snapshot(result, failed=[{'name': 'Delta', 'domain': 'delta.dev'}])
+    ok &= check("company not saved downstream is left out", stored_row(conn, URL) == (2, None, COMPANY_KEY_VERSION))
+    ok &= check("dropped fingerprint forces a re-extract", not reloaded.matches(reloaded.get_snapshot(URL), 'hash-2', 'http'))
+    retry = reloaded.stage_snapshot(URL, 'Test VC', 'hash-2', 'http', SECOND_RUN)
+    ok &= check("next run reports it as added again", names(retry['added']) == ['Delta'] and not retry['removed'])
+
+    print("\n=== Key version migration ===")
+    # A snapshot stored before key versions existed, with a subdomain the company has since moved off
+    conn.execute("""
+        INSERT INTO portfolio_snapshots (portfolio_url, firm_name, content_hash, hash_strategy, companies,
+            company_count, unchanged_runs, fetched_at, changed_at, key_version)
+        VALUES (?, 'Old VC', 'old-hash', 'http', ?, 2, 0, ?, ?, NULL)
+    """, (LEGACY_URL, json.dumps([{'name': 'Acme', 'domain': 'app.acme.com'}, {'name': 'Gone', 'domain': 'gone.io'}]),
+          datetime.now(), datetime.now()))
+    legacy = PortfolioSnapshotStore(conn)
+    ok &= check("missing key_version loads as version 1", legacy.get_snapshot(LEGACY_URL)['key_version'] == 1)
+    current = [{'name': 'Acme', 'domain': 'acme.com'}]
+    result = legacy.stage_snapshot(LEGACY_URL, 'Old VC', 'new-hash', 'http', current)
+    print(f"added={names(result['added'])} removed={names(result['removed'])}")
+    ok &= check("re-keyed company is not reported removed", names(result['removed']) == ['Gone'])
+    legacy.commit_snapshot(result)
+    ok &= check("commit re-saves at the current key version", stored_row(conn, LEGACY_URL)[2] == COMPANY_KEY_VERSION)
+    result = PortfolioSnapshotStore(conn).stage_snapshot(LEGACY_URL, 'Old VC', 'new-hash', 'http', current)
+    ok &= check("migrated snapshot diffs clean", not result['added'] and not result['removed'])
+
+    print(f"\n{'[SUCCESS] All portfolio snapshot checks passed' if ok else '[FAIL] Some portfolio snapshot checks failed'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Test script for the shared focus-area, stage and fund-tier taxonomy"""
+import sys
+sys.path.insert(0, '.')
+
+from taxonomy import focus_area_matcher, company_focus_matcher, stage_matcher
+from data_enrichment import determine_fund_tier
+
+GENERIC_WORDS = ['platform', 'api', 'software', 'cloud', 'dev', 'tools']
+
+# VC thesis text of the kind every firm writes - none of it names a focus area
+GENERIC_THESIS = "We back founders building the software platform, api and cloud tools of tomorrow"
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+def main():
+    ok = True
+
+    print("\n=== Generic words (VC focus) ===")
+    for word in GENERIC_WORDS:
+        ok &= check(f"'{word}' is no focus area", focus_area_matcher.classify(word) == [])
+    print(f"Thesis: {focus_area_matcher.classify(GENERIC_THESIS)}")
+    ok &= check("generic thesis text has no focus area", focus_area_matcher.classify(GENERIC_THESIS) == [])
+    ok &= check("specific terms still match",
+                focus_area_matcher.classify("Seed fund for fintech and developer tools") == ['Fintech', 'DevTools'])
+
+    print("\n=== Generic words (company domain/name) ===")
+    ok &= check("'api' in a domain is B2B SaaS", company_focus_matcher.classify("acme-api.com Acme") == ['B2B SaaS'])
+    ok &= check("'dev tools' in a name is DevTools", 'DevTools' in company_focus_matcher.classify("acme.dev Acme Dev Tools"))
+    ok &= check("company batch matches one text at a time",
+                company_focus_matcher.classify_batch(["acme-cloud.io", "paystack.com payments", ""]) ==
+                [['B2B SaaS'], ['Fintech'], []])
+
+    print("\n=== Word boundaries ===")
+    ok &= check("'raise' is not AI", focus_area_matcher.classify("We help founders raise their seed round") == [])
+    ok &= check("'AI' on its own is AI", focus_area_matcher.classify("AI-first investors") == ['AI/ML'])
+    ok &= check("separators are interchangeable", stage_matcher.classify("series-a and series_b") == ['Series A', 'Series B'])
+
+    print("\n=== Fund tiers ===")
+    for name, tier in [('Accel-KKR', None), ('Accel Partners', 'Tier 1'), ('accel partners', 'Tier 1'),
+                       ('Accelerate Ventures', None), ('YC', 'Tier 1'), ('Sequoia Capital', 'Tier 1'),
+                       ('Sequoia Heritage', None)]:
+        ok &= check(f"{name} -> {tier}", determine_fund_tier(name) == tier)
+
+    print(f"\n{'[SUCCESS] All taxonomy checks passed' if ok else '[FAIL] Some taxonomy checks failed'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Test script pinning the vectorized 3M formulas to the scalar scorer"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import random
+
+import numpy as np
+
+from scorer import compute_messaging, compute_motion, compute_market, _assemble_scores
+from vector_scoring import columns_from_rows, score_columns
+
+WORDS = ['ai', 'platform', 'llm', 'payments', 'for', 'teams', 'generative', 'fast', 'secure', 'data', 'gpt', 'the']
+
+# Boundary values of every step in the motion and market formulas
+RATIOS = [None, 0, 0.49, 0.5, 1.0, 2.0, 2.01, 3.0, 3.01, 999]
+STARS = [0, 1, 100, 101, 500, 501, 4000]
+COMMIT_DAYS = [0, 6, 7, 29, 30, 90, 91, 365]
+HIRING_STATUSES = ['active', 'frozen', 'unknown']
+
+
+def check(label, condition):
+    print(f"{'[SUCCESS]' if condition else '[FAIL]'} {label}")
+    return condition
+
+
+def random_homepage(rng):
+    if rng.random() < 0.2:
+        return None
+    title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+    h1 = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+    return f"<html><head><title>{title}</title></head><body><h1>{h1}</h1></body></html>"
+
+
+def scalar_scan(rng):
+    """Scores as a full scan computes them, from one random set of signals"""
+    results = {
+        'messaging': compute_messaging(
+            random_homepage(rng),
+            {'h1_volatility': rng.choice([0, 1, 2, 3, 5]), 'snapshot_count': rng.randint(0, 40)},
+            {'industry': 'Software'} if rng.random() < 0.3 else {}
+        ),
+        'motion': compute_motion(
+            {'traffic_score': rng.uniform(0, 100)},
+            {'hiring_status': rng.choice(HIRING_STATUSES), 'sales_to_eng_ratio': rng.choice(RATIOS)}
+        ),
+        'market': compute_market(
+            {'sentiment_score': rng.uniform(0, 100), 'reddit_mentions': rng.randint(0, 50)},
+            {'github_stars': rng.choice(STARS), 'last_commit_days': rng.choice(COMMIT_DAYS)}
+        )
+    }
+    return _assemble_scores(results)
+
+
+def main():
+    ok = True
+    rng = random.Random(7)
+    scans = [scalar_scan(rng) for _ in range(2000)]
+
+    print("\n=== Stored signals rescored in one pass ===")
+    # Signals go through JSON exactly as they are stored in companies.signals
+    rows = [(i, json.dumps(scan['signals']), 0.0, 0.0, 0.0) for i, scan in enumerate(scans)]
+    scores = score_columns(columns_from_rows(rows))
+
+    for vector in ('messaging_score', 'motion_score', 'market_score'):
+        scalar = np.array([scan[vector] for scan in scans])
+        worst = float(np.max(np.abs(scores[vector] - scalar)))
+        print(f"{vector}: max difference {worst:.6f}")
+        ok &= check(f"{vector} matches the scalar formula", worst <= 0.01)
+
+    mismatched = [i for i, scan in enumerate(scans) if scores['stall_probability'][i] != scan['stall_probability']]
+    ok &= check("stall_probability matches calculate_stall_probability", not mismatched)
+    ok &= check("every stall bucket is exercised", set(scores['stall_probability']) == {'high', 'medium', 'low'})
+
+    print("\n=== Rows without signals ===")
+    rows = [(1, json.dumps({'market': scans[0]['signals']['market']}), 42.0, 43.0, 0.0)]
+    scores = score_columns(columns_from_rows(rows))
+    ok &= check("vectors without signals keep their stored score",
+                (scores['messaging_score'][0], scores['motion_score'][0]) == (42.0, 43.0)
+                and scores['market_score'][0] == scans[0]['market_score'])
+
+    print(f"\n{'[SUCCESS] All vector scoring checks passed' if ok else '[FAIL] Some vector scoring checks failed'}")
+
+
+if __name__ == "__main__":
+    main()
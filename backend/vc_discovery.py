@@ -5,11 +5,14 @@ Comprehensive multi-layered discovery system
 """
 import asyncio
 import re
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 import aiohttp
-from urllib.parse import urlparse, urljoin, quote_plus
+from urllib.parse import urljoin, quote_plus
 import json
+from domain_canonical import get_domain_canonicalizer
+from entity_resolution import EntityResolver
+from taxonomy import focus_area_matcher, stage_matcher
 
 try:
     from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
@@ -47,8 +50,8 @@ class VCDiscovery:
     """Discovers VC firms from various web sources - Comprehensive multi-layered system"""
     
     def __init__(self):
-        self.seen_firms: Set[str] = set()
-        self.seen_domains: Set[str] = set()
+        # Fuzzy name/domain matching of firms seen so far (the same firm from several sources)
+        self.entity_resolver = EntityResolver('vc')
     
     def _normalize_name(self, name: str) -> str:
         """Normalize firm name for deduplication"""
@@ -62,66 +65,16 @@ class VCDiscovery:
         return normalized
     
     def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL"""
+        """Canonical domain of a URL (registrable domain, known redirects followed)"""
         if not url:
             return ""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path.split('/')[0]
-            domain = domain.replace('www.', '').lower()
-            return domain
-        except:
-            return ""
+        return get_domain_canonicalizer().canonicalize(url) or ""
     
     def _is_duplicate(self, vc: Dict) -> bool:
-        """Check if VC is duplicate"""
-        firm_name = vc.get('firm_name', '').strip()
-        domain = vc.get('domain', '').strip()
-        
-        if not firm_name:
+        """Check if VC is duplicate (same firm under a variant name or domain counts)"""
+        if not vc.get('firm_name', '').strip():
             return True
-        
-        normalized_name = self._normalize_name(firm_name)
-        
-        if normalized_name in self.seen_firms:
-            return True
-        
-        if domain and domain in self.seen_domains:
-            return True
-        
-        if not domain:
-            url = vc.get('url', '')
-            domain = self._extract_domain(url)
-            if domain and domain in self.seen_domains:
-                return True
-        
-        self.seen_firms.add(normalized_name)
-        if domain:
-            self.seen_domains.add(domain)
-        
-        return False
-    
-    # Focus area keywords for categorization
-    FOCUS_KEYWORDS = {
-        "AI/ML": ["artificial intelligence", "machine learning", "ai", "ml", "deep learning", "neural", "llm", "gpt"],
-        "B2B SaaS": ["b2b", "saas", "enterprise", "business software", "b2b saas"],
-        "Fintech": ["fintech", "financial technology", "payments", "banking", "crypto", "blockchain"],
-        "Healthcare": ["healthcare", "health tech", "medtech", "biotech", "pharma"],
-        "Consumer": ["consumer", "b2c", "retail", "e-commerce", "marketplace"],
-        "Enterprise": ["enterprise", "b2b enterprise", "corporate software"],
-        "DevTools": ["developer tools", "devtools", "infrastructure", "platform"],
-        "Security": ["cybersecurity", "security", "privacy", "compliance"],
-        "Climate": ["climate", "clean tech", "sustainability", "energy"],
-    }
-    
-    # Stage keywords
-    STAGE_KEYWORDS = {
-        "Pre-Seed": ["pre-seed", "pre seed", "idea stage", "concept"],
-        "Seed": ["seed", "seed stage", "early stage"],
-        "Series A": ["series a", "series-a", "series_a"],
-        "Series B": ["series b", "series-b", "series_b"],
-        "Growth": ["growth", "late stage", "growth stage"],
-    }
+        return not self.entity_resolver.add_unique(vc)
     
     async def discover_from_crunchbase(self) -> List[Dict]:
         """Discover VCs from Crunchbase (mock - would need API access)"""
@@ -381,10 +334,9 @@ class VCDiscovery:
         firm_lower = firm_name.lower()
         
         # Check for stage keywords
-        for stage, keywords in self.STAGE_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text_lower or keyword in firm_lower:
-                    return stage
+        stage = stage_matcher.first(text_lower + ' ' + firm_lower)
+        if stage:
+            return stage
         
         # Default based on common patterns
         if 'accelerator' in text_lower or 'accelerator' in firm_lower:
@@ -396,15 +348,7 @@ class VCDiscovery:
     
     def _determine_focus_areas(self, text: str) -> List[str]:
         """Determine focus areas from text"""
-        text_lower = text.lower()
-        focus_areas = []
-        
-        for focus, keywords in self.FOCUS_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    focus_areas.append(focus)
-                    break  # Only add once per focus area
-        
+        focus_areas = focus_area_matcher.classify(text)
         return focus_areas if focus_areas else ['General']
     
     def _determine_type(self, text: str, firm_name: str) -> str:
@@ -1101,6 +1045,12 @@ class VCDiscovery:
                     added_known += 1
             print(f"[SUCCESS] Known Lists: Added {added_known} from fallback\n")
         
+        # The same firm found by several layers (Crunchbase, F6S, search) is kept once
+        found_count = len(all_vcs)
+        all_vcs = [vc for vc in all_vcs if not self._is_duplicate(vc)]
+        if len(all_vcs) < found_count:
+            print(f"[DEDUP] Merged {found_count - len(all_vcs)} duplicate firms across sources")
+        
         # Categorize each VC (with error handling)
         print(f"[CATEGORIZATION] Categorizing {len(all_vcs)} investment vehicles...")
         categorized_vcs = []
@@ -0,0 +1,372 @@
+"""
+Celerio Scout - Vectorized 3M Scoring
+Pure NumPy versions of the Messaging, Motion and Market formulas over signal
+columns, and a job that rescores the whole companies table from stored signals
+"""
+import json
+from typing import Dict, List, Optional
+from datetime import datetime
+import numpy as np
+
+from scorer import DEFAULT_WEIGHTS, DEFAULT_THRESHOLDS, SIGNAL_DEFAULTS
+
+# Signal columns read from companies.signals: column -> (vector, key, default)
+SIGNAL_COLUMNS = {
+    'jargon_density': ('messaging', 'jargon_density', 0.05),
+    'positioning_consistency': ('messaging', 'positioning_consistency', 50.0),
+    'h1_volatility': ('messaging', 'h1_volatility', 0.0),
+    'traffic_score': ('motion', 'traffic_score', SIGNAL_DEFAULTS['traffic']['traffic_score']),
+    'hiring_status': ('motion', 'hiring_status', SIGNAL_DEFAULTS['careers']['hiring_status']),
+    'sales_to_eng_ratio': ('motion', 'sales_to_eng_ratio', SIGNAL_DEFAULTS['careers']['sales_to_eng_ratio']),
+    'sentiment_score': ('market', 'sentiment_score', SIGNAL_DEFAULTS['reddit']['sentiment_score']),
+    'github_stars': ('market', 'github_stars', SIGNAL_DEFAULTS['github_stats']['github_stars']),
+    'last_commit_days': ('market', 'last_commit_days', SIGNAL_DEFAULTS['github_stats']['last_commit_days'])
+}
+
+# Columns where a stored None means "no evidence" (NaN, scored neutral) rather than "not collected"
+NULLABLE_COLUMNS = {'sales_to_eng_ratio'}
+
+# Weight of each vector in the combined score used for ranking and stall buckets
+DEFAULT_VECTOR_WEIGHTS = {'messaging': 1 / 3, 'motion': 1 / 3, 'market': 1 / 3}
+
+# Rows are written back in chunks of this size
+RESCORE_WRITE_BATCH = 5000
+
+
+def merge_weights(overrides: Optional[Dict] = None) -> Dict[str, Dict[str, float]]:
+    """Default component weights with overrides applied, normalized to sum to 1 per vector"""
+    weights = {vector: dict(components) for vector, components in DEFAULT_WEIGHTS.items()}
+    for vector, components in (overrides or {}).items():
+        if vector not in weights:
+            raise ValueError(f"Unknown vector: {vector}")
+        for component, value in components.items():
+            if component not in weights[vector]:
+                raise ValueError(f"Unknown {vector} weight: {component}")
+            if float(value) < 0:
+                raise ValueError(f"{vector} weight for {component} must not be negative")
+            weights[vector][component] = float(value)
+    for vector, components in weights.items():
+        total = sum(components.values())
+        if total <= 0:
+            raise ValueError(f"{vector} weights must not all be zero")
+        weights[vector] = {component: value / total for component, value in components.items()}
+    return weights
+
+
+def merge_vector_weights(overrides: Optional[Dict] = None) -> Dict[str, float]:
+    """Vector weights with overrides applied, normalized to sum to 1"""
+    vector_weights = dict(DEFAULT_VECTOR_WEIGHTS)
+    for vector, value in (overrides or {}).items():
+        if vector not in vector_weights:
+            raise ValueError(f"Unknown vector: {vector}")
+        if float(value) < 0:
+            raise ValueError(f"Vector weight for {vector} must not be negative")
+        vector_weights[vector] = float(value)
+    total = sum(vector_weights.values())
+    if total <= 0:
+        raise ValueError("Vector weights must not all be zero")
+    return {vector: value / total for vector, value in vector_weights.items()}
+
+
+def merge_thresholds(overrides: Optional[Dict] = None) -> Dict[str, float]:
+    """Default stall thresholds with overrides applied"""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for name, value in (overrides or {}).items():
+        if name not in thresholds:
+            raise ValueError(f"Unknown threshold: {name}")
+        thresholds[name] = float(value)
+    return thresholds
+
+
+def messaging_scores(
+    jargon_density: np.ndarray,
+    positioning_consistency: np.ndarray,
+    h1_volatility: np.ndarray,
+    homepage_fetched: Optional[np.ndarray] = None,
+    weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Messaging vector: low jargon, consistent positioning and a stable H1 score high"""
+    weights = weights or DEFAULT_WEIGHTS['messaging']
+    jargon = (1 - np.minimum(jargon_density * 10, 1)) * 100
+    stability = (1 - np.minimum(h1_volatility / 3, 1)) * 100
+    scores = (
+        jargon * weights['jargon'] +
+        positioning_consistency * weights['positioning'] +
+        stability * weights['stability']
+    )
+    if homepage_fetched is not None:
+        # No homepage means no messaging evidence - neutral score, as in compute_messaging
+        scores = np.where(homepage_fetched, scores, 50.0)
+    return np.clip(scores, 0, 100)
+
+
+def motion_scores(
+    traffic_score: np.ndarray,
+    hiring_status: np.ndarray,
+    sales_to_eng_ratio: np.ndarray,
+    weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Motion vector: traffic, hiring activity and a healthy sales/engineering mix"""
+    weights = weights or DEFAULT_WEIGHTS['motion']
+    hiring = np.select([hiring_status == 'active', hiring_status == 'frozen'], [70.0, 20.0], default=50.0)
+    # An unknown (NaN) ratio fails both conditions and stays neutral, as in compute_motion
+    ratio = np.select(
+        [(sales_to_eng_ratio >= 0.5) & (sales_to_eng_ratio <= 2.0), sales_to_eng_ratio > 3.0],
+        [70.0, 30.0],
+        default=50.0
+    )
+    scores = (
+        traffic_score * weights['traffic'] +
+        hiring * weights['hiring'] +
+        ratio * weights['ratio']
+    )
+    return np.clip(scores, 0, 100)
+
+
+def market_scores(
+    sentiment_score: np.ndarray,
+    github_stars: np.ndarray,
+    last_commit_days: np.ndarray,
+    weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Market vector: social sentiment, GitHub traction and engineering activity"""
+    weights = weights or DEFAULT_WEIGHTS['market']
+    github = np.select(
+        [github_stars > 500, github_stars > 100, github_stars == 0],
+        [80.0, 60.0, 30.0],
+        default=50.0
+    )
+    activity = np.select(
+        [last_commit_days < 7, last_commit_days < 30, last_commit_days > 90],
+        [80.0, 60.0, 20.0],
+        default=50.0
+    )
+    scores = (
+        sentiment_score * weights['sentiment'] +
+        github * weights['github'] +
+        activity * weights['activity']
+    )
+    return np.clip(scores, 0, 100)
+
+
+def combined_scores(
+    messaging: np.ndarray,
+    motion: np.ndarray,
+    market: np.ndarray,
+    vector_weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Weighted average of the three vectors (equal weights by default)"""
+    vector_weights = vector_weights or DEFAULT_VECTOR_WEIGHTS
+    return (
+        messaging * vector_weights['messaging'] +
+        motion * vector_weights['motion'] +
+        market * vector_weights['market']
+    )
+
+
+def stall_probabilities(
+    messaging: np.ndarray,
+    motion: np.ndarray,
+    market: np.ndarray,
+    thresholds: Optional[Dict[str, float]] = None,
+    vector_weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """Stall bucket ('high'/'medium'/'low') from the (weighted) average vector score"""
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    avg_score = combined_scores(messaging, motion, market, vector_weights)
+    return np.select(
+        [avg_score < thresholds['stall_high'], avg_score < thresholds['stall_medium']],
+        ['high', 'medium'],
+        default='low'
+    )
+
+
+def load_signal_columns(db_conn, where: str = "", params: Optional[List] = None) -> Dict[str, np.ndarray]:
+    """
+    Read stored signals into column arrays.
+    Includes id, the stored scores and stall probability, and has_<vector> masks for
+    rows that carry signals for each vector (rows without them keep their stored score).
+    """
+    rows = db_conn.execute(f"""
+        SELECT id, signals, messaging_score, motion_score, market_score, stall_probability
+        FROM companies
+        WHERE signals IS NOT NULL AND signals != '' {where}
+    """, params or []).fetchall()
+    return columns_from_rows(rows)
+
+
+def columns_from_rows(rows: List, include_unsignaled: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Build signal columns from (id, signals, messaging_score, motion_score, market_score[, stall_probability])
+    rows. With include_unsignaled, rows without parseable signals are kept (scored from stored values).
+    """
+    columns = {name: [] for name in SIGNAL_COLUMNS}
+    ids, stored, stored_stall, homepage_fetched = [], [], [], []
+    has_vector = {'messaging': [], 'motion': [], 'market': []}
+
+    for row in rows:
+        try:
+            signals = json.loads(row[1]) if isinstance(row[1], str) and row[1] else (row[1] or {})
+        except (TypeError, ValueError):
+            signals = None
+        if not isinstance(signals, dict):
+            if not include_unsignaled:
+                continue
+            signals = {}
+
+        ids.append(row[0])
+        stored.append((row[2], row[3], row[4]))
+        stored_stall.append((row[5] if len(row) > 5 else None) or '')
+        for vector in has_vector:
+            has_vector[vector].append(isinstance(signals.get(vector), dict) and bool(signals[vector]))
+        for name, (vector, key, default) in SIGNAL_COLUMNS.items():
+            vector_signals = signals.get(vector) if isinstance(signals.get(vector), dict) else {}
+            value = vector_signals.get(key)
+            if value is None:
+                value = np.nan if name in NULLABLE_COLUMNS and key in vector_signals else default
+            columns[name].append(value)
+
+        messaging_signals = signals.get('messaging') if isinstance(signals.get('messaging'), dict) else {}
+        if 'homepage_fetched' in messaging_signals:
+            homepage_fetched.append(bool(messaging_signals['homepage_fetched']))
+        else:
+            # Older rows: a missing homepage left exactly the fallback values and no Wayback count
+            homepage_fetched.append(not (
+                'wayback_snapshots' not in messaging_signals and
+                messaging_signals.get('jargon_density') == 0.05 and
+                messaging_signals.get('positioning_consistency') == 50.0 and
+                not messaging_signals.get('h1_volatility')
+            ))
+
+    result = {name: np.array(values, dtype=object if name == 'hiring_status' else float)
+              for name, values in columns.items()}
+    result['hiring_status'] = result['hiring_status'].astype(str)
+    stored_scores = np.array(stored, dtype=float).reshape(-1, 3) if stored else np.zeros((0, 3))
+    result.update({
+        'id': np.array(ids, dtype=np.int64),
+        'homepage_fetched': np.array(homepage_fetched, dtype=bool),
+        'stored_messaging': stored_scores[:, 0],
+        'stored_motion': stored_scores[:, 1],
+        'stored_market': stored_scores[:, 2],
+        'stored_stall_probability': np.array(stored_stall, dtype=object),
+        **{f'has_{vector}': np.array(mask, dtype=bool) for vector, mask in has_vector.items()}
+    })
+    return result
+
+
+def score_columns(
+    columns: Dict[str, np.ndarray],
+    weights: Optional[Dict] = None,
+    thresholds: Optional[Dict] = None,
+    vector_weights: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """Compute all three vectors, the combined score and stall buckets for loaded signal columns"""
+    weights = merge_weights(weights)
+    thresholds = merge_thresholds(thresholds)
+    vector_weights = merge_vector_weights(vector_weights)
+
+    messaging = messaging_scores(
+        columns['jargon_density'], columns['positioning_consistency'], columns['h1_volatility'],
+        columns.get('homepage_fetched'), weights['messaging']
+    )
+    motion = motion_scores(
+        columns['traffic_score'], columns['hiring_status'], columns['sales_to_eng_ratio'], weights['motion']
+    )
+    market = market_scores(
+        columns['sentiment_score'], columns['github_stars'], columns['last_commit_days'], weights['market']
+    )
+
+    # Keep stored scores for vectors a row has no signals for
+    for name, vector in (('messaging', messaging), ('motion', motion), ('market', market)):
+        mask = columns.get(f'has_{name}')
+        stored = columns.get(f'stored_{name}')
+        if mask is not None and stored is not None:
+            vector[:] = np.where(mask, vector, np.nan_to_num(stored, nan=50.0))
+
+    return {
+        'id': columns['id'],
+        'messaging_score': np.round(messaging, 2),
+        'motion_score': np.round(motion, 2),
+        'market_score': np.round(market, 2),
+        'combined_score': np.round(combined_scores(messaging, motion, market, vector_weights), 2),
+        'stall_probability': stall_probabilities(messaging, motion, market, thresholds, vector_weights)
+    }
+
+
+def rescore_all_companies(db_conn, weights: Optional[Dict] = None, thresholds: Optional[Dict] = None) -> Dict:
+    """
+    Recompute every company's 3M scores from its stored signals in one pass
+    and bulk-write back the rows whose scores changed. No network access, so
+    updated_at (the signal staleness order) is only moved for those rows.
+    """
+    started = datetime.now()
+    columns = load_signal_columns(db_conn)
+    scored = score_columns(columns, weights, thresholds)
+    total = len(scored['id'])
+
+    changed_mask = (
+        (np.abs(scored['messaging_score'] - np.nan_to_num(columns['stored_messaging'], nan=-1)) > 0.005) |
+        (np.abs(scored['motion_score'] - np.nan_to_num(columns['stored_motion'], nan=-1)) > 0.005) |
+        (np.abs(scored['market_score'] - np.nan_to_num(columns['stored_market'], nan=-1)) > 0.005) |
+        (scored['stall_probability'] != columns['stored_stall_probability'])
+    ) if total else np.zeros(0, dtype=bool)
+    changed = int(np.count_nonzero(changed_mask))
+
+    if changed:
+        db_conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS rescored_companies (
+                id INTEGER,
+                messaging_score DOUBLE,
+                motion_score DOUBLE,
+                market_score DOUBLE,
+                stall_probability TEXT
+            )
+        """)
+        db_conn.execute("DELETE FROM rescored_companies")
+
+        rows = list(zip(
+            scored['id'][changed_mask].tolist(),
+            scored['messaging_score'][changed_mask].tolist(),
+            scored['motion_score'][changed_mask].tolist(),
+            scored['market_score'][changed_mask].tolist(),
+            scored['stall_probability'][changed_mask].tolist()
+        ))
+        for batch_start in range(0, changed, RESCORE_WRITE_BATCH):
+            db_conn.executemany(
+                "INSERT INTO rescored_companies VALUES (?, ?, ?, ?, ?)",
+                rows[batch_start:batch_start + RESCORE_WRITE_BATCH]
+            )
+
+        # One set-based update instead of a statement per company, unchanged rows untouched
+        db_conn.execute("""
+            UPDATE companies SET
+                messaging_score = r.messaging_score,
+                motion_score = r.motion_score,
+                market_score = r.market_score,
+                stall_probability = r.stall_probability,
+                updated_at = ?
+            FROM rescored_companies r
+            WHERE companies.id = r.id
+        """, (datetime.now(),))
+        db_conn.execute("DROP TABLE rescored_companies")
+        db_conn.commit()
+
+    buckets = {bucket: int(np.count_nonzero(scored['stall_probability'] == bucket))
+               for bucket in ('high', 'medium', 'low')}
+    summary = {
+        'rescored': total,
+        'changed': changed,
+        'stall_buckets': buckets,
+        'duration_seconds': round((datetime.now() - started).total_seconds(), 2)
+    }
+    print(f"[RESCORE] Rescored {total} companies ({changed} changed) in {summary['duration_seconds']}s - "
+          f"high: {buckets['high']}, medium: {buckets['medium']}, low: {buckets['low']}")
+    return summary
+
+
+if __name__ == "__main__":
+    import duckdb
+
+    conn = duckdb.connect("celerio_scout.db")
+    rescore_all_companies(conn)
+    conn.close()
@@ -10,6 +10,7 @@ import re
 from urllib.parse import urlparse, quote_plus
 import json
 from datetime import datetime
+from entity_resolution import EntityResolver
 
 # Try to import crawl4ai for advanced web scraping
 try:
@@ -118,15 +119,15 @@ class WebCompanyDiscovery:
             elif isinstance(result, list):
                 print(f"[WEB-DISCOVERY] Search task {idx+1} found {len(result)} companies")
         
-        # Combine and deduplicate results
-        seen_domains = set()
+        # Combine and deduplicate results (same company under variant names/domains across sources)
+        found = []
         for result_list in results:
             if isinstance(result_list, list):
                 for company in result_list:
                     domain = company.get('domain', '').lower().strip()
-                    if domain and domain not in seen_domains and len(domain) > 3:  # Basic validation
-                        seen_domains.add(domain)
-                        discovered.append(company)
+                    if domain and len(domain) > 3:  # Basic validation
+                        found.append(company)
+        discovered.extend(EntityResolver('company').dedupe(found))
         
         print(f"[WEB-DISCOVERY] Total unique companies discovered: {len(discovered)}")
         return discovered
@@ -258,19 +259,22 @@ class WebCompanyDiscovery:
                 from portfolio_scraper_observable import ObservablePortfolioScraper
                 scraper = ObservablePortfolioScraper(progress_callback=progress_callback)
                 
-                if 'yc' in sources and 'antler' in sources:
-                    print("[WEB-DISCOVERY] Scraping both YC and Antler portfolios with observability...")
-                    results = await scraper.scrape_both_observable()
-                    companies.extend(results.get('yc', []))
-                    companies.extend(results.get('antler', []))
-                elif 'yc' in sources:
-                    print("[WEB-DISCOVERY] Scraping YC portfolio with observability...")
-                    yc_companies = await scraper.scrape_yc_portfolio_observable()
-                    companies.extend(yc_companies)
-                elif 'antler' in sources:
-                    print("[WEB-DISCOVERY] Scraping Antler portfolio with observability...")
-                    antler_companies = await scraper.scrape_antler_portfolio_observable()
-                    companies.extend(antler_companies)
+                try:
+                    if 'yc' in sources and 'antler' in sources:
+                        print("[WEB-DISCOVERY] Scraping both YC and Antler portfolios with observability...")
+                        results = await scraper.scrape_both_observable()
+                        companies.extend(results.get('yc', []))
+                        companies.extend(results.get('antler', []))
+                    elif 'yc' in sources:
+                        print("[WEB-DISCOVERY] Scraping YC portfolio with observability...")
+                        yc_companies = await scraper.scrape_yc_portfolio_observable()
+                        companies.extend(yc_companies)
+                    elif 'antler' in sources:
+                        print("[WEB-DISCOVERY] Scraping Antler portfolio with observability...")
+                        antler_companies = await scraper.scrape_antler_portfolio_observable()
+                        companies.extend(antler_companies)
+                finally:
+                    await scraper.close()
             else:
                 from portfolio_scraper_enhanced import EnhancedPortfolioScraper
                 scraper = EnhancedPortfolioScraper()
@@ -0,0 +1,244 @@
+"""
+Celerio Scout - What-If Ranking
+Re-weights the 3M vectors over in-memory signal columns without persisting
+anything. Results are cached per weight-vector hash and named weight profiles
+are hot-reloaded from data/weight_profiles.json
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from vector_scoring import (
+    columns_from_rows, score_columns,
+    merge_weights, merge_thresholds, merge_vector_weights
+)
+
+WEIGHT_PROFILES_PATH = Path(__file__).parent.parent / "data" / "weight_profiles.json"
+
+# Number of re-ranked result sets kept (keyed by weight-vector hash + data version)
+RESULT_CACHE_SIZE = 32
+
+STALL_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+
+class WeightProfileStore:
+    """Named weight profiles read from a JSON file, reloaded whenever the file changes"""
+
+    def __init__(self, path: Path = WEIGHT_PROFILES_PATH):
+        self.path = Path(path)
+        self._profiles: Dict[str, Dict] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _reload_if_changed(self):
+        """Re-read the profiles file if its modification time moved"""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            if self._profiles:
+                print(f"[WHAT-IF] Weight profiles file {self.path} disappeared - keeping last loaded profiles")
+            return
+
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+                profiles = {}
+                for name, profile in raw.items():
+                    # Validate up front so a bad edit never replaces working profiles
+                    merge_weights(profile.get('weights'))
+                    merge_thresholds(profile.get('thresholds'))
+                    merge_vector_weights(profile.get('vector_weights'))
+                    profiles[name] = profile
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"[WHAT-IF] Error loading weight profiles from {self.path}: {e} - keeping last loaded profiles")
+                self._mtime = mtime
+                return
+
+            self._profiles = profiles
+            self._mtime = mtime
+            print(f"[WHAT-IF] Loaded {len(profiles)} weight profiles from {self.path}")
+
+    def get_profile(self, name: str) -> Optional[Dict]:
+        """Get a named profile (None if unknown)"""
+        self._reload_if_changed()
+        return self._profiles.get(name)
+
+    def list_profiles(self) -> Dict[str, Dict]:
+        """All profiles with their fully merged weights"""
+        self._reload_if_changed()
+        return {
+            name: {
+                'description': profile.get('description', ''),
+                **resolve_weights(profile)
+            }
+            for name, profile in self._profiles.items()
+        }
+
+
+def resolve_weights(
+    profile: Optional[Dict] = None,
+    vector_weights: Optional[Dict] = None,
+    weights: Optional[Dict] = None,
+    thresholds: Optional[Dict] = None
+) -> Dict:
+    """Merge defaults, a profile and per-request overrides (request wins) into one weight set"""
+    profile = profile or {}
+    profile_weights = profile.get('weights') or {}
+    weights = weights or {}
+    component_overrides = {
+        vector: {**(profile_weights.get(vector) or {}), **(weights.get(vector) or {})}
+        for vector in set(profile_weights) | set(weights)
+    }
+    return {
+        'vector_weights': merge_vector_weights({**(profile.get('vector_weights') or {}), **(vector_weights or {})}),
+        'weights': merge_weights(component_overrides),
+        'thresholds': merge_thresholds({**(profile.get('thresholds') or {}), **(thresholds or {})})
+    }
+
+
+def weights_hash(resolved: Dict) -> str:
+    """Stable hash of a resolved weight set"""
+    canonical = json.dumps(
+        {
+            section: {k: (round(v, 6) if isinstance(v, float) else
+                          {ck: round(cv, 6) for ck, cv in sorted(v.items())})
+                      for k, v in sorted(values.items())}
+            for section, values in sorted(resolved.items())
+        },
+        sort_keys=True
+    )
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+class WhatIfRanker:
+    """Ranks companies under alternative weights over cached in-memory signal columns"""
+
+    def __init__(self, profile_store: Optional[WeightProfileStore] = None, cache_size: int = RESULT_CACHE_SIZE):
+        self.profiles = profile_store or WeightProfileStore()
+        self.cache_size = cache_size
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._companies: Optional[Dict[str, np.ndarray]] = None
+        self._data_version: Optional[Tuple] = None
+        self._results: "OrderedDict[Tuple[str, Tuple], Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _current_data_version(self, db_conn) -> Tuple:
+        """Cheap change marker for the companies table"""
+        row = db_conn.execute("SELECT COUNT(*), MAX(updated_at) FROM companies").fetchone()
+        return (row[0], str(row[1]))
+
+    def _load_columns(self, db_conn):
+        """(Re)load signal columns when the companies table changed"""
+        version = self._current_data_version(db_conn)
+        if self._columns is not None and version == self._data_version:
+            return
+
+        rows = db_conn.execute("""
+            SELECT id, signals, messaging_score, motion_score, market_score, name, domain, stall_probability
+            FROM companies
+        """).fetchall()
+        self._columns = columns_from_rows([row[:5] for row in rows], include_unsignaled=True)
+        self._companies = {
+            'name': np.array([row[5] or '' for row in rows], dtype=object),
+            'domain': np.array([row[6] or '' for row in rows], dtype=object),
+            'stored_stall_probability': np.array([row[7] or '' for row in rows], dtype=object)
+        }
+        self._data_version = version
+        self._results.clear()
+
+    def _scored(self, db_conn, resolved: Dict, key: str) -> Tuple[Dict, bool]:
+        """Scored and ranked arrays for a weight set, from cache when possible"""
+        with self._lock:
+            self._load_columns(db_conn)
+            cache_key = (key, self._data_version)
+            if cache_key in self._results:
+                self._results.move_to_end(cache_key)
+                return self._results[cache_key], True
+
+            scored = score_columns(
+                self._columns, resolved['weights'], resolved['thresholds'], resolved['vector_weights']
+            )
+            # Most stalled first: lowest combined score ranks highest
+            scored['order'] = np.argsort(scored['combined_score'], kind='stable')
+            self._results[cache_key] = scored
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            return scored, False
+
+    def rerank(
+        self,
+        db_conn,
+        profile: Optional[str] = None,
+        vector_weights: Optional[Dict] = None,
+        weights: Optional[Dict] = None,
+        thresholds: Optional[Dict] = None,
+        stall_probability: Optional[List[str]] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict:
+        """
+        Rank companies under a profile and/or explicit overrides.
+        Nothing is written back - stored scores stay as they are.
+        """
+        profile_config = None
+        if profile:
+            profile_config = self.profiles.get_profile(profile)
+            if profile_config is None:
+                raise ValueError(f"Unknown weight profile: {profile}")
+
+        resolved = resolve_weights(profile_config, vector_weights, weights, thresholds)
+        key = weights_hash(resolved)
+        scored, cached = self._scored(db_conn, resolved, key)
+
+        order = scored['order']
+        if stall_probability:
+            order = order[np.isin(scored['stall_probability'][order], stall_probability)]
+
+        buckets = {bucket: int(np.count_nonzero(scored['stall_probability'] == bucket)) for bucket in STALL_RANK}
+        page = order[offset:offset + limit]
+        companies = [
+            {
+                'rank': offset + position + 1,
+                'id': int(scored['id'][index]),
+                'name': self._companies['name'][index],
+                'domain': self._companies['domain'][index],
+                'messaging_score': float(scored['messaging_score'][index]),
+                'motion_score': float(scored['motion_score'][index]),
+                'market_score': float(scored['market_score'][index]),
+                'combined_score': float(scored['combined_score'][index]),
+                'stall_probability': str(scored['stall_probability'][index]),
+                'stored_stall_probability': self._companies['stored_stall_probability'][index]
+            }
+            for position, index in enumerate(page.tolist())
+        ]
+
+        return {
+            'profile': profile,
+            'weights_hash': key,
+            'cached': cached,
+            'resolved_weights': resolved,
+            'total': int(len(order)),
+            'stall_buckets': buckets,
+            'companies': companies
+        }
+
+
+_ranker: Optional[WhatIfRanker] = None
+
+
+def get_what_if_ranker() -> WhatIfRanker:
+    """Process-wide ranker so the column and result caches survive between requests"""
+    global _ranker
+    if _ranker is None:
+        _ranker = WhatIfRanker()
+    return _ranker
@@ -41,8 +41,8 @@ function PortfolioScrapingMonitor({ sessionId, onClose, onComplete }) {
       }
       
       // Update screenshot
-      if (data.type === 'screenshot' && data.screenshot) {
-        setLatestScreenshot(`data:image/png;base64,${data.screenshot}`)
+      if (data.type === 'screenshot' && data.screenshot_url) {
+        setLatestScreenshot(`http://localhost:8000${data.screenshot_url}`)
       }
       
       // Handle companies_added event - new companies saved to database
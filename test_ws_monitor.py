@@ -20,8 +20,8 @@ async def test_monitor(session_id):
                     print(f"\n[{data.get('type', 'info').upper()}] {data.get('message', 'Update')}")
                     if 'total_companies' in data:
                         print(f"  Total: {data.get('total_companies', 0)} | YC: {data.get('yc_companies', 0)} | Antler: {data.get('antler_companies', 0)}")
-                    if 'screenshot' in data:
-                        print(f"  [Screenshot received - {len(data['screenshot'])} bytes]")
+                    if 'screenshot_url' in data:
+                        print(f"  [Screenshot stored - {data.get('bytes', 0)} bytes at {data['screenshot_url']}]")
                 except asyncio.TimeoutError:
                     print(".", end="", flush=True)
     except Exception as e: